@@ -0,0 +1,411 @@
+"""Incremental usage rollups for limits control
+
+Revision ID: 018_usage_rollups
+Revises: 017_b2b_billing_system
+Create Date: 2025-10-02 09:00:00.000000
+
+Mantém agregados diários de service_usage_tracking atualizados por trigger:
+
+- service_usage_daily: contrato x serviço x dia (monitoramento de regras)
+- authorization_usage_daily: autorização x dia (limites da autorização)
+
+Com isso o uso DAILY/WEEKLY/MONTHLY vira a soma de no máximo 31 linhas
+pré-agregadas, e monitor_contract_limits avalia todas as regras em uma única
+passada (INSERT ... SELECT) em vez de um loop com re-scan por regra.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "018_usage_rollups"
+down_revision = "017_b2b_billing_system"
+branch_labels = None
+depends_on = None
+
+# As funções leem os agregados; no downgrade as mesmas funções são recriadas
+# sobre subconsultas equivalentes em service_usage_tracking.
+CHECK_AUTHORIZATION_LIMITS_SQL = """
+        CREATE OR REPLACE FUNCTION master.check_authorization_limits(
+            p_authorization_id BIGINT,
+            p_sessions_to_use INTEGER DEFAULT 1,
+            p_execution_date DATE DEFAULT CURRENT_DATE
+        ) RETURNS JSON AS $$
+        DECLARE
+            auth_record RECORD;
+            daily_usage INTEGER;
+            weekly_usage INTEGER;
+            monthly_usage INTEGER;
+            month_start DATE := DATE_TRUNC('month', p_execution_date)::DATE;
+            limit_violations JSON := '[]'::JSON;
+        BEGIN
+            SELECT * INTO auth_record
+            FROM master.medical_authorizations
+            WHERE id = p_authorization_id AND status = 'active';
+
+            IF NOT FOUND THEN
+                RETURN json_build_object(
+                    'valid', false,
+                    'reason', 'Authorization not found or not active',
+                    'violations', '[]'::JSON
+                );
+            END IF;
+
+            IF p_execution_date < auth_record.valid_from OR p_execution_date > auth_record.valid_until THEN
+                RETURN json_build_object(
+                    'valid', false,
+                    'reason', 'Authorization not valid for this date',
+                    'violations', '[]'::JSON
+                );
+            END IF;
+
+            IF auth_record.sessions_remaining IS NOT NULL THEN
+                IF auth_record.sessions_remaining < p_sessions_to_use THEN
+                    RETURN json_build_object(
+                        'valid', false,
+                        'reason', 'Insufficient sessions remaining',
+                        'sessions_remaining', auth_record.sessions_remaining,
+                        'sessions_requested', p_sessions_to_use,
+                        'violations', '[]'::JSON
+                    );
+                END IF;
+            END IF;
+
+            IF COALESCE(auth_record.daily_limit, auth_record.weekly_limit, auth_record.monthly_limit) IS NOT NULL THEN
+                SELECT
+                    COALESCE(SUM(sessions_used) FILTER (WHERE usage_date = p_execution_date), 0),
+                    COALESCE(SUM(sessions_used) FILTER (WHERE usage_date >= p_execution_date - 6
+                                                          AND usage_date <= p_execution_date), 0),
+                    COALESCE(SUM(sessions_used) FILTER (WHERE usage_date >= month_start), 0)
+                INTO daily_usage, weekly_usage, monthly_usage
+                FROM {authorization_usage} u
+                WHERE u.authorization_id = p_authorization_id
+                  AND u.usage_date >= LEAST(p_execution_date - 6, month_start)
+                  AND u.usage_date < (month_start + INTERVAL '1 month')::DATE;
+            END IF;
+
+            IF auth_record.daily_limit IS NOT NULL
+               AND daily_usage + p_sessions_to_use > auth_record.daily_limit THEN
+                limit_violations := limit_violations || json_build_object(
+                    'type', 'DAILY_LIMIT_EXCEEDED',
+                    'limit', auth_record.daily_limit,
+                    'current_usage', daily_usage,
+                    'requested', p_sessions_to_use
+                )::JSON;
+            END IF;
+
+            IF auth_record.weekly_limit IS NOT NULL
+               AND weekly_usage + p_sessions_to_use > auth_record.weekly_limit THEN
+                limit_violations := limit_violations || json_build_object(
+                    'type', 'WEEKLY_LIMIT_EXCEEDED',
+                    'limit', auth_record.weekly_limit,
+                    'current_usage', weekly_usage,
+                    'requested', p_sessions_to_use
+                )::JSON;
+            END IF;
+
+            IF auth_record.monthly_limit IS NOT NULL
+               AND monthly_usage + p_sessions_to_use > auth_record.monthly_limit THEN
+                limit_violations := limit_violations || json_build_object(
+                    'type', 'MONTHLY_LIMIT_EXCEEDED',
+                    'limit', auth_record.monthly_limit,
+                    'current_usage', monthly_usage,
+                    'requested', p_sessions_to_use
+                )::JSON;
+            END IF;
+
+            RETURN json_build_object(
+                'valid', json_array_length(limit_violations) = 0,
+                'authorization_id', p_authorization_id,
+                'sessions_remaining', auth_record.sessions_remaining,
+                'violations', limit_violations
+            );
+        END;
+        $$ LANGUAGE plpgsql;
+    """
+
+MONITOR_CONTRACT_LIMITS_SQL = """
+        CREATE OR REPLACE FUNCTION master.monitor_contract_limits(
+            p_contract_id BIGINT DEFAULT NULL,
+            p_check_date DATE DEFAULT CURRENT_DATE
+        ) RETURNS JSON AS $$
+        DECLARE
+            result_array JSON;
+        BEGIN
+            WITH rules AS (
+                SELECT lc.*,
+                       CASE lc.limit_scope
+                           WHEN 'DAILY' THEN p_check_date
+                           WHEN 'WEEKLY' THEN p_check_date - 6
+                           WHEN 'MONTHLY' THEN DATE_TRUNC('month', p_check_date)::DATE
+                           WHEN 'YEARLY' THEN DATE_TRUNC('year', p_check_date)::DATE
+                       END AS window_start,
+                       CASE lc.limit_scope
+                           WHEN 'MONTHLY' THEN (DATE_TRUNC('month', p_check_date) + INTERVAL '1 month - 1 day')::DATE
+                           WHEN 'YEARLY' THEN (DATE_TRUNC('year', p_check_date) + INTERVAL '1 year - 1 day')::DATE
+                           WHEN 'TOTAL' THEN NULL
+                           ELSE p_check_date
+                       END AS window_end
+                FROM master.limits_configuration lc
+                WHERE lc.is_active = true
+                  AND lc.rule_type IN ('SESSION', 'FINANCIAL')
+                  AND lc.valid_from <= p_check_date
+                  AND (lc.valid_until IS NULL OR lc.valid_until >= p_check_date)
+                  AND (p_contract_id IS NULL OR lc.contract_id IS NULL
+                       OR lc.contract_id = p_contract_id)
+            ),
+            usage AS (
+                SELECT r.id AS rule_id,
+                       d.contract_id,
+                       SUM(CASE WHEN r.rule_type = 'SESSION'
+                                THEN d.sessions_used ELSE d.value_charged END) AS usage_amount
+                FROM rules r
+                JOIN {contract_usage} d
+                  ON (r.contract_id IS NULL OR d.contract_id = r.contract_id)
+                 AND (r.service_id IS NULL OR d.service_id = r.service_id)
+                 AND (r.window_start IS NULL OR d.usage_date >= r.window_start)
+                 AND (r.window_end IS NULL OR d.usage_date <= r.window_end)
+                WHERE p_contract_id IS NULL OR d.contract_id = p_contract_id
+                GROUP BY r.id, d.contract_id
+            ),
+            evaluated AS (
+                SELECT r.id AS rule_id,
+                       u.contract_id,
+                       u.usage_amount,
+                       r.limit_value,
+                       r.auto_block,
+                       COALESCE(r.window_start, p_check_date) AS period_start,
+                       CASE WHEN r.limit_value > 0
+                            THEN u.usage_amount / r.limit_value ELSE 0 END AS percentage_used,
+                       r.alert_threshold
+                FROM usage u
+                JOIN rules r ON r.id = u.rule_id
+            ),
+            inserted AS (
+                INSERT INTO master.limits_violations (
+                    limit_rule_id, contract_id, violation_type, current_usage,
+                    limit_value, percentage_used, period_start, period_end,
+                    auto_action_taken
+                )
+                SELECT e.rule_id,
+                       e.contract_id,
+                       CASE WHEN e.percentage_used >= 1.0 THEN 'EXCEEDED' ELSE 'ALERT' END,
+                       e.usage_amount,
+                       e.limit_value,
+                       e.percentage_used,
+                       e.period_start,
+                       p_check_date,
+                       CASE WHEN e.percentage_used >= 1.0 AND e.auto_block
+                            THEN 'AUTO_BLOCKED' ELSE 'ALERT_GENERATED' END
+                FROM evaluated e
+                WHERE e.percentage_used >= e.alert_threshold
+                RETURNING id, limit_rule_id, contract_id, current_usage,
+                          limit_value, percentage_used, violation_type
+            )
+            SELECT COALESCE(
+                json_agg(
+                    json_build_object(
+                        'rule_id', i.limit_rule_id,
+                        'rule_name', r.rule_name,
+                        'contract_id', i.contract_id,
+                        'violation_id', i.id,
+                        'usage_amount', i.current_usage,
+                        'limit_value', i.limit_value,
+                        'percentage_used', i.percentage_used,
+                        'violation_type', i.violation_type
+                    )
+                    ORDER BY r.priority, i.contract_id
+                ),
+                '[]'::JSON
+            ) INTO result_array
+            FROM inserted i
+            JOIN rules r ON r.id = i.limit_rule_id;
+
+            RETURN json_build_object(
+                'check_date', p_check_date,
+                'violations_found', json_array_length(result_array),
+                'violations', result_array
+            );
+        END;
+        $$ LANGUAGE plpgsql;
+    """
+
+RAW_AUTHORIZATION_USAGE = """(
+    SELECT authorization_id, execution_date AS usage_date, sessions_used
+    FROM master.service_usage_tracking
+    WHERE status = 'completed'
+)"""
+
+RAW_CONTRACT_USAGE = """(
+    SELECT cl.contract_id, ma.service_id, sut.execution_date AS usage_date,
+           sut.sessions_used, COALESCE(sut.value_charged, 0) AS value_charged
+    FROM master.service_usage_tracking sut
+    JOIN master.medical_authorizations ma ON ma.id = sut.authorization_id
+    JOIN master.contract_lives cl ON cl.id = ma.contract_life_id
+    WHERE sut.status = 'completed'
+)"""
+
+# Trigger: aplica o delta de cada linha 'completed' nos agregados
+ROLLUP_TRIGGER_SQL = """
+        CREATE OR REPLACE FUNCTION master.apply_service_usage_rollup(
+            p_authorization_id BIGINT,
+            p_usage_date DATE,
+            p_sessions BIGINT,
+            p_value NUMERIC,
+            p_executions INTEGER
+        ) RETURNS VOID AS $$
+        BEGIN
+            INSERT INTO master.authorization_usage_daily AS a (
+                authorization_id, usage_date, sessions_used
+            ) VALUES (p_authorization_id, p_usage_date, p_sessions)
+            ON CONFLICT (authorization_id, usage_date) DO UPDATE
+            SET sessions_used = a.sessions_used + EXCLUDED.sessions_used;
+
+            INSERT INTO master.service_usage_daily AS d (
+                contract_id, service_id, usage_date,
+                sessions_used, value_charged, executions
+            )
+            SELECT cl.contract_id, ma.service_id, p_usage_date,
+                   p_sessions, p_value, p_executions
+            FROM master.medical_authorizations ma
+            JOIN master.contract_lives cl ON cl.id = ma.contract_life_id
+            WHERE ma.id = p_authorization_id
+            ON CONFLICT (contract_id, service_id, usage_date) DO UPDATE
+            SET sessions_used = d.sessions_used + EXCLUDED.sessions_used,
+                value_charged = d.value_charged + EXCLUDED.value_charged,
+                executions = d.executions + EXCLUDED.executions;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE FUNCTION master.service_usage_rollup_trigger()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status = 'completed' THEN
+                PERFORM master.apply_service_usage_rollup(
+                    OLD.authorization_id, OLD.execution_date,
+                    -OLD.sessions_used, -COALESCE(OLD.value_charged, 0), -1
+                );
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status = 'completed' THEN
+                PERFORM master.apply_service_usage_rollup(
+                    NEW.authorization_id, NEW.execution_date,
+                    NEW.sessions_used, COALESCE(NEW.value_charged, 0), 1
+                );
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER tr_service_usage_rollup
+            AFTER INSERT OR DELETE OR UPDATE OF
+                status, authorization_id, execution_date, sessions_used, value_charged
+            ON master.service_usage_tracking
+            FOR EACH ROW EXECUTE FUNCTION master.service_usage_rollup_trigger();
+    """
+
+# Backfill a partir do histórico existente
+BACKFILL_SQL = """
+        INSERT INTO master.authorization_usage_daily (
+            authorization_id, usage_date, sessions_used
+        )
+        SELECT authorization_id, execution_date, SUM(sessions_used)
+        FROM master.service_usage_tracking
+        WHERE status = 'completed'
+        GROUP BY authorization_id, execution_date;
+
+        INSERT INTO master.service_usage_daily (
+            contract_id, service_id, usage_date,
+            sessions_used, value_charged, executions
+        )
+        SELECT cl.contract_id, ma.service_id, sut.execution_date,
+               SUM(sut.sessions_used), COALESCE(SUM(sut.value_charged), 0), COUNT(*)
+        FROM master.service_usage_tracking sut
+        JOIN master.medical_authorizations ma ON ma.id = sut.authorization_id
+        JOIN master.contract_lives cl ON cl.id = ma.contract_life_id
+        WHERE sut.status = 'completed'
+        GROUP BY cl.contract_id, ma.service_id, sut.execution_date;
+    """
+
+
+def upgrade():
+    """Create usage rollups and set-based limit checks"""
+
+    op.create_table(
+        "service_usage_daily",
+        sa.Column("contract_id", sa.BigInteger(), nullable=False),
+        sa.Column("service_id", sa.BigInteger(), nullable=False),
+        sa.Column("usage_date", sa.Date(), nullable=False),
+        sa.Column("sessions_used", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column(
+            "value_charged", sa.Numeric(14, 2), nullable=False, server_default="0"
+        ),
+        sa.Column("executions", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["contract_id"], ["master.contracts.id"]),
+        sa.ForeignKeyConstraint(["service_id"], ["master.services_catalog.id"]),
+        sa.PrimaryKeyConstraint("contract_id", "service_id", "usage_date"),
+        schema="master",
+    )
+    # Regras globais (sem contrato) filtram apenas pela janela de datas
+    op.create_index(
+        "idx_service_usage_daily_date",
+        "service_usage_daily",
+        ["usage_date"],
+        schema="master",
+    )
+
+    op.create_table(
+        "authorization_usage_daily",
+        sa.Column("authorization_id", sa.BigInteger(), nullable=False),
+        sa.Column("usage_date", sa.Date(), nullable=False),
+        sa.Column("sessions_used", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(
+            ["authorization_id"], ["master.medical_authorizations.id"]
+        ),
+        sa.PrimaryKeyConstraint("authorization_id", "usage_date"),
+        schema="master",
+    )
+
+    op.execute(ROLLUP_TRIGGER_SQL)
+    op.execute(BACKFILL_SQL)
+
+    # Limites da autorização: uma leitura de até 31 linhas do agregado
+    op.execute(
+        CHECK_AUTHORIZATION_LIMITS_SQL.format(
+            authorization_usage="master.authorization_usage_daily"
+        )
+    )
+
+    # Monitoramento: todas as regras x contratos em uma única passada
+    op.execute(
+        MONITOR_CONTRACT_LIMITS_SQL.format(contract_usage="master.service_usage_daily")
+    )
+
+
+def downgrade():
+    """Drop usage rollups (funções voltam a ler service_usage_tracking)"""
+
+    op.execute(
+        CHECK_AUTHORIZATION_LIMITS_SQL.format(
+            authorization_usage=RAW_AUTHORIZATION_USAGE
+        )
+    )
+    op.execute(MONITOR_CONTRACT_LIMITS_SQL.format(contract_usage=RAW_CONTRACT_USAGE))
+
+    op.execute(
+        "DROP TRIGGER IF EXISTS tr_service_usage_rollup ON master.service_usage_tracking;"
+    )
+    op.execute("DROP FUNCTION IF EXISTS master.service_usage_rollup_trigger();")
+    op.execute(
+        "DROP FUNCTION IF EXISTS master.apply_service_usage_rollup("
+        "BIGINT, DATE, BIGINT, NUMERIC, INTEGER);"
+    )
+    op.drop_table("authorization_usage_daily", schema="master")
+    op.drop_index(
+        "idx_service_usage_daily_date",
+        table_name="service_usage_daily",
+        schema="master",
+    )
+    op.drop_table("service_usage_daily", schema="master")
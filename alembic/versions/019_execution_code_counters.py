@@ -0,0 +1,122 @@
+"""Sequence-backed service execution codes
+
+Revision ID: 019_execution_code_counters
+Revises: 018_usage_rollups
+Create Date: 2025-10-03 09:00:00.000000
+
+Substitui o loop com EXISTS de generate_execution_code por um contador por
+dia (upsert atômico com RETURNING). reserve_execution_codes permite reservar
+um bloco de códigos de uma vez para inserções em lote.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "019_execution_code_counters"
+down_revision = "018_usage_rollups"
+branch_labels = None
+depends_on = None
+
+
+COUNTERS_TABLE_SQL = """
+    CREATE TABLE master.execution_code_counters (
+        code_date DATE PRIMARY KEY,
+        last_value INTEGER NOT NULL
+    );
+"""
+
+# Backfill a partir dos códigos existentes (data do próprio código)
+BACKFILL_SQL = r"""
+    INSERT INTO master.execution_code_counters (code_date, last_value)
+    SELECT TO_DATE(SUBSTRING(execution_code FROM 5 FOR 8), 'YYYYMMDD'),
+           MAX(SUBSTRING(execution_code FROM 14)::INTEGER)
+    FROM master.service_executions
+    WHERE execution_code ~ '^EXE-\d{8}-\d+$'
+    GROUP BY 1;
+"""
+
+EXECUTION_CODE_FUNCTIONS_SQL = """
+    CREATE OR REPLACE FUNCTION master.format_execution_code(
+        p_code_date DATE,
+        p_value INTEGER
+    ) RETURNS TEXT AS $$
+        -- Format: EXE-YYYYMMDD-001 (sem truncar acima de 999)
+        SELECT 'EXE-' || TO_CHAR(p_code_date, 'YYYYMMDD') || '-'
+               || LPAD(p_value::TEXT, GREATEST(3, LENGTH(p_value::TEXT)), '0');
+    $$ LANGUAGE sql IMMUTABLE;
+
+    CREATE OR REPLACE FUNCTION master.reserve_execution_codes(
+        p_code_date DATE,
+        p_count INTEGER DEFAULT 1
+    ) RETURNS SETOF TEXT AS $$
+    DECLARE
+        last_reserved INTEGER;
+    BEGIN
+        IF p_count < 1 THEN
+            RETURN;
+        END IF;
+
+        INSERT INTO master.execution_code_counters AS c (code_date, last_value)
+        VALUES (p_code_date, p_count)
+        ON CONFLICT (code_date) DO UPDATE
+        SET last_value = c.last_value + EXCLUDED.last_value
+        RETURNING c.last_value INTO last_reserved;
+
+        RETURN QUERY
+        SELECT master.format_execution_code(p_code_date, n)
+        FROM generate_series(last_reserved - p_count + 1, last_reserved) AS n;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION master.generate_execution_code()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        SELECT code INTO NEW.execution_code
+        FROM master.reserve_execution_codes(NEW.execution_date, 1) AS code;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade():
+    """Create per-day execution code counters"""
+
+    op.execute(COUNTERS_TABLE_SQL)
+    op.execute(BACKFILL_SQL)
+    op.execute(EXECUTION_CODE_FUNCTIONS_SQL)
+
+
+def downgrade():
+    """Restore EXISTS-probing execution code generation"""
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION master.generate_execution_code()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            new_code TEXT;
+            counter INTEGER := 1;
+            date_part TEXT;
+        BEGIN
+            date_part := TO_CHAR(NEW.execution_date, 'YYYYMMDD');
+
+            LOOP
+                new_code := 'EXE-' || date_part || '-' || LPAD(counter::TEXT, 3, '0');
+
+                IF NOT EXISTS (SELECT 1 FROM master.service_executions WHERE execution_code = new_code) THEN
+                    EXIT;
+                END IF;
+
+                counter := counter + 1;
+            END LOOP;
+
+            NEW.execution_code := new_code;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """
+    )
+    op.execute("DROP FUNCTION IF EXISTS master.reserve_execution_codes(DATE, INTEGER);")
+    op.execute("DROP FUNCTION IF EXISTS master.format_execution_code(DATE, INTEGER);")
+    op.execute("DROP TABLE IF EXISTS master.execution_code_counters;")
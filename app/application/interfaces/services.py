@@ -64,6 +64,16 @@ class AuthServiceInterface(ABC):
     def get_password_hash(self, password: str) -> str:
         """Gerar hash da senha"""
 
+    @abstractmethod
+    async def verify_password_async(
+        self, plain_password: str, hashed_password: str
+    ) -> bool:
+        """Verificar senha fora do event loop"""
+
+    @abstractmethod
+    async def get_password_hash_async(self, password: str) -> str:
+        """Gerar hash da senha fora do event loop"""
+
     @abstractmethod
     def create_access_token(
         self, data: dict, expires_delta: Optional[timedelta] = None
@@ -26,7 +26,7 @@ class AuthUseCase:
         if not user:
             return None
 
-        if not self.auth_service.verify_password(password, user.password):
+        if not await self.auth_service.verify_password_async(password, user.password):
             return None
 
         return user
@@ -47,7 +47,9 @@ class AuthUseCase:
             raise ValueError("User already exists")
 
         # Hash da senha
-        hashed_password = self.auth_service.get_password_hash(user_data["password"])
+        hashed_password = await self.auth_service.get_password_hash_async(
+            user_data["password"]
+        )
 
         # Criar usuário
         user_entity = await self.user_repository.create(
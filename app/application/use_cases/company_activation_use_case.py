@@ -324,7 +324,7 @@ class CompanyActivationUseCase:
         Raises:
             ValueError: Se token inválido ou usuário já existe
         """
-        from app.infrastructure.auth import get_password_hash
+        from app.infrastructure.auth import get_password_hash_async
 
         # Validar token
         validation = await self.validate_user_creation_token(user_creation_token)
@@ -359,7 +359,7 @@ class CompanyActivationUseCase:
             company_id=company.id,
             establishment_id=None,
             email_address=user_email,
-            password=get_password_hash(password),
+            password=await get_password_hash_async(password),
             context_type="company",
             status="active",
             is_active=True,
@@ -7,7 +7,7 @@ from sqlalchemy.orm import selectinload
 
 from app.application.dto.user_dto import UserCreateWithInvitation, UserResponse
 from app.domain.entities.user import User as UserDomain
-from app.infrastructure.auth import get_password_hash
+from app.infrastructure.auth import get_password_hash_async
 from app.infrastructure.orm.models import Company, Establishments, People, User
 from app.infrastructure.services.email_service import EmailService
 
@@ -76,7 +76,7 @@ class UserManagementUseCase:
             company_id=company_id,
             establishment_id=None,  # Gestor da empresa não tem estabelecimento específico
             email_address=email,
-            password=get_password_hash(
+            password=await get_password_hash_async(
                 "temp_password_will_be_changed"
             ),  # Senha temporária
             context_type="company",
@@ -167,7 +167,7 @@ class UserManagementUseCase:
             company_id=establishment.company_id,
             establishment_id=establishment_id,
             email_address=email,
-            password=get_password_hash(
+            password=await get_password_hash_async(
                 "temp_password_will_be_changed"
             ),  # Senha temporária
             context_type="establishment",
@@ -241,7 +241,7 @@ class UserManagementUseCase:
             raise ValueError("Usuário já foi ativado")
 
         # Ativar usuário
-        user.password = get_password_hash(new_password)
+        user.password = await get_password_hash_async(new_password)
         user.status = "active"
         user.is_active = True
         user.activated_at = datetime.utcnow()
@@ -3,15 +3,38 @@ Menu Repository - Sistema de Menus Dinâmicos
 Responsável por buscar e filtrar menus baseado em permissões de usuário
 """
 
-import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import structlog
 from sqlalchemy import text
 
 logger = structlog.get_logger()
 
+# Permissões do usuário no contexto (ROOT ignora o contexto da role)
+USER_MENU_ACCESS_QUERY = text(
+    """
+    SELECT
+        u.is_system_admin,
+        ARRAY(
+            SELECT DISTINCT p.name
+            FROM master.user_roles ur
+            JOIN master.role_permissions rp ON ur.role_id = rp.role_id
+            JOIN master.permissions p ON rp.permission_id = p.id
+            WHERE ur.user_id = u.id
+              AND ur.status = 'active'
+              AND ur.deleted_at IS NULL
+              AND p.is_active = true
+              AND ur.context_type = :context_type
+              AND ur.context_id = :context_id
+        ) AS permissions
+    FROM master.users u
+    WHERE u.id = :user_id
+      AND u.is_active = true
+      AND u.deleted_at IS NULL
+"""
+)
+
 
 def timing_decorator(func):
     """Decorator para medir tempo de execução de métodos"""
@@ -50,8 +73,27 @@ def timing_decorator(func):
 class MenuRepository:
     """Repository para gerenciamento de menus dinâmicos"""
 
-    def __init__(self, db):
+    def __init__(self, db, catalog_store=None):
         self.db = db
+        # Catálogo de menus compilado (MenuCatalogStore), injetado pela API
+        self.catalog_store = catalog_store
+
+    async def _get_menu_access(
+        self, user_id: int, context_type: str, context_id: Optional[int]
+    ) -> Optional[Tuple[bool, List[str]]]:
+        """(is_system_admin, permissões no contexto) ou None se inativo"""
+        result = await self.db.execute(
+            USER_MENU_ACCESS_QUERY,
+            {
+                "user_id": user_id,
+                "context_type": context_type,
+                "context_id": context_id,
+            },
+        )
+        row = result.fetchone()
+        if row is None:
+            return None
+        return bool(row.is_system_admin), list(row.permissions or [])
 
     @timing_decorator
     async def get_user_menus(
@@ -65,6 +107,9 @@ class MenuRepository:
         Busca menus permitidos para usuário baseado em suas permissões
         e contexto atual (system/company/establishment).
 
+        Os menus vêm do catálogo compilado do worker; apenas as permissões do
+        usuário são consultadas no banco.
+
         Args:
             user_id: ID do usuário
             context_type: Tipo de contexto (system/company/establishment)
@@ -82,172 +127,17 @@ class MenuRepository:
             context_id=context_id,
         )
 
-        # Query complexa usando a view vw_menu_hierarchy
-        query = text(
-            """
-            WITH user_info AS (
-                SELECT
-                    u.id,
-                    u.is_system_admin,
-                    u.email_address,
-                    u.is_active
-                FROM master.users u
-                WHERE u.id = :user_id
-                AND u.is_active = true
-                AND u.deleted_at IS NULL
-            ),
-            user_permissions AS (
-                SELECT DISTINCT p.name as permission_name
-                FROM master.users u
-                JOIN master.user_roles ur ON u.id = ur.user_id
-                JOIN master.role_permissions rp ON ur.role_id = rp.role_id
-                JOIN master.permissions p ON rp.permission_id = p.id
-                WHERE u.id = :user_id
-                AND ur.status = 'active'
-                AND ur.deleted_at IS NULL
-                AND p.is_active = true
-                AND (
-                    -- Validar contexto da role
-                    (ur.context_type = :context_type AND ur.context_id = :context_id)
-                    OR
-                    -- ROOT ignora contexto de role
-                    EXISTS (SELECT 1 FROM user_info ui WHERE ui.is_system_admin = true)
-                )
-            ),
-            filtered_menus AS (
-                SELECT
-                    m.id,
-                    m.parent_id,
-                    m.name,
-                    m.slug,
-                    m.url,
-                    m.route_name,
-                    m.route_params,
-                    m.icon,
-                    m.level,
-                    m.sort_order,
-                    m.badge_text,
-                    m.badge_color,
-                    m.full_path_name,
-                    m.id_path,
-                    m.type,
-                    m.permission_name,
-                    m.company_specific,
-                    m.establishment_specific,
-                    ui.is_system_admin
-                FROM master.vw_menu_hierarchy m
-                CROSS JOIN user_info ui  -- Garantir info do usuário em cada linha
-                WHERE m.is_active = true
-                AND m.is_visible = true
-                AND m.visible_in_menu = true
-                AND (
-                    -- 🔑 ROOT: VÊ TUDO (controlado por include_dev_menus)
-                    (
-                        ui.is_system_admin = true
-                    )
-                    OR
-                    -- Usuário normal: validação de permissões
-                    (
-                        ui.is_system_admin = false
-                        AND (
-                            -- Menu sem permissão específica (público)
-                            m.permission_name IS NULL
-                            OR
-                            -- Usuário tem a permissão necessária
-                            EXISTS (
-                                SELECT 1 FROM user_permissions up
-                                WHERE up.permission_name = m.permission_name
-                            )
-                        )
-                    )
-                )
-                -- Filtros de contexto empresa/estabelecimento
-                AND (
-                    -- ROOT ignora restrições de contexto
-                    ui.is_system_admin = true
-                    OR
-                    -- Usuário normal: validar contexto
-                    (
-                        ui.is_system_admin = false
-                        AND (
-                            (m.company_specific = false AND m.establishment_specific = false)
-                            OR
-                            (m.company_specific = true AND :context_type IN ('company', 'establishment'))
-                            OR
-                            (m.establishment_specific = true AND :context_type = 'establishment')
-                        )
-                    )
-                )
-            )
-            SELECT
-                id,
-                parent_id,
-                name,
-                slug,
-                url,
-                route_name,
-                route_params,
-                icon,
-                level,
-                sort_order,
-                badge_text,
-                badge_color,
-                full_path_name,
-                id_path,
-                type,
-                permission_name,
-                is_system_admin
-            FROM filtered_menus
-            ORDER BY level, sort_order, name
-        """
-        )
-
-        # Determinar se deve mostrar menus de desenvolvimento
-        # ROOT em development ou explicitamente solicitado
-        if include_dev_menus is None:
-            include_dev_menus = (
-                context_type == "system"
-                and os.getenv("ENVIRONMENT", "production") == "development"
-            )
-
         try:
-            result = await self.db.execute(
-                query,
-                {
-                    "user_id": user_id,
-                    "context_type": context_type,
-                    "context_id": context_id,
-                    "include_dev_menus": include_dev_menus,
-                },
+            access = await self._get_menu_access(user_id, context_type, context_id)
+            if access is None:
+                return []
+            is_root, permissions = access
+
+            catalog = await self.catalog_store.get_catalog(self.db)
+            menus = catalog.flat_menus(
+                catalog.visible_indexes(permissions, is_root, context_type)
             )
 
-            rows = result.fetchall()
-            menus = []
-            for row in rows:
-                # Converter row para dict manualmente
-                menu_dict = {
-                    "id": row[0],
-                    "parent_id": row[1],
-                    "name": row[2],
-                    "slug": row[3],
-                    "url": row[4],
-                    "route_name": row[5],
-                    "route_params": row[6],
-                    "icon": row[7],
-                    "level": row[8],
-                    "sort_order": row[9],
-                    "badge_text": row[10],
-                    "badge_color": row[11],
-                    "full_path_name": row[12],
-                    "id_path": row[13],
-                    "type": row[14],
-                    "permission_name": row[15],
-                    "is_system_admin": row[16],
-                }
-                menus.append(menu_dict)
-
-            # Log resultado
-            is_root = menus[0]["is_system_admin"] if menus else False
             logger.info(
                 "Menus encontrados",
                 user_id=user_id,
@@ -256,51 +146,8 @@ class MenuRepository:
                 context_type=context_type,
             )
 
-            # 🔐 INJETAR MENU CRUD PARA USUÁRIOS ROOT
-            # ROOT deve ter acesso total ao sistema, incluindo gerenciamento de menus
             if is_root:
-                # Verificar se já existe um menu CRUD (evitar duplicação)
-                has_crud_menu = any(menu.get("slug") == "crud-menus" for menu in menus)
-
-                if not has_crud_menu:
-                    # Encontrar o menu "Administração" para adicionar como submenu
-                    admin_menu_id = None
-                    for menu in menus:
-                        if menu.get("slug") == "administracao":
-                            admin_menu_id = menu["id"]
-                            break
-
-                    if admin_menu_id:
-                        # Adicionar menu CRUD de Menus na seção Administração
-                        crud_menu = {
-                            "id": 9999,  # ID especial para menu injetado
-                            "parent_id": admin_menu_id,
-                            "name": "Gerenciar Menus",
-                            "slug": "crud-menus",
-                            "url": "/admin/menus",
-                            "route_name": "admin.menus.crud",
-                            "route_params": None,
-                            "icon": "Menu",
-                            "level": 2,
-                            "sort_order": 99,  # No final da lista
-                            "badge_text": "ROOT",
-                            "badge_color": "bg-red-500",
-                            "full_path_name": "Administração → Gerenciar Menus",
-                            "id_path": [admin_menu_id, 9999],
-                            "type": "menu",
-                            "permission_name": "menus.manage",
-                        }
-                        menus.append(crud_menu)
-
-                        logger.info(
-                            "Menu CRUD injetado para usuário ROOT",
-                            user_id=user_id,
-                            menu_name=crud_menu["name"],
-                        )
-
-            # Remover campo is_system_admin do resultado (usado apenas para controle)
-            for menu in menus:
-                menu.pop("is_system_admin", None)
+                self._inject_root_menus(menus, user_id)
 
             return menus
 
@@ -308,6 +155,111 @@ class MenuRepository:
             logger.error("Erro ao buscar menus", user_id=user_id, error=str(e))
             raise
 
+    @timing_decorator
+    async def get_user_menu_tree(
+        self,
+        user_id: int,
+        context_type: str = "establishment",
+        context_id: Optional[int] = None,
+        include_dev_menus: bool = False,
+    ) -> Tuple[List[dict], int]:
+        """
+        Árvore de menus do usuário e total de menus visíveis.
+
+        A árvore é cacheada por versão do catálogo + fingerprint das
+        permissões e do contexto: usuários com o mesmo perfil compartilham a
+        mesma entrada.
+        """
+        try:
+            access = await self._get_menu_access(user_id, context_type, context_id)
+            if access is None:
+                return [], 0
+            is_root, permissions = access
+
+            store = self.catalog_store
+            catalog = await store.get_catalog(self.db)
+            fingerprint = catalog.fingerprint(permissions, is_root, context_type)
+
+            cached = await store.get_tree("user", catalog.version, fingerprint)
+            if cached is not None:
+                return cached["menus"], cached["total_menus"]
+
+            menus = catalog.flat_menus(
+                catalog.visible_indexes(permissions, is_root, context_type)
+            )
+            if is_root:
+                self._inject_root_menus(menus, user_id)
+
+            tree = await self.get_menu_tree(menus)
+            await store.set_tree(
+                "user",
+                catalog.version,
+                fingerprint,
+                {"menus": tree, "total_menus": len(menus)},
+            )
+
+            logger.info(
+                "Árvore de menus montada",
+                user_id=user_id,
+                total_menus=len(menus),
+                is_root=is_root,
+                context_type=context_type,
+                fingerprint=fingerprint,
+            )
+            return tree, len(menus)
+
+        except Exception as e:
+            logger.error(
+                "Erro ao montar árvore de menus", user_id=user_id, error=str(e)
+            )
+            raise
+
+    def _inject_root_menus(self, menus: List[dict], user_id: int) -> None:
+        """🔐 Injeta o CRUD de menus para usuários ROOT
+
+        ROOT deve ter acesso total ao sistema, incluindo gerenciamento de menus
+        """
+        # Verificar se já existe um menu CRUD (evitar duplicação)
+        if any(menu.get("slug") == "crud-menus" for menu in menus):
+            return
+
+        # Encontrar o menu "Administração" para adicionar como submenu
+        admin_menu_id = None
+        for menu in menus:
+            if menu.get("slug") == "administracao":
+                admin_menu_id = menu["id"]
+                break
+
+        if not admin_menu_id:
+            return
+
+        # Adicionar menu CRUD de Menus na seção Administração
+        crud_menu = {
+            "id": 9999,  # ID especial para menu injetado
+            "parent_id": admin_menu_id,
+            "name": "Gerenciar Menus",
+            "slug": "crud-menus",
+            "url": "/admin/menus",
+            "route_name": "admin.menus.crud",
+            "route_params": None,
+            "icon": "Menu",
+            "level": 2,
+            "sort_order": 99,  # No final da lista
+            "badge_text": "ROOT",
+            "badge_color": "bg-red-500",
+            "full_path_name": "Administração → Gerenciar Menus",
+            "id_path": [admin_menu_id, 9999],
+            "type": "menu",
+            "permission_name": "menus.manage",
+        }
+        menus.append(crud_menu)
+
+        logger.info(
+            "Menu CRUD injetado para usuário ROOT",
+            user_id=user_id,
+            menu_name=crud_menu["name"],
+        )
+
     async def get_menu_tree(self, flat_menus: List[dict]) -> List[dict]:
         """
         Converte lista plana de menus em árvore hierárquica.
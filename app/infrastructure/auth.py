@@ -1,6 +1,7 @@
+import re
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 
 import structlog
 from fastapi import Depends, HTTPException, Request, status
@@ -11,11 +12,16 @@ from passlib.context import CryptContext
 from app.domain.entities.user import User
 from app.infrastructure.database import get_db
 from app.infrastructure.orm.models import User as UserORM
+from app.infrastructure.security.password_hasher import PasswordHasher
 from app.infrastructure.services.security_service import (
     SecurityService,
     get_security_service,
 )
 from app.infrastructure.services.tenant_context_service import get_tenant_context
+from app.infrastructure.services.write_behind_counters import (
+    USER_LAST_LOGIN,
+    get_write_behind_counters,
+)
 from config.settings import settings
 
 logger = structlog.get_logger()
@@ -30,7 +36,13 @@ class TokenData:
 
 # Configurar bcrypt com tratamento de erro mais robusto
 try:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    pwd_context = CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=settings.password_bcrypt_rounds,
+        # Hashes com custo menor que o atual são atualizados no próximo login
+        bcrypt__min_rounds=settings.password_bcrypt_rounds,
+    )
     bcrypt_available = True
 except Exception as e:
     logger.warning(f"Bcrypt initialization failed: {e}. Using fallback.")
@@ -38,6 +50,8 @@ except Exception as e:
     bcrypt_available = False
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+_LEGACY_HASH_RE = re.compile(r"[0-9a-f]{64}")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hashed version using bcrypt or simple hash."""
@@ -69,6 +83,70 @@ def get_password_hash(password: str) -> str:
     return hashlib.sha256(password.encode()).hexdigest()
 
 
+def _is_legacy_hash(hashed_password: str) -> bool:
+    """Hash SHA256 simples (fallback de desenvolvimento)"""
+    return bool(_LEGACY_HASH_RE.fullmatch(hashed_password or ""))
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Hash legado (SHA256) ou bcrypt com custo desatualizado"""
+    if not pwd_context:
+        return False
+    if _is_legacy_hash(hashed_password):
+        return True
+    try:
+        return pwd_context.needs_update(hashed_password)
+    except Exception:
+        return False
+
+
+def _verify_and_update(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    if not verify_password(plain_password, hashed_password):
+        return False, None
+    if not password_needs_rehash(hashed_password):
+        return True, None
+
+    new_hash = get_password_hash(plain_password)
+    if _is_legacy_hash(new_hash):
+        # bcrypt indisponível: manter o hash atual
+        return True, None
+    return True, new_hash
+
+
+# Operações bcrypt em threads dedicadas, fora do event loop
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password no executor de hash (PasswordHasherBusyError se saturado)"""
+    return await password_hasher.run(
+        "verify", verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash no executor de hash (PasswordHasherBusyError se saturado)"""
+    return await password_hasher.run("hash", get_password_hash, password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a senha e, se o hash armazenado for legado ou tiver custo
+    desatualizado, retorna também um novo hash para ser persistido.
+    Ambas as operações usam uma única vaga do executor.
+    """
+    return await password_hasher.run(
+        "verify", _verify_and_update, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token with the given data and expiration."""
     to_encode = data.copy()
@@ -159,13 +237,16 @@ async def get_current_user(
                     detail="Session expired or invalid",
                 )
 
-        # Update last login timestamp
+        # Update last login timestamp (write-behind, flushed in batch)
+        last_login_at = user.last_login_at
         if (
-            user.last_login_at is None
-            or (datetime.utcnow() - user.last_login_at).total_seconds() > 3600
+            last_login_at is None
+            or (datetime.utcnow() - last_login_at).total_seconds() > 3600
         ):  # Update every hour
-            user.last_login_at = datetime.utcnow()
-            await db.commit()
+            last_login_at = datetime.utcnow()
+            get_write_behind_counters().record(
+                USER_LAST_LOGIN, user.id, maxima={"last_login_at": last_login_at}
+            )
 
         # Convert ORM user to domain user
         # Access attributes directly - SQLAlchemy should provide actual values after loading
@@ -185,7 +266,7 @@ async def get_current_user(
             notification_settings=getattr(user, "notification_settings", None),
             two_factor_secret=getattr(user, "two_factor_secret", None),
             two_factor_recovery_codes=getattr(user, "two_factor_recovery_codes", None),
-            last_login_at=getattr(user, "last_login_at", None),
+            last_login_at=last_login_at,
             password_changed_at=getattr(user, "password_changed_at", None),
             deleted_at=getattr(user, "deleted_at", None),
         )
@@ -14,10 +14,7 @@ from typing import Any, Callable, Dict, List, Optional, Set, Union
 
 import structlog
 
-from app.infrastructure.cache.simplified_redis import (
-    SerializationMethod,
-    SimplifiedRedisClient,
-)
+from app.infrastructure.cache.simplified_redis import SimplifiedRedisClient
 
 logger = structlog.get_logger()
 
@@ -240,12 +237,7 @@ class AdvancedCacheManager:
                     try:
                         # Serializar se necessário
                         redis_value = serializer(value) if serializer else value
-                        await self.redis_client.set(
-                            cache_key,
-                            redis_value,
-                            ttl_seconds=ttl,
-                            serialization=SerializationMethod.JSON,
-                        )
+                        await self.redis_client.set(cache_key, redis_value, ttl)
                     except Exception as e:
                         logger.warning(f"⚠️ L2 Cache set error: {e}")
 
@@ -291,6 +283,142 @@ class AdvancedCacheManager:
             logger.error(f"❌ Cache DELETE error: {e}")
             return False
 
+    async def get_many(
+        self,
+        namespace: str,
+        keys: List[str],
+        deserializer: Optional[Callable] = None,
+    ) -> Dict[str, Any]:
+        """Obtém vários valores (L1 -> um MGET no L2 para as faltas)
+
+        Retorna apenas as chaves encontradas, indexadas pela chave original.
+        """
+        results: Dict[str, Any] = {}
+
+        try:
+            async with self._lock:
+                missing: Dict[str, str] = {}
+                for key in keys:
+                    cache_key = self._generate_key(namespace, key)
+                    entry = self._l1_cache.get(cache_key)
+                    if entry is not None and not entry.is_expired():
+                        entry.touch()
+                        self._update_access_order(cache_key)
+                        results[key] = entry.value
+                        continue
+                    if entry is not None:
+                        await self._remove_from_l1(cache_key)
+                    missing[cache_key] = key
+
+                l1_hits = len(results)
+                if missing and self.redis_client.redis:
+                    try:
+                        found = await self.redis_client.get_many(list(missing))
+                        for cache_key, redis_value in found.items():
+                            value = (
+                                deserializer(redis_value)
+                                if deserializer
+                                else redis_value
+                            )
+                            await self._add_to_l1(
+                                cache_key, value, ttl_seconds=self.l1_ttl_seconds
+                            )
+                            results[missing[cache_key]] = value
+                    except Exception as e:
+                        logger.warning(f"⚠️ L2 Cache get_many error: {e}")
+
+                if self.metrics:
+                    self.metrics.hits += len(results)
+                    self.metrics.l1_hits += l1_hits
+                    self.metrics.l2_hits += len(results) - l1_hits
+                    self.metrics.misses += len(keys) - len(results)
+                    self.metrics.total_requests += len(keys)
+
+                logger.debug(
+                    f"📋 Cache GET_MANY: {namespace} {len(results)}/{len(keys)} hits"
+                )
+                return results
+
+        except Exception as e:
+            logger.error(f"❌ Cache GET_MANY error: {e}")
+            return results
+
+    async def set_many(
+        self,
+        namespace: str,
+        values: Dict[str, Any],
+        ttl_seconds: Optional[int] = None,
+        tags: Optional[Set[str]] = None,
+        serializer: Optional[Callable] = None,
+        l1_only: bool = False,
+        ttls: Optional[Dict[str, int]] = None,
+    ) -> int:
+        """Define vários valores (L1 + pipeline no L2); ttls é por chave"""
+        ttl = ttl_seconds or self.l2_default_ttl
+        ttls = ttls or {}
+        tags = tags or set()
+
+        try:
+            async with self._lock:
+                redis_values: Dict[str, Any] = {}
+                redis_ttls: Dict[str, int] = {}
+                for key, value in values.items():
+                    cache_key = self._generate_key(namespace, key)
+                    key_ttl = ttls.get(key) or ttl
+                    await self._add_to_l1(
+                        cache_key, value, ttl_seconds=key_ttl, tags=tags
+                    )
+                    self._update_tags(cache_key, tags)
+                    redis_values[cache_key] = serializer(value) if serializer else value
+                    redis_ttls[cache_key] = key_ttl
+
+                if not l1_only and redis_values and self.redis_client.redis:
+                    try:
+                        await self.redis_client.set_many(
+                            redis_values, ttl, ttls=redis_ttls
+                        )
+                    except Exception as e:
+                        logger.warning(f"⚠️ L2 Cache set_many error: {e}")
+
+                if self.metrics:
+                    self.metrics.sets += len(values)
+
+                logger.debug(
+                    f"💾 Cache SET_MANY: {namespace} {len(values)} keys Tags: {tags}"
+                )
+                return len(values)
+
+        except Exception as e:
+            logger.error(f"❌ Cache SET_MANY error: {e}")
+            return 0
+
+    async def delete_many(self, namespace: str, keys: List[str]) -> int:
+        """Remove vários valores (L1 + um DEL no L2)"""
+        cache_keys = [self._generate_key(namespace, key) for key in keys]
+
+        try:
+            async with self._lock:
+                removed = 0
+                for cache_key in cache_keys:
+                    if await self._remove_from_l1(cache_key):
+                        removed += 1
+
+                if cache_keys and self.redis_client.redis:
+                    try:
+                        await self.redis_client.delete_many(cache_keys)
+                    except Exception as e:
+                        logger.warning(f"⚠️ L2 Cache delete_many error: {e}")
+
+                if self.metrics:
+                    self.metrics.deletes += len(cache_keys)
+
+                logger.debug(f"🗑️ Cache DELETE_MANY: {namespace} {len(keys)} keys")
+                return removed
+
+        except Exception as e:
+            logger.error(f"❌ Cache DELETE_MANY error: {e}")
+            return 0
+
     async def invalidate_by_tags(self, tags: Set[str]) -> int:
         """Invalida todas as entradas com as tags especificadas"""
         invalidated_count = 0
@@ -307,12 +435,12 @@ class AdvancedCacheManager:
                     if await self._remove_from_l1(cache_key):
                         invalidated_count += 1
 
-                    # Remover do L2
-                    if self.redis_client.redis:
-                        try:
-                            await self.redis_client.delete(cache_key)
-                        except Exception as e:
-                            logger.warning(f"⚠️ L2 invalidation error: {e}")
+                # Remover do L2
+                if keys_to_remove and self.redis_client.redis:
+                    try:
+                        await self.redis_client.delete_many(list(keys_to_remove))
+                    except Exception as e:
+                        logger.warning(f"⚠️ L2 invalidation error: {e}")
 
                 logger.info(
                     f"🔄 Cache invalidated by tags {tags}: {invalidated_count} entries"
@@ -365,14 +493,18 @@ class AdvancedCacheManager:
         ttl_seconds: Optional[int] = None,
         tags: Optional[Set[str]] = None,
     ):
-        """Pre-aquece o cache com dados"""
+        """Pre-aquece o cache com dados
+
+        Os valores são calculados em paralelo (limite de concorrência) e
+        gravados de uma vez com set_many.
+        """
+        warmed: Dict[str, Any] = {}
 
         async def warm_single_key(key: str):
             try:
                 value = await warm_func(key)
                 if value is not None:
-                    await self.set(namespace, key, value, ttl_seconds, tags)
-                    logger.debug(f"🔥 Cache warmed: {namespace}:{key}")
+                    warmed[key] = value
             except Exception as e:
                 logger.warning(f"⚠️ Cache warm error for {key}: {e}")
 
@@ -388,8 +520,11 @@ class AdvancedCacheManager:
 
         try:
             await asyncio.gather(*tasks, return_exceptions=True)
+            if warmed:
+                await self.set_many(namespace, warmed, ttl_seconds, tags)
             logger.info(
-                f"🔥 Cache warming completed for namespace '{namespace}': {len(keys)} keys"
+                f"🔥 Cache warming completed for namespace '{namespace}': "
+                f"{len(warmed)}/{len(keys)} keys"
             )
         finally:
             for task in tasks:
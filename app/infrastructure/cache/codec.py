@@ -0,0 +1,159 @@
+"""
+Codec de valores do cache Redis
+
+Cada valor gravado carrega o próprio formato em um byte de cabeçalho, então
+uma leitura é um único GET (antes o cliente tentava json:<key>, pickle:<key>
+e raw:<key> em sequência).
+
+Cabeçalho: bits 0-3 = formato, bits 6-7 = compressão
+
+    formato     0x01 JSON (orjson quando instalado)  0x02 msgpack
+                0x03 pickle                          0x04 texto UTF-8
+    compressão  0x40 zlib                            0x80 zstd
+
+Valores nativos de JSON usam o serializer configurado (json ou msgpack);
+os demais caem para pickle e, em último caso, para texto. Payloads acima de
+compress_threshold bytes são comprimidos (zstd quando instalado, senão zlib)
+se a compressão reduzir o tamanho.
+"""
+
+import json
+import pickle
+import zlib
+from typing import Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is optional
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+FORMAT_JSON = 0x01
+FORMAT_MSGPACK = 0x02
+FORMAT_PICKLE = 0x03
+FORMAT_RAW = 0x04
+
+COMPRESSION_ZLIB = 0x40
+COMPRESSION_ZSTD = 0x80
+
+_FORMAT_MASK = 0x0F
+_COMPRESSION_MASK = 0xC0
+
+_JSON_NATIVE = (str, int, float, bool, list, dict, type(None))
+
+
+class CodecError(ValueError):
+    """Valor que não pode ser codificado/decodificado"""
+
+
+def _json_dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=str).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+class CacheCodec:
+    """Serializa valores com cabeçalho de formato e compressão opcional"""
+
+    def __init__(self, serializer: str = "json", compress_threshold: int = 1024):
+        if serializer == "msgpack" and msgpack is None:
+            serializer = "json"
+        self.serializer = serializer
+        self.compress_threshold = compress_threshold
+        self._zstd_compressor = zstandard.ZstdCompressor() if zstandard else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+    def encode(self, value: Any) -> bytes:
+        """Valor -> bytes com cabeçalho"""
+        fmt, payload = self._serialize(value)
+        flags, payload = self._compress(payload)
+        return bytes((fmt | flags,)) + payload
+
+    def decode(self, data: Optional[bytes]) -> Any:
+        """Bytes com cabeçalho -> valor (CodecError se inválido)"""
+        if not data:
+            raise CodecError("Valor vazio")
+
+        header, payload = data[0], data[1:]
+        fmt = header & _FORMAT_MASK
+
+        try:
+            payload = self._decompress(header & _COMPRESSION_MASK, payload)
+            if fmt == FORMAT_JSON:
+                return _json_loads(payload)
+            if fmt == FORMAT_MSGPACK:
+                if msgpack is None:
+                    raise CodecError("msgpack não instalado")
+                return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+            if fmt == FORMAT_PICKLE:
+                return pickle.loads(payload)
+            if fmt == FORMAT_RAW:
+                return payload.decode("utf-8")
+        except CodecError:
+            raise
+        except Exception as e:
+            raise CodecError(f"Falha ao decodificar formato {fmt:#x}: {e}") from e
+
+        raise CodecError(f"Formato desconhecido: {header:#x}")
+
+    def _serialize(self, value: Any) -> Tuple[int, bytes]:
+        if isinstance(value, _JSON_NATIVE):
+            try:
+                if self.serializer == "msgpack":
+                    return FORMAT_MSGPACK, msgpack.packb(
+                        value, use_bin_type=True, default=str
+                    )
+                return FORMAT_JSON, _json_dumps(value)
+            except (TypeError, ValueError):
+                pass
+
+        try:
+            return FORMAT_PICKLE, pickle.dumps(value)
+        except Exception:
+            pass
+
+        try:
+            return FORMAT_RAW, str(value).encode("utf-8")
+        except Exception as e:
+            raise CodecError(f"Unable to serialize value of type {type(value)}") from e
+
+    def _compress(self, payload: bytes) -> Tuple[int, bytes]:
+        if self.compress_threshold <= 0 or len(payload) < self.compress_threshold:
+            return 0, payload
+
+        if self._zstd_compressor is not None:
+            flags = COMPRESSION_ZSTD
+            compressed = self._zstd_compressor.compress(payload)
+        else:
+            # Nível baixo: o ganho de tamanho já é grande em JSON repetitivo
+            flags, compressed = COMPRESSION_ZLIB, zlib.compress(payload, 1)
+
+        if len(compressed) >= len(payload):
+            return 0, payload
+        return flags, compressed
+
+    def _decompress(self, flags: int, payload: bytes) -> bytes:
+        if not flags:
+            return payload
+        if flags == COMPRESSION_ZLIB:
+            return zlib.decompress(payload)
+        if flags == COMPRESSION_ZSTD:
+            if self._zstd_decompressor is None:
+                raise CodecError("zstandard não instalado")
+            return self._zstd_decompressor.decompress(payload)
+        raise CodecError(f"Compressão desconhecida: {flags:#x}")
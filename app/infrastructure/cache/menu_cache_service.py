@@ -8,6 +8,10 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from app.domain.entities.menu import MenuEntity
+from app.infrastructure.cache.menu_catalog import (
+    MenuCatalogStore,
+    get_menu_catalog_store,
+)
 from app.infrastructure.cache.simplified_redis import (
     SimplifiedRedisClient,
     get_simplified_redis,
@@ -23,8 +27,13 @@ class MenuCacheService:
     a performance do sistema de menus com invalidação automática.
     """
 
-    def __init__(self, redis_client: Optional[SimplifiedRedisClient] = None):
+    def __init__(
+        self,
+        redis_client: Optional[SimplifiedRedisClient] = None,
+        catalog_store: Optional[MenuCatalogStore] = None,
+    ):
         self.redis = redis_client
+        self.catalog_store = catalog_store or get_menu_catalog_store()
 
         # Configurações de TTL otimizadas
         self.ttl_config = {
@@ -53,9 +62,17 @@ class MenuCacheService:
             self.redis = await get_simplified_redis()
         return self.redis
 
-    def _make_cache_key(self, prefix: str, *args) -> str:
-        """Criar chave de cache consistente"""
-        parts = [str(arg) for arg in args if arg is not None]
+    async def _catalog_version(self) -> int:
+        """Versão atual do catálogo de menus (parte de todas as chaves)"""
+        return await self.catalog_store.current_version()
+
+    def _make_cache_key(self, prefix: str, version: int, *args) -> str:
+        """Criar chave de cache consistente
+
+        A versão do catálogo entra na chave: edições de menu incrementam a
+        versão e as entradas antigas expiram pelo TTL, sem varrer chaves.
+        """
+        parts = [f"v{version}"] + [str(arg) for arg in args if arg is not None]
         key_suffix = ":".join(parts)
 
         # Gerar hash para chaves muito longas (>200 chars)
@@ -90,20 +107,13 @@ class MenuCacheService:
     ) -> bool:
         """Cache da árvore hierárquica de menus"""
         redis = await self._get_redis()
+        version = await self._catalog_version()
 
         try:
-            cache_key = self._make_cache_key("tree", user_id, context_type, context_id)
-            serialized_tree = self._serialize_menu_list(tree)
-
-            # Adicionar metadados de cache
-            cache_data = {
-                "tree": serialized_tree,
-                "cached_at": datetime.now().isoformat(),
-                "user_id": user_id,
-                "context_type": context_type,
-                "context_id": context_id,
-                "total_menus": self._count_tree_nodes(tree),
-            }
+            cache_key = self._make_cache_key(
+                "tree", version, user_id, context_type, context_id
+            )
+            cache_data = self._menu_tree_data(tree, user_id, context_type, context_id)
 
             success = await redis.set(
                 cache_key, cache_data, self.ttl_config["menu_tree"]
@@ -123,6 +133,23 @@ class MenuCacheService:
             logger.error("Error caching menu tree", error=str(e), user_id=user_id)
             return False
 
+    def _menu_tree_data(
+        self,
+        tree: List[MenuEntity],
+        user_id: Optional[int],
+        context_type: str,
+        context_id: Optional[int],
+    ) -> Dict[str, Any]:
+        """Árvore serializada com metadados de cache"""
+        return {
+            "tree": self._serialize_menu_list(tree),
+            "cached_at": datetime.now().isoformat(),
+            "user_id": user_id,
+            "context_type": context_type,
+            "context_id": context_id,
+            "total_menus": self._count_tree_nodes(tree),
+        }
+
     async def get_menu_tree(
         self,
         user_id: Optional[int] = None,
@@ -131,9 +158,12 @@ class MenuCacheService:
     ) -> Optional[List[MenuEntity]]:
         """Recuperar árvore de menus do cache"""
         redis = await self._get_redis()
+        version = await self._catalog_version()
 
         try:
-            cache_key = self._make_cache_key("tree", user_id, context_type, context_id)
+            cache_key = self._make_cache_key(
+                "tree", version, user_id, context_type, context_id
+            )
             cached_data = await redis.get(cache_key)
 
             if cached_data and isinstance(cached_data, dict):
@@ -171,10 +201,11 @@ class MenuCacheService:
     ) -> bool:
         """Cache de listagem de menus"""
         redis = await self._get_redis()
+        version = await self._catalog_version()
 
         try:
             cache_key = self._make_cache_key(
-                "list", skip, limit, parent_id, status, search, level
+                "list", version, skip, limit, parent_id, status, search, level
             )
             serialized_menus = self._serialize_menu_list(menus)
 
@@ -216,10 +247,11 @@ class MenuCacheService:
     ) -> Optional[List[MenuEntity]]:
         """Recuperar listagem de menus do cache"""
         redis = await self._get_redis()
+        version = await self._catalog_version()
 
         try:
             cache_key = self._make_cache_key(
-                "list", skip, limit, parent_id, status, search, level
+                "list", version, skip, limit, parent_id, status, search, level
             )
             cached_data = await redis.get(cache_key)
 
@@ -249,9 +281,10 @@ class MenuCacheService:
             return False
 
         redis = await self._get_redis()
+        version = await self._catalog_version()
 
         try:
-            cache_key = self._make_cache_key("item", menu.id)
+            cache_key = self._make_cache_key("item", version, menu.id)
             serialized_menu = self._serialize_menu_entity(menu)
 
             success = await redis.set(
@@ -272,9 +305,10 @@ class MenuCacheService:
     async def get_menu_item(self, menu_id: int) -> Optional[MenuEntity]:
         """Recuperar item de menu do cache"""
         redis = await self._get_redis()
+        version = await self._catalog_version()
 
         try:
-            cache_key = self._make_cache_key("item", menu_id)
+            cache_key = self._make_cache_key("item", version, menu_id)
             cached_data = await redis.get(cache_key)
 
             if cached_data:
@@ -291,6 +325,55 @@ class MenuCacheService:
             )
             return None
 
+    async def cache_menu_items(self, menus: List[MenuEntity]) -> int:
+        """Cache de vários itens de menu em um único pipeline"""
+        redis = await self._get_redis()
+        version = await self._catalog_version()
+
+        try:
+            values = {
+                self._make_cache_key(
+                    "item", version, menu.id
+                ): self._serialize_menu_entity(menu)
+                for menu in menus
+                if menu.id
+            }
+            if not values:
+                return 0
+
+            written = await redis.set_many(values, self.ttl_config["menu_item"])
+            logger.debug("Menu items cached", count=written)
+            return written
+
+        except Exception as e:
+            logger.error("Error caching menu items", error=str(e))
+            return 0
+
+    async def get_menu_items(self, menu_ids: List[int]) -> Dict[int, MenuEntity]:
+        """Recuperar vários itens de menu do cache (um MGET)"""
+        redis = await self._get_redis()
+        version = await self._catalog_version()
+
+        try:
+            keys = {
+                self._make_cache_key("item", version, menu_id): menu_id
+                for menu_id in menu_ids
+            }
+            cached = await redis.get_many(list(keys))
+
+            menus = {
+                keys[key]: self._deserialize_menu_entity(data)
+                for key, data in cached.items()
+            }
+            logger.debug(
+                "Menu items cache lookup", requested=len(menu_ids), hits=len(menus)
+            )
+            return menus
+
+        except Exception as e:
+            logger.error("Error retrieving menu items from cache", error=str(e))
+            return {}
+
     async def cache_user_menus(
         self,
         menus: List[MenuEntity],
@@ -300,9 +383,12 @@ class MenuCacheService:
     ) -> bool:
         """Cache de menus específicos do usuário"""
         redis = await self._get_redis()
+        version = await self._catalog_version()
 
         try:
-            cache_key = self._make_cache_key("user", user_id, context_type, context_id)
+            cache_key = self._make_cache_key(
+                "user", version, user_id, context_type, context_id
+            )
             serialized_menus = self._serialize_menu_list(menus)
 
             cache_data = {
@@ -340,9 +426,12 @@ class MenuCacheService:
     ) -> Optional[List[MenuEntity]]:
         """Recuperar menus do usuário do cache"""
         redis = await self._get_redis()
+        version = await self._catalog_version()
 
         try:
-            cache_key = self._make_cache_key("user", user_id, context_type, context_id)
+            cache_key = self._make_cache_key(
+                "user", version, user_id, context_type, context_id
+            )
             cached_data = await redis.get(cache_key)
 
             if cached_data and isinstance(cached_data, dict):
@@ -378,12 +467,13 @@ class MenuCacheService:
     ) -> bool:
         """Cache de resultados de busca"""
         redis = await self._get_redis()
+        version = await self._catalog_version()
 
         try:
             # Hash da query para chave consistente
             query_hash = hashlib.md5(query.lower().encode()).hexdigest()[:8]
             cache_key = self._make_cache_key(
-                "search", query_hash, user_id, context_type, limit
+                "search", version, query_hash, user_id, context_type, limit
             )
 
             serialized_results = self._serialize_menu_list(results)
@@ -424,11 +514,12 @@ class MenuCacheService:
     ) -> Optional[List[MenuEntity]]:
         """Recuperar resultados de busca do cache"""
         redis = await self._get_redis()
+        version = await self._catalog_version()
 
         try:
             query_hash = hashlib.md5(query.lower().encode()).hexdigest()[:8]
             cache_key = self._make_cache_key(
-                "search", query_hash, user_id, context_type, limit
+                "search", version, query_hash, user_id, context_type, limit
             )
             cached_data = await redis.get(cache_key)
 
@@ -458,45 +549,18 @@ class MenuCacheService:
             return None
 
     async def invalidate_menu_caches(self, menu_id: Optional[int] = None) -> int:
-        """Invalidar caches relacionados a menus"""
-        redis = await self._get_redis()
+        """Invalidar caches relacionados a menus
 
+        Incrementa a versão do catálogo: árvores, listagens, itens e buscas
+        de todas as versões anteriores deixam de ser lidas (em todos os
+        workers) e expiram pelo TTL. Retorna a nova versão.
+        """
         try:
-            patterns_to_clear = []
-
-            if menu_id:
-                # Invalidar cache específico do menu
-                patterns_to_clear.extend(
-                    [
-                        f"{self.prefixes['item']}:{menu_id}:*",
-                        f"{self.prefixes['item']}:{menu_id}",
-                    ]
-                )
-
-            # Invalidar caches gerais (sempre)
-            patterns_to_clear.extend(
-                [
-                    f"{self.prefixes['tree']}:*",
-                    f"{self.prefixes['list']}:*",
-                    f"{self.prefixes['user']}:*",
-                    f"{self.prefixes['search']}:*",
-                    f"{self.prefixes['hierarchy']}:*",
-                ]
-            )
+            version = await self.catalog_store.bump_version()
 
-            total_deleted = 0
-            for pattern in patterns_to_clear:
-                deleted = await redis.clear_pattern(pattern)
-                total_deleted += deleted
+            logger.info("Menu caches invalidated", menu_id=menu_id, version=version)
 
-            logger.info(
-                "Menu caches invalidated",
-                menu_id=menu_id,
-                patterns=len(patterns_to_clear),
-                total_deleted=total_deleted,
-            )
-
-            return total_deleted
+            return version
 
         except Exception as e:
             logger.error(
@@ -517,6 +581,7 @@ class MenuCacheService:
                 "redis_info": redis_info,
                 "cache_prefixes": list(self.prefixes.keys()),
                 "ttl_config": self.ttl_config,
+                "catalog_version": await self._catalog_version(),
                 "timestamp": datetime.now().isoformat(),
             }
 
@@ -543,21 +608,38 @@ class MenuCacheService:
         user_id: Optional[int] = None,
         context_type: str = "system",
     ) -> Dict[str, bool]:
-        """Pré-aquecer cache com dados principais"""
-        results = {}
-
-        # Cache da árvore principal
-        results["tree"] = await self.cache_menu_tree(menu_tree, user_id, context_type)
+        """Pré-aquecer cache com dados principais
 
-        # Cache de itens individuais
+        Árvore e itens individuais vão em um único set_many (pipeline), com o
+        TTL de cada tipo de chave.
+        """
+        redis = await self._get_redis()
+        version = await self._catalog_version()
         all_menus = self._flatten_tree(menu_tree)
-        item_results = []
+
+        tree_key = self._make_cache_key("tree", version, user_id, context_type, None)
+        values: Dict[str, Any] = {
+            tree_key: self._menu_tree_data(menu_tree, user_id, context_type, None)
+        }
         for menu in all_menus:
-            success = await self.cache_menu_item(menu)
-            item_results.append(success)
+            if menu.id:
+                item_key = self._make_cache_key("item", version, menu.id)
+                values[item_key] = self._serialize_menu_entity(menu)
 
-        results["items"] = all(item_results) if item_results else True
-        results["items_count"] = len(item_results)
+        ttls = {tree_key: self.ttl_config["menu_tree"]}
+        try:
+            written = await redis.set_many(
+                values, self.ttl_config["menu_item"], ttls=ttls
+            )
+        except Exception as e:
+            logger.error("Error warming menu cache", error=str(e), user_id=user_id)
+            written = 0
+
+        results = {
+            "tree": written > 0,
+            "items": written == len(values),
+            "items_count": len(values) - 1,
+        }
 
         logger.info(
             "Cache warming completed", results=results, total_menus=len(all_menus)
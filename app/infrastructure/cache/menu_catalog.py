@@ -0,0 +1,247 @@
+"""
+Catálogo de menus compilado
+
+O catálogo de menus é global; o que muda entre usuários é apenas o filtro de
+permissões e de contexto. Cada worker carrega o catálogo uma vez (vetores
+planos + índice de pais) e só o recarrega quando a versão muda.
+
+- versão: contador no Redis (menu_catalog:version), consultado no máximo a
+  cada menu_catalog_check_interval segundos. Edições de menu incrementam a
+  versão em vez de varrer chaves.
+- árvores filtradas: cacheadas no Redis por versão + fingerprint do conjunto
+  de permissões (intersectado com as permissões exigidas pelo catálogo) e do
+  contexto, então usuários com o mesmo perfil compartilham a mesma árvore.
+  Versões antigas deixam de ser lidas e expiram pelo TTL.
+"""
+
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import structlog
+from sqlalchemy import text
+
+from app.infrastructure.cache.simplified_redis import simplified_redis_client
+
+logger = structlog.get_logger()
+
+MENU_CATALOG_VERSION_KEY = "menu_catalog:version"
+
+# Campos expostos por item (mesmo formato de MenuRepository.get_user_menus)
+MENU_FIELDS = (
+    "id",
+    "parent_id",
+    "name",
+    "slug",
+    "url",
+    "route_name",
+    "route_params",
+    "icon",
+    "level",
+    "sort_order",
+    "badge_text",
+    "badge_color",
+    "full_path_name",
+    "id_path",
+    "type",
+    "permission_name",
+)
+
+CATALOG_QUERY = text(
+    """
+    SELECT
+        m.id, m.parent_id, m.name, m.slug, m.url, m.route_name,
+        m.route_params, m.icon, m.level, m.sort_order, m.badge_text,
+        m.badge_color, m.full_path_name, m.id_path, m.type,
+        m.permission_name, m.company_specific, m.establishment_specific
+    FROM master.vw_menu_hierarchy m
+    WHERE m.is_active = true
+      AND m.is_visible = true
+      AND m.visible_in_menu = true
+    ORDER BY m.level, m.sort_order, m.name
+"""
+)
+
+
+def permission_fingerprint(
+    permissions: Iterable[str],
+    is_system_admin: bool,
+    context_type: str,
+    relevant: Optional[FrozenSet[str]] = None,
+) -> str:
+    """Fingerprint do filtro aplicado ao catálogo
+
+    Apenas permissões exigidas por algum menu (relevant) entram no hash.
+    Administradores veem todo o catálogo em qualquer contexto.
+    """
+    if is_system_admin:
+        return "admin"
+
+    granted = set(permissions)
+    if relevant is not None:
+        granted &= relevant
+    payload = "\n".join([context_type, *sorted(granted)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+
+@dataclass(frozen=True)
+class CompiledMenuCatalog:
+    """Catálogo imutável em vetores planos, na ordem level, sort_order, name"""
+
+    version: int
+    items: Tuple[Dict[str, Any], ...]
+    parent_index: Tuple[int, ...]  # -1: raiz ou pai fora do catálogo
+    permission_names: Tuple[Optional[str], ...]
+    company_specific: Tuple[bool, ...]
+    establishment_specific: Tuple[bool, ...]
+    required_permissions: FrozenSet[str]
+
+    @classmethod
+    def compile(cls, version: int, rows: Sequence[Any]) -> "CompiledMenuCatalog":
+        items = tuple(
+            {field: getattr(row, field) for field in MENU_FIELDS} for row in rows
+        )
+        position = {item["id"]: index for index, item in enumerate(items)}
+        permission_names = tuple(item["permission_name"] for item in items)
+
+        return cls(
+            version=version,
+            items=items,
+            parent_index=tuple(
+                position.get(item["parent_id"], -1) if item["parent_id"] else -1
+                for item in items
+            ),
+            permission_names=permission_names,
+            company_specific=tuple(bool(row.company_specific) for row in rows),
+            establishment_specific=tuple(
+                bool(row.establishment_specific) for row in rows
+            ),
+            required_permissions=frozenset(p for p in permission_names if p),
+        )
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def visible_indexes(
+        self, permissions: Iterable[str], is_system_admin: bool, context_type: str
+    ) -> List[int]:
+        """Índices dos menus visíveis (mesmas regras da consulta original)"""
+        if is_system_admin:
+            return list(range(len(self.items)))
+
+        granted = frozenset(permissions)
+        company_context = context_type in ("company", "establishment")
+        establishment_context = context_type == "establishment"
+
+        visible = []
+        for index, permission_name in enumerate(self.permission_names):
+            if permission_name and permission_name not in granted:
+                continue
+            company = self.company_specific[index]
+            establishment = self.establishment_specific[index]
+            if (
+                (not company and not establishment)
+                or (company and company_context)
+                or (establishment and establishment_context)
+            ):
+                visible.append(index)
+        return visible
+
+    def fingerprint(
+        self, permissions: Iterable[str], is_system_admin: bool, context_type: str
+    ) -> str:
+        """Fingerprint do filtro considerando só as permissões do catálogo"""
+        return permission_fingerprint(
+            permissions, is_system_admin, context_type, self.required_permissions
+        )
+
+    def flat_menus(self, indexes: Iterable[int]) -> List[Dict[str, Any]]:
+        """Cópias dos itens (o catálogo é compartilhado pelo worker)"""
+        return [dict(self.items[index]) for index in indexes]
+
+
+class MenuCatalogStore:
+    """Catálogo compilado do worker + versão compartilhada + árvores filtradas"""
+
+    def __init__(self, check_interval: float = 5.0, tree_ttl: int = 300):
+        self.check_interval = check_interval
+        self.tree_ttl = tree_ttl
+        self._catalog: Optional[CompiledMenuCatalog] = None
+        self._version = 0
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def current_version(self) -> int:
+        """Versão do catálogo (Redis consultado no máximo a cada check_interval)"""
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.check_interval:
+            version = await simplified_redis_client.get_counter(
+                MENU_CATALOG_VERSION_KEY
+            )
+            if version is not None:
+                self._version = version
+            self._checked_at = now
+        return self._version
+
+    async def bump_version(self) -> int:
+        """Invalida catálogo e árvores de todos os workers"""
+        version = await simplified_redis_client.incr(MENU_CATALOG_VERSION_KEY)
+        # Sem Redis a versão é apenas local
+        self._version = version if version is not None else self._version + 1
+        self._checked_at = time.monotonic()
+        self._catalog = None
+        logger.info("menu_catalog_version_bumped", version=self._version)
+        return self._version
+
+    async def get_catalog(self, db) -> CompiledMenuCatalog:
+        """Catálogo da versão atual, compilado uma vez por worker"""
+        version = await self.current_version()
+        catalog = self._catalog
+        if catalog is not None and catalog.version == version:
+            return catalog
+
+        async with self._lock:
+            catalog = self._catalog
+            if catalog is None or catalog.version != version:
+                result = await db.execute(CATALOG_QUERY)
+                catalog = CompiledMenuCatalog.compile(version, result.fetchall())
+                self._catalog = catalog
+                logger.info(
+                    "menu_catalog_compiled", version=version, total_menus=len(catalog)
+                )
+        return catalog
+
+    def _tree_key(self, namespace: str, version: int, fingerprint: str) -> str:
+        return f"menu_tree:{namespace}:v{version}:{fingerprint}"
+
+    async def get_tree(
+        self, namespace: str, version: int, fingerprint: str
+    ) -> Optional[Any]:
+        return await simplified_redis_client.get(
+            self._tree_key(namespace, version, fingerprint)
+        )
+
+    async def set_tree(
+        self, namespace: str, version: int, fingerprint: str, tree: Any
+    ) -> None:
+        await simplified_redis_client.set(
+            self._tree_key(namespace, version, fingerprint), tree, self.tree_ttl
+        )
+
+
+_menu_catalog_store: Optional[MenuCatalogStore] = None
+
+
+def get_menu_catalog_store() -> MenuCatalogStore:
+    """Instância global do catálogo de menus do worker"""
+    global _menu_catalog_store
+    if _menu_catalog_store is None:
+        from config.settings import settings
+
+        _menu_catalog_store = MenuCatalogStore(
+            check_interval=settings.menu_catalog_check_interval,
+            tree_ttl=settings.menu_tree_cache_ttl,
+        )
+    return _menu_catalog_store
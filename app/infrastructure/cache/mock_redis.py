@@ -2,7 +2,7 @@
 
 import json
 import pickle
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.infrastructure.logging import logger
 
@@ -29,6 +29,38 @@ class MockRedis:
     async def get(self, key: str) -> Optional[bytes]:
         return self._data.get(key)
 
+    async def mget(self, *keys: str) -> List[Optional[bytes]]:
+        return [self._data.get(key) for key in keys]
+
+    async def incr(self, key: str) -> int:
+        value = int(self._data.get(key, 0)) + 1
+        self._data[key] = str(value).encode()
+        return value
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        fields = self._data.setdefault(key, {})
+        value = int(fields.get(field, 0)) + amount
+        fields[field] = str(value).encode()
+        return value
+
+    async def hset(self, key: str, mapping: Dict[str, Any]) -> int:
+        fields = self._data.setdefault(key, {})
+        for field, value in mapping.items():
+            fields[field] = str(value).encode()
+        return len(mapping)
+
+    async def hgetall(self, key: str) -> Dict[bytes, bytes]:
+        fields = self._data.get(key, {})
+        return {field.encode(): value for field, value in fields.items()}
+
+    async def ttl(self, key: str) -> int:
+        if key not in self._data:
+            return -2
+        return self._expiry.get(key, -1)
+
+    def pipeline(self, transaction: bool = True) -> "MockPipeline":
+        return MockPipeline(self)
+
     async def delete(self, *keys: str) -> int:
         deleted = 0
         for key in keys:
@@ -72,6 +104,35 @@ class MockRedis:
         }
 
 
+class MockPipeline:
+    """Pipeline mock: enfileira os comandos e executa em ordem"""
+
+    def __init__(self, redis: MockRedis):
+        self._redis = redis
+        self._commands: List[Tuple[str, tuple, dict]] = []
+
+    async def __aenter__(self) -> "MockPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._commands.clear()
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self) -> List[Any]:
+        results = [
+            await getattr(self._redis, name)(*args, **kwargs)
+            for name, args, kwargs in self._commands
+        ]
+        self._commands.clear()
+        return results
+
+
 class MockRedisClient:
     """Mock version of RedisClient for testing"""
 
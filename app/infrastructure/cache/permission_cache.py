@@ -1,12 +1,17 @@
 """
 Sistema de Cache de Permissões
 Cache otimizado para verificação rápida de permissões granulares
+
+Cada entrada registra a versão dos perfis de que foi calculada
+({"roles": {role_id: versão}, "permissions": [...]}). Editar um perfil
+incrementa role_version:{role_id}; entradas com versão diferente da atual
+são recalculadas no próximo acesso, sem varrer chaves de usuários.
 """
 
 import asyncio
 import json
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import redis.asyncio as aioredis
 import structlog
@@ -82,45 +87,10 @@ class PermissionCache:
         Buscar todas as permissões do usuário em um contexto específico
         """
         try:
-            cache_key = self._get_cache_key(user_id, context_type, context_id)
-
-            # Verificar cache se não forçar refresh
-            if not force_refresh and self.redis:
-                try:
-                    cached_data = await self.redis.get(cache_key)
-                    if cached_data:
-                        permissions = json.loads(cached_data)
-                        logger.debug(
-                            "🎯 Cache hit para permissões",
-                            user_id=user_id,
-                            context_type=context_type,
-                            permissions_count=len(permissions),
-                        )
-                        return permissions
-                except (json.JSONDecodeError, Exception) as e:
-                    logger.warning(f"⚠️ Erro ao ler cache: {e}")
-
-            # Buscar no banco de dados
-            permissions = await self._fetch_permissions_from_db(
-                user_id, context_type, context_id
+            permissions = await self._get_contexts_permissions(
+                user_id, [(context_type, context_id)], force_refresh
             )
-
-            # Cachear resultado
-            if self.redis:
-                try:
-                    await self.redis.setex(
-                        cache_key, self.cache_ttl, json.dumps(permissions)
-                    )
-                    logger.debug(
-                        "💾 Permissões cacheadas",
-                        user_id=user_id,
-                        context_type=context_type,
-                        permissions_count=len(permissions),
-                    )
-                except Exception as e:
-                    logger.warning(f"⚠️ Erro ao cachear: {e}")
-
-            return permissions
+            return permissions[(context_type, context_id)]
 
         except Exception as e:
             logger.error(
@@ -131,71 +101,217 @@ class PermissionCache:
             )
             return []
 
-    async def _fetch_permissions_from_db(
-        self, user_id: int, context_type: str, context_id: Optional[int] = None
-    ) -> List[str]:
-        """Buscar permissões diretamente do banco"""
+    async def _get_contexts_permissions(
+        self,
+        user_id: int,
+        contexts: List[Tuple[str, Optional[int]]],
+        force_refresh: bool = False,
+    ) -> Dict[Tuple[str, Optional[int]], List[str]]:
+        """Permissões de vários contextos: cache validado pelas versões dos perfis
+
+        Um MGET para as entradas, um MGET para as versões dos perfis que elas
+        registraram e, apenas para as ausentes ou desatualizadas, uma leitura
+        do banco e um pipeline de gravação.
+        """
+        keys = {
+            self._get_cache_key(user_id, context_type, context_id): (
+                context_type,
+                context_id,
+            )
+            for context_type, context_id in contexts
+        }
+        permissions: Dict[str, List[str]] = {}
+
+        if self.redis and keys and not force_refresh:
+            try:
+                entries = {}
+                for key, data in zip(keys, await self.redis.mget(*keys)):
+                    entry = self._parse_entry(data)
+                    if entry is not None:
+                        entries[key] = entry
+
+                versions = await self._get_role_versions(
+                    int(role_id)
+                    for entry in entries.values()
+                    for role_id in entry["roles"]
+                )
+                for key, entry in entries.items():
+                    if all(
+                        versions.get(int(role_id), 0) == version
+                        for role_id, version in entry["roles"].items()
+                    ):
+                        permissions[key] = entry["permissions"]
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao ler cache: {e}")
+
+        missing = {key: ctx for key, ctx in keys.items() if key not in permissions}
+        if missing:
+            fetched = await self._fetch_contexts_entries_from_db(
+                user_id, list(missing.values())
+            )
+            entries = {
+                key: fetched.get(ctx, {"roles": {}, "permissions": []})
+                for key, ctx in missing.items()
+            }
+            for key, entry in entries.items():
+                permissions[key] = entry["permissions"]
+
+            if self.redis:
+                try:
+                    async with self.redis.pipeline(transaction=False) as pipe:
+                        for key, entry in entries.items():
+                            pipe.setex(key, self.cache_ttl, json.dumps(entry))
+                        await pipe.execute()
+                except Exception as e:
+                    logger.warning(f"⚠️ Erro ao cachear: {e}")
+
+        logger.debug(
+            "🎯 Permissões resolvidas",
+            user_id=user_id,
+            contexts_count=len(keys),
+            cache_hits=len(keys) - len(missing),
+        )
+
+        return {ctx: permissions[key] for key, ctx in keys.items()}
+
+    @staticmethod
+    def _parse_entry(data: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Entrada cacheada ou None (ausente, inválida ou no formato antigo)"""
+        if not data:
+            return None
+        try:
+            entry = json.loads(data)
+        except json.JSONDecodeError:
+            return None
+        # Listas simples (formato anterior) não registram versões
+        if not isinstance(entry, dict) or "roles" not in entry:
+            return None
+        return entry
+
+    def _get_role_version_key(self, role_id: int) -> str:
+        """Contador de versão do perfil"""
+        # Fora de permissions:* para que limpar o cache não zere versões e
+        # volte a validar entradas antigas
+        return f"role_version:{role_id}"
+
+    async def _get_role_versions(self, role_ids: Iterable[int]) -> Dict[int, int]:
+        """Versões atuais dos perfis (0 para perfis nunca alterados)"""
+        role_ids = sorted(set(role_ids))
+        if not role_ids or not self.redis:
+            return {}
+
+        values = await self.redis.mget(
+            *[self._get_role_version_key(role_id) for role_id in role_ids]
+        )
+        return {
+            role_id: int(value) if value else 0
+            for role_id, value in zip(role_ids, values)
+        }
+
+    async def bump_role_versions(self, role_ids: Iterable[int]) -> None:
+        """Invalidar as permissões de todos os usuários que têm os perfis
+
+        Um INCR por perfil, sem varrer chaves: entradas que registraram a
+        versão anterior deixam de ser lidas e são recalculadas no próximo
+        acesso (as antigas expiram pelo TTL).
+        """
+        role_ids = sorted(set(role_ids))
+        if not role_ids or not self.redis:
+            return
+
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for role_id in role_ids:
+                    pipe.incr(self._get_role_version_key(role_id))
+                await pipe.execute()
+            logger.info("🔄 Versão de perfis incrementada", role_ids=role_ids)
+        except Exception as e:
+            logger.error(f"❌ Erro ao incrementar versão de perfis: {e}")
+
+    async def _fetch_contexts_entries_from_db(
+        self, user_id: int, contexts: List[Tuple[str, Optional[int]]]
+    ) -> Dict[Tuple[str, Optional[int]], Dict[str, Any]]:
+        """Buscar perfis e permissões de vários contextos no banco
+
+        Contextos sem context_id reúnem os perfis de todos os context_id do
+        tipo. As versões dos perfis são lidas antes das permissões: uma
+        edição concorrente pode, no máximo, causar um recálculo a mais, nunca
+        gravar permissões antigas com a versão nova.
+        """
         try:
             async for db in get_db():
-                # Construir query dinamicamente para evitar problemas com NULL
-                if context_id is None:
-                    query = text(
-                        """
-                        SELECT DISTINCT p.name
-                        FROM master.user_roles ur
-                        JOIN master.roles r ON ur.role_id = r.id
-                        JOIN master.role_permissions rp ON r.id = rp.role_id
-                        JOIN master.permissions p ON rp.permission_id = p.id
-                        WHERE ur.user_id = :user_id
-                          AND ur.context_type = :context_type
-                          AND ur.status = 'active'
-                          AND ur.deleted_at IS NULL
-                          AND r.is_active = true
-                          AND p.is_active = true
-                        ORDER BY p.name
+                roles_query = text(
                     """
+                    SELECT DISTINCT ur.context_type, ur.context_id, ur.role_id
+                    FROM master.user_roles ur
+                    WHERE ur.user_id = :user_id
+                      AND ur.context_type = ANY(:context_types)
+                      AND ur.status = 'active'
+                      AND ur.deleted_at IS NULL
+                """
+                )
+                result = await db.execute(
+                    roles_query,
+                    {
+                        "user_id": user_id,
+                        "context_types": sorted({ctx[0] for ctx in contexts}),
+                    },
+                )
+                rows = result.fetchall()
+
+                roles = {}
+                for context_type, context_id in contexts:
+                    roles[(context_type, context_id)] = sorted(
+                        {
+                            row.role_id
+                            for row in rows
+                            if row.context_type == context_type
+                            and (not context_id or row.context_id == context_id)
+                        }
                     )
-                    params = {"user_id": user_id, "context_type": context_type}
-                else:
-                    query = text(
+
+                role_ids = sorted({row.role_id for row in rows})
+                versions = await self._get_role_versions(role_ids)
+
+                role_permissions: Dict[int, Set[str]] = {}
+                if role_ids:
+                    # Perfis inativos continuam registrados na entrada para
+                    # que a reativação também a invalide
+                    permissions_query = text(
                         """
-                        SELECT DISTINCT p.name
-                        FROM master.user_roles ur
-                        JOIN master.roles r ON ur.role_id = r.id
-                        JOIN master.role_permissions rp ON r.id = rp.role_id
+                        SELECT rp.role_id, p.name
+                        FROM master.role_permissions rp
+                        JOIN master.roles r ON rp.role_id = r.id
                         JOIN master.permissions p ON rp.permission_id = p.id
-                        WHERE ur.user_id = :user_id
-                          AND ur.context_type = :context_type
-                          AND ur.context_id = :context_id
-                          AND ur.status = 'active'
-                          AND ur.deleted_at IS NULL
+                        WHERE rp.role_id = ANY(:role_ids)
                           AND r.is_active = true
                           AND p.is_active = true
-                        ORDER BY p.name
                     """
                     )
-                    params = {
-                        "user_id": user_id,
-                        "context_type": context_type,
-                        "context_id": context_id,
+                    result = await db.execute(permissions_query, {"role_ids": role_ids})
+                    for row in result.fetchall():
+                        role_permissions.setdefault(row.role_id, set()).add(row.name)
+
+                return {
+                    ctx: {
+                        "roles": {
+                            str(role_id): versions.get(role_id, 0)
+                            for role_id in context_roles
+                        },
+                        "permissions": sorted(
+                            {
+                                name
+                                for role_id in context_roles
+                                for name in role_permissions.get(role_id, ())
+                            }
+                        ),
                     }
-
-                result = await db.execute(query, params)
-
-                permissions = [row[0] for row in result.fetchall()]
-
-                logger.debug(
-                    "🔍 Permissões buscadas do banco",
-                    user_id=user_id,
-                    context_type=context_type,
-                    permissions_count=len(permissions),
-                )
-
-                return permissions
+                    for ctx, context_roles in roles.items()
+                }
 
         except Exception as e:
             logger.error(f"❌ Erro ao buscar permissões do banco: {e}")
-            return []
+            return {}
 
     async def has_permission(
         self,
@@ -347,17 +463,20 @@ class PermissionCache:
 
     async def preload_user_permissions(
         self, user_id: int, contexts: List[Dict[str, Any]]
-    ):
-        """Pre-carregar permissões de múltiplos contextos para um usuário"""
-        try:
-            tasks = []
-            for context in contexts:
-                task = self.get_user_permissions(
-                    user_id, context["context_type"], context.get("context_id")
-                )
-                tasks.append(task)
+    ) -> Dict[Tuple[str, Optional[int]], List[str]]:
+        """Pre-carregar permissões de múltiplos contextos para um usuário
 
-            await asyncio.gather(*tasks)
+        Mesmo caminho de get_user_permissions, em lote para todos os
+        contextos.
+        """
+        try:
+            permissions = await self._get_contexts_permissions(
+                user_id,
+                [
+                    (context["context_type"], context.get("context_id"))
+                    for context in contexts
+                ],
+            )
 
             logger.info(
                 "🚀 Permissões pré-carregadas",
@@ -365,8 +484,11 @@ class PermissionCache:
                 contexts_count=len(contexts),
             )
 
+            return permissions
+
         except Exception as e:
             logger.error(f"❌ Erro no pré-carregamento: {e}")
+            return {}
 
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Estatísticas do cache de permissões"""
@@ -460,3 +582,8 @@ async def get_user_permissions(
 async def invalidate_user_permissions(user_id: int):
     """Função utilitária para invalidar cache do usuário"""
     await permission_cache.invalidate_user_cache(user_id)
+
+
+async def invalidate_role_permissions(*role_ids: int):
+    """Função utilitária para invalidar as permissões de quem tem os perfis"""
+    await permission_cache.bump_role_versions(role_ids)
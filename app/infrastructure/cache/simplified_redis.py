@@ -6,16 +6,17 @@ import asyncio
 import json
 import pickle
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import redis.asyncio as redis
 
+from app.infrastructure.cache.codec import CacheCodec, CodecError
 from app.infrastructure.logging import logger
 from config.settings import settings
 
 
 class SerializationMethod(Enum):
-    """Serialization methods for cache values"""
+    """Prefixos de chave do formato antigo (antes do codec com cabeçalho)"""
 
     JSON = "json"
     PICKLE = "pickle"
@@ -29,6 +30,14 @@ class SimplifiedRedisClient:
         self.redis: Optional[redis.Redis] = None
         self._connection_retries = 3
         self._retry_delay = 1.0
+        self.codec = CacheCodec(
+            serializer=settings.cache_serializer,
+            compress_threshold=settings.cache_compress_threshold,
+        )
+        # Lê (e migra) chaves json:/pickle:/raw: gravadas antes do codec
+        self.read_legacy_keys = settings.cache_read_legacy_keys
+        # Chaves por comando em get_many/set_many/delete_many
+        self.batch_size = settings.cache_batch_size
 
     async def connect(self):
         """Connect to Redis server with retry logic - fails if connection cannot be established"""
@@ -105,35 +114,17 @@ class SimplifiedRedisClient:
             logger.warning(f"Unexpected error during Redis ping: {e}")
         return False
 
-    def _serialize_value(self, value: Any) -> tuple[bytes, SerializationMethod]:
-        """Serialize value using the best method with improved error handling"""
-        # Try JSON first (most compatible)
-        try:
-            if isinstance(value, (str, int, float, bool, list, dict, type(None))):
-                return (
-                    json.dumps(value, default=str).encode("utf-8"),
-                    SerializationMethod.JSON,
-                )
-        except (TypeError, ValueError) as e:
-            logger.debug(f"JSON serialization failed for {type(value)}: {e}")
-
-        # Fallback to pickle for complex objects
-        try:
-            return pickle.dumps(value), SerializationMethod.PICKLE
-        except (pickle.PickleError, TypeError) as e:
-            logger.warning(f"Pickle serialization failed for {type(value)}: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error during pickle serialization: {e}")
+    def _legacy_key(self, key: str, method: SerializationMethod) -> str:
+        """Chave prefixada pelo formato (gravações anteriores ao codec)"""
+        return f"{method.value}:{key}"
 
-        # Last resort: convert to string
-        try:
-            return str(value).encode("utf-8"), SerializationMethod.RAW
-        except Exception as e:
-            logger.error(f"Failed to serialize value as string: {e}")
-            raise ValueError(f"Unable to serialize value of type {type(value)}") from e
+    def _legacy_keys(self, key: str) -> List[str]:
+        if not self.read_legacy_keys:
+            return []
+        return [self._legacy_key(key, method) for method in SerializationMethod]
 
-    def _deserialize_value(self, data: bytes, method: SerializationMethod) -> Any:
-        """Deserialize value based on method with improved error handling"""
+    def _decode_legacy(self, data: bytes, method: SerializationMethod) -> Any:
+        """Decodifica valores gravados no formato antigo (prefixo na chave)"""
         try:
             if method == SerializationMethod.JSON:
                 return json.loads(data.decode("utf-8"))
@@ -141,23 +132,10 @@ class SimplifiedRedisClient:
                 return pickle.loads(data)
             else:  # RAW
                 return data.decode("utf-8")
-        except json.JSONDecodeError as e:
-            logger.warning(f"JSON deserialization failed: {e}")
-            return None
-        except pickle.PickleError as e:
-            logger.warning(f"Pickle deserialization failed: {e}")
-            return None
-        except UnicodeDecodeError as e:
-            logger.warning(f"Unicode decode error during deserialization: {e}")
-            return None
         except Exception as e:
-            logger.error(f"Unexpected deserialization error for method {method}: {e}")
+            logger.warning(f"Legacy deserialization failed ({method.value}): {e}")
             return None
 
-    def _make_key(self, key: str, method: SerializationMethod) -> str:
-        """Create prefixed key based on serialization method"""
-        return f"{method.value}:{key}"
-
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Set a value with automatic serialization and error handling"""
         if not self.redis:
@@ -165,18 +143,15 @@ class SimplifiedRedisClient:
             return False
 
         try:
-            serialized_value, method = self._serialize_value(value)
-            prefixed_key = self._make_key(key, method)
+            encoded = self.codec.encode(value)
 
             ttl = ttl or settings.cache_ttl
-            await self.redis.setex(prefixed_key, ttl, serialized_value)
+            await self.redis.setex(key, ttl, encoded)
 
-            logger.debug(
-                f"Cache set: {key} ({method.value}, {len(serialized_value)} bytes, TTL: {ttl}s)"
-            )
+            logger.debug(f"Cache set: {key} ({len(encoded)} bytes, TTL: {ttl}s)")
             return True
 
-        except ValueError as e:
+        except CodecError as e:
             logger.error(f"Serialization error for key {key}: {e}")
             return False
         except (redis.ConnectionError, redis.TimeoutError) as e:
@@ -187,53 +162,198 @@ class SimplifiedRedisClient:
             return False
 
     async def get(self, key: str) -> Optional[Any]:
-        """Get a value with automatic deserialization and error handling"""
+        """Get a value with automatic deserialization and error handling
+
+        Um único round trip: GET da chave (e, durante a migração, das chaves
+        prefixadas antigas no mesmo MGET).
+        """
         if not self.redis:
             logger.warning("Redis not available for get operation")
             return None
 
-        # Try all serialization methods in order of preference
-        methods = [
-            SerializationMethod.JSON,
-            SerializationMethod.PICKLE,
-            SerializationMethod.RAW,
-        ]
+        legacy_keys = self._legacy_keys(key)
+        try:
+            if legacy_keys:
+                data, *legacy_values = await self.redis.mget(key, *legacy_keys)
+            else:
+                data, legacy_values = await self.redis.get(key), []
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            logger.error(f"Redis connection error during get for key {key}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error during cache get for key {key}: {e}")
+            return None
+
+        result, legacy_key = self._decode_entry(key, data, legacy_values)
+        if legacy_key:
+            await self._migrate_legacy([(key, result, legacy_key)])
+
+        logger.debug(f"Cache {'hit' if result is not None else 'miss'}: {key}")
+        return result
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several values in one MGET per batch
+
+        Retorna apenas as chaves encontradas. Chaves no formato antigo entram
+        no mesmo MGET e são migradas em um único pipeline.
+        """
+        if not self.redis:
+            logger.warning("Redis not available for get_many operation")
+            return {}
+
+        keys = list(dict.fromkeys(keys))
+        width = 1 + (len(SerializationMethod) if self.read_legacy_keys else 0)
+        results: Dict[str, Any] = {}
+        to_migrate = []
 
-        for method in methods:
+        for batch in self._batches(keys):
+            request = []
+            for key in batch:
+                request.append(key)
+                request.extend(self._legacy_keys(key))
+
+            try:
+                values = await self.redis.mget(*request)
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                logger.error(f"Redis connection error during get_many: {e}")
+                return results
+            except Exception as e:
+                logger.error(f"Unexpected error during cache get_many: {e}")
+                return results
+
+            for index, key in enumerate(batch):
+                data, *legacy_values = values[index * width : (index + 1) * width]
+                result, legacy_key = self._decode_entry(key, data, legacy_values)
+                if result is None:
+                    continue
+                results[key] = result
+                if legacy_key:
+                    to_migrate.append((key, result, legacy_key))
+
+        if to_migrate:
+            await self._migrate_legacy(to_migrate)
+
+        logger.debug(f"Cache get_many: {len(results)}/{len(keys)} hits")
+        return results
+
+    def _decode_entry(
+        self, key: str, data: Optional[bytes], legacy_values: List[Optional[bytes]]
+    ) -> Tuple[Any, Optional[str]]:
+        """Decodifica o valor de uma chave; retorna (valor, chave antiga lida)"""
+        if data:
             try:
-                prefixed_key = self._make_key(key, method)
-                data = await self.redis.get(prefixed_key)
+                return self.codec.decode(data), None
+            except CodecError as e:
+                logger.warning(f"Cache decode failed for {key}: {e}")
+                return None, None
+
+        for method, legacy_data in zip(SerializationMethod, legacy_values):
+            if legacy_data:
+                result = self._decode_legacy(legacy_data, method)
+                if result is not None:
+                    return result, self._legacy_key(key, method)
+
+        return None, None
+
+    async def _migrate_legacy(self, entries: List[Tuple[str, Any, str]]):
+        """Regrava valores antigos no formato novo (mesmo TTL restante) e
+        remove as chaves prefixadas; entries = [(chave, valor, chave antiga)]"""
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for _, _, legacy_key in entries:
+                    pipe.ttl(legacy_key)
+                ttls = await pipe.execute()
+
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for (key, value, _), ttl in zip(entries, ttls):
+                    ttl = ttl if ttl and ttl > 0 else settings.cache_ttl
+                    pipe.setex(key, ttl, self.codec.encode(value))
+                    pipe.delete(*self._legacy_keys(key))
+                await pipe.execute()
+        except Exception as e:
+            logger.debug(f"Legacy cache migration skipped ({len(entries)} keys): {e}")
+
+    async def set_many(
+        self,
+        values: Dict[str, Any],
+        ttl: Optional[int] = None,
+        ttls: Optional[Dict[str, int]] = None,
+    ) -> int:
+        """Set several values through pipelines (one round trip per batch)
+
+        ttls define o TTL por chave; as demais usam ttl (ou o padrão).
+        Retorna quantas chaves foram gravadas.
+        """
+        if not self.redis:
+            logger.warning("Redis not available for set_many operation")
+            return 0
 
-                if data:
-                    result = self._deserialize_value(data, method)
-                    if result is not None:
-                        logger.debug(f"Cache hit: {key} ({method.value})")
-                        return result
+        default_ttl = ttl or settings.cache_ttl
+        ttls = ttls or {}
+        written = 0
 
+        for batch in self._batches(list(values)):
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    queued = 0
+                    for key in batch:
+                        try:
+                            encoded = self.codec.encode(values[key])
+                        except CodecError as e:
+                            logger.error(f"Serialization error for key {key}: {e}")
+                            continue
+                        pipe.setex(key, ttls.get(key) or default_ttl, encoded)
+                        queued += 1
+                    if queued:
+                        await pipe.execute()
+                        written += queued
             except (redis.ConnectionError, redis.TimeoutError) as e:
-                logger.error(f"Redis connection error during get for key {key}: {e}")
-                return None
+                logger.error(f"Redis connection error during set_many: {e}")
+                break
             except Exception as e:
-                logger.debug(
-                    f"Cache get attempt failed for {key} with {method.value}: {e}"
-                )
-                continue
+                logger.error(f"Unexpected error during cache set_many: {e}")
+                break
+
+        logger.debug(f"Cache set_many: {written}/{len(values)} keys")
+        return written
+
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys (and legacy variants) in one DEL per batch"""
+        if not self.redis:
+            logger.warning("Redis not available for delete_many operation")
+            return 0
+
+        deleted = 0
+        for batch in self._batches(list(dict.fromkeys(keys))):
+            request = []
+            for key in batch:
+                request.append(key)
+                request.extend(self._legacy_keys(key))
+            try:
+                deleted += await self.redis.delete(*request)
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                logger.error(f"Redis connection error during delete_many: {e}")
+                break
+            except Exception as e:
+                logger.error(f"Unexpected error during cache delete_many: {e}")
+                break
 
-        logger.debug(f"Cache miss: {key}")
-        return None
+        logger.debug(f"Cache delete_many: {deleted} keys removed")
+        return deleted
+
+    def _batches(self, keys: List[str]) -> Iterator[List[str]]:
+        """Divide as chaves em lotes para limitar o tamanho de cada comando"""
+        for start in range(0, len(keys), self.batch_size):
+            yield keys[start : start + self.batch_size]
 
     async def delete(self, key: str) -> bool:
-        """Delete a key from all possible formats with error handling"""
+        """Delete a key (and its legacy prefixed variants) with error handling"""
         if not self.redis:
             logger.warning("Redis not available for delete operation")
             return False
 
         try:
-            keys_to_delete = [
-                self._make_key(key, method) for method in SerializationMethod
-            ]
-
-            deleted = await self.redis.delete(*keys_to_delete)
+            deleted = await self.redis.delete(key, *self._legacy_keys(key))
             logger.debug(f"Cache delete: {key} ({deleted} keys removed)")
             return deleted > 0
 
@@ -245,17 +365,13 @@ class SimplifiedRedisClient:
             return False
 
     async def exists(self, key: str) -> bool:
-        """Check if key exists in any format with error handling"""
+        """Check if key exists with error handling"""
         if not self.redis:
             logger.debug("Redis not available for exists check")
             return False
 
         try:
-            keys_to_check = [
-                self._make_key(key, method) for method in SerializationMethod
-            ]
-
-            exists_count = await self.redis.exists(*keys_to_check)
+            exists_count = await self.redis.exists(key, *self._legacy_keys(key))
             return exists_count > 0
 
         except (redis.ConnectionError, redis.TimeoutError) as e:
@@ -269,6 +385,101 @@ class SimplifiedRedisClient:
             )
             return False
 
+    async def incr(self, key: str) -> Optional[int]:
+        """Increment an integer counter (stored raw, outside the codec)"""
+        if not self.redis:
+            logger.warning("Redis not available for incr operation")
+            return None
+
+        try:
+            return await self.redis.incr(key)
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            logger.error(f"Redis connection error during incr for key {key}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error during incr for key {key}: {e}")
+            return None
+
+    async def get_counter(self, key: str) -> Optional[int]:
+        """Read a counter written by incr (0 when missing, None on error)"""
+        if not self.redis:
+            return None
+
+        try:
+            value = await self.redis.get(key)
+            return int(value) if value is not None else 0
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            logger.error(f"Redis connection error reading counter {key}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error reading counter {key}: {e}")
+            return None
+
+    async def hincrby(
+        self, key: str, field: str, amount: int = 1, ttl: Optional[int] = None
+    ) -> Optional[int]:
+        """Increment an integer hash field (stored raw, outside the codec)"""
+        if not self.redis:
+            logger.warning("Redis not available for hincrby operation")
+            return None
+
+        try:
+            if not ttl:
+                return await self.redis.hincrby(key, field, amount)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hincrby(key, field, amount)
+                pipe.expire(key, ttl)
+                value, _ = await pipe.execute()
+            return value
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            logger.error(f"Redis connection error during hincrby for key {key}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error during hincrby for key {key}: {e}")
+            return None
+
+    async def hset(
+        self, key: str, mapping: Dict[str, Any], ttl: Optional[int] = None
+    ) -> bool:
+        """Set raw hash fields, optionally refreshing the key TTL"""
+        if not self.redis:
+            logger.warning("Redis not available for hset operation")
+            return False
+
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hset(key, mapping=mapping)
+                if ttl:
+                    pipe.expire(key, ttl)
+                await pipe.execute()
+            return True
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            logger.error(f"Redis connection error during hset for key {key}: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected error during hset for key {key}: {e}")
+            return False
+
+    async def hgetall(self, key: str) -> Optional[Dict[str, str]]:
+        """Read raw hash fields ({} when missing, None on error)"""
+        if not self.redis:
+            return None
+
+        try:
+            data = await self.redis.hgetall(key)
+            return {
+                (k.decode() if isinstance(k, bytes) else k): (
+                    v.decode() if isinstance(v, bytes) else v
+                )
+                for k, v in data.items()
+            }
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            logger.error(f"Redis connection error reading hash {key}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error reading hash {key}: {e}")
+            return None
+
     async def clear_pattern(self, pattern: str) -> int:
         """Clear keys matching pattern with error handling"""
         if not self.redis:
@@ -277,9 +488,7 @@ class SimplifiedRedisClient:
 
         try:
             deleted = 0
-            for method in SerializationMethod:
-                prefixed_pattern = self._make_key(pattern, method)
-
+            for prefixed_pattern in [pattern, *self._legacy_keys(pattern)]:
                 keys = []
                 try:
                     async for key in self.redis.scan_iter(match=prefixed_pattern):
@@ -0,0 +1,77 @@
+"""
+Contadores de notificações não lidas
+
+Um hash por usuário (notifications:unread:{user_id}) com os campos count e
+synced_at. O contador é mantido incrementalmente (criação, leitura, leitura
+de todas) e reconciliado com o banco quando:
+
+- o hash não existe ou não tem synced_at (HINCRBY sobre chave ausente cria
+  apenas count, que não é confiável)
+- a última reconciliação é mais antiga que reconcile_interval (notificações
+  que expiram não passam pelo serviço)
+- o valor ficou negativo
+"""
+
+import time
+from typing import Optional
+
+import structlog
+
+from app.infrastructure.cache.simplified_redis import simplified_redis_client
+
+logger = structlog.get_logger()
+
+
+class UnreadCounterStore:
+    """Contador de não lidas por usuário no Redis"""
+
+    def __init__(self, reconcile_interval: int = 300, ttl: int = 86400):
+        self.reconcile_interval = reconcile_interval
+        self.ttl = ttl
+
+    def _key(self, user_id: int) -> str:
+        return f"notifications:unread:{user_id}"
+
+    async def get(self, user_id: int) -> Optional[int]:
+        """Contador atual ou None quando precisa ser reconciliado"""
+        fields = await simplified_redis_client.hgetall(self._key(user_id))
+        if not fields or "synced_at" not in fields or "count" not in fields:
+            return None
+
+        try:
+            count = int(fields["count"])
+            synced_at = float(fields["synced_at"])
+        except ValueError:
+            return None
+
+        if count < 0 or time.time() - synced_at >= self.reconcile_interval:
+            return None
+        return count
+
+    async def set(self, user_id: int, count: int) -> None:
+        """Valor exato (contagem do banco ou zerado por mark_all_as_read)"""
+        await simplified_redis_client.hset(
+            self._key(user_id), {"count": count, "synced_at": time.time()}, self.ttl
+        )
+
+    async def add(self, user_id: int, delta: int) -> None:
+        """Ajuste incremental após criar/ler notificações"""
+        if delta:
+            await simplified_redis_client.hincrby(
+                self._key(user_id), "count", delta, self.ttl
+            )
+
+
+_unread_counter_store: Optional[UnreadCounterStore] = None
+
+
+def get_unread_counter_store() -> UnreadCounterStore:
+    """Instância global dos contadores de não lidas"""
+    global _unread_counter_store
+    if _unread_counter_store is None:
+        from config.settings import settings
+
+        _unread_counter_store = UnreadCounterStore(
+            reconcile_interval=settings.notification_unread_reconcile_interval
+        )
+    return _unread_counter_store
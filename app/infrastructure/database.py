@@ -1,7 +1,18 @@
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Dict
+from uuid import uuid4
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
+from app.infrastructure.monitoring.db_instrumentation import (
+    InstrumentedAsyncAdaptedQueuePool,
+    instrument_engine,
+)
 from config.settings import settings
 
 
@@ -12,21 +23,77 @@ def get_database_url() -> str:
     return settings.database_url_with_schema
 
 
-engine = create_async_engine(
-    settings.database_url,  # Use basic URL without schema parameter
-    echo=False,  # Disabled for production
-    future=True,
-    pool_size=10,  # Reduced pool size to avoid conflicts
-    max_overflow=5,  # Allow some overflow connections
-    pool_pre_ping=True,  # Validate connections before use
-    pool_recycle=300,  # Recycle connections every 5 minutes
-    pool_timeout=30,  # Connection timeout
-    connect_args={
-        "server_settings": {"search_path": settings.db_schema},
-        "command_timeout": 60,  # Command timeout in seconds
-        "statement_cache_size": 0,  # Disable statement cache to avoid conflicts
-        "prepared_statement_cache_size": 0,  # Disable prepared statement cache
-    },
+def _unique_prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def _build_connect_args(workload: str, command_timeout: int) -> Dict[str, Any]:
+    """
+    asyncpg connect args, including prepared statement caching.
+
+    Direct connections use both asyncpg's statement cache and SQLAlchemy's
+    prepared statement cache. Behind PgBouncer in transaction pooling mode
+    (DB_PGBOUNCER_MODE=transaction) statements get unique names so they never
+    collide across server connections, and asyncpg's name-based cache is
+    turned off; this requires PgBouncer >= 1.21 with max_prepared_statements
+    enabled. Set the cache sizes to 0 for older PgBouncer versions.
+    """
+    connect_args: Dict[str, Any] = {
+        "server_settings": {
+            "search_path": settings.db_schema,
+            "application_name": f"{settings.db_application_name}-{workload}",
+        },
+        "command_timeout": command_timeout,
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+    }
+
+    if settings.db_pgbouncer_mode == "transaction":
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = _unique_prepared_statement_name
+    else:
+        connect_args["statement_cache_size"] = settings.db_statement_cache_size
+
+    return connect_args
+
+
+def create_workload_engine(
+    workload: str,
+    pool_size: int,
+    max_overflow: int,
+    command_timeout: int,
+) -> AsyncEngine:
+    """Create an instrumented engine with its own pool for one workload"""
+    workload_engine = create_async_engine(
+        settings.database_url,  # Use basic URL without schema parameter
+        echo=False,  # Disabled for production
+        future=True,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,  # Records checkout wait time
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=True,  # Validate connections before use
+        pool_recycle=settings.db_pool_recycle,
+        pool_timeout=settings.db_pool_timeout,
+        connect_args=_build_connect_args(workload, command_timeout),
+    )
+
+    # Query latency, pool usage and slow query capture
+    return instrument_engine(workload_engine, name=workload)
+
+
+# Interactive API traffic
+engine = create_workload_engine(
+    "api",
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_pool_overflow,
+    command_timeout=settings.db_command_timeout,
+)
+
+# Batch jobs (billing, reports): separate pool so long jobs can't starve requests
+batch_engine = create_workload_engine(
+    "batch",
+    pool_size=settings.db_batch_pool_size,
+    max_overflow=settings.db_batch_pool_overflow,
+    command_timeout=settings.db_batch_command_timeout,
 )
 
 # Create async session factory using the new async_sessionmaker
@@ -37,6 +104,13 @@ async_session = async_sessionmaker(
     autoflush=False,  # Disable autoflush to avoid conflicts
 )
 
+batch_session = async_sessionmaker(
+    bind=batch_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get database session"""
@@ -49,3 +123,26 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
         finally:
             await session.close()
+
+
+async def get_batch_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get a session from the batch pool (long-running endpoints)"""
+    async with batch_session() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
+# Context manager for background jobs running outside a request
+batch_session_scope = asynccontextmanager(get_batch_db)
+
+
+async def dispose_engines():
+    """Close all pooled connections (application shutdown)"""
+    await engine.dispose()
+    await batch_engine.dispose()
@@ -5,6 +5,7 @@ from fastapi import Request
 from fastapi.responses import JSONResponse
 from starlette.status import (
     HTTP_422_UNPROCESSABLE_ENTITY,
+    HTTP_429_TOO_MANY_REQUESTS,
     HTTP_500_INTERNAL_SERVER_ERROR,
 )
 
@@ -109,6 +110,23 @@ async def not_found_exception_handler(
     )
 
 
+async def password_hasher_busy_handler(
+    request: Request, exc: Exception
+) -> JSONResponse:
+    """Handler para executor de hash de senhas saturado (backpressure)"""
+    return JSONResponse(
+        status_code=HTTP_429_TOO_MANY_REQUESTS,
+        content={
+            "error": {
+                "code": "TOO_MANY_REQUESTS",
+                "message": "Server busy, please retry shortly",
+                "type": "rate_limit_error",
+            }
+        },
+        headers={"Retry-After": "1"},
+    )
+
+
 async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     """Handler para exceções gerais"""
     logger.error(
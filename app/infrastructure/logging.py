@@ -1,4 +1,215 @@
+"""
+Structured logging pipeline
+
+structlog processes events on the caller, then hands the event dict to the
+stdlib root logger. A QueueHandler enqueues the record and a QueueListener
+thread renders JSON (orjson when available) and writes it, so rendering and
+I/O never run on the event loop. Per-event sampling and rate limits drop
+noisy info/debug events before any expensive processing happens.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
 import structlog
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
 # Configure and export logger
 logger = structlog.get_logger()
+
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _orjson_dumps(event_dict: Dict[str, Any], **kwargs) -> str:
+    # OPT_NON_STR_KEYS: eventos com dicts de chaves int (ex: contagens por id)
+    return orjson.dumps(event_dict, default=str, option=orjson.OPT_NON_STR_KEYS).decode(
+        "utf-8"
+    )
+
+
+def _json_renderer() -> structlog.processors.JSONRenderer:
+    if orjson is not None:
+        return structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+    return structlog.processors.JSONRenderer()
+
+
+def parse_event_rules(raw: str) -> Dict[str, float]:
+    """Parse "event_a=0.1,event_b=5" into {"event_a": 0.1, "event_b": 5.0}"""
+    rules: Dict[str, float] = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        event, value = item.rsplit("=", 1)
+        try:
+            rules[event.strip()] = float(value)
+        except ValueError:
+            continue
+    return rules
+
+
+class EventSampler:
+    """
+    structlog processor that samples and rate limits info/debug events by
+    event name. Warnings and errors always pass.
+
+    - sample_rates: event -> fraction of events kept (0.0 - 1.0)
+    - rate_limits: event -> max events per second per process
+    Dropped events are counted and reported on the next emitted event with
+    the same name ("dropped" key).
+    """
+
+    _ALWAYS_KEEP = {"warning", "warn", "error", "critical", "exception"}
+
+    def __init__(
+        self,
+        sample_rates: Optional[Dict[str, float]] = None,
+        rate_limits: Optional[Dict[str, float]] = None,
+    ):
+        self.sample_rates = sample_rates or {}
+        self.rate_limits = rate_limits or {}
+        self._windows: Dict[str, list] = {}
+        self._dropped: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, logger, method_name: str, event_dict: Dict[str, Any]):
+        if method_name in self._ALWAYS_KEEP:
+            return event_dict
+
+        event = event_dict.get("event")
+        if event not in self.sample_rates and event not in self.rate_limits:
+            return event_dict
+
+        if not self._should_keep(event):
+            with self._lock:
+                self._dropped[event] = self._dropped.get(event, 0) + 1
+            raise structlog.DropEvent
+
+        with self._lock:
+            dropped = self._dropped.pop(event, 0)
+        if dropped:
+            event_dict["dropped"] = dropped
+        return event_dict
+
+    def _should_keep(self, event: str) -> bool:
+        rate = self.sample_rates.get(event)
+        if rate is not None and random.random() >= rate:  # nosec B311
+            return False
+
+        limit = self.rate_limits.get(event)
+        if limit is not None:
+            now = time.monotonic()
+            with self._lock:
+                window = self._windows.setdefault(event, [now, 0])
+                if now - window[0] >= 1.0:
+                    window[0], window[1] = now, 0
+                if window[1] >= limit:
+                    return False
+                window[1] += 1
+
+        return True
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues the record untouched; formatting (the
+    expensive part) happens in the listener thread instead of the caller.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # Never block the caller: drop records when the queue is full
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(
+    level: str = "INFO",
+    sample_rates: Optional[Dict[str, float]] = None,
+    rate_limits: Optional[Dict[str, float]] = None,
+    queue_size: int = 10000,
+) -> None:
+    """Configure structlog + stdlib logging with a queue-backed handler"""
+    global _queue_listener
+
+    shared_processors = [
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.StackInfoRenderer(),
+        structlog.processors.format_exc_info,
+    ]
+
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            EventSampler(sample_rates, rate_limits),
+            *shared_processors,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+    # Rendering runs in the listener thread
+    formatter = structlog.stdlib.ProcessorFormatter(
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.UnicodeDecoder(),
+            _json_renderer(),
+        ],
+        foreign_pre_chain=shared_processors,
+    )
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    if _queue_listener is not None:
+        _queue_listener.stop()
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    queue_handler = _DeferredQueueHandler(log_queue)
+
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root_logger.removeHandler(handler)
+    root_logger.addHandler(queue_handler)
+    root_logger.setLevel(level)
+
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,335 @@
+"""
+SQLAlchemy engine instrumentation
+
+Hooks engine and pool events to feed the database metrics defined in
+PerformanceMetrics:
+- per-statement latency (Prometheus by operation/table, in-process by fingerprint)
+- pool checkout wait time and saturation
+- per-request query counts (N+1 detection)
+- bounded ring buffer of the slowest normalized statements
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.infrastructure.logging import logger
+from app.infrastructure.monitoring.metrics import performance_metrics
+from config.settings import settings
+
+_NS_PER_SECOND = 1_000_000_000
+
+# Statement normalization patterns
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_BIND_PARAM_RE = re.compile(r"\$\d+|%\(\w+\)s|(?<![:\w]):\w+\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_OPERATION_RE = re.compile(r"^\s*(\w+)")
+_TABLE_RE = re.compile(r"\b(?:from|into|update|join)\s+([\w\.\"]+)", re.IGNORECASE)
+
+_MAX_FINGERPRINT_LENGTH = 500
+
+# Query counter for the current HTTP request (None outside requests)
+_request_query_count: ContextVar[Optional[List[int]]] = ContextVar(
+    "request_query_count", default=None
+)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint_statement(statement: str) -> str:
+    """
+    Normalize a SQL statement so that executions differing only in literal
+    values or IN-list sizes share one fingerprint.
+    """
+    normalized = _COMMENT_RE.sub(" ", statement)
+    normalized = _STRING_LITERAL_RE.sub("?", normalized)
+    normalized = _BIND_PARAM_RE.sub("?", normalized)
+    normalized = _NUMBER_LITERAL_RE.sub("?", normalized)
+    normalized = _IN_LIST_RE.sub("(?)", normalized)
+    normalized = _WHITESPACE_RE.sub(" ", normalized).strip()
+    return normalized[:_MAX_FINGERPRINT_LENGTH]
+
+
+@lru_cache(maxsize=2048)
+def classify_statement(fingerprint: str) -> Tuple[str, str]:
+    """Extract (operation, table) labels from a statement fingerprint"""
+    operation_match = _OPERATION_RE.match(fingerprint)
+    operation = operation_match.group(1).lower() if operation_match else "unknown"
+
+    table_match = _TABLE_RE.search(fingerprint)
+    table = table_match.group(1).replace('"', "").lower() if table_match else "none"
+
+    return operation, table
+
+
+@dataclass
+class SlowQuery:
+    """Slow statement sample kept in the ring buffer"""
+
+    fingerprint: str
+    duration_ms: float
+    timestamp: float
+    operation: str
+    table: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "duration_ms": round(self.duration_ms, 3),
+            "timestamp": self.timestamp,
+            "operation": self.operation,
+            "table": self.table,
+        }
+
+
+@dataclass
+class FingerprintStats:
+    """Aggregated latency for one statement fingerprint"""
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    errors: int = 0
+    last_seen: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "errors": self.errors,
+            "last_seen": self.last_seen,
+        }
+
+
+class QueryStatsCollector:
+    """
+    In-process statement statistics.
+
+    Slow statements go to a bounded ring buffer; per-fingerprint aggregates
+    are capped at max_fingerprints (least recently seen entries are evicted).
+    """
+
+    def __init__(
+        self,
+        slow_threshold_ms: float = 200.0,
+        slow_log_size: int = 100,
+        max_fingerprints: int = 500,
+    ):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.max_fingerprints = max_fingerprints
+        self._slow_queries: Deque[SlowQuery] = deque(maxlen=slow_log_size)
+        self._stats: Dict[str, FingerprintStats] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        fingerprint: str,
+        operation: str,
+        table: str,
+        duration_ms: float,
+        error: bool = False,
+    ):
+        now = time.time()
+        with self._lock:
+            stats = self._stats.get(fingerprint)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    self._evict_oldest()
+                stats = self._stats[fingerprint] = FingerprintStats()
+
+            stats.count += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.last_seen = now
+            if error:
+                stats.errors += 1
+
+            if duration_ms >= self.slow_threshold_ms:
+                self._slow_queries.append(
+                    SlowQuery(
+                        fingerprint=fingerprint,
+                        duration_ms=duration_ms,
+                        timestamp=now,
+                        operation=operation,
+                        table=table,
+                    )
+                )
+
+    def _evict_oldest(self):
+        oldest = min(self._stats.items(), key=lambda item: item[1].last_seen)[0]
+        del self._stats[oldest]
+
+    def get_slow_queries(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Slowest samples currently in the ring buffer, slowest first"""
+        with self._lock:
+            samples = sorted(
+                self._slow_queries, key=lambda q: q.duration_ms, reverse=True
+            )
+        return [sample.to_dict() for sample in samples[:limit]]
+
+    def get_top_fingerprints(
+        self, limit: int = 20, order_by: str = "total_ms"
+    ) -> List[Dict[str, Any]]:
+        """Fingerprints ordered by total_ms, max_ms or count"""
+        with self._lock:
+            items = list(self._stats.items())
+
+        items.sort(key=lambda item: getattr(item[1], order_by), reverse=True)
+        return [
+            {"fingerprint": fingerprint, **stats.to_dict()}
+            for fingerprint, stats in items[:limit]
+        ]
+
+    def reset(self):
+        with self._lock:
+            self._slow_queries.clear()
+            self._stats.clear()
+
+
+query_stats = QueryStatsCollector(
+    slow_threshold_ms=settings.db_slow_query_threshold_ms,
+    slow_log_size=settings.db_slow_query_log_size,
+)
+
+
+# =================================
+# PER-REQUEST QUERY COUNT
+# =================================
+
+
+def start_request_tracking():
+    """Start counting queries for the current request; returns a reset token"""
+    return _request_query_count.set([0])
+
+
+def get_request_query_count() -> Optional[int]:
+    counter = _request_query_count.get()
+    return counter[0] if counter is not None else None
+
+
+def stop_request_tracking(token):
+    _request_query_count.reset(token)
+
+
+# =================================
+# POOL INSTRUMENTATION
+# =================================
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long checkouts wait"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics_name = "default"
+
+    def connect(self):
+        start_ns = time.perf_counter_ns()
+        try:
+            return super().connect()
+        finally:
+            wait = (time.perf_counter_ns() - start_ns) / _NS_PER_SECOND
+            performance_metrics.record_db_pool_checkout_wait(self.metrics_name, wait)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+    @property
+    def capacity(self) -> int:
+        return self.size() + max(self._max_overflow, 0)
+
+
+def _update_pool_gauges(pool, engine_name: str):
+    checked_out = pool.checkedout()
+    capacity = getattr(pool, "capacity", None) or pool.size()
+    performance_metrics.update_db_pool_usage(engine_name, checked_out, capacity)
+
+
+# =================================
+# ENGINE INSTRUMENTATION
+# =================================
+
+
+def _record_statement(statement: str, duration: float, error: bool = False):
+    fingerprint = fingerprint_statement(statement)
+    operation, table = classify_statement(fingerprint)
+
+    performance_metrics.record_db_query(operation, table, duration)
+    query_stats.record(fingerprint, operation, table, duration * 1000, error=error)
+
+
+def instrument_engine(engine, name: str = "default"):
+    """
+    Attach query and pool event listeners to an engine.
+
+    Accepts an AsyncEngine or a sync Engine.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    if isinstance(sync_engine.pool, InstrumentedAsyncAdaptedQueuePool):
+        sync_engine.pool.metrics_name = name
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("query_start_ns", []).append(time.perf_counter_ns())
+
+        counter = _request_query_count.get()
+        if counter is not None:
+            counter[0] += 1
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        start_stack = conn.info.get("query_start_ns")
+        if not start_stack:
+            return
+        duration = (time.perf_counter_ns() - start_stack.pop()) / _NS_PER_SECOND
+        _record_statement(statement, duration)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        performance_metrics.record_db_error(
+            type(exception_context.original_exception).__name__
+        )
+
+        conn = exception_context.connection
+        statement = exception_context.statement
+        if conn is None or statement is None:
+            return
+        start_stack = conn.info.get("query_start_ns")
+        if not start_stack:
+            return
+        duration = (time.perf_counter_ns() - start_stack.pop()) / _NS_PER_SECOND
+        _record_statement(statement, duration, error=True)
+
+    # Saturation only makes sense for sized pools
+    if isinstance(sync_engine.pool, QueuePool):
+
+        @event.listens_for(sync_engine.pool, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            _update_pool_gauges(sync_engine.pool, name)
+
+        @event.listens_for(sync_engine.pool, "checkin")
+        def _on_checkin(dbapi_connection, connection_record):
+            _update_pool_gauges(sync_engine.pool, name)
+
+    logger.info("Database engine instrumented", engine=name)
+    return engine
@@ -6,7 +6,7 @@ import asyncio
 import time
 from contextlib import asynccontextmanager
 from functools import wraps
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import psutil
 from prometheus_client import (
@@ -43,6 +43,16 @@ class PerformanceMetrics:
             buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
         )
 
+        # Time spent inside the router (routing, dependencies, endpoint and
+        # response rendering). Total minus handler = middleware overhead.
+        self.http_handler_duration = Histogram(
+            "http_handler_duration_seconds",
+            "HTTP handler duration in seconds (excluding middleware)",
+            ["method", "endpoint"],
+            registry=self.registry,
+            buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+        )
+
         # Database metrics
         self.db_connections_active = Gauge(
             "db_connections_active",
@@ -64,6 +74,36 @@ class PerformanceMetrics:
             registry=self.registry,
         )
 
+        self.db_pool_checkout_wait = Histogram(
+            "db_pool_checkout_wait_seconds",
+            "Time waiting to check out a connection from the pool",
+            ["engine"],
+            registry=self.registry,
+            buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+        )
+
+        self.db_pool_checked_out = Gauge(
+            "db_pool_checked_out_connections",
+            "Connections currently checked out of the pool",
+            ["engine"],
+            registry=self.registry,
+        )
+
+        self.db_pool_saturation = Gauge(
+            "db_pool_saturation_ratio",
+            "Checked out connections / pool capacity (size + max overflow)",
+            ["engine"],
+            registry=self.registry,
+        )
+
+        self.db_queries_per_request = Histogram(
+            "db_queries_per_request",
+            "Number of database queries executed per HTTP request",
+            ["method", "endpoint"],
+            registry=self.registry,
+            buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250),
+        )
+
         # Cache metrics
         self.cache_operations_total = Counter(
             "cache_operations_total",
@@ -107,6 +147,36 @@ class PerformanceMetrics:
             registry=self.registry,
         )
 
+        # Password hashing executor
+        self.password_hash_duration = Histogram(
+            "password_hash_duration_seconds",
+            "Password hash/verify execution time in the hashing executor",
+            ["operation"],
+            registry=self.registry,
+            buckets=(0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+        )
+
+        self.password_hash_queue_wait = Histogram(
+            "password_hash_queue_wait_seconds",
+            "Time waiting for a free password hashing thread",
+            ["operation"],
+            registry=self.registry,
+            buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+        )
+
+        self.password_hash_in_flight = Gauge(
+            "password_hash_in_flight",
+            "Password hashing operations running or queued",
+            registry=self.registry,
+        )
+
+        self.password_hash_rejected_total = Counter(
+            "password_hash_rejected_total",
+            "Password hashing operations rejected because the executor was full",
+            ["operation"],
+            registry=self.registry,
+        )
+
         # Error metrics
         self.errors_total = Counter(
             "errors_total",
@@ -122,7 +192,12 @@ class PerformanceMetrics:
         logger.info("Performance metrics initialized")
 
     def record_http_request(
-        self, method: str, endpoint: str, status_code: int, duration: float
+        self,
+        method: str,
+        endpoint: str,
+        status_code: int,
+        duration: float,
+        handler_duration: Optional[float] = None,
     ):
         """Record HTTP request metrics"""
         self.http_requests_total.labels(
@@ -133,6 +208,11 @@ class PerformanceMetrics:
             duration
         )
 
+        if handler_duration is not None:
+            self.http_handler_duration.labels(method=method, endpoint=endpoint).observe(
+                handler_duration
+            )
+
     def record_db_query(self, operation: str, table: str, duration: float):
         """Record database query metrics"""
         self.db_query_duration.labels(operation=operation, table=table).observe(
@@ -143,6 +223,23 @@ class PerformanceMetrics:
         """Record database error"""
         self.db_errors_total.labels(error_type=error_type).inc()
 
+    def record_db_pool_checkout_wait(self, engine: str, duration: float):
+        """Record time spent waiting for a pooled connection"""
+        self.db_pool_checkout_wait.labels(engine=engine).observe(duration)
+
+    def update_db_pool_usage(self, engine: str, checked_out: int, capacity: int):
+        """Update pool checked out connections and saturation"""
+        self.db_pool_checked_out.labels(engine=engine).set(checked_out)
+        if capacity > 0:
+            self.db_pool_saturation.labels(engine=engine).set(checked_out / capacity)
+        self.db_connections_active.set(checked_out)
+
+    def record_db_queries_per_request(self, method: str, endpoint: str, count: int):
+        """Record number of queries executed by one HTTP request"""
+        self.db_queries_per_request.labels(method=method, endpoint=endpoint).observe(
+            count
+        )
+
     def record_cache_operation(self, operation: str, result: str):
         """Record cache operation (hit/miss/set/delete)"""
         self.cache_operations_total.labels(operation=operation, result=result).inc()
@@ -155,6 +252,19 @@ class PerformanceMetrics:
         """Record authentication attempt"""
         self.auth_attempts_total.labels(result=result).inc()
 
+    def record_password_hash(self, operation: str, queue_wait: float, duration: float):
+        """Record one password hashing operation"""
+        self.password_hash_queue_wait.labels(operation=operation).observe(queue_wait)
+        self.password_hash_duration.labels(operation=operation).observe(duration)
+
+    def update_password_hash_in_flight(self, count: int):
+        """Update password hashing operations running or queued"""
+        self.password_hash_in_flight.set(count)
+
+    def record_password_hash_rejected(self, operation: str):
+        """Record password hashing operation rejected by backpressure"""
+        self.password_hash_rejected_total.labels(operation=operation).inc()
+
     def record_error(self, error_type: str, module: str):
         """Record application error"""
         self.errors_total.labels(error_type=error_type, module=module).inc()
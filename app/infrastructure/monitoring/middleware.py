@@ -2,15 +2,56 @@
 Monitoring middleware for automatic performance tracking
 """
 
+import re
 import time
-from typing import Callable
+from typing import Callable, Optional
 
+from starlette.middleware import Middleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.infrastructure.logging import logger
+from app.infrastructure.monitoring import db_instrumentation
 from app.infrastructure.monitoring.metrics import performance_metrics
+from config.settings import settings
+
+# Fallback normalization for requests that did not match any route (404s)
+_NUMERIC_ID_RE = re.compile(r"/\d+")
+_UUID_RE = re.compile(r"/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+# Scope key written by HandlerTimingMiddleware
+HANDLER_DURATION_SCOPE_KEY = "handler_duration_ns"
+
+_NS_PER_SECOND = 1_000_000_000
+
+
+class HandlerTimingMiddleware:
+    """
+    Pure ASGI middleware installed innermost (just above the router).
+
+    Measures the time from the request reaching the router until the handler
+    starts the response, and stores it in the scope so the outer
+    PerformanceMonitoringMiddleware can report handler vs. total time.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_ns = time.perf_counter_ns()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                scope[HANDLER_DURATION_SCOPE_KEY] = time.perf_counter_ns() - start_ns
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
 
 
 class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
@@ -25,24 +66,38 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
         if self._should_skip_monitoring(request.url.path):
             return await call_next(request)
 
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         method = request.method
-        path = self._normalize_path(request.url.path)
+        query_tracking_token = db_instrumentation.start_request_tracking()
 
         try:
             # Process request
             response = await call_next(request)
 
             # Record metrics
-            duration = time.time() - start_time
+            duration = (time.perf_counter_ns() - start_ns) / _NS_PER_SECOND
+            handler_duration = self._get_handler_duration(request.scope)
             status_code = response.status_code
+            path = self._get_route_template(request.scope, request.url.path)
 
             performance_metrics.record_http_request(
-                method=method, endpoint=path, status_code=status_code, duration=duration
+                method=method,
+                endpoint=path,
+                status_code=status_code,
+                duration=duration,
+                handler_duration=handler_duration,
+            )
+
+            query_count = db_instrumentation.get_request_query_count() or 0
+            performance_metrics.record_db_queries_per_request(
+                method=method, endpoint=path, count=query_count
             )
 
             # Add performance headers
             response.headers["X-Response-Time"] = f"{duration:.3f}s"
+            if settings.debug:
+                # Surfaces N+1 patterns while developing
+                response.headers["X-DB-Query-Count"] = str(query_count)
 
             # Log slow requests
             if duration > 1.0:  # Requests slower than 1 second
@@ -51,6 +106,8 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
                     method=method,
                     path=path,
                     duration=duration,
+                    handler_duration=handler_duration,
+                    query_count=query_count,
                     status_code=status_code,
                 )
 
@@ -58,7 +115,8 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
 
         except Exception as e:
             # Record error
-            duration = time.time() - start_time
+            duration = (time.perf_counter_ns() - start_ns) / _NS_PER_SECOND
+            path = self._get_route_template(request.scope, request.url.path)
             performance_metrics.record_http_request(
                 method=method, endpoint=path, status_code=500, duration=duration
             )
@@ -77,6 +135,9 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
 
             raise
 
+        finally:
+            db_instrumentation.stop_request_tracking(query_tracking_token)
+
     def _should_skip_monitoring(self, path: str) -> bool:
         """Check if path should be skipped from monitoring"""
         skip_paths = [
@@ -90,20 +151,36 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
 
         return any(path.startswith(skip_path) for skip_path in skip_paths)
 
+    def _get_handler_duration(self, scope: Scope) -> Optional[float]:
+        """Handler duration in seconds, if HandlerTimingMiddleware recorded it"""
+        handler_ns = scope.get(HANDLER_DURATION_SCOPE_KEY)
+        if handler_ns is None:
+            return None
+        return handler_ns / _NS_PER_SECOND
+
+    def _get_route_template(self, scope: Scope, path: str) -> str:
+        """
+        Metrics label for the request: the matched route's path template
+        (e.g. /api/v1/companies/{company_id}), set in the scope by the router.
+        Unmatched requests fall back to regex normalization.
+        """
+        route = scope.get("route")
+        if route is not None:
+            template = getattr(route, "path_format", None) or getattr(
+                route, "path", None
+            )
+            if template:
+                return template
+
+        return self._normalize_path(path)
+
     def _normalize_path(self, path: str) -> str:
         """Normalize path for metrics to avoid high cardinality"""
-        # Replace IDs with placeholder
-        import re
-
         # Replace numeric IDs
-        path = re.sub(r"/\d+", "/{id}", path)
+        path = _NUMERIC_ID_RE.sub("/{id}", path)
 
         # Replace UUIDs
-        path = re.sub(
-            r"/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}",
-            "/{uuid}",
-            path,
-        )
+        path = _UUID_RE.sub("/{uuid}", path)
 
         return path
 
@@ -124,4 +201,8 @@ class DatabaseMonitoringMixin:
 def setup_monitoring_middleware(app):
     """Setup monitoring middleware on FastAPI app"""
     app.add_middleware(PerformanceMonitoringMiddleware, collect_detailed_metrics=True)
+
+    # add_middleware() prepends (outermost); appending keeps the handler timer
+    # innermost so it only measures the router and the endpoint.
+    app.user_middleware.append(Middleware(HandlerTimingMiddleware))
     logger.info("Performance monitoring middleware enabled")
@@ -4,9 +4,10 @@ Repository para sistema de cobrança B2B Pro Team Care
 
 from datetime import date, datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -208,6 +209,48 @@ class B2BBillingRepository:
             await self.db.rollback()
             raise e
 
+    async def get_subscriptions_for_invoicing(
+        self,
+        period_start: date,
+        period_end: date,
+        company_ids: Optional[List[int]] = None,
+    ) -> List[Any]:
+        """Assinaturas ativas com o preço do plano em uma única consulta
+
+        Cada linha traz already_invoiced: se a empresa já tem fatura com
+        início dentro do período.
+        """
+        already_invoiced = (
+            select(ProTeamCareInvoice.id)
+            .where(
+                and_(
+                    ProTeamCareInvoice.company_id == CompanySubscription.company_id,
+                    ProTeamCareInvoice.billing_period_start >= period_start,
+                    ProTeamCareInvoice.billing_period_start <= period_end,
+                )
+            )
+            .exists()
+        )
+
+        query = (
+            select(
+                CompanySubscription.id,
+                CompanySubscription.company_id,
+                CompanySubscription.billing_day,
+                CompanySubscription.payment_method,
+                SubscriptionPlan.monthly_price,
+                already_invoiced.label("already_invoiced"),
+            )
+            .join(SubscriptionPlan, CompanySubscription.plan_id == SubscriptionPlan.id)
+            .where(CompanySubscription.status == "active")
+            .order_by(CompanySubscription.billing_day, CompanySubscription.company_id)
+        )
+        if company_ids:
+            query = query.where(CompanySubscription.company_id.in_(company_ids))
+
+        result = await self.db.execute(query)
+        return result.all()
+
     async def get_all_active_subscriptions(self) -> List[CompanySubscription]:
         """Buscar todas as assinaturas ativas"""
         query = (
@@ -241,6 +284,32 @@ class B2BBillingRepository:
             await self.db.rollback()
             raise e
 
+    async def create_proteamcare_invoices_bulk(
+        self, invoices: List[Dict[str, Any]]
+    ) -> Set[int]:
+        """Criar várias faturas em um único INSERT multi-linha (uma transação)
+
+        Faturas cujo número já existe são ignoradas. Retorna os company_id
+        efetivamente faturados.
+        """
+        if not invoices:
+            return set()
+
+        try:
+            stmt = (
+                insert(ProTeamCareInvoice)
+                .values(invoices)
+                .on_conflict_do_nothing(index_elements=["invoice_number"])
+                .returning(ProTeamCareInvoice.company_id)
+            )
+            result = await self.db.execute(stmt)
+            created = set(result.scalars().all())
+            await self.db.commit()
+            return created
+        except Exception as e:
+            await self.db.rollback()
+            raise e
+
     async def get_proteamcare_invoice_by_id(
         self, invoice_id: int
     ) -> Optional[ProTeamCareInvoice]:
@@ -477,9 +546,6 @@ class B2BBillingRepository:
         self, company_id: int, year: int, month: int
     ) -> str:
         """Gerar número da fatura"""
-        # Formato: PTC-YYYY-MM-{company_id:04d}-{sequence:03d}
-        prefix = f"PTC-{year:04d}-{month:02d}-{company_id:04d}"
-
         # Buscar última fatura do mesmo período
         query = select(func.count(ProTeamCareInvoice.id)).where(
             and_(
@@ -491,7 +557,15 @@ class B2BBillingRepository:
         result = await self.db.execute(query)
         sequence = result.scalar() + 1
 
-        return f"{prefix}-{sequence:03d}"
+        return self.format_invoice_number(company_id, year, month, sequence)
+
+    @staticmethod
+    def format_invoice_number(
+        company_id: int, year: int, month: int, sequence: int = 1
+    ) -> str:
+        """Número da fatura sem consulta (sequência conhecida)"""
+        # Formato: PTC-YYYY-MM-{company_id:04d}-{sequence:03d}
+        return f"PTC-{year:04d}-{month:02d}-{company_id:04d}-{sequence:03d}"
 
     async def get_companies_for_billing(
         self, target_day: int
@@ -1384,23 +1384,36 @@ class BillingRepository:
             )
             raise
 
-    async def increment_billing_attempt(self, schedule_id: int) -> None:
-        """Increment attempt count for a billing schedule"""
+    async def increment_billing_attempt(self, schedule_id: int) -> Optional[int]:
+        """
+        Atomically increment attempt count for a billing schedule in the
+        caller's transaction; returns the new count (None if not found)
+        """
         try:
             stmt = (
                 update(ContractBillingSchedule)
                 .where(ContractBillingSchedule.id == schedule_id)
                 .values(
-                    attempt_count=ContractBillingSchedule.attempt_count + 1,
+                    attempt_count=func.coalesce(
+                        ContractBillingSchedule.attempt_count, 0
+                    )
+                    + 1,
                     last_attempt_date=date.today(),
                     updated_at=datetime.utcnow(),
                 )
+                .returning(ContractBillingSchedule.attempt_count)
+                .execution_options(synchronize_session=False)
             )
 
-            await self.db.execute(stmt)
-            await self.db.flush()
+            result = await self.db.execute(stmt)
+            attempt_count = result.scalar_one_or_none()
 
-            logger.info("Billing attempt count incremented", schedule_id=schedule_id)
+            logger.info(
+                "Billing attempt count incremented",
+                schedule_id=schedule_id,
+                attempt_count=attempt_count,
+            )
+            return attempt_count
 
         except Exception as e:
             logger.error(
@@ -1,7 +1,7 @@
 from typing import Any, Dict, List, Optional
 
 import structlog
-from sqlalchemy import Integer, and_, func, or_, select, text
+from sqlalchemy import Integer, and_, func, select, text
 from sqlalchemy.orm import joinedload, selectinload
 
 from app.infrastructure.orm.models import Address
@@ -9,6 +9,11 @@ from app.infrastructure.orm.models import Client as ClientEntity
 from app.infrastructure.orm.models import Company, Email
 from app.infrastructure.orm.models import Establishments as EstablishmentEntity
 from app.infrastructure.orm.models import People, Phone
+from app.infrastructure.repositories.company_counters_repository import (
+    CompanyCountersRepository,
+    is_active_status,
+)
+from app.infrastructure.repositories.search_builder import SearchClause, build_search
 from app.infrastructure.services.tenant_context_service import get_tenant_context
 from app.presentation.schemas.client import (
     ClientCreate,
@@ -29,6 +34,15 @@ class ClientRepository:
     def __init__(self, db):
         self.db = db
 
+    @staticmethod
+    def _build_search(term: Optional[str]) -> Optional[SearchClause]:
+        """Busca por nome, CPF/CNPJ (prefixo) e código do cliente"""
+        return build_search(
+            term,
+            [People.name, ClientEntity.client_code],
+            tax_id_column=People.tax_id,
+        )
+
     def _to_naive_datetime(self, dt):
         """Convert timezone-aware datetime to naive datetime"""
         if dt is None:
@@ -219,6 +233,11 @@ class ClientRepository:
             self.db.add(client_entity)
             await self.db.flush()
 
+            await CompanyCountersRepository(self.db).adjust_for_establishment(
+                client_entity.establishment_id,
+                clients_count=1,
+                active_clients_count=int(is_active_status(client_entity.status)),
+            )
             await self.db.commit()
 
             return await self.get_by_id(client_entity.id)
@@ -379,17 +398,16 @@ class ClientRepository:
                     People.person_type == params.person_type
                 )
 
-            if params.search:
-                search_filter = or_(
-                    People.name.ilike(f"%{params.search}%"),
-                    People.tax_id.ilike(f"%{params.search}%"),
-                    ClientEntity.client_code.ilike(f"%{params.search}%"),
-                )
+            search = self._build_search(params.search)
+            if search is not None:
+                search_filter = search.condition
                 query = query.join(People, ClientEntity.person_id == People.id).where(
                     search_filter
                 )
 
-            # Ordenação
+            # Ordenação (relevância primeiro quando há busca)
+            if search is not None:
+                query = query.order_by(search.rank.desc())
             query = query.order_by(
                 ClientEntity.establishment_id,
                 ClientEntity.created_at.desc(),
@@ -434,12 +452,9 @@ class ClientRepository:
                     People.person_type == params.person_type
                 )
 
-            if params.search:
-                search_filter = or_(
-                    People.name.ilike(f"%{params.search}%"),
-                    People.tax_id.ilike(f"%{params.search}%"),
-                    ClientEntity.client_code.ilike(f"%{params.search}%"),
-                )
+            search = self._build_search(params.search)
+            if search is not None:
+                search_filter = search.condition
                 query = query.join(People, ClientEntity.person_id == People.id).where(
                     search_filter
                 )
@@ -486,17 +501,16 @@ class ClientRepository:
                     People.person_type == params.person_type
                 )
 
-            if params.search:
-                search_filter = or_(
-                    People.name.ilike(f"%{params.search}%"),
-                    People.tax_id.ilike(f"%{params.search}%"),
-                    ClientEntity.client_code.ilike(f"%{params.search}%"),
-                )
+            search = self._build_search(params.search)
+            if search is not None:
+                search_filter = search.condition
                 if not query._legacy_facade_select_state._setup_joins:
                     query = query.join(People, ClientEntity.person_id == People.id)
                 query = query.where(search_filter)
 
             # Ordenação (usar alias correto da tabela People)
+            if search is not None:
+                query = query.order_by(search.rank.desc())
             query = query.order_by(
                 EstablishmentEntity.company_id,
                 ClientEntity.establishment_id,
@@ -552,12 +566,9 @@ class ClientRepository:
                     People.person_type == params.person_type
                 )
 
-            if params.search:
-                search_filter = or_(
-                    People.name.ilike(f"%{params.search}%"),
-                    People.tax_id.ilike(f"%{params.search}%"),
-                    ClientEntity.client_code.ilike(f"%{params.search}%"),
-                )
+            search = self._build_search(params.search)
+            if search is not None:
+                search_filter = search.condition
                 query = query.join(People, ClientEntity.person_id == People.id).where(
                     search_filter
                 )
@@ -608,11 +619,21 @@ class ClientRepository:
                     )
 
             # Atualizar campos do client
+            was_active = is_active_status(client_entity.status)
+            old_establishment_id = client_entity.establishment_id
             update_fields = client_data.dict(exclude={"person"}, exclude_none=True)
             for field, value in update_fields.items():
                 if hasattr(client_entity, field):
                     setattr(client_entity, field, value)
 
+            await CompanyCountersRepository(self.db).adjust_for_client_update(
+                client_id,
+                old_establishment_id,
+                client_entity.establishment_id,
+                was_active=was_active,
+                is_active=is_active_status(client_entity.status),
+            )
+
             # Atualizar pessoa relacionada se fornecida
             if client_data.person:
                 person_update = client_data.person.dict(exclude_none=True)
@@ -658,6 +679,11 @@ class ClientRepository:
 
             # Soft delete
             client_entity.deleted_at = func.now()
+            await CompanyCountersRepository(self.db).adjust_for_establishment(
+                client_entity.establishment_id,
+                clients_count=-1,
+                active_clients_count=-int(is_active_status(client_entity.status)),
+            )
             await self.db.commit()
 
             return True
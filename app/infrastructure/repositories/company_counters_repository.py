@@ -0,0 +1,370 @@
+"""
+Projeção de contadores por empresa
+
+master.company_counters guarda uma linha por empresa com os totais exibidos
+na página da empresa e nos dashboards. Os repositórios ajustam os contadores
+na mesma transação das escritas (create/delete/mudança de status ou de
+estabelecimento) com um UPDATE incremental; reconcile() recalcula tudo em
+lote e corrige eventuais desvios de escritas feitas fora dos repositórios.
+Os ajustes não são limitados a zero: um contador negativo é registrado no
+log (company_counters_drift) para que o desvio apareça em vez de ser
+mascarado até a próxima reconciliação.
+
+"Ativo" é status = 'active' sem diferenciar maiúsculas (professionals.py grava
+"ACTIVE"): is_active_status e o SQL de contagem usam LOWER(status) igualmente.
+"""
+
+from typing import Dict, Iterable, Optional
+
+import structlog
+from sqlalchemy import text
+
+logger = structlog.get_logger()
+
+COUNTER_COLUMNS = (
+    "establishments_count",
+    "clients_count",
+    "active_clients_count",
+    "professionals_count",
+    "active_professionals_count",
+    "users_count",
+    "active_users_count",
+    "active_contracts_count",
+    "active_lives_count",
+)
+
+# Recalcula a projeção a partir das tabelas de origem (uma passada por tabela)
+_RECONCILE_SQL = """
+WITH target AS (
+    SELECT c.id AS company_id
+    FROM master.companies c
+    WHERE c.deleted_at IS NULL
+      AND (CAST(:company_ids AS bigint[]) IS NULL
+           OR c.id = ANY(CAST(:company_ids AS bigint[])))
+),
+est AS (
+    SELECT e.id, e.company_id
+    FROM master.establishments e
+    JOIN target t ON t.company_id = e.company_id
+    WHERE e.deleted_at IS NULL
+),
+est_counts AS (
+    SELECT company_id, COUNT(*) AS establishments_count
+    FROM est GROUP BY company_id
+),
+client_counts AS (
+    SELECT est.company_id,
+           COUNT(*) AS clients_count,
+           COUNT(*) FILTER (WHERE LOWER(cl.status) = 'active') AS active_clients_count
+    FROM master.clients cl
+    JOIN est ON est.id = cl.establishment_id
+    WHERE cl.deleted_at IS NULL
+    GROUP BY est.company_id
+),
+professional_counts AS (
+    SELECT est.company_id,
+           COUNT(*) AS professionals_count,
+           COUNT(*) FILTER (WHERE LOWER(p.status) = 'active') AS active_professionals_count
+    FROM master.professionals p
+    JOIN est ON est.id = p.establishment_id
+    WHERE p.deleted_at IS NULL
+    GROUP BY est.company_id
+),
+user_counts AS (
+    SELECT u.company_id,
+           COUNT(*) AS users_count,
+           COUNT(*) FILTER (WHERE u.is_active) AS active_users_count
+    FROM master.users u
+    JOIN target t ON t.company_id = u.company_id
+    WHERE u.deleted_at IS NULL
+    GROUP BY u.company_id
+),
+contract_counts AS (
+    SELECT est.company_id, COUNT(*) AS active_contracts_count
+    FROM master.contracts ct
+    JOIN master.clients cl ON cl.id = ct.client_id
+    JOIN est ON est.id = cl.establishment_id
+    WHERE LOWER(ct.status) = 'active'
+    GROUP BY est.company_id
+),
+lives_counts AS (
+    SELECT est.company_id, COUNT(*) AS active_lives_count
+    FROM master.contract_lives lv
+    JOIN master.contracts ct ON ct.id = lv.contract_id
+    JOIN master.clients cl ON cl.id = ct.client_id
+    JOIN est ON est.id = cl.establishment_id
+    WHERE LOWER(lv.status) = 'active'
+    GROUP BY est.company_id
+)
+INSERT INTO master.company_counters AS cc (
+    company_id, establishments_count, clients_count, active_clients_count,
+    professionals_count, active_professionals_count, users_count,
+    active_users_count, active_contracts_count, active_lives_count,
+    reconciled_at, updated_at
+)
+SELECT t.company_id,
+       COALESCE(e.establishments_count, 0),
+       COALESCE(c.clients_count, 0),
+       COALESCE(c.active_clients_count, 0),
+       COALESCE(p.professionals_count, 0),
+       COALESCE(p.active_professionals_count, 0),
+       COALESCE(u.users_count, 0),
+       COALESCE(u.active_users_count, 0),
+       COALESCE(ct.active_contracts_count, 0),
+       COALESCE(l.active_lives_count, 0),
+       CURRENT_TIMESTAMP,
+       CURRENT_TIMESTAMP
+FROM target t
+LEFT JOIN est_counts e ON e.company_id = t.company_id
+LEFT JOIN client_counts c ON c.company_id = t.company_id
+LEFT JOIN professional_counts p ON p.company_id = t.company_id
+LEFT JOIN user_counts u ON u.company_id = t.company_id
+LEFT JOIN contract_counts ct ON ct.company_id = t.company_id
+LEFT JOIN lives_counts l ON l.company_id = t.company_id
+ON CONFLICT (company_id) DO UPDATE SET
+    establishments_count = EXCLUDED.establishments_count,
+    clients_count = EXCLUDED.clients_count,
+    active_clients_count = EXCLUDED.active_clients_count,
+    professionals_count = EXCLUDED.professionals_count,
+    active_professionals_count = EXCLUDED.active_professionals_count,
+    users_count = EXCLUDED.users_count,
+    active_users_count = EXCLUDED.active_users_count,
+    active_contracts_count = EXCLUDED.active_contracts_count,
+    active_lives_count = EXCLUDED.active_lives_count,
+    reconciled_at = EXCLUDED.reconciled_at,
+    updated_at = EXCLUDED.updated_at
+"""
+
+_COMPANY_OF_ESTABLISHMENT = """
+SELECT company_id FROM master.establishments WHERE id = :key
+"""
+
+_COMPANY_OF_CLIENT = """
+SELECT e.company_id
+FROM master.clients cl
+JOIN master.establishments e ON e.id = cl.establishment_id
+WHERE cl.id = :key
+"""
+
+# O que a reconciliação conta através de um cliente / estabelecimento
+_CLIENT_DEPENDANTS = """
+SELECT
+    (SELECT COUNT(*) FROM master.contracts ct
+      WHERE ct.client_id = :key AND LOWER(ct.status) = 'active') AS active_contracts_count,
+    (SELECT COUNT(*) FROM master.contract_lives lv
+       JOIN master.contracts ct ON ct.id = lv.contract_id
+      WHERE ct.client_id = :key AND LOWER(lv.status) = 'active') AS active_lives_count
+"""
+
+_ESTABLISHMENT_DEPENDANTS = """
+SELECT
+    (SELECT COUNT(*) FROM master.clients cl
+      WHERE cl.establishment_id = :key AND cl.deleted_at IS NULL) AS clients_count,
+    (SELECT COUNT(*) FROM master.clients cl
+      WHERE cl.establishment_id = :key AND cl.deleted_at IS NULL
+        AND LOWER(cl.status) = 'active') AS active_clients_count,
+    (SELECT COUNT(*) FROM master.professionals p
+      WHERE p.establishment_id = :key AND p.deleted_at IS NULL) AS professionals_count,
+    (SELECT COUNT(*) FROM master.professionals p
+      WHERE p.establishment_id = :key AND p.deleted_at IS NULL
+        AND LOWER(p.status) = 'active') AS active_professionals_count,
+    (SELECT COUNT(*) FROM master.contracts ct
+       JOIN master.clients cl ON cl.id = ct.client_id
+      WHERE cl.establishment_id = :key AND LOWER(ct.status) = 'active') AS active_contracts_count,
+    (SELECT COUNT(*) FROM master.contract_lives lv
+       JOIN master.contracts ct ON ct.id = lv.contract_id
+       JOIN master.clients cl ON cl.id = ct.client_id
+      WHERE cl.establishment_id = :key AND LOWER(lv.status) = 'active') AS active_lives_count
+"""
+
+_COMPANY_OF_CONTRACT = """
+SELECT e.company_id
+FROM master.contracts ct
+JOIN master.clients cl ON cl.id = ct.client_id
+JOIN master.establishments e ON e.id = cl.establishment_id
+WHERE ct.id = :key
+"""
+
+
+def is_active_status(status) -> bool:
+    """Aceita string ou Enum de status (mesma regra do LOWER(status) no SQL)"""
+    return str(getattr(status, "value", status) or "").lower() == "active"
+
+
+def status_delta(was_active: bool, is_active: bool) -> int:
+    """+1/-1/0 para um contador de ativos quando o status muda"""
+    return int(is_active) - int(was_active)
+
+
+class CompanyCountersRepository:
+    def __init__(self, db):
+        self.db = db
+
+    async def adjust(self, company_id: Optional[int], **deltas: int) -> None:
+        """Aplica incrementos na linha da empresa (sem commit: usa a transação
+        de quem chamou). Empresas ainda sem linha são calculadas na primeira
+        leitura, então não há nada a ajustar."""
+        deltas = {column: delta for column, delta in deltas.items() if delta}
+        if company_id is None or not deltas:
+            return
+
+        unknown = set(deltas) - set(COUNTER_COLUMNS)
+        if unknown:
+            raise ValueError(f"Contadores desconhecidos: {sorted(unknown)}")
+
+        assignments = ", ".join(f"{column} = {column} + :{column}" for column in deltas)
+        result = await self.db.execute(
+            text(
+                f"UPDATE master.company_counters SET {assignments}, "
+                f"updated_at = CURRENT_TIMESTAMP WHERE company_id = :company_id "
+                f"RETURNING {', '.join(deltas)}"
+            ),
+            {"company_id": company_id, **deltas},
+        )
+        row = result.mappings().first()
+        negative = {column: value for column, value in (row or {}).items() if value < 0}
+        if negative:
+            logger.warning(
+                "company_counters_drift", company_id=company_id, counters=negative
+            )
+
+    async def ensure(self, company_id: int) -> None:
+        """Cria a linha zerada de uma empresa nova"""
+        await self.db.execute(
+            text(
+                "INSERT INTO master.company_counters (company_id) "
+                "VALUES (:company_id) ON CONFLICT (company_id) DO NOTHING"
+            ),
+            {"company_id": company_id},
+        )
+
+    async def adjust_for_establishment(
+        self, establishment_id: Optional[int], **deltas: int
+    ) -> None:
+        await self.adjust(
+            await self._company_of(_COMPANY_OF_ESTABLISHMENT, establishment_id),
+            **deltas,
+        )
+
+    async def adjust_for_client_update(
+        self,
+        client_id: int,
+        old_establishment_id: Optional[int],
+        new_establishment_id: Optional[int],
+        was_active: bool,
+        is_active: bool,
+    ) -> None:
+        """Mudança de status e/ou de estabelecimento de um cliente; ao trocar
+        de empresa, contratos e vidas ativos do cliente vão junto"""
+        old_company = await self._company_of(
+            _COMPANY_OF_ESTABLISHMENT, old_establishment_id
+        )
+        new_company = old_company
+        if new_establishment_id != old_establishment_id:
+            new_company = await self._company_of(
+                _COMPANY_OF_ESTABLISHMENT, new_establishment_id
+            )
+
+        if new_company == old_company:
+            await self.adjust(
+                old_company, active_clients_count=status_delta(was_active, is_active)
+            )
+            return
+
+        result = await self.db.execute(text(_CLIENT_DEPENDANTS), {"key": client_id})
+        dependants = {
+            column: int(value) for column, value in result.mappings().one().items()
+        }
+        await self.adjust(
+            old_company,
+            clients_count=-1,
+            active_clients_count=-int(was_active),
+            **{column: -value for column, value in dependants.items()},
+        )
+        await self.adjust(
+            new_company,
+            clients_count=1,
+            active_clients_count=int(is_active),
+            **dependants,
+        )
+
+    async def remove_establishment(
+        self, company_id: Optional[int], establishment_id: int
+    ) -> None:
+        """Soft delete de estabelecimento: a reconciliação deixa de contar o
+        estabelecimento e tudo o que é contado através dele"""
+        result = await self.db.execute(
+            text(_ESTABLISHMENT_DEPENDANTS), {"key": establishment_id}
+        )
+        await self.adjust(
+            company_id,
+            establishments_count=-1,
+            **{
+                column: -int(value) for column, value in result.mappings().one().items()
+            },
+        )
+
+    async def adjust_for_client(self, client_id: Optional[int], **deltas: int):
+        await self.adjust(
+            await self._company_of(_COMPANY_OF_CLIENT, client_id), **deltas
+        )
+
+    async def adjust_for_contract(self, contract_id: Optional[int], **deltas: int):
+        await self.adjust(
+            await self._company_of(_COMPANY_OF_CONTRACT, contract_id), **deltas
+        )
+
+    async def _company_of(self, query: str, key: Optional[int]) -> Optional[int]:
+        if key is None:
+            return None
+        result = await self.db.execute(text(query), {"key": key})
+        return result.scalar()
+
+    async def get(self, company_id: int) -> Dict[str, int]:
+        """Contadores de uma empresa (reconcilia na primeira leitura)"""
+        row = await self._fetch(company_id)
+        if row is None:
+            # Sem commit: a linha fica na transação de quem chamou
+            await self.reconcile([company_id])
+            await self.db.flush()
+            row = await self._fetch(company_id)
+        return row or {column: 0 for column in COUNTER_COLUMNS}
+
+    async def _fetch(self, company_id: int) -> Optional[Dict[str, int]]:
+        result = await self.db.execute(
+            text(
+                f"SELECT {', '.join(COUNTER_COLUMNS)} "
+                f"FROM master.company_counters WHERE company_id = :company_id"
+            ),
+            {"company_id": company_id},
+        )
+        row = result.mappings().first()
+        return dict(row) if row else None
+
+    async def totals(self) -> Dict[str, int]:
+        """Soma dos contadores de todas as empresas (dashboards administrativos)"""
+        sums = ", ".join(
+            f"COALESCE(SUM({column}), 0) AS {column}" for column in COUNTER_COLUMNS
+        )
+        result = await self.db.execute(
+            text(f"SELECT {sums} FROM master.company_counters")
+        )
+        return {key: int(value) for key, value in result.mappings().one().items()}
+
+    async def reconcile(self, company_ids: Optional[Iterable[int]] = None) -> int:
+        """Recalcula a projeção (todas as empresas ou as informadas)"""
+        ids = list(company_ids) if company_ids is not None else None
+        result = await self.db.execute(text(_RECONCILE_SQL), {"company_ids": ids})
+        if ids is None:
+            await self.db.execute(
+                text(
+                    "DELETE FROM master.company_counters cc USING master.companies c "
+                    "WHERE c.id = cc.company_id AND c.deleted_at IS NOT NULL"
+                )
+            )
+        logger.info(
+            "company_counters_reconciled",
+            companies=result.rowcount,
+            scope="all" if ids is None else len(ids),
+        )
+        return result.rowcount
@@ -1,12 +1,16 @@
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy import and_, delete, func, literal, select
 from sqlalchemy.orm import joinedload
 from structlog import get_logger
 
 from app.infrastructure.exceptions import ValidationException
 from app.infrastructure.orm.models import Address, Company, Email, People, Phone
+from app.infrastructure.repositories.company_counters_repository import (
+    CompanyCountersRepository,
+)
+from app.infrastructure.repositories.search_builder import SearchClause, build_search
 from app.infrastructure.services.address_enrichment_service import (
     address_enrichment_service,
 )
@@ -21,6 +25,14 @@ from app.presentation.schemas.company import (
 )
 from app.utils.validators import validate_contacts_quality
 
+# Tipo polimórfico gravado nos contatos das empresas (default das colunas
+# phoneable_type/emailable_type/addressable_type)
+PEOPLE_CONTACT_TYPE = "App\\Models\\People"
+
+# Valores legados ainda presentes no banco para contatos de People
+# (migration 005, ClientRepository, SaaS billing)
+PEOPLE_CONTACT_TYPES = (PEOPLE_CONTACT_TYPE, "People", "people", "person")
+
 
 class CompanyRepository:
     def __init__(self, db):
@@ -238,6 +250,7 @@ class CompanyRepository:
 
                     self.db.add(address_db)
 
+            await CompanyCountersRepository(self.db).ensure(company_id)
             await self.db.commit()
 
             # Return the complete company data
@@ -419,7 +432,16 @@ class CompanyRepository:
         status: Optional[str] = None,
     ) -> List[CompanyList]:
         """Get list of companies with summary information"""
-        query = (
+        # Primeiro a página de empresas; depois uma contagem correlacionada por
+        # tipo de contato só para as linhas da página. Outer joins simultâneos
+        # multiplicariam telefones x emails x endereços, e subqueries agrupadas
+        # varreriam as tabelas de contatos inteiras.
+        search_clause = self._build_search(search)
+        rank = (search_clause.rank if search_clause is not None else literal(0)).label(
+            "rank"
+        )
+
+        page_query = (
             select(
                 Company.id,
                 Company.person_id,
@@ -427,43 +449,46 @@ class CompanyRepository:
                 People.trade_name,
                 People.tax_id,
                 People.status,
-                func.count(Phone.id).label("phones_count"),
-                func.count(Email.id).label("emails_count"),
-                func.count(Address.id).label("addresses_count"),
                 Company.created_at,
                 Company.updated_at,
+                rank,
             )
             .join(People, Company.person_id == People.id)
-            .outerjoin(
-                Phone, and_(Phone.phoneable_id == People.id, Phone.deleted_at.is_(None))
-            )
-            .outerjoin(
-                Email, and_(Email.emailable_id == People.id, Email.deleted_at.is_(None))
-            )
-            .outerjoin(
-                Address,
-                and_(Address.addressable_id == People.id, Address.deleted_at.is_(None)),
-            )
             .where(and_(Company.deleted_at.is_(None), People.deleted_at.is_(None)))
-            .group_by(Company.id, People.id)
-            .order_by(Company.id.desc())
         )
 
         # Add search filter
-        if search:
-            search_filter = or_(
-                People.name.ilike(f"%{search}%"),
-                People.trade_name.ilike(f"%{search}%"),
-                People.tax_id.ilike(f"%{search}%"),
-            )
-            query = query.where(search_filter)
+        if search_clause is not None:
+            # Mais relevantes primeiro
+            page_query = page_query.where(search_clause.condition)
 
         # Add status filter
         if status:
-            query = query.where(People.status == status)
+            page_query = page_query.where(People.status == status)
 
         # Add pagination
-        query = query.offset(skip).limit(limit)
+        page = (
+            page_query.order_by(rank.desc(), Company.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .subquery("page")
+        )
+
+        query = select(
+            page,
+            self._contacts_count(
+                Phone, Phone.phoneable_type, Phone.phoneable_id, page.c.person_id
+            ).label("phones_count"),
+            self._contacts_count(
+                Email, Email.emailable_type, Email.emailable_id, page.c.person_id
+            ).label("emails_count"),
+            self._contacts_count(
+                Address,
+                Address.addressable_type,
+                Address.addressable_id,
+                page.c.person_id,
+            ).label("addresses_count"),
+        ).order_by(page.c.rank.desc(), page.c.id.desc())
 
         result = await self.db.execute(query)
         rows = result.fetchall()
@@ -488,6 +513,28 @@ class CompanyRepository:
 
         return companies
 
+    @staticmethod
+    def _build_search(search: Optional[str]) -> Optional[SearchClause]:
+        """Busca por razão social, nome fantasia e prefixo do CNPJ"""
+        return build_search(
+            search, [People.name, People.trade_name], tax_id_column=People.tax_id
+        )
+
+    @staticmethod
+    def _contacts_count(model, type_column, owner_column, person_id):
+        """Contagem de contatos ativos da pessoa (tipos polimórficos de People)"""
+        return (
+            select(func.count())
+            .where(
+                and_(
+                    owner_column == person_id,
+                    type_column.in_(PEOPLE_CONTACT_TYPES),
+                    model.deleted_at.is_(None),
+                )
+            )
+            .scalar_subquery()
+        )
+
     async def update_company(
         self, company_id: int, company_data: CompanyUpdate
     ) -> Optional[CompanyDetailed]:
@@ -960,13 +1007,9 @@ class CompanyRepository:
         )
 
         # Add search filter
-        if search:
-            search_filter = or_(
-                People.name.ilike(f"%{search}%"),
-                People.trade_name.ilike(f"%{search}%"),
-                People.tax_id.ilike(f"%{search}%"),
-            )
-            query = query.where(search_filter)
+        search_clause = self._build_search(search)
+        if search_clause is not None:
+            query = query.where(search_clause.condition)
 
         # Add status filter
         if status:
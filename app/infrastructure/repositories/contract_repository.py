@@ -17,6 +17,11 @@ from app.infrastructure.orm.models import (
     ServiceExecution,
     ServicesCatalog,
 )
+from app.infrastructure.repositories.company_counters_repository import (
+    CompanyCountersRepository,
+    is_active_status,
+    status_delta,
+)
 from app.infrastructure.services.tenant_context_service import get_tenant_context
 
 logger = structlog.get_logger()
@@ -34,6 +39,21 @@ class ContractRepository:
             return dt.replace(tzinfo=None)
         return dt
 
+    async def _adjust_active_contracts(
+        self, contract_id: int, new_status: Optional[str]
+    ) -> None:
+        """Atualiza o contador de contratos ativos antes de mudar o status"""
+        result = await self.db.execute(
+            select(Contract.status).where(Contract.id == contract_id)
+        )
+        old_status = result.scalar_one_or_none()
+        await CompanyCountersRepository(self.db).adjust_for_contract(
+            contract_id,
+            active_contracts_count=status_delta(
+                is_active_status(old_status), is_active_status(new_status)
+            ),
+        )
+
     async def _generate_contract_number(self, client_id: int) -> str:
         """Generate unique contract number in format CLI{client_id}-{sequential}"""
         try:
@@ -104,6 +124,11 @@ class ContractRepository:
             await self.db.flush()
             await self.db.refresh(contract)
 
+            await CompanyCountersRepository(self.db).adjust_for_client(
+                contract.client_id,
+                active_contracts_count=int(is_active_status(contract.status)),
+            )
+
             logger.info(
                 "Contract created successfully",
                 contract_id=contract.id,
@@ -289,6 +314,9 @@ class ContractRepository:
             update_data_with_timestamp = update_data.copy()
             update_data_with_timestamp["updated_at"] = datetime.utcnow()
 
+            if "status" in update_data:
+                await self._adjust_active_contracts(contract_id, update_data["status"])
+
             stmt = (
                 update(Contract)
                 .where(Contract.id == contract_id)
@@ -318,6 +346,8 @@ class ContractRepository:
             # Use SQLAlchemy update query
             from sqlalchemy import update
 
+            await self._adjust_active_contracts(contract_id, status)
+
             stmt = (
                 update(Contract)
                 .where(Contract.id == contract_id)
@@ -349,6 +379,8 @@ class ContractRepository:
             # Use SQLAlchemy update query
             from sqlalchemy import update
 
+            await self._adjust_active_contracts(contract_id, "deleted")
+
             stmt = (
                 update(Contract)
                 .where(Contract.id == contract_id)
@@ -7,6 +7,10 @@ from sqlalchemy.orm import joinedload
 from app.infrastructure.orm.models import Address, Company, Email
 from app.infrastructure.orm.models import Establishments as EstablishmentEntity
 from app.infrastructure.orm.models import People, Phone
+from app.infrastructure.repositories.company_counters_repository import (
+    CompanyCountersRepository,
+)
+from app.infrastructure.repositories.ordering import next_position, reorder_rows
 from app.presentation.schemas.company import Address as AddressSchema
 from app.presentation.schemas.company import Email as EmailSchema
 from app.presentation.schemas.company import Phone as PhoneSchema
@@ -112,7 +116,7 @@ class EstablishmentRepository:
                 category=establishment_data.category,
                 is_active=establishment_data.is_active,
                 is_principal=establishment_data.is_principal,
-                display_order=validation["suggested_display_order"],
+                display_order=validation["next_display_order"],
                 settings=establishment_data.settings,
                 meta_data=establishment_data.metadata,
                 operating_hours=establishment_data.operating_hours,
@@ -121,6 +125,9 @@ class EstablishmentRepository:
             self.db.add(establishment_entity)
             await self.db.flush()
 
+            await CompanyCountersRepository(self.db).adjust(
+                establishment_entity.company_id, establishments_count=1
+            )
             await self.db.commit()
 
             return await self.get_by_id(establishment_entity.id)
@@ -424,6 +431,9 @@ class EstablishmentRepository:
 
             # Soft delete
             establishment_entity.deleted_at = func.now()
+            await CompanyCountersRepository(self.db).remove_establishment(
+                establishment_entity.company_id, establishment_id
+            )
             await self.db.commit()
 
             return True
@@ -438,33 +448,30 @@ class EstablishmentRepository:
             raise
 
     async def reorder(self, reorder_data: EstablishmentReorderRequest) -> bool:
-        """Reordenar establishments dentro da empresa"""
+        """Reordenar establishments dentro da empresa (um SELECT e um UPDATE)"""
         try:
-            # Implementação simples: atualizar display_order de cada establishment
-            for order_item in reorder_data.establishment_orders:
-                establishment_id = order_item["id"]
-                new_order = order_item["order"]
-
-                # Atualizar display_order
-                update_query = select(EstablishmentEntity).where(
-                    and_(
-                        EstablishmentEntity.id == establishment_id,
-                        EstablishmentEntity.company_id == reorder_data.company_id,
-                        EstablishmentEntity.deleted_at.is_(None),
-                    )
+            ordered_ids = [
+                item["id"]
+                for item in sorted(
+                    reorder_data.establishment_orders, key=lambda item: item["order"]
                 )
-
-                result = await self.db.execute(update_query)
-                establishment = result.scalar_one_or_none()
-
-                if establishment:
-                    establishment.display_order = new_order
-                else:
-                    logger.warning(
-                        f"Establishment {establishment_id} not found for reordering"
-                    )
+            ]
+            # Sem filtrar deleted_at: o índice único (company_id, display_order)
+            # também cobre os excluídos
+            updated = await reorder_rows(
+                self.db,
+                EstablishmentEntity,
+                "display_order",
+                ordered_ids,
+                EstablishmentEntity.company_id == reorder_data.company_id,
+            )
 
             await self.db.commit()
+            logger.info(
+                "Establishments reordered",
+                company_id=reorder_data.company_id,
+                updated_rows=updated,
+            )
             return True
 
         except Exception as e:
@@ -565,6 +572,8 @@ class EstablishmentRepository:
                 "is_valid": True,
                 "error_message": "",
                 "suggested_display_order": suggested_display_order,
+                # Posição usada na criação (intervalo das reordenações)
+                "next_display_order": next_position(max_order),
             }
 
         except Exception as e:
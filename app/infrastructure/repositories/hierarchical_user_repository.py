@@ -3,13 +3,20 @@ HIERARCHICAL USER REPOSITORY - IMPLEMENTAÇÃO UNIFICADA
 Combina vw_users_complete + sistema hierárquico de permissões
 """
 
-from datetime import datetime
+from dataclasses import asdict, dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from sqlalchemy import text
 
+from app.infrastructure.cache.simplified_redis import simplified_redis_client
+from app.infrastructure.repositories.search_builder import like_pattern, search_sql
 from app.infrastructure.repositories.user_repository import UserRepository
+from app.infrastructure.services.data_access_audit import (
+    DataAccessEvent,
+    get_data_access_audit_log,
+)
+from config.settings import settings
 
 
 class AccessLevel(Enum):
@@ -23,6 +30,144 @@ class AccessLevel(Enum):
     NONE = "none"  # Sem acesso
 
 
+# Colunas da listagem hierárquica (vw_users_complete + projeção user_hierarchy)
+USER_LIST_COLUMNS = """
+    vc.user_id,
+    vc.user_email,
+    vc.user_is_active,
+    vc.user_is_system_admin,
+    vc.user_last_login_at,
+    vc.user_created_at,
+    vc.person_name,
+    vc.person_status,
+    vc.company_id,
+    vc.establishment_code,
+    vc.establishment_type,
+    vc.role_name,
+    vc.role_display_name,
+    vc.role_level,
+    uh.hierarchy_level,
+    uh.hierarchy_rank,
+    uh.company_ids AS member_company_ids,
+    uh.establishment_ids AS member_establishment_ids
+"""
+
+
+def _scope_cache_key(user_id: int) -> str:
+    return f"user_scope:{user_id}"
+
+
+async def invalidate_access_scope(user_id: int) -> None:
+    """Descarta o escopo em cache após mudanças de roles do usuário"""
+    await simplified_redis_client.delete(_scope_cache_key(user_id))
+
+
+@dataclass(frozen=True)
+class AccessScope:
+    """
+    Escopo de acesso de um solicitante
+
+    Mesmas regras de master.get_accessible_users_hierarchical, expressas como
+    empresas/estabelecimentos em vez da lista de ids de usuários:
+    full (ROOT), company (admin de empresa, level >= 80), establishment
+    (admin de estabelecimento, level >= 60) ou self (próprios dados e colegas
+    dos seus estabelecimentos).
+    """
+
+    user_id: int
+    access_level: str
+    company_ids: Tuple[int, ...] = ()
+    establishment_ids: Tuple[int, ...] = ()
+
+    @classmethod
+    def from_hierarchy(cls, row) -> "AccessScope":
+        """Monta o escopo a partir da linha do solicitante em user_hierarchy"""
+        company_role_ids = tuple(row.company_role_ids or ())
+        establishment_role_ids = tuple(row.establishment_role_ids or ())
+
+        if row.is_system_admin:
+            return cls(row.user_id, "full")
+        if (row.max_company_level or 0) >= 80 and company_role_ids:
+            return cls(row.user_id, "company", company_ids=company_role_ids)
+        if (row.max_establishment_level or 0) >= 60 and establishment_role_ids:
+            return cls(
+                row.user_id, "establishment", establishment_ids=establishment_role_ids
+            )
+        return cls(
+            row.user_id,
+            "self",
+            establishment_ids=tuple(row.establishment_ids or ()),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AccessScope":
+        return cls(
+            user_id=data["user_id"],
+            access_level=data["access_level"],
+            company_ids=tuple(data.get("company_ids") or ()),
+            establishment_ids=tuple(data.get("establishment_ids") or ()),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def condition(self) -> Tuple[str, Dict[str, Any]]:
+        """Condição SQL sobre a projeção (alias uh) e seus parâmetros"""
+        if self.access_level == "full":
+            return "TRUE", {}
+        if self.access_level == "company":
+            return "uh.company_ids && CAST(:scope_company_ids AS bigint[])", {
+                "scope_company_ids": list(self.company_ids)
+            }
+
+        establishments = (
+            "uh.establishment_ids && CAST(:scope_establishment_ids AS bigint[])"
+        )
+        params = {
+            "scope_establishment_ids": list(self.establishment_ids),
+            "scope_user_id": self.user_id,
+        }
+        if self.access_level == "establishment":
+            params.pop("scope_user_id")
+            return establishments, params
+        return f"(uh.user_id = :scope_user_id OR {establishments})", params
+
+    def access_level_condition(self, access_level: str) -> Optional[str]:
+        """Filtro por nível de acesso (None quando nenhum usuário o teria)"""
+        if self.access_level != "self":
+            return "TRUE" if access_level == self.access_level else None
+        if access_level == "self":
+            return "uh.user_id = :scope_user_id"
+        if access_level == "establishment":
+            return "uh.user_id <> :scope_user_id"
+        return None
+
+    def describe_access(
+        self,
+        user_id: int,
+        member_company_ids: Sequence[int],
+        member_establishment_ids: Sequence[int],
+    ) -> Tuple[str, str]:
+        """Nível de acesso e motivo para um usuário listado"""
+        if self.access_level == "full":
+            return "full", "System Administrator - Full Access"
+        if self.access_level == "company":
+            shared = sorted(set(member_company_ids) & set(self.company_ids))
+            return "company", "Company Administrator - Access to Company " + (
+                ", ".join(str(company_id) for company_id in shared)
+            )
+        if self.access_level == "self" and user_id == self.user_id:
+            return "self", "Own Data Access"
+
+        shared = sorted(set(member_establishment_ids) & set(self.establishment_ids))
+        prefix = (
+            "Establishment Administrator - Access to Establishment "
+            if self.access_level == "establishment"
+            else "Colleague in Establishment "
+        )
+        return "establishment", prefix + ", ".join(str(e) for e in shared)
+
+
 class HierarchicalUserRepository(UserRepository):
     """
     Repository unificado com controle hierárquico completo
@@ -86,25 +231,20 @@ class HierarchicalUserRepository(UserRepository):
         Lista usuários acessíveis com controle hierárquico
         """
         try:
-            # 1. Obter lista de usuários acessíveis
-            accessible_users = await self._get_accessible_user_ids(requesting_user_id)
+            # 1. Escopo do solicitante (empresas/estabelecimentos, em cache)
+            scope = await self.get_access_scope(requesting_user_id)
 
-            if not accessible_users:
+            if scope is None:
                 return [], 0
 
             # 2. Construir query com filtros
-            query_conditions = [
-                "vc.user_id = ANY(:accessible_users)",
-                "vc.user_is_active = true",
-            ]
-            query_params = {"accessible_users": list(accessible_users.keys())}
+            scope_condition, query_params = scope.condition()
+            query_conditions = [scope_condition, "vc.user_is_active = true"]
 
             # Aplicar filtros
-            if search:
-                query_conditions.append(
-                    "(vc.person_name ILIKE :search OR vc.user_email ILIKE :search)"
-                )
-                query_params["search"] = f"%{search}%"
+            if search and search.strip():
+                query_conditions.append(search_sql(["vc.person_name", "vc.user_email"]))
+                query_params["search"] = like_pattern(search)
 
             if role_filter:
                 query_conditions.append("vc.role_name = :role_filter")
@@ -119,93 +259,65 @@ class HierarchicalUserRepository(UserRepository):
                 query_params["establishment_filter"] = establishment_filter
 
             if hierarchy_filter:
-                hierarchy_users = [
-                    uid
-                    for uid, access in accessible_users.items()
-                    if access.access_level == hierarchy_filter
-                ]
-                if hierarchy_users:
-                    query_conditions.append("vc.user_id = ANY(:hierarchy_users)")
-                    query_params["hierarchy_users"] = hierarchy_users
-                else:
+                hierarchy_condition = scope.access_level_condition(hierarchy_filter)
+                if hierarchy_condition is None:
                     return [], 0
+                query_conditions.append(hierarchy_condition)
 
-            # 3. Query principal
-            main_query = f"""
-            SELECT DISTINCT
-                vc.user_id,
-                vc.user_email,
-                vc.user_is_active,
-                vc.user_is_system_admin,
-                vc.user_last_login_at,
-                vc.user_created_at,
-                vc.person_name,
-                vc.person_status,
-                vc.company_id,
-                vc.establishment_code,
-                vc.establishment_type,
-                vc.role_name,
-                vc.role_display_name,
-                vc.role_level,
-                -- Classificação hierárquica
-                CASE
-                    WHEN vc.user_is_system_admin THEN 'ROOT'
-                    WHEN EXISTS(
-                        SELECT 1 FROM master.user_roles ur
-                        JOIN master.roles r ON ur.role_id = r.id
-                        WHERE ur.user_id = vc.user_id
-                        AND r.context_type = 'company'
-                        AND r.level >= 80
-                    ) THEN 'ADMIN_EMPRESA'
-                    WHEN EXISTS(
-                        SELECT 1 FROM master.user_roles ur
-                        JOIN master.roles r ON ur.role_id = r.id
-                        WHERE ur.user_id = vc.user_id
-                        AND r.context_type = 'establishment'
-                        AND r.level >= 60
-                    ) THEN 'ADMIN_ESTABELECIMENTO'
-                    ELSE 'USUARIO_COMUM'
-                END as hierarchy_level,
-                COUNT(*) OVER() as total_count
+            # 3. Query principal (junção com a projeção master.user_hierarchy)
+            from_clause = f"""
             FROM master.vw_users_complete vc
+            JOIN master.user_hierarchy uh ON uh.user_id = vc.user_id
             WHERE {' AND '.join(query_conditions)}
-            ORDER BY
-                CASE
-                    WHEN vc.user_is_system_admin THEN 1
-                    WHEN EXISTS(SELECT 1 FROM master.user_roles ur JOIN master.roles r ON ur.role_id = r.id WHERE ur.user_id = vc.user_id AND r.level >= 80) THEN 2
-                    WHEN EXISTS(SELECT 1 FROM master.user_roles ur JOIN master.roles r ON ur.role_id = r.id WHERE ur.user_id = vc.user_id AND r.level >= 60) THEN 3
-                    ELSE 4
-                END,
-                vc.person_name
+            """
+            main_query = f"""
+            SELECT DISTINCT {USER_LIST_COLUMNS}
+            {from_clause}
+            ORDER BY uh.hierarchy_rank, vc.person_name
             LIMIT :limit OFFSET :skip
             """
+            count_query = f"""
+            SELECT COUNT(*) FROM (
+                SELECT DISTINCT {USER_LIST_COLUMNS}
+                {from_clause}
+            ) AS accessible
+            """
 
-            query_params.update({"limit": limit, "skip": skip})
-
-            # 4. Executar query
-            result = await self.db.execute(text(main_query), query_params)
+            # 4. Executar queries
+            result = await self.db.execute(
+                text(main_query), {**query_params, "limit": limit, "skip": skip}
+            )
             rows = result.fetchall()
 
-            total = rows[0].total_count if rows else 0
+            if not skip and len(rows) < limit:
+                total = len(rows)
+            else:
+                count_result = await self.db.execute(text(count_query), query_params)
+                total = count_result.scalar() or 0
 
             # 5. Processar dados baseado no nível de acesso
             users = []
             for row in rows:
                 user_data = dict(row._mapping)
-                access_info = accessible_users.get(user_data["user_id"])
+                user_data.pop("hierarchy_rank", None)
+                access_level, reason = scope.describe_access(
+                    user_data["user_id"],
+                    user_data.pop("member_company_ids", None) or [],
+                    user_data.pop("member_establishment_ids", None) or [],
+                )
 
                 # Aplicar mascaramento baseado no acesso
-                if access_info:
-                    user_data = await self._apply_data_masking(
-                        user_data, access_info.access_level
-                    )
-                    user_data["access_reason"] = access_info.reason
+                user_data = await self._apply_data_masking(user_data, access_level)
+                user_data["access_reason"] = reason
 
                 users.append(user_data)
 
             # 6. Log da operação para auditoria
             await self._log_user_list_access(
-                requesting_user_id, len(users), search, role_filter
+                requesting_user_id,
+                [user["user_id"] for user in users],
+                search,
+                role_filter,
             )
 
             return users, total
@@ -218,6 +330,35 @@ class HierarchicalUserRepository(UserRepository):
             )
             raise
 
+    async def get_access_scope(self, requesting_user_id: int) -> Optional[AccessScope]:
+        """Escopo de acesso do solicitante (cache Redis com TTL curto)"""
+        cache_key = _scope_cache_key(requesting_user_id)
+        cached = await simplified_redis_client.get(cache_key)
+        if cached:
+            return AccessScope.from_dict(cached)
+
+        result = await self.db.execute(
+            text(
+                """
+            SELECT user_id, is_system_admin, max_company_level,
+                   max_establishment_level, company_role_ids,
+                   establishment_role_ids, establishment_ids
+            FROM master.user_hierarchy
+            WHERE user_id = :user_id
+            """
+            ),
+            {"user_id": requesting_user_id},
+        )
+        row = result.fetchone()
+        if not row:
+            return None
+
+        scope = AccessScope.from_hierarchy(row)
+        await simplified_redis_client.set(
+            cache_key, scope.to_dict(), settings.user_scope_cache_ttl
+        )
+        return scope
+
     async def _get_access_level(
         self, requesting_user_id: int, target_user_id: int
     ) -> AccessLevel:
@@ -250,30 +391,6 @@ class HierarchicalUserRepository(UserRepository):
             self.logger.error("Error determining access level", error=str(e))
             return AccessLevel.NONE
 
-    async def _get_accessible_user_ids(self, requesting_user_id: int) -> Dict[int, Any]:
-        """Obtém todos os IDs de usuários acessíveis"""
-        try:
-            result = await self.db.execute(
-                text(
-                    "SELECT accessible_user_id, access_level, reason FROM master.get_accessible_users_hierarchical(:user_id)"
-                ),
-                {"user_id": requesting_user_id},
-            )
-
-            accessible_users = {}
-            for row in result.fetchall():
-                accessible_users[row.accessible_user_id] = type(
-                    "AccessInfo",
-                    (),
-                    {"access_level": row.access_level, "reason": row.reason},
-                )()
-
-            return accessible_users
-
-        except Exception as e:
-            self.logger.error("Error getting accessible user IDs", error=str(e))
-            return {}
-
     async def _get_full_user_data(self, user_id: int) -> Dict[str, Any]:
         """Dados completos para ROOT (com mascaramento de segurança)"""
         query = text(
@@ -415,19 +532,28 @@ class HierarchicalUserRepository(UserRepository):
         return user_data
 
     async def _log_user_list_access(
-        self, user_id: int, count: int, search: str, role_filter: str
+        self,
+        user_id: int,
+        user_ids: List[int],
+        search: Optional[str],
+        role_filter: Optional[str],
     ):
-        """Log de auditoria para listagem de usuários"""
+        """Auditoria LGPD da listagem de usuários (gravada em lote, sem esperar)"""
         try:
-            log_data = {
-                "action": "list_users",
-                "user_count": count,
-                "search_term": search,
-                "role_filter": role_filter,
-                "timestamp": datetime.utcnow().isoformat(),
-            }
-
-            self.logger.info("User list accessed", user_id=user_id, **log_data)
+            await get_data_access_audit_log().record(
+                DataAccessEvent(
+                    user_id=user_id,
+                    table_accessed="vw_users_complete",
+                    records_accessed={
+                        "user_ids": user_ids,
+                        "search_term": search,
+                        "role_filter": role_filter,
+                    },
+                    records_count=len(user_ids),
+                    query_purpose="list_users",
+                    application_module="hierarchical_users",
+                )
+            )
 
         except Exception as e:
             self.logger.warning("Failed to log user list access", error=str(e))
@@ -438,43 +564,15 @@ class HierarchicalUserRepository(UserRepository):
             query = text(
                 """
             SELECT
-                user_id,
-                user_email,
-                person_name,
-                CASE
-                    WHEN user_is_system_admin THEN 'ROOT'
-                    WHEN EXISTS(
-                        SELECT 1 FROM master.user_roles ur
-                        JOIN master.roles r ON ur.role_id = r.id
-                        WHERE ur.user_id = vc.user_id
-                        AND r.context_type = 'company'
-                        AND r.level >= 80
-                    ) THEN 'ADMIN_EMPRESA'
-                    WHEN EXISTS(
-                        SELECT 1 FROM master.user_roles ur
-                        JOIN master.roles r ON ur.role_id = r.id
-                        WHERE ur.user_id = vc.user_id
-                        AND r.context_type = 'establishment'
-                        AND r.level >= 60
-                    ) THEN 'ADMIN_ESTABELECIMENTO'
-                    ELSE 'USUARIO_COMUM'
-                END as hierarchy_level,
-                (SELECT ARRAY_AGG(DISTINCT ur2.context_id::text)
-                 FROM master.user_roles ur2
-                 JOIN master.roles r2 ON ur2.role_id = r2.id
-                 WHERE ur2.user_id = vc.user_id
-                   AND r2.context_type = 'company'
-                   AND ur2.deleted_at IS NULL
-                ) as accessible_companies,
-                (SELECT ARRAY_AGG(DISTINCT ur3.context_id::text)
-                 FROM master.user_roles ur3
-                 JOIN master.roles r3 ON ur3.role_id = r3.id
-                 WHERE ur3.user_id = vc.user_id
-                   AND r3.context_type = 'establishment'
-                   AND ur3.deleted_at IS NULL
-                ) as accessible_establishments
+                vc.user_id,
+                vc.user_email,
+                vc.person_name,
+                uh.hierarchy_level,
+                uh.company_role_ids::text[] AS accessible_companies,
+                uh.establishment_role_ids::text[] AS accessible_establishments
             FROM master.vw_users_complete vc
-            WHERE user_id = :user_id
+            JOIN master.user_hierarchy uh ON uh.user_id = vc.user_id
+            WHERE vc.user_id = :user_id
             LIMIT 1
             """
             )
@@ -356,6 +356,27 @@ class LimitsRepository:
 
         return result.scalar()
 
+    async def monitor_contract_limits(
+        self, contract_id: Optional[int] = None, check_date: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """Avaliar todas as regras ativas (agregados diários) e registrar violações"""
+        if check_date is None:
+            check_date = date.today()
+
+        query = text(
+            """
+            SELECT master.monitor_contract_limits(:contract_id, :check_date)
+        """
+        )
+
+        result = await self.db_session.execute(
+            query, {"contract_id": contract_id, "check_date": check_date}
+        )
+        monitoring = result.scalar()
+        await self.db_session.commit()
+
+        return monitoring
+
     async def check_contract_limits(
         self, contract_id: int, current_month: Optional[date] = None
     ) -> Dict[str, Any]:
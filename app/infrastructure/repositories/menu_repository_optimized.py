@@ -7,7 +7,7 @@ import time
 from typing import Any, Dict, List, Optional
 
 import structlog
-from sqlalchemy import and_, func, or_, select, text, update
+from sqlalchemy import and_, func, select, text, update
 
 from app.domain.entities.menu import MenuEntity, MenuStatus, MenuType
 from app.domain.repositories.menu_repository_interface import MenuRepositoryInterface
@@ -16,9 +16,19 @@ from app.infrastructure.cache.menu_cache_service import (
     get_menu_cache_service,
 )
 from app.infrastructure.orm.models import Menu as MenuORM
+from app.infrastructure.repositories.ordering import next_position, reorder_rows
+from app.infrastructure.repositories.search_builder import build_search
 
 logger = structlog.get_logger()
 
+# Colunas com índice trigram (migration 021)
+MENU_SEARCH_COLUMNS = (
+    MenuORM.name,
+    MenuORM.slug,
+    MenuORM.full_path_name,
+    MenuORM.description,
+)
+
 
 def timing_decorator(func):
     """Decorator para medir tempo de execução de métodos"""
@@ -154,9 +164,11 @@ class MenuRepositoryOptimized(MenuRepositoryInterface):
         else:
             menu.level = 0
 
-        # Auto sort_order (último + 1)
+        # Auto sort_order (depois do último, com intervalo para reordenações)
         siblings = await self.get_siblings(menu.parent_id)
-        menu.sort_order = max([s.sort_order for s in siblings], default=0) + 1
+        menu.sort_order = next_position(
+            max([s.sort_order for s in siblings], default=0)
+        )
 
         # Criar ORM
         menu_orm = self._entity_to_orm(menu)
@@ -274,14 +286,18 @@ class MenuRepositoryOptimized(MenuRepositoryInterface):
         if level is not None:
             query = query.where(MenuORM.level == level)
 
-        if search:
-            search_filter = or_(
-                MenuORM.name.ilike(f"%{search}%"),
-                MenuORM.slug.ilike(f"%{search}%"),
-                MenuORM.full_path_name.ilike(f"%{search}%"),
-                MenuORM.description.ilike(f"%{search}%"),
+        search_clause = build_search(search, MENU_SEARCH_COLUMNS)
+        if search_clause is not None:
+            query = (
+                query.where(search_clause.condition)
+                .order_by(None)
+                .order_by(
+                    search_clause.rank.desc(),
+                    MenuORM.level,
+                    MenuORM.sort_order,
+                    MenuORM.name,
+                )
             )
-            query = query.where(search_filter)
 
         query = query.offset(skip).limit(limit)
 
@@ -396,11 +412,16 @@ class MenuRepositoryOptimized(MenuRepositoryInterface):
         context_type: str = "system",
         include_inactive: bool = False,
     ) -> List[MenuEntity]:
-        """Buscar árvore hierárquica com cache otimizado"""
+        """Buscar árvore hierárquica com cache otimizado
+
+        A árvore não é filtrada por usuário nem por contexto: uma entrada de
+        cache por versão do catálogo (e por include_inactive) atende todos.
+        """
 
         # Tentar cache primeiro
         cache_service = await self._get_cache_service()
-        cached_tree = await cache_service.get_menu_tree(user_id, context_type)
+        tree_scope = "all" if include_inactive else "active"
+        cached_tree = await cache_service.get_menu_tree(context_type=tree_scope)
         if cached_tree is not None:
             return cached_tree
 
@@ -496,7 +517,7 @@ class MenuRepositoryOptimized(MenuRepositoryInterface):
                     parent.children.append(entity)
 
         # Cachear resultado
-        await cache_service.cache_menu_tree(root_menus, user_id, context_type)
+        await cache_service.cache_menu_tree(root_menus, context_type=tree_scope)
 
         self.logger.info(
             "Hierarquia de menus carregada",
@@ -524,17 +545,21 @@ class MenuRepositoryOptimized(MenuRepositoryInterface):
     async def reorder_siblings(
         self, parent_id: Optional[int], menu_orders: List[Dict]
     ) -> bool:
-        """Reordenar menus irmãos em lote"""
+        """Reordenar menus irmãos em lote (um SELECT e um UPDATE)"""
 
         try:
-            # Update em batch para performance
-            for item in menu_orders:
-                query = (
-                    update(MenuORM)
-                    .where(MenuORM.id == item["menu_id"])
-                    .values(sort_order=item["sort_order"])
-                )
-                await self.db.execute(query)
+            ordered_ids = [
+                item["menu_id"]
+                for item in sorted(menu_orders, key=lambda item: item["sort_order"])
+            ]
+            await reorder_rows(
+                self.db,
+                MenuORM,
+                "sort_order",
+                ordered_ids,
+                MenuORM.parent_id == parent_id,
+                MenuORM.deleted_at.is_(None),
+            )
 
             await self.db.commit()
 
@@ -640,13 +665,9 @@ class MenuRepositoryOptimized(MenuRepositoryInterface):
         if status:
             query = query.where(MenuORM.status == status)
 
-        if search:
-            search_filter = or_(
-                MenuORM.name.ilike(f"%{search}%"),
-                MenuORM.slug.ilike(f"%{search}%"),
-                MenuORM.full_path_name.ilike(f"%{search}%"),
-            )
-            query = query.where(search_filter)
+        search_clause = build_search(search, MENU_SEARCH_COLUMNS)
+        if search_clause is not None:
+            query = query.where(search_clause.condition)
 
         result = await self.db.execute(query)
         return result.scalar() or 0
@@ -711,30 +732,26 @@ class MenuRepositoryOptimized(MenuRepositoryInterface):
         if cached_results is not None:
             return cached_results
 
-        # Busca com full-text search otimizada
+        # Inclui keywords (array sem índice): a tabela de menus é pequena e o
+        # resultado da busca fica em cache
+        search_clause = build_search(
+            query,
+            [*MENU_SEARCH_COLUMNS, func.array_to_string(MenuORM.keywords, " ")],
+        )
+        if search_clause is None:
+            return []
+
         search_query = (
             select(MenuORM)
             .where(
                 and_(
                     MenuORM.deleted_at.is_(None),
                     MenuORM.status == "active",
-                    or_(
-                        MenuORM.name.ilike(f"%{query}%"),
-                        MenuORM.slug.ilike(f"%{query}%"),
-                        MenuORM.description.ilike(f"%{query}%"),
-                        MenuORM.full_path_name.ilike(f"%{query}%"),
-                        func.array_to_string(MenuORM.keywords, " ").ilike(f"%{query}%"),
-                    ),
+                    search_clause.condition,
                 )
             )
             .order_by(
-                # Relevância: nome > slug > descrição > path
-                func.case(
-                    (MenuORM.name.ilike(f"%{query}%"), 1),
-                    (MenuORM.slug.ilike(f"%{query}%"), 2),
-                    (MenuORM.description.ilike(f"%{query}%"), 3),
-                    else_=4,
-                ),
+                search_clause.rank.desc(),
                 MenuORM.level,
                 MenuORM.sort_order,
             )
@@ -0,0 +1,171 @@
+"""
+Ordenação manual (drag-and-drop) compartilhada pelos repositórios
+
+As posições (display_order, sort_order) são chaves espaçadas de ORDER_GAP em
+ORDER_GAP. Para deixar os itens na ordem pedida, plan_positions mantém no
+lugar a maior subsequência que já está em ordem e encaixa os demais nos
+intervalos entre os vizinhos: mover um item altera uma única linha em vez de
+renumerar todos os irmãos. Só quando um intervalo se esgota o grupo é
+reespaçado, com chaves acima da maior existente.
+
+As novas chaves nunca coincidem com uma chave atual do grupo, então o UPDATE
+único de bulk_update_positions não viola índices únicos como
+(company_id, display_order), verificados linha a linha pelo PostgreSQL.
+"""
+
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Set
+
+import structlog
+from sqlalchemy import BigInteger, Integer, column, select, update, values
+
+logger = structlog.get_logger()
+
+# Distância entre chaves consecutivas ao anexar ou reespaçar
+ORDER_GAP = 1024
+
+
+def next_position(max_position: Optional[int], gap: int = ORDER_GAP) -> int:
+    """Posição para um item anexado ao fim do grupo"""
+    return (max_position or 0) + gap
+
+
+def _increasing_indexes(keys: Sequence[int]) -> Set[int]:
+    """Índices de uma maior subsequência estritamente crescente"""
+    tails: List[int] = []
+    tail_indexes: List[int] = []
+    previous = [-1] * len(keys)
+
+    for index, key in enumerate(keys):
+        position = bisect_left(tails, key)
+        if position:
+            previous[index] = tail_indexes[position - 1]
+        if position == len(tails):
+            tails.append(key)
+            tail_indexes.append(index)
+        else:
+            tails[position] = key
+            tail_indexes[position] = index
+
+    kept = set()
+    index = tail_indexes[-1] if tail_indexes else -1
+    while index != -1:
+        kept.add(index)
+        index = previous[index]
+    return kept
+
+
+def _fill_gap(
+    lower: int, upper: Optional[int], count: int, taken: Set[int], gap: int
+) -> Optional[List[int]]:
+    """count chaves livres e crescentes em (lower, upper); None se não couberem"""
+    if upper is None:
+        # Depois do último item mantido: além de qualquer chave existente
+        start = max(lower, max(taken, default=0))
+        return [start + gap * (offset + 1) for offset in range(count)]
+
+    step = (upper - lower) / (count + 1)
+    assigned: List[int] = []
+    for offset in range(count):
+        previous = assigned[-1] if assigned else lower
+        key = max(lower + round(step * (offset + 1)), previous + 1)
+        while key in taken:
+            key += 1
+        if key >= upper:
+            return None
+        assigned.append(key)
+    return assigned
+
+
+def _respace(current: Dict[int, int], ordered_ids: Sequence[int], gap: int):
+    base = max(current.values(), default=0) // gap + 1
+    return {item_id: (base + index) * gap for index, item_id in enumerate(ordered_ids)}
+
+
+def plan_positions(
+    current: Dict[int, int], ordered_ids: Sequence[int], gap: int = ORDER_GAP
+) -> Dict[int, int]:
+    """
+    Novas chaves para que ordered_ids fiquem nessa ordem
+
+    Args:
+        current: id -> chave atual de todos os itens do grupo
+        ordered_ids: ids a ordenar, na ordem desejada (subconjunto do grupo)
+
+    Returns:
+        id -> nova chave, apenas dos itens cuja chave muda
+    """
+    keys = [current[item_id] or 0 for item_id in ordered_ids]
+    kept = _increasing_indexes(keys)
+    taken = set(current.values())
+
+    positions: Dict[int, int] = {}
+    lower = 0
+    index = 0
+    while index < len(ordered_ids):
+        if index in kept:
+            lower = keys[index]
+            index += 1
+            continue
+
+        end = index
+        while end < len(ordered_ids) and end not in kept:
+            end += 1
+        upper = keys[end] if end < len(ordered_ids) else None
+
+        assigned = _fill_gap(lower, upper, end - index, taken, gap)
+        if assigned is None:
+            positions = _respace(current, ordered_ids, gap)
+            break
+
+        positions.update(zip(ordered_ids[index:end], assigned))
+        taken.update(assigned)
+        lower = assigned[-1]
+        index = end
+
+    return {
+        item_id: key for item_id, key in positions.items() if key != current[item_id]
+    }
+
+
+async def bulk_update_positions(
+    db, model, column_name: str, positions: Dict[int, int], *guards
+) -> int:
+    """UPDATE ... FROM (VALUES ...) único; guards restringem ao grupo/tenant"""
+    if not positions:
+        return 0
+
+    new_positions = values(
+        column("id", BigInteger), column("position", Integer), name="new_positions"
+    ).data(list(positions.items()))
+    result = await db.execute(
+        update(model)
+        .where(model.id == new_positions.c.id, *guards)
+        .values({getattr(model, column_name): new_positions.c.position})
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def reorder_rows(
+    db, model, column_name: str, ordered_ids: Sequence[int], *guards
+) -> int:
+    """
+    Reordena os itens de um grupo com um SELECT e um UPDATE
+
+    Ids que não pertencem ao grupo definido pelos guards são ignorados (com
+    aviso no log), como na atualização item a item que esta função substitui.
+    """
+    position = getattr(model, column_name)
+    result = await db.execute(select(model.id, position).where(*guards))
+    current = {item_id: key for item_id, key in result.all()}
+
+    missing = [item_id for item_id in ordered_ids if item_id not in current]
+    if missing:
+        logger.warning(
+            "Items not found for reordering", table=model.__tablename__, ids=missing
+        )
+        ordered_ids = [item_id for item_id in ordered_ids if item_id in current]
+
+    positions = plan_positions(current, ordered_ids)
+    return await bulk_update_positions(db, model, column_name, positions, *guards)
@@ -5,6 +5,7 @@ from sqlalchemy import and_, desc, func, or_, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.infrastructure.cache.permission_cache import invalidate_role_permissions
 from app.infrastructure.orm.models import Permission, Role, RolePermission
 from app.presentation.schemas.role import (
     PermissionCreate,
@@ -248,6 +249,8 @@ class RoleRepository:
                 await self._update_role_permissions(role_id, role_data.permission_ids)
 
             await self.db.commit()
+            # Após o commit: quem recalcular a partir daqui lê os dados novos
+            await invalidate_role_permissions(role_id)
             return await self.get_by_id(role_id)
 
         except Exception as e:
@@ -302,6 +305,7 @@ class RoleRepository:
                 logger.info("Role deleted permanently", role_id=role_id)
 
             await self.db.commit()
+            await invalidate_role_permissions(role_id)
             return True
 
         except Exception as e:
@@ -0,0 +1,116 @@
+"""
+Builder de busca textual compartilhado pelos repositórios
+
+Gera as condições de busca sobre master.search_normalize(coluna) (minúsculas,
+sem acentos), a mesma expressão dos índices GIN pg_trgm da migration 021, de
+modo que LIKE '%termo%' usa índice em vez de varrer a tabela. Termos que
+parecem CPF/CNPJ também buscam por prefixo de tax_id (índice
+text_pattern_ops). O ranking combina match exato, prefixo e similarity().
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from sqlalchemy import case, func, literal, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+# Mínimo de dígitos para considerar o termo um prefixo de CPF/CNPJ
+TAX_ID_MIN_DIGITS = 3
+
+_TAX_ID_TERM = re.compile(r"^[\d.\-/\s]+$")
+_LIKE_ESCAPE = "\\"
+
+
+def normalize_search_term(term: str) -> str:
+    """Equivalente em Python de master.search_normalize (lower + unaccent)
+
+    Só as bordas do termo digitado são removidas; espaços internos são
+    mantidos como estão, igual à função SQL, que não os colapsa.
+    """
+    decomposed = unicodedata.normalize("NFKD", term)
+    without_accents = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return without_accents.lower().strip()
+
+
+def tax_id_digits(term: str) -> Optional[str]:
+    """Dígitos do termo se ele parece um CPF/CNPJ (com ou sem máscara)"""
+    if not _TAX_ID_TERM.match(term):
+        return None
+    digits = re.sub(r"\D", "", term)
+    return digits if len(digits) >= TAX_ID_MIN_DIGITS else None
+
+
+def _escape_like(value: str) -> str:
+    return (
+        value.replace(_LIKE_ESCAPE, _LIKE_ESCAPE * 2)
+        .replace("%", _LIKE_ESCAPE + "%")
+        .replace("_", _LIKE_ESCAPE + "_")
+    )
+
+
+def search_normalize(column) -> ColumnElement:
+    return func.master.search_normalize(column)
+
+
+@dataclass(frozen=True)
+class SearchClause:
+    """Condição WHERE e expressão de relevância (0..1) de uma busca"""
+
+    condition: ColumnElement
+    rank: ColumnElement
+
+
+def build_search(
+    term: Optional[str],
+    text_columns: Sequence,
+    tax_id_column=None,
+) -> Optional[SearchClause]:
+    """Monta a busca para as colunas informadas (None se o termo for vazio)"""
+    normalized = normalize_search_term(term or "")
+    if not normalized:
+        return None
+
+    pattern = f"%{_escape_like(normalized)}%"
+    prefix = f"{_escape_like(normalized)}%"
+
+    conditions = []
+    ranks = []
+    for column in text_columns:
+        expression = search_normalize(column)
+        conditions.append(expression.like(pattern, escape=_LIKE_ESCAPE))
+        ranks.append(
+            case(
+                (expression == normalized, literal(1.0)),
+                (expression.like(prefix, escape=_LIKE_ESCAPE), literal(0.9)),
+                else_=func.similarity(expression, normalized),
+            )
+        )
+
+    digits = tax_id_digits(term) if tax_id_column is not None else None
+    if digits:
+        conditions.append(tax_id_column.like(f"{digits}%"))
+        ranks.append(case((tax_id_column == digits, literal(1.0)), else_=literal(0.9)))
+
+    rank = ranks[0] if len(ranks) == 1 else func.greatest(*ranks)
+    return SearchClause(condition=or_(*conditions), rank=rank)
+
+
+def search_sql(columns: Sequence[str], parameter: str = "search") -> str:
+    """Condição equivalente para consultas em SQL textual
+
+    O valor do parâmetro deve ser gerado por like_pattern().
+    """
+    return (
+        "("
+        + " OR ".join(
+            f"master.search_normalize({column}) LIKE :{parameter}" for column in columns
+        )
+        + ")"
+    )
+
+
+def like_pattern(term: str) -> str:
+    """Padrão '%termo%' normalizado e escapado para search_sql()"""
+    return f"%{_escape_like(normalize_search_term(term))}%"
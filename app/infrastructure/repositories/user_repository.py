@@ -1,18 +1,23 @@
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
-from passlib.context import CryptContext
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, func, select
 from sqlalchemy.orm import selectinload
 from structlog import get_logger
 
 # Domain
 from app.domain.entities.user import User
 from app.domain.repositories.user_repository import UserRepositoryInterface
+from app.infrastructure.auth import get_password_hash_async, verify_password_async
 
 # ORM Models
 from app.infrastructure.orm.models import Address, Email, People, Phone
 from app.infrastructure.orm.models import User as UserEntity
+from app.infrastructure.repositories.company_counters_repository import (
+    CompanyCountersRepository,
+    status_delta,
+)
+from app.infrastructure.repositories.search_builder import build_search
 
 # Schemas
 from app.presentation.schemas.user import UserCreate, UserDetailed, UserList, UserUpdate
@@ -27,7 +32,6 @@ class UserRepository(UserRepositoryInterface):
     def __init__(self, db):
         self.db = db
         self.logger = get_logger()
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
     def _to_naive_datetime(self, dt):
         """Convert timezone-aware datetime to naive datetime"""
@@ -37,13 +41,13 @@ class UserRepository(UserRepositoryInterface):
             return dt.replace(tzinfo=None)
         return dt
 
-    def _hash_password(self, password: str) -> str:
-        """Hash password using bcrypt"""
-        return self.pwd_context.hash(password)
+    async def _hash_password(self, password: str) -> str:
+        """Hash bcrypt no executor de hash, fora do event loop"""
+        return await get_password_hash_async(password)
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Verify password against hash"""
-        return self.pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verifica a senha no executor de hash, fora do event loop"""
+        return await verify_password_async(plain_password, hashed_password)
 
     def _entity_to_domain_user(self, user_entity: UserEntity) -> User:
         """Convert UserEntity to User domain entity"""
@@ -86,6 +90,8 @@ class UserRepository(UserRepositoryInterface):
             if existing_user.scalar_one_or_none():
                 raise ValueError(f"Email {user_data.email_address} já está em uso")
 
+            password_hash = await self._hash_password(user_data.password)
+
             # 2. Criar pessoa (PF)
             person_data = user_data.person.model_dump()
             person_data["created_at"] = datetime.utcnow()
@@ -99,7 +105,7 @@ class UserRepository(UserRepositoryInterface):
             user_dict = {
                 "person_id": person.id,
                 "email_address": user_data.email_address,
-                "password": self._hash_password(user_data.password),
+                "password": password_hash,
                 "is_active": user_data.is_active,
                 "preferences": user_data.preferences or {},
                 "notification_settings": user_data.notification_settings or {},
@@ -114,6 +120,11 @@ class UserRepository(UserRepositoryInterface):
             # 4. Criar relacionamentos (telefones, emails, endereços)
             await self._create_user_contacts(user.id, person.id, user_data)
 
+            await CompanyCountersRepository(self.db).adjust(
+                user.company_id,
+                users_count=1,
+                active_users_count=int(bool(user.is_active)),
+            )
             await self.db.commit()
 
             # 5. Buscar usuário completo criado
@@ -271,12 +282,11 @@ class UserRepository(UserRepositoryInterface):
             # Aplicar filtros
             filters = []
 
-            if search:
-                search_filter = or_(
-                    People.name.ilike(f"%{search}%"),
-                    UserEntity.email_address.ilike(f"%{search}%"),
-                )
-                filters.append(search_filter)
+            search_clause = build_search(
+                search, [People.name, UserEntity.email_address]
+            )
+            if search_clause is not None:
+                filters.append(search_clause.condition)
 
             if is_active is not None:
                 filters.append(UserEntity.is_active == is_active)
@@ -299,7 +309,9 @@ class UserRepository(UserRepositoryInterface):
             if filters:
                 count_query = count_query.where(and_(*filters))
 
-            # Executar queries
+            # Executar queries (mais relevantes primeiro quando há busca)
+            if search_clause is not None:
+                base_query = base_query.order_by(search_clause.rank.desc())
             users_result = await self.db.execute(
                 base_query.order_by(UserEntity.created_at.desc())
                 .offset(skip)
@@ -365,6 +377,12 @@ class UserRepository(UserRepositoryInterface):
                 user_entity.email_address = user_data.email_address
 
             if user_data.is_active is not None:
+                await CompanyCountersRepository(self.db).adjust(
+                    user_entity.company_id,
+                    active_users_count=status_delta(
+                        bool(user_entity.is_active), user_data.is_active
+                    ),
+                )
                 user_entity.is_active = user_data.is_active
 
             if user_data.preferences is not None:
@@ -409,6 +427,11 @@ class UserRepository(UserRepositoryInterface):
             user_entity.deleted_at = datetime.utcnow()
             user_entity.updated_at = datetime.utcnow()
 
+            await CompanyCountersRepository(self.db).adjust(
+                user_entity.company_id,
+                users_count=-1,
+                active_users_count=-int(bool(user_entity.is_active)),
+            )
             await self.db.commit()
 
             self.logger.info("User soft deleted", user_id=user_id)
@@ -466,7 +489,7 @@ class UserRepository(UserRepositoryInterface):
             if not user_entity or user_entity.deleted_at is not None:
                 return False
 
-            user_entity.password = self._hash_password(new_password)
+            user_entity.password = await self._hash_password(new_password)
             user_entity.password_changed_at = datetime.utcnow()
             user_entity.updated_at = datetime.utcnow()
 
@@ -0,0 +1,89 @@
+"""
+Hash de senhas fora do event loop
+
+bcrypt leva ~100-300 ms por operação e é CPU-bound. As operações rodam em um
+ThreadPoolExecutor dedicado (a biblioteca bcrypt libera o GIL durante o hash),
+com limite de operações pendentes: quando o limite é atingido a chamada falha
+imediatamente com PasswordHasherBusyError (HTTP 429) em vez de enfileirar
+indefinidamente e degradar todas as outras requisições.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+import structlog
+
+from app.infrastructure.monitoring.metrics import performance_metrics
+
+logger = structlog.get_logger()
+
+
+class PasswordHasherBusyError(Exception):
+    """Executor de hash saturado"""
+
+    def __init__(self, message: str = "Password hashing capacity exceeded"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class PasswordHasher:
+    """Executor limitado para operações de hash de senha"""
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 64):
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Operações em execução ou aguardando uma thread"""
+        return self._in_flight
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    async def run(self, operation: str, func: Callable[..., Any], *args) -> Any:
+        """Executa func(*args) no executor, rejeitando se saturado"""
+        if self._in_flight >= self.max_pending:
+            performance_metrics.record_password_hash_rejected(operation)
+            logger.warning(
+                "password_hash_rejected",
+                operation=operation,
+                in_flight=self._in_flight,
+            )
+            raise PasswordHasherBusyError()
+
+        self._in_flight += 1
+        performance_metrics.update_password_hash_in_flight(self._in_flight)
+        enqueued_at = time.perf_counter()
+
+        def timed_call():
+            started_at = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                performance_metrics.record_password_hash(
+                    operation,
+                    queue_wait=started_at - enqueued_at,
+                    duration=time.perf_counter() - started_at,
+                )
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), timed_call)
+        finally:
+            self._in_flight -= 1
+            performance_metrics.update_password_hash_in_flight(self._in_flight)
+
+    def shutdown(self, wait: bool = True):
+        """Encerra as threads do executor (application shutdown)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
@@ -12,6 +12,10 @@ from fastapi import HTTPException, status
 from sqlalchemy import text
 from structlog import get_logger
 
+from app.infrastructure.security.session_context_cache import (
+    get_session_context_cache,
+)
+
 
 class SecureSessionManager:
     """
@@ -350,6 +354,7 @@ class SecureSessionManager:
             )
 
             await self.db.commit()
+            await get_session_context_cache().invalidate(session_token)
 
             # Retornar nova sessão
             updated_session = await self.validate_session(session_token)
@@ -406,6 +411,7 @@ class SecureSessionManager:
             )
 
             await self.db.commit()
+            await get_session_context_cache().invalidate(session_token)
 
             affected_rows = result.rowcount
             if affected_rows > 0:
@@ -0,0 +1,137 @@
+"""
+Cache de contextos de sessão validados
+
+get_current_user valida o session_token do JWT a cada requisição. Contextos
+válidos ficam em dois níveis:
+
+- memória do worker: TTL curto (session_context_local_ttl), nunca além do
+  expires_at da sessão, com limite de entradas (LRU)
+- Redis: compartilhado entre workers, expira junto com a sessão
+
+Logout e troca de perfil (SecureSessionManager) removem a entrada do Redis e
+da memória do worker atual; nos demais workers a entrada local expira em no
+máximo session_context_local_ttl segundos. Apenas contextos válidos são
+guardados, então tokens inválidos sempre consultam o banco.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import datetime
+from typing import Optional, Tuple
+
+import structlog
+
+from app.infrastructure.cache.simplified_redis import simplified_redis_client
+
+logger = structlog.get_logger()
+
+
+def _cache_key(session_token: str) -> str:
+    digest = hashlib.sha256(session_token.encode("utf-8")).hexdigest()
+    return f"session_ctx:{digest}"
+
+
+class SessionContextCache:
+    """Cache em dois níveis (memória + Redis) de SessionContext válidos"""
+
+    def __init__(self, local_ttl: float = 30.0, max_entries: int = 10000):
+        self.local_ttl = local_ttl
+        self.max_entries = max_entries
+        # chave -> (user_id validado, contexto, deadline monotônico)
+        self._local: "OrderedDict[str, Tuple[Optional[int], object, float]]" = (
+            OrderedDict()
+        )
+
+    async def get(self, session_token: str, user_id: Optional[int]):
+        """Contexto em cache ou None (validado para o mesmo user_id)"""
+        key = _cache_key(session_token)
+
+        entry = self._local.get(key)
+        if entry is not None:
+            cached_user_id, context, deadline = entry
+            if deadline > time.monotonic():
+                if cached_user_id != user_id:
+                    return None
+                self._local.move_to_end(key)
+                return context
+            self._local.pop(key, None)
+
+        cached = await simplified_redis_client.get(key)
+        if not cached or cached.get("user_id") != user_id:
+            return None
+
+        remaining = (
+            datetime.fromisoformat(cached["expires_at"]) - datetime.utcnow()
+        ).total_seconds()
+        if remaining <= 0:
+            return None
+
+        from app.infrastructure.services.security_service import SessionContext
+
+        context = SessionContext(**cached["context"])
+        self._store_local(key, user_id, context, remaining)
+        return context
+
+    async def set(
+        self,
+        session_token: str,
+        user_id: Optional[int],
+        context,
+        expires_at: Optional[datetime],
+    ) -> None:
+        """Guarda um contexto válido até o expires_at da sessão"""
+        if not context.is_valid or expires_at is None:
+            return
+
+        remaining = (expires_at - datetime.utcnow()).total_seconds()
+        if remaining <= 0:
+            return
+
+        key = _cache_key(session_token)
+        self._store_local(key, user_id, context, remaining)
+        await simplified_redis_client.set(
+            key,
+            {
+                "user_id": user_id,
+                "context": asdict(context),
+                "expires_at": expires_at.isoformat(),
+            },
+            max(1, int(remaining)),
+        )
+
+    async def invalidate(self, session_token: str) -> None:
+        """Remove a sessão do cache (logout, troca de perfil)"""
+        key = _cache_key(session_token)
+        self._local.pop(key, None)
+        await simplified_redis_client.delete(key)
+        logger.debug("session_context_invalidated", session_token=session_token[:10])
+
+    def clear_local(self) -> None:
+        self._local.clear()
+
+    def _store_local(
+        self, key: str, user_id: Optional[int], context, remaining: float
+    ) -> None:
+        deadline = time.monotonic() + min(self.local_ttl, remaining)
+        self._local[key] = (user_id, context, deadline)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+
+_session_context_cache: Optional[SessionContextCache] = None
+
+
+def get_session_context_cache() -> SessionContextCache:
+    """Instância global do cache de contextos de sessão"""
+    global _session_context_cache
+    if _session_context_cache is None:
+        from config.settings import settings
+
+        _session_context_cache = SessionContextCache(
+            local_ttl=settings.session_context_local_ttl,
+            max_entries=settings.session_context_cache_size,
+        )
+    return _session_context_cache
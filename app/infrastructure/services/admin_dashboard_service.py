@@ -14,11 +14,12 @@ from app.infrastructure.orm.models import (
     Client,
     Company,
     CompanySubscription,
-    Establishments,
     People,
     ProTeamCareInvoice,
     SubscriptionPlan,
-    User,
+)
+from app.infrastructure.repositories.company_counters_repository import (
+    CompanyCountersRepository,
 )
 
 
@@ -71,28 +72,14 @@ class AdminDashboardService:
         result = await self.db.execute(query_companies)
         total_companies = result.scalar() or 0
 
-        # Total de estabelecimentos ativos
-        query_establishments = select(func.count(Establishments.id)).where(
-            Establishments.deleted_at.is_(None)
-        )
-        result = await self.db.execute(query_establishments)
-        total_establishments = result.scalar() or 0
-
-        # Total de clientes ativos
-        query_clients = select(func.count(Client.id)).where(Client.deleted_at.is_(None))
-        result = await self.db.execute(query_clients)
-        total_clients = result.scalar() or 0
-
-        # Total de usuários ativos
-        query_users = select(func.count(User.id)).where(User.is_active == True)
-        result = await self.db.execute(query_users)
-        total_users = result.scalar() or 0
+        # Estabelecimentos, clientes e usuários: soma da projeção por empresa
+        counters = await CompanyCountersRepository(self.db).totals()
 
         return {
             "total_companies": total_companies,
-            "total_establishments": total_establishments,
-            "total_clients": total_clients,
-            "total_users": total_users,
+            "total_establishments": counters["establishments_count"],
+            "total_clients": counters["clients_count"],
+            "total_users": counters["active_users_count"],
         }
 
     async def _get_revenue_metrics(self) -> Dict[str, Any]:
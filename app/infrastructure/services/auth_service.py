@@ -9,7 +9,9 @@ from app.application.interfaces.services import AuthServiceInterface
 from app.infrastructure.auth import (
     create_access_token,
     get_password_hash,
+    get_password_hash_async,
     verify_password,
+    verify_password_async,
 )
 
 
@@ -24,6 +26,16 @@ class AuthService(AuthServiceInterface):
         """Gerar hash da senha"""
         return get_password_hash(password)
 
+    async def verify_password_async(
+        self, plain_password: str, hashed_password: str
+    ) -> bool:
+        """Verificar senha no executor de hash"""
+        return await verify_password_async(plain_password, hashed_password)
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """Gerar hash da senha no executor de hash"""
+        return await get_password_hash_async(password)
+
     def create_access_token(
         self, data: dict, expires_delta: Optional[timedelta] = None
     ) -> str:
@@ -21,6 +21,9 @@ from app.presentation.schemas.b2b_billing import (
 class B2BBillingService:
     """Serviço para operações de cobrança B2B"""
 
+    # Faturas por INSERT/transação na geração mensal
+    INVOICE_BATCH_SIZE = 500
+
     def __init__(
         self, repository: B2BBillingRepository, pagbank_service: PagBankService
     ):
@@ -314,26 +317,12 @@ class B2BBillingService:
         target_year: int,
         company_ids: Optional[List[int]] = None,
     ) -> dict:
-        """Gerar faturas mensais para todas as empresas ativas"""
-        if company_ids:
-            # Buscar assinaturas específicas
-            subscriptions = []
-            for company_id in company_ids:
-                subscription = await self.repository.get_company_subscription(
-                    company_id
-                )
-                if subscription:
-                    subscriptions.append(subscription)
-        else:
-            # Buscar todas as assinaturas ativas
-            subscriptions = await self.repository.get_all_active_subscriptions()
-
-        total_companies = len(subscriptions)
-        invoices_created = 0
-        invoices_failed = 0
-        total_amount = Decimal("0.00")
-        errors = []
+        """Gerar faturas mensais para todas as empresas ativas
 
+        Uma consulta carrega assinaturas, preços e faturas já existentes no
+        período; as faturas são inseridas em lotes de INVOICE_BATCH_SIZE, um
+        INSERT multi-linha por transação.
+        """
         # Calcular período de faturamento
         billing_period_start = date(target_year, target_month, 1)
         if target_month == 12:
@@ -343,59 +332,73 @@ class B2BBillingService:
                 days=1
             )
 
-        for subscription in subscriptions:
-            try:
-                # Calcular data de vencimento baseada no billing_day
-                if subscription.billing_day <= billing_period_end.day:
-                    due_date = date(target_year, target_month, subscription.billing_day)
-                else:
-                    # Se o dia não existe no mês, usar último dia do mês
-                    due_date = billing_period_end
+        subscriptions = await self.repository.get_subscriptions_for_invoicing(
+            billing_period_start, billing_period_end, company_ids
+        )
 
-                # Verificar se já existe fatura para este período
-                existing_invoices = await self.repository.get_company_invoices(
-                    subscription.company_id, status=None, limit=5
-                )
+        total_companies = len(subscriptions)
+        invoices_created = 0
+        invoices_failed = 0
+        total_amount = Decimal("0.00")
+        errors = []
 
-                invoice_exists = any(
-                    inv.billing_period_start.month == target_month
-                    and inv.billing_period_start.year == target_year
-                    for inv in existing_invoices
+        pending = []
+        created_at = datetime.now()
+        for subscription in subscriptions:
+            if subscription.already_invoiced:
+                errors.append(
+                    f"Fatura já existe para empresa ID {subscription.company_id}"
                 )
+                invoices_failed += 1
+                continue
 
-                if invoice_exists:
-                    errors.append(
-                        f"Fatura já existe para empresa ID {subscription.company_id}"
-                    )
-                    invoices_failed += 1
-                    continue
-
-                # Gerar número da fatura
-                invoice_number = await self.repository.generate_invoice_number(
-                    subscription.company_id, target_year, target_month
-                )
+            # Calcular data de vencimento baseada no billing_day
+            if subscription.billing_day <= billing_period_end.day:
+                due_date = date(target_year, target_month, subscription.billing_day)
+            else:
+                # Se o dia não existe no mês, usar último dia do mês
+                due_date = billing_period_end
 
-                # Criar fatura
-                invoice_data = {
+            # Sem fatura no período, a sequência da empresa é 001
+            pending.append(
+                {
                     "company_id": subscription.company_id,
                     "subscription_id": subscription.id,
-                    "invoice_number": invoice_number,
-                    "amount": subscription.plan.monthly_price,
+                    "invoice_number": self.repository.format_invoice_number(
+                        subscription.company_id, target_year, target_month
+                    ),
+                    "amount": subscription.monthly_price,
                     "billing_period_start": billing_period_start,
                     "billing_period_end": billing_period_end,
                     "due_date": due_date,
                     "status": "pending",
                     "payment_method": subscription.payment_method,
-                    "created_at": datetime.now(),
+                    "created_at": created_at,
                 }
+            )
 
-                await self.repository.create_proteamcare_invoice(invoice_data)
-                invoices_created += 1
-                total_amount += subscription.plan.monthly_price
-
+        for start in range(0, len(pending), self.INVOICE_BATCH_SIZE):
+            batch = pending[start : start + self.INVOICE_BATCH_SIZE]
+            try:
+                created = await self.repository.create_proteamcare_invoices_bulk(batch)
             except Exception as e:
-                errors.append(f"Erro na empresa ID {subscription.company_id}: {str(e)}")
-                invoices_failed += 1
+                for invoice in batch:
+                    errors.append(
+                        f"Erro na empresa ID {invoice['company_id']}: {str(e)}"
+                    )
+                invoices_failed += len(batch)
+                continue
+
+            for invoice in batch:
+                if invoice["company_id"] in created:
+                    invoices_created += 1
+                    total_amount += invoice["amount"]
+                else:
+                    # Criada por outra execução entre a consulta e o INSERT
+                    errors.append(
+                        f"Fatura já existe para empresa ID {invoice['company_id']}"
+                    )
+                    invoices_failed += 1
 
         return {
             "success": invoices_failed == 0,
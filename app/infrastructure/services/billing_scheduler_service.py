@@ -8,7 +8,7 @@ from typing import Any, Dict, List, Optional
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infrastructure.database import get_db
+from app.infrastructure.database import batch_session_scope
 from app.infrastructure.repositories.billing_repository import BillingRepository
 from app.infrastructure.services.billing_service import BillingService
 
@@ -192,7 +192,7 @@ class BillingSchedulerService:
         self.job_results.append(job_result)
 
         try:
-            async with get_db() as db:
+            async with batch_session_scope() as db:
                 billing_service = BillingService(db)
 
                 logger.info(
@@ -252,7 +252,7 @@ class BillingSchedulerService:
         self.job_results.append(job_result)
 
         try:
-            async with get_db() as db:
+            async with batch_session_scope() as db:
                 billing_service = BillingService(db)
 
                 logger.info("Starting recurrent billing execution", job_id=job_id)
@@ -306,7 +306,7 @@ class BillingSchedulerService:
         self.job_results.append(job_result)
 
         try:
-            async with get_db() as db:
+            async with batch_session_scope() as db:
                 billing_repository = BillingRepository(db)
                 billing_service = BillingService(db)
 
@@ -403,7 +403,7 @@ class BillingSchedulerService:
         self.job_results.append(job_result)
 
         try:
-            async with get_db() as db:
+            async with batch_session_scope() as db:
                 billing_repository = BillingRepository(db)
 
                 logger.info("Starting invoice status sync", job_id=job_id)
@@ -758,7 +758,9 @@ class BillingService:
         """Process failure in recurrent billing and handle fallback"""
         try:
             # Increment attempt count
-            await self.billing_repository.increment_billing_attempt(schedule_id)
+            attempt_count = await self.billing_repository.increment_billing_attempt(
+                schedule_id
+            )
 
             # Get updated schedule
             schedule = await self.billing_repository.get_billing_schedule_by_id(
@@ -772,20 +774,17 @@ class BillingService:
             result = {
                 "schedule_id": schedule_id,
                 "contract_id": schedule.contract_id,
-                "attempt_count": schedule.attempt_count,
+                "attempt_count": attempt_count,
                 "max_attempts": max_attempts,
                 "fallback_triggered": False,
             }
 
             # Check if should trigger fallback
-            if (
-                schedule.attempt_count >= max_attempts
-                and schedule.auto_fallback_enabled
-            ):
+            if attempt_count >= max_attempts and schedule.auto_fallback_enabled:
                 logger.info(
                     "Triggering fallback to manual billing",
                     schedule_id=schedule_id,
-                    attempt_count=schedule.attempt_count,
+                    attempt_count=attempt_count,
                 )
 
                 # Switch to manual billing
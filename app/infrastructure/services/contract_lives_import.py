@@ -0,0 +1,473 @@
+"""
+Importação em lote de vidas de contrato (CSV/XLSX)
+
+O arquivo é lido em streaming (linha a linha) e cada linha é validada com o
+schema ContractLifeImportRow. As regras de negócio que antes custavam várias
+consultas por vida são aplicadas sobre o lote inteiro:
+
+- período do contrato e sobreposição entre linhas do próprio arquivo: em memória
+- pessoas: uma consulta pelos CPFs do arquivo (company_id + tax_id)
+- sobreposição com vínculos existentes: uma consulta com daterange (&&)
+- limite de vidas: uma contagem das vidas ativas
+- gravação: INSERT multi-row em blocos (pessoas novas e vidas) e um único commit
+
+Erros são reportados por linha; linhas válidas são importadas mesmo que outras
+falhem. Com dry_run nada é gravado.
+"""
+
+import csv
+import io
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import structlog
+from pydantic import ValidationError
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.orm.models import Contract, ContractLive, People
+from app.infrastructure.repositories.company_counters_repository import (
+    CompanyCountersRepository,
+)
+from app.presentation.schemas.contract_lives import (
+    ContractLifeImportError,
+    ContractLifeImportRow,
+    ContractLivesImportResponse,
+)
+
+try:
+    from openpyxl import load_workbook
+except ImportError:  # pragma: no cover - dependência opcional (XLSX)
+    load_workbook = None
+
+logger = structlog.get_logger()
+
+IMPORT_COLUMNS = (
+    "person_name",
+    "cpf",
+    "start_date",
+    "end_date",
+    "relationship_type",
+    "notes",
+)
+
+# Vínculos existentes cujo período intercepta o de alguma linha do arquivo
+_OVERLAP_SQL = """
+SELECT DISTINCT c.row_number
+FROM unnest(
+    CAST(:person_ids AS bigint[]),
+    CAST(:start_dates AS date[]),
+    CAST(:end_dates AS date[]),
+    CAST(:row_numbers AS integer[])
+) AS c(person_id, start_date, end_date, row_number)
+JOIN master.contract_lives l
+  ON l.contract_id = :contract_id
+ AND l.person_id = c.person_id
+ AND daterange(l.start_date, l.end_date, '[]')
+     && daterange(c.start_date, c.end_date, '[]')
+"""
+
+
+class ImportFileError(ValueError):
+    """Arquivo inválido como um todo (formato, cabeçalho, tamanho)"""
+
+
+@dataclass
+class _ValidRow:
+    row_number: int
+    data: ContractLifeImportRow
+
+
+def iter_import_rows(
+    filename: str, fileobj: BinaryIO
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """(número da linha, valores por coluna) sem carregar o arquivo inteiro"""
+    if (filename or "").lower().endswith(".xlsx"):
+        rows = _iter_xlsx(fileobj)
+    else:
+        rows = _iter_csv(fileobj)
+
+    header = next(rows, None)
+    if not header:
+        raise ImportFileError("Arquivo vazio")
+    columns = [str(value or "").strip().lower() for value in header]
+    missing = {"person_name", "cpf", "start_date", "relationship_type"} - set(columns)
+    if missing:
+        raise ImportFileError(
+            f"Colunas obrigatórias ausentes: {', '.join(sorted(missing))}"
+        )
+
+    for row_number, values in enumerate(rows, start=2):
+        if not any(value not in (None, "") for value in values):
+            continue
+        row = {}
+        for column, value in zip(columns, values):
+            if column in IMPORT_COLUMNS:
+                if isinstance(value, str):
+                    value = value.strip() or None
+                if column == "cpf" and value and value.isdigit():
+                    # Planilhas removem os zeros à esquerda do CPF
+                    value = value.zfill(11)
+                row[column] = value
+        yield row_number, row
+
+
+def _iter_csv(fileobj: BinaryIO) -> Iterator[List[Any]]:
+    text_stream = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        first_line = text_stream.readline()
+        delimiter = ";" if first_line.count(";") > first_line.count(",") else ","
+        yield next(csv.reader([first_line], delimiter=delimiter), [])
+        yield from csv.reader(text_stream, delimiter=delimiter)
+    finally:
+        # Não fecha o arquivo do UploadFile junto com o wrapper
+        text_stream.detach()
+
+
+def _iter_xlsx(fileobj: BinaryIO) -> Iterator[List[Any]]:
+    if load_workbook is None:
+        raise ImportFileError("Importação de XLSX requer o pacote openpyxl")
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        for values in workbook.active.iter_rows(values_only=True):
+            yield [_xlsx_value(value) for value in values]
+    finally:
+        workbook.close()
+
+
+def _xlsx_value(value: Any) -> Any:
+    # CPF digitado como número vira int/float na planilha
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    return value
+
+
+def _validation_message(error: ValidationError) -> str:
+    messages = []
+    for item in error.errors():
+        field = ".".join(str(part) for part in item["loc"])
+        messages.append(f"{field}: {item['msg']}" if field else item["msg"])
+    return "; ".join(messages)
+
+
+def _overlaps(first: ContractLifeImportRow, second: ContractLifeImportRow) -> bool:
+    first_end = first.end_date or date.max
+    second_end = second.end_date or date.max
+    return first.start_date <= second_end and second.start_date <= first_end
+
+
+class ContractLivesImportService:
+    """Valida e grava as vidas de um arquivo com consultas por lote"""
+
+    def __init__(self, db: AsyncSession, max_rows: int = 5000, batch_size: int = 1000):
+        self.db = db
+        self.max_rows = max_rows
+        self.batch_size = batch_size
+
+    async def import_file(
+        self,
+        contract: Contract,
+        company_id: int,
+        filename: str,
+        fileobj: BinaryIO,
+        created_by: Optional[int] = None,
+        dry_run: bool = False,
+    ) -> ContractLivesImportResponse:
+        """Importa as vidas do arquivo para um contrato já validado"""
+        errors: Dict[int, ContractLifeImportError] = {}
+        rows = self._parse(contract, filename, fileobj, errors)
+        total_rows = len(rows) + len(errors)
+
+        self._check_file_overlaps(rows, errors)
+        rows = [row for row in rows if row.row_number not in errors]
+
+        people = await self._fetch_people(company_id, {row.data.cpf for row in rows})
+        await self._check_existing_overlaps(contract.id, rows, people, errors)
+        rows = [row for row in rows if row.row_number not in errors]
+
+        rows = await self._apply_lives_limit(contract, rows, errors)
+
+        imported = len(rows)
+        if not dry_run and rows:
+            imported = await self._write(
+                contract.id, company_id, rows, people, created_by, errors
+            )
+            await self.db.commit()
+
+        logger.info(
+            "contract_lives_imported",
+            contract_id=contract.id,
+            total_rows=total_rows,
+            imported=imported,
+            failed=len(errors),
+            dry_run=dry_run,
+        )
+
+        return ContractLivesImportResponse(
+            total_rows=total_rows,
+            imported=imported,
+            failed=len(errors),
+            dry_run=dry_run,
+            errors=[errors[row_number] for row_number in sorted(errors)],
+        )
+
+    def _parse(
+        self,
+        contract: Contract,
+        filename: str,
+        fileobj: BinaryIO,
+        errors: Dict[int, ContractLifeImportError],
+    ) -> List[_ValidRow]:
+        rows: List[_ValidRow] = []
+        for row_number, values in iter_import_rows(filename, fileobj):
+            if len(rows) + len(errors) >= self.max_rows:
+                raise ImportFileError(
+                    f"Arquivo excede o limite de {self.max_rows} linhas"
+                )
+            try:
+                data = ContractLifeImportRow(**values)
+            except ValidationError as e:
+                errors[row_number] = ContractLifeImportError(
+                    row=row_number,
+                    cpf=values.get("cpf"),
+                    error=_validation_message(e),
+                )
+                continue
+
+            period_error = self._contract_period_error(contract, data)
+            if period_error:
+                errors[row_number] = ContractLifeImportError(
+                    row=row_number, cpf=data.cpf, error=period_error
+                )
+                continue
+
+            rows.append(_ValidRow(row_number, data))
+        return rows
+
+    @staticmethod
+    def _contract_period_error(
+        contract: Contract, data: ContractLifeImportRow
+    ) -> Optional[str]:
+        """Mesmas regras de validate_date_within_contract_period"""
+        if data.start_date < contract.start_date:
+            return (
+                f"Data de início da vida ({data.start_date}) é anterior ao "
+                f"início do contrato ({contract.start_date})"
+            )
+        if contract.end_date and data.start_date > contract.end_date:
+            return (
+                f"Data de início da vida ({data.start_date}) é posterior ao "
+                f"fim do contrato ({contract.end_date})"
+            )
+        if contract.end_date and data.end_date and data.end_date > contract.end_date:
+            return (
+                f"Data de fim da vida ({data.end_date}) é posterior ao "
+                f"fim do contrato ({contract.end_date})"
+            )
+        return None
+
+    @staticmethod
+    def _check_file_overlaps(
+        rows: List[_ValidRow], errors: Dict[int, ContractLifeImportError]
+    ) -> None:
+        """Períodos sobrepostos da mesma pessoa dentro do arquivo"""
+        by_cpf: Dict[str, List[_ValidRow]] = {}
+        for row in rows:
+            by_cpf.setdefault(row.data.cpf, []).append(row)
+
+        for cpf, person_rows in by_cpf.items():
+            person_rows.sort(key=lambda row: row.data.start_date)
+            # Compara com o período aceito que termina por último
+            kept = person_rows[0]
+            for current in person_rows[1:]:
+                if _overlaps(kept.data, current.data):
+                    errors[current.row_number] = ContractLifeImportError(
+                        row=current.row_number,
+                        cpf=cpf,
+                        error=(
+                            f"Período sobrepõe a linha {kept.row_number} "
+                            f"do arquivo para a mesma pessoa"
+                        ),
+                    )
+                elif (current.data.end_date or date.max) > (
+                    kept.data.end_date or date.max
+                ):
+                    kept = current
+
+    async def _fetch_people(self, company_id: int, cpfs: set) -> Dict[str, int]:
+        """tax_id -> person_id das pessoas já cadastradas (uma consulta)"""
+        if not cpfs:
+            return {}
+        result = await self.db.execute(
+            select(People.tax_id, People.id).where(
+                People.company_id == company_id, People.tax_id.in_(cpfs)
+            )
+        )
+        return {tax_id: person_id for tax_id, person_id in result.all()}
+
+    async def _check_existing_overlaps(
+        self,
+        contract_id: int,
+        rows: List[_ValidRow],
+        people: Dict[str, int],
+        errors: Dict[int, ContractLifeImportError],
+    ) -> None:
+        """Sobreposição com vínculos já gravados, em uma única consulta"""
+        candidates = [row for row in rows if row.data.cpf in people]
+        if not candidates:
+            return
+
+        result = await self.db.execute(
+            text(_OVERLAP_SQL),
+            {
+                "contract_id": contract_id,
+                "person_ids": [people[row.data.cpf] for row in candidates],
+                "start_dates": [row.data.start_date for row in candidates],
+                "end_dates": [row.data.end_date for row in candidates],
+                "row_numbers": [row.row_number for row in candidates],
+            },
+        )
+        by_number = {row.row_number: row for row in candidates}
+        for (row_number,) in result.all():
+            errors[row_number] = ContractLifeImportError(
+                row=row_number,
+                cpf=by_number[row_number].data.cpf,
+                error=(
+                    "Período sobrepõe vida existente desta pessoa no contrato. "
+                    "Uma pessoa não pode ter 2 vínculos ativos simultâneos."
+                ),
+            )
+
+    async def _apply_lives_limit(
+        self,
+        contract: Contract,
+        rows: List[_ValidRow],
+        errors: Dict[int, ContractLifeImportError],
+    ) -> List[_ValidRow]:
+        """Vagas restantes (máximo/contratadas) contadas uma vez para o lote"""
+        if not rows:
+            return rows
+
+        result = await self.db.execute(
+            select(func.count())
+            .select_from(ContractLive)
+            .where(
+                ContractLive.contract_id == contract.id,
+                ContractLive.status == "active",
+            )
+        )
+        active_count = result.scalar() or 0
+
+        limit = contract.lives_contracted
+        if contract.lives_maximum:
+            limit = min(limit, contract.lives_maximum)
+        available = max(limit - active_count, 0)
+
+        for row in rows[available:]:
+            errors[row.row_number] = ContractLifeImportError(
+                row=row.row_number,
+                cpf=row.data.cpf,
+                error=(
+                    f"Limite de vidas do contrato atingido. "
+                    f"Limite: {limit}, Ativas: {active_count}"
+                ),
+            )
+        return rows[:available]
+
+    async def _write(
+        self,
+        contract_id: int,
+        company_id: int,
+        rows: List[_ValidRow],
+        people: Dict[str, int],
+        created_by: Optional[int],
+        errors: Dict[int, ContractLifeImportError],
+    ) -> int:
+        new_people = {}
+        for row in rows:
+            if row.data.cpf not in people:
+                new_people.setdefault(row.data.cpf, row.data.person_name)
+        if new_people:
+            people.update(await self._insert_people(company_id, new_people))
+
+        values = [
+            {
+                "contract_id": contract_id,
+                "person_id": people[row.data.cpf],
+                "start_date": row.data.start_date,
+                "end_date": row.data.end_date,
+                "relationship_type": row.data.relationship_type,
+                "status": "active",
+                "substitution_reason": row.data.notes,
+                "created_by": created_by,
+            }
+            for row in rows
+        ]
+
+        inserted = set()
+        for start in range(0, len(values), self.batch_size):
+            result = await self.db.execute(
+                insert(ContractLive)
+                .values(values[start : start + self.batch_size])
+                .on_conflict_do_nothing(
+                    index_elements=["contract_id", "person_id", "start_date"]
+                )
+                .returning(ContractLive.person_id, ContractLive.start_date)
+            )
+            inserted.update(tuple(row) for row in result.all())
+
+        # Gravadas por outra requisição entre a validação e o INSERT
+        for row in rows:
+            if (people[row.data.cpf], row.data.start_date) not in inserted:
+                errors[row.row_number] = ContractLifeImportError(
+                    row=row.row_number,
+                    cpf=row.data.cpf,
+                    error="Vida já cadastrada para esta pessoa nesta data de início",
+                )
+
+        await CompanyCountersRepository(self.db).adjust_for_contract(
+            contract_id, active_lives_count=len(inserted)
+        )
+        return len(inserted)
+
+    async def _insert_people(
+        self, company_id: int, new_people: Dict[str, str]
+    ) -> Dict[str, int]:
+        """Cria as pessoas (PF) que ainda não existem; devolve tax_id -> id"""
+        values = [
+            {
+                "company_id": company_id,
+                "person_type": "PF",
+                "name": name,
+                "tax_id": cpf,
+                "status": "active",
+            }
+            for cpf, name in new_people.items()
+        ]
+
+        people = {}
+        for start in range(0, len(values), self.batch_size):
+            statement = insert(People).values(values[start : start + self.batch_size])
+            # Atualização sem efeito só para que o RETURNING traga também as
+            # pessoas criadas em paralelo por outra requisição
+            statement = statement.on_conflict_do_update(
+                index_elements=["company_id", "tax_id"],
+                set_={"tax_id": statement.excluded.tax_id},
+            ).returning(People.tax_id, People.id)
+            result = await self.db.execute(statement)
+            people.update({tax_id: person_id for tax_id, person_id in result.all()})
+        return people
+
+
+def get_contract_lives_import_service(db: AsyncSession) -> ContractLivesImportService:
+    from config.settings import settings
+
+    return ContractLivesImportService(
+        db,
+        max_rows=settings.contract_lives_import_max_rows,
+        batch_size=settings.contract_lives_import_batch_size,
+    )
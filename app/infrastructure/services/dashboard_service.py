@@ -8,9 +8,11 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
 import structlog
-from sqlalchemy import and_, func, select, text
+from sqlalchemy import text
 
-from app.infrastructure.orm.models import Client, Establishments, Professional, User
+from app.infrastructure.repositories.company_counters_repository import (
+    CompanyCountersRepository,
+)
 from app.infrastructure.services.security_service import SecurityService
 
 logger = structlog.get_logger()
@@ -239,41 +241,13 @@ class DashboardService:
         metrics = []
 
         try:
-            # Total de usuários
-            total_users = await self.session.execute(
-                select(func.count(User.id)).where(User.deleted_at.is_(None))
-            )
-            total_users = total_users.scalar() or 0
-
-            # Usuários ativos
-            active_users = await self.session.execute(
-                select(func.count(User.id)).where(
-                    and_(User.is_active == True, User.deleted_at.is_(None))
-                )
-            )
-            active_users = active_users.scalar() or 0
-
-            # Total de profissionais
-            total_professionals = await self.session.execute(
-                select(func.count(Professional.id)).where(
-                    Professional.deleted_at.is_(None)
-                )
-            )
-            total_professionals = total_professionals.scalar() or 0
-
-            # Total de clientes
-            total_clients = await self.session.execute(
-                select(func.count(Client.id)).where(Client.deleted_at.is_(None))
-            )
-            total_clients = total_clients.scalar() or 0
-
-            # Total de estabelecimentos
-            total_establishments = await self.session.execute(
-                select(func.count(Establishments.id)).where(
-                    Establishments.deleted_at.is_(None)
-                )
-            )
-            total_establishments = total_establishments.scalar() or 0
+            # Contadores somados da projeção por empresa (master.company_counters)
+            counters = await CompanyCountersRepository(self.session).totals()
+            total_users = counters["users_count"]
+            active_users = counters["active_users_count"]
+            total_professionals = counters["professionals_count"]
+            total_clients = counters["clients_count"]
+            total_establishments = counters["establishments_count"]
 
             metrics.extend(
                 [
@@ -0,0 +1,346 @@
+"""
+Auditoria LGPD de acesso a dados pessoais
+
+Cada leitura auditada (listagem de usuários, views seguras) vira um evento
+numa fila em memória do worker; uma tarefa em segundo plano grava os eventos
+em master.query_audit_logs a cada flush_interval segundos (ou quando a fila
+atinge batch_size), com um único INSERT ... SELECT FROM jsonb_to_recordset
+por lote. A leitura auditada não ganha um round trip de escrita.
+
+- fila limitada (max_queue_size): com a política "block" quem registra
+  aguarda um flush por até block_timeout segundos antes de descartar; com
+  "drop" o evento é descartado na hora. Descartes são contados em stats e
+  registrados no log
+- se um INSERT falhar, o lote volta para o início da fila; depois de
+  max_batch_retries falhas seguidas ele é estacionado para não bloquear os
+  demais. Lotes estacionados são regravados quando o banco volta a aceitar
+  escritas; se ainda falharem, são divididos ao meio até isolar o evento
+  problemático, que é descartado (e registrado no log com seu conteúdo)
+- o flush final acontece no shutdown da aplicação: o loop é sinalizado em
+  vez de cancelado, então uma escrita em andamento termina antes
+"""
+
+import asyncio
+import json
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import structlog
+from sqlalchemy import text
+
+logger = structlog.get_logger()
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP = "drop"
+
+_INSERT_SQL = """
+INSERT INTO master.query_audit_logs (
+    "timestamp", user_id, ip_address, session_id, table_accessed,
+    records_accessed, records_count, query_purpose, lawful_basis,
+    data_sensitivity_level, access_context, application_module
+)
+SELECT e."timestamp", e.user_id, e.ip_address, e.session_id, e.table_accessed,
+       e.records_accessed, e.records_count, e.query_purpose, e.lawful_basis,
+       e.data_sensitivity_level, e.access_context, e.application_module
+FROM jsonb_to_recordset(CAST(:events AS jsonb)) AS e(
+    "timestamp" timestamptz,
+    user_id bigint,
+    ip_address varchar,
+    session_id varchar,
+    table_accessed varchar,
+    records_accessed jsonb,
+    records_count integer,
+    query_purpose text,
+    lawful_basis varchar,
+    data_sensitivity_level varchar,
+    access_context varchar,
+    application_module varchar
+)
+"""
+
+
+@dataclass
+class DataAccessEvent:
+    """Acesso a dados pessoais (uma linha de master.query_audit_logs)"""
+
+    user_id: int
+    table_accessed: str
+    records_count: int = 0
+    records_accessed: Optional[Any] = None
+    query_purpose: str = "System query"
+    lawful_basis: str = "legitimate_interests"
+    data_sensitivity_level: str = "confidential"
+    ip_address: str = "127.0.0.1"
+    session_id: Optional[str] = None
+    access_context: Optional[str] = None
+    application_module: Optional[str] = None
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def to_row(self) -> Dict[str, Any]:
+        row = asdict(self)
+        row["timestamp"] = self.timestamp.isoformat()
+        # Limites das colunas varchar da tabela
+        row["table_accessed"] = self.table_accessed[:63]
+        if self.access_context:
+            row["access_context"] = self.access_context[:200]
+        return row
+
+
+class DataAccessAuditLog:
+    """Fila limitada de eventos de auditoria com flush periódico em lote"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Any]] = None,
+        flush_interval: float = 2.0,
+        batch_size: int = 500,
+        max_queue_size: int = 10000,
+        overflow_policy: str = OVERFLOW_BLOCK,
+        block_timeout: float = 1.0,
+        max_batch_retries: int = 3,
+        stop_timeout: float = 10.0,
+    ):
+        self._session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.max_batch_retries = max_batch_retries
+        self.stop_timeout = stop_timeout
+        self._queue: Deque[DataAccessEvent] = deque()
+        self._parked: Deque[List[DataAccessEvent]] = deque()
+        self._parked_events = 0
+        self._batch_failures = 0
+        self._stopping = False
+        self._flush_lock = asyncio.Lock()
+        self._space_available = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_requested: Optional[asyncio.Event] = None
+        self.stats: Dict[str, int] = {
+            "recorded": 0,
+            "written": 0,
+            "dropped": 0,
+            "errors": 0,
+            "parked": 0,
+            "discarded": 0,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self._flush_task is not None
+
+    def pending(self) -> int:
+        return len(self._queue) + self._parked_events
+
+    async def record(self, event: DataAccessEvent) -> bool:
+        """Enfileira o evento; False se foi descartado por fila cheia"""
+        if self.pending() >= self.max_queue_size:
+            if self.overflow_policy == OVERFLOW_BLOCK and self.is_running:
+                self._flush_requested.set()
+                await self._wait_for_space()
+            if self.pending() >= self.max_queue_size:
+                self.stats["dropped"] += 1
+                logger.warning(
+                    "lgpd_audit_event_dropped",
+                    table=event.table_accessed,
+                    user_id=event.user_id,
+                    dropped_total=self.stats["dropped"],
+                )
+                return False
+
+        self._queue.append(event)
+        self.stats["recorded"] += 1
+
+        if self._flush_requested and len(self._queue) >= self.batch_size:
+            self._flush_requested.set()
+        return True
+
+    async def _wait_for_space(self) -> None:
+        self._space_available.clear()
+        try:
+            await asyncio.wait_for(self._space_available.wait(), self.block_timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def flush(self) -> int:
+        """Grava os eventos pendentes em lotes; retorna quantos foram gravados"""
+        async with self._flush_lock:
+            written = 0
+            failed = False
+            while self._queue:
+                count = min(self.batch_size, len(self._queue))
+                batch = [self._queue.popleft() for _ in range(count)]
+                try:
+                    await self._write(batch)
+                except Exception as e:
+                    self._batch_failed(batch, e)
+                    failed = True
+                    break
+                except BaseException:
+                    # Cancelado durante a escrita: o lote volta para a fila
+                    self._queue.extendleft(reversed(batch))
+                    raise
+
+                self._batch_failures = 0
+                written += len(batch)
+                self._space_available.set()
+
+            if self._parked and not failed:
+                written += await self._retry_parked(healthy=written > 0)
+
+            self.stats["written"] += written
+            return written
+
+    def _batch_failed(self, batch: List[DataAccessEvent], error: Exception) -> None:
+        """Devolve o lote à fila ou, após max_batch_retries falhas, o estaciona"""
+        self.stats["errors"] += 1
+        self._batch_failures += 1
+        logger.error(
+            "lgpd_audit_flush_failed",
+            events=len(batch),
+            attempt=self._batch_failures,
+            error=str(error),
+        )
+        if self._batch_failures < self.max_batch_retries:
+            self._queue.extendleft(reversed(batch))
+            return
+
+        # O lote deixa de bloquear a fila; os seguintes seguem no próximo flush
+        self._batch_failures = 0
+        self._park(batch)
+        self.stats["parked"] += len(batch)
+        logger.error("lgpd_audit_batch_parked", events=len(batch))
+
+    def _park(self, batch: List[DataAccessEvent], first: bool = False) -> None:
+        if first:
+            self._parked.appendleft(batch)
+        else:
+            self._parked.append(batch)
+        self._parked_events += len(batch)
+
+    def _unpark(self) -> List[DataAccessEvent]:
+        batch = self._parked.popleft()
+        self._parked_events -= len(batch)
+        return batch
+
+    async def _retry_parked(self, healthy: bool) -> int:
+        """
+        Regrava os lotes estacionados (uma tentativa por lote e flush)
+
+        Enquanto nenhuma escrita deste flush teve sucesso a falha é tratada
+        como indisponibilidade do banco: o lote vai para o fim da fila de
+        estacionados e o próximo flush testa outro. Com o banco respondendo,
+        o lote que falha é dividido ao meio; um evento sozinho que falha é
+        descartado.
+        """
+        written = 0
+        for _ in range(len(self._parked)):
+            batch = self._unpark()
+            try:
+                await self._write(batch)
+            except Exception as e:
+                self.stats["errors"] += 1
+                if not healthy:
+                    self._park(batch)
+                    break
+                self._split_parked(batch, e)
+                continue
+            except BaseException:
+                self._park(batch, first=True)
+                raise
+
+            healthy = True
+            written += len(batch)
+            self._space_available.set()
+        return written
+
+    def _split_parked(self, batch: List[DataAccessEvent], error: Exception) -> None:
+        if len(batch) > 1:
+            middle = len(batch) // 2
+            self._park(batch[:middle])
+            self._park(batch[middle:])
+            return
+
+        self.stats["discarded"] += 1
+        self._space_available.set()
+        logger.error(
+            "lgpd_audit_event_discarded",
+            audit_event=batch[0].to_row(),
+            error=str(error),
+        )
+
+    async def _write(self, batch: List[DataAccessEvent]) -> None:
+        events = json.dumps([event.to_row() for event in batch], default=str)
+        async with self._get_session_factory()() as session:
+            await session.execute(text(_INSERT_SQL), {"events": events})
+            await session.commit()
+
+    def _get_session_factory(self):
+        if self._session_factory is None:
+            from app.infrastructure.database import async_session
+
+            self._session_factory = async_session
+        return self._session_factory
+
+    async def start(self):
+        """Inicia o flush periódico"""
+        if self.is_running:
+            return
+        self._flush_requested = asyncio.Event()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info("LGPD audit log started", interval=self.flush_interval)
+
+    async def stop(self):
+        """Encerra o flush periódico e grava o que estiver pendente"""
+        if self._flush_task is not None:
+            # Sinaliza o loop em vez de cancelá-lo: a escrita em andamento
+            # termina; só é cancelada se passar de stop_timeout (e o lote
+            # volta para a fila)
+            self._stopping = True
+            self._flush_requested.set()
+            done, _ = await asyncio.wait({self._flush_task}, timeout=self.stop_timeout)
+            if not done:
+                self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+            self._flush_requested = None
+            self._stopping = False
+        written = await self.flush()
+        if self.pending():
+            logger.error("lgpd_audit_events_lost", events=self.pending())
+        logger.info("LGPD audit log stopped", written=written)
+
+    async def _flush_loop(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            if self._stopping:
+                break
+            await self.flush()
+
+
+_data_access_audit_log: Optional[DataAccessAuditLog] = None
+
+
+def get_data_access_audit_log() -> DataAccessAuditLog:
+    """Instância global da auditoria de acesso a dados"""
+    global _data_access_audit_log
+    if _data_access_audit_log is None:
+        from config.settings import settings
+
+        _data_access_audit_log = DataAccessAuditLog(
+            flush_interval=settings.lgpd_audit_flush_interval,
+            batch_size=settings.lgpd_audit_batch_size,
+            max_queue_size=settings.lgpd_audit_max_queue_size,
+            overflow_policy=settings.lgpd_audit_overflow_policy,
+            max_batch_retries=settings.lgpd_audit_max_batch_retries,
+        )
+    return _data_access_audit_log
@@ -0,0 +1,305 @@
+"""
+Email outbox - entrega assíncrona de emails
+
+Emails são enfileirados em memória e entregues por workers em background,
+cada um mantendo uma conexão SMTP persistente (verificada com NOOP antes de
+cada lote e refeita sem custo de tentativa se o servidor a encerrou). A conversa SMTP (bloqueante)
+roda em threads, nunca no event loop. Inclui lotes por conexão, retentativas
+com backoff exponencial e limite de envios por segundo.
+"""
+
+import asyncio
+import smtplib
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from email.message import Message
+from typing import Callable, Deque, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class OutboxEmail:
+    """Email aguardando entrega"""
+
+    message: Message
+    attempts: int = 0
+    enqueued_at: float = field(default_factory=time.monotonic)
+    last_error: Optional[str] = None
+
+
+def _connection_lost(error: BaseException) -> bool:
+    """Erro que invalida a conexão SMTP
+
+    SMTPException herda de OSError, mas recusas de destinatário ou remetente
+    chegam por uma conexão que continua utilizável.
+    """
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+class EmailOutboxFullError(Exception):
+    """Fila de emails cheia"""
+
+
+class _RateLimiter:
+    """Espaçamento mínimo entre envios (compartilhado entre workers)"""
+
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, count: int = 1):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + self.interval * count
+        delay = start - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class EmailOutbox:
+    """Fila de saída com pool de conexões SMTP persistentes"""
+
+    def __init__(
+        self,
+        connection_factory: Callable[[], smtplib.SMTP],
+        workers: int = 2,
+        queue_size: int = 5000,
+        batch_size: int = 20,
+        max_attempts: int = 3,
+        retry_base_delay: float = 5.0,
+        rate_limit_per_second: float = 10.0,
+        dead_letter_size: int = 100,
+    ):
+        self.connection_factory = connection_factory
+        self.workers = workers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.rate_limit_per_second = rate_limit_per_second
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._retry_tasks: set = set()
+        self._rate_limiter: Optional[_RateLimiter] = None
+        self.dead_letters: Deque[OutboxEmail] = deque(maxlen=dead_letter_size)
+        self.stats: Dict[str, int] = {
+            "enqueued": 0,
+            "sent": 0,
+            "retried": 0,
+            "failed": 0,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._worker_tasks)
+
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def start(self):
+        """Inicia os workers de envio"""
+        if self.is_running:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._rate_limiter = _RateLimiter(self.rate_limit_per_second)
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(worker_id))
+            for worker_id in range(self.workers)
+        ]
+        logger.info("Email outbox started", workers=self.workers)
+
+    async def stop(self, drain_timeout: float = 10.0):
+        """Aguarda a fila esvaziar (até drain_timeout) e encerra os workers"""
+        if not self.is_running:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Email outbox stopped with pending emails", pending=self.pending()
+            )
+
+        if self._retry_tasks:
+            logger.warning(
+                "Email outbox stopped with scheduled retries",
+                retries=len(self._retry_tasks),
+            )
+
+        for task in [*self._worker_tasks, *self._retry_tasks]:
+            task.cancel()
+        await asyncio.gather(
+            *self._worker_tasks, *self._retry_tasks, return_exceptions=True
+        )
+        self._worker_tasks = []
+        self._retry_tasks = set()
+        logger.info("Email outbox stopped", stats=self.stats)
+
+    def enqueue(self, message: Message) -> None:
+        """Enfileira email para entrega (não bloqueia)"""
+        if not self.is_running:
+            raise RuntimeError("Email outbox is not running")
+        try:
+            self._queue.put_nowait(OutboxEmail(message=message))
+        except asyncio.QueueFull:
+            raise EmailOutboxFullError("Fila de emails cheia")
+        self.stats["enqueued"] += 1
+
+    async def _next_batch(self) -> List[OutboxEmail]:
+        batch = [await self._queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _worker(self, worker_id: int):
+        connection: Optional[smtplib.SMTP] = None
+        try:
+            while True:
+                batch = await self._next_batch()
+                try:
+                    await self._rate_limiter.acquire(len(batch))
+                    connection, failures = await asyncio.to_thread(
+                        self._deliver_batch, connection, batch
+                    )
+                    self.stats["sent"] += len(batch) - len(failures)
+                    for item in failures:
+                        self._schedule_retry(item)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if connection is not None:
+                await asyncio.to_thread(self._close_connection, connection)
+
+    def _deliver_batch(
+        self, connection: Optional[smtplib.SMTP], batch: List[OutboxEmail]
+    ):
+        """Envia um lote reutilizando a conexão (executa em thread)
+
+        A conexão é aberta e fechada apenas aqui: `connection` sempre aponta
+        para a conexão viva (ou None), inclusive quando o envio falha.
+        """
+        failures: List[OutboxEmail] = []
+        connection = self._check_connection(connection)
+        for item in batch:
+            item.attempts += 1
+            try:
+                reused = connection is not None
+                if connection is None:
+                    connection = self.connection_factory()
+                try:
+                    connection.send_message(item.message)
+                except OSError as e:
+                    if not reused or not _connection_lost(e):
+                        raise
+                    # Servidor encerrou a conexão ociosa: não conta como tentativa
+                    self._close_connection(connection)
+                    connection = None
+                    connection = self.connection_factory()
+                    connection.send_message(item.message)
+            except Exception as e:
+                item.last_error = str(e)
+                failures.append(item)
+                if _connection_lost(e):
+                    # Conexão quebrada: descarta e reconecta no próximo email
+                    self._close_connection(connection)
+                    connection = None
+                # Recusa do servidor ou mensagem inválida: a conexão continua
+                # válida para os próximos emails
+        return connection, failures
+
+    def _check_connection(
+        self, connection: Optional[smtplib.SMTP]
+    ) -> Optional[smtplib.SMTP]:
+        """NOOP antes de reutilizar a conexão; None se ela não responder"""
+        if connection is None:
+            return None
+        try:
+            code, _ = connection.noop()
+            if code == 250:
+                return connection
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._close_connection(connection)
+        return None
+
+    @staticmethod
+    def _close_connection(connection: Optional[smtplib.SMTP]):
+        if connection is None:
+            return
+        try:
+            connection.quit()
+        except Exception:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def _schedule_retry(self, item: OutboxEmail):
+        if item.attempts >= self.max_attempts:
+            self.stats["failed"] += 1
+            self.dead_letters.append(item)
+            logger.error(
+                "Email delivery failed",
+                to=item.message.get("To"),
+                subject=item.message.get("Subject"),
+                attempts=item.attempts,
+                error=item.last_error,
+            )
+            return
+
+        self.stats["retried"] += 1
+        delay = self.retry_base_delay * (2 ** (item.attempts - 1))
+        task = asyncio.create_task(self._requeue_later(item, delay))
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    async def _requeue_later(self, item: OutboxEmail, delay: float):
+        await asyncio.sleep(delay)
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.stats["failed"] += 1
+            self.dead_letters.append(item)
+
+
+def _create_default_outbox() -> EmailOutbox:
+    from app.infrastructure.services.email_service import EmailService
+    from config.settings import settings
+
+    return EmailOutbox(
+        connection_factory=EmailService()._create_smtp_connection,
+        workers=settings.email_outbox_workers,
+        queue_size=settings.email_outbox_queue_size,
+        batch_size=settings.email_outbox_batch_size,
+        max_attempts=settings.email_outbox_max_attempts,
+        rate_limit_per_second=settings.email_outbox_rate_limit_per_second,
+    )
+
+
+_email_outbox: Optional[EmailOutbox] = None
+
+
+def get_email_outbox() -> EmailOutbox:
+    """Instância global da outbox"""
+    global _email_outbox
+    if _email_outbox is None:
+        _email_outbox = _create_default_outbox()
+    return _email_outbox
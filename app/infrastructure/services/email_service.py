@@ -1,6 +1,8 @@
+import asyncio
 import secrets
 import smtplib
 from datetime import datetime, timedelta
+from email.message import Message
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from typing import Optional
@@ -26,9 +28,9 @@ class EmailService:
     def _create_smtp_connection(self):
         """Cria conexão SMTP"""
         if self.smtp_use_ssl:
-            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port)
+            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=30)
         else:
-            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=30)
             if self.smtp_use_tls:
                 server.starttls()
 
@@ -37,6 +39,33 @@ class EmailService:
 
         return server
 
+    def _send_now(self, msg: Message) -> None:
+        """Envio síncrono em conexão própria (executa fora do event loop)"""
+        with self._create_smtp_connection() as server:
+            server.send_message(msg)
+
+    async def _dispatch(self, msg: Message) -> bool:
+        """
+        Entrega o email via outbox (fila + pool SMTP em background).
+        Sem outbox ativa, ou com a fila cheia, envia em uma thread para não
+        bloquear o event loop.
+        """
+        from app.infrastructure.services.email_outbox import (
+            EmailOutboxFullError,
+            get_email_outbox,
+        )
+
+        outbox = get_email_outbox()
+        if outbox.is_running:
+            try:
+                outbox.enqueue(msg)
+                return True
+            except EmailOutboxFullError:
+                pass
+
+        await asyncio.to_thread(self._send_now, msg)
+        return True
+
     async def send_activation_email(
         self,
         email: str,
@@ -163,11 +192,8 @@ class EmailService:
             msg.attach(MIMEText(text_content, "plain"))
             msg.attach(MIMEText(html_content, "html"))
 
-            # Enviar email
-            with self._create_smtp_connection() as server:
-                server.send_message(msg)
-
-            return True
+            # Enviar email (outbox assíncrona quando disponível)
+            return await self._dispatch(msg)
 
         except Exception as e:
             print(f"Erro ao enviar email de ativação: {str(e)}")
@@ -271,10 +297,8 @@ class EmailService:
             msg.attach(MIMEText(text_content, "plain"))
             msg.attach(MIMEText(html_content, "html"))
 
-            with self._create_smtp_connection() as server:
-                server.send_message(msg)
-
-            return True
+            # Enviar email (outbox assíncrona quando disponível)
+            return await self._dispatch(msg)
 
         except Exception as e:
             print(f"Erro ao enviar email de reset: {str(e)}")
@@ -420,10 +444,8 @@ class EmailService:
             msg.attach(MIMEText(text_content, "plain"))
             msg.attach(MIMEText(html_content, "html"))
 
-            with self._create_smtp_connection() as server:
-                server.send_message(msg)
-
-            return True
+            # Enviar email (outbox assíncrona quando disponível)
+            return await self._dispatch(msg)
 
         except Exception as e:
             print(f"Erro ao enviar email de aceite de contrato: {str(e)}")
@@ -588,10 +610,8 @@ class EmailService:
             msg.attach(MIMEText(text_content, "plain"))
             msg.attach(MIMEText(html_content, "html"))
 
-            with self._create_smtp_connection() as server:
-                server.send_message(msg)
-
-            return True
+            # Enviar email (outbox assíncrona quando disponível)
+            return await self._dispatch(msg)
 
         except Exception as e:
             print(f"Erro ao enviar email de criação de gestor: {str(e)}")
@@ -3,13 +3,16 @@ Menu Service - Sistema de menus dinâmicos baseado em permissões
 Integra com views PostgreSQL e sistema de segurança
 """
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import Any, Dict, List, Optional
 
 import structlog
 from sqlalchemy import and_, select, text
 
-from app.infrastructure.cache.decorators import cache_invalidate, cached
+from app.infrastructure.cache.menu_catalog import (
+    get_menu_catalog_store,
+    permission_fingerprint,
+)
 from app.infrastructure.orm.views import MenuHierarchyView
 from app.infrastructure.services.security_service import SecurityService
 
@@ -63,11 +66,6 @@ class MenuService:
         self.session = session
         self.security_service = security_service
 
-    @cached(
-        ttl=300,  # 5 minutos
-        key_prefix="menu_tree",
-        invalidate_patterns=["cache:func:*menu*"],
-    )
     async def get_user_menu_tree(
         self,
         user_id: int,
@@ -77,6 +75,10 @@ class MenuService:
     ) -> List[MenuItem]:
         """
         Busca árvore de menus para usuário baseado em permissões
+
+        A árvore filtrada é cacheada por versão do catálogo de menus e
+        fingerprint das permissões: usuários com o mesmo perfil compartilham
+        a mesma entrada.
         """
         try:
             # Buscar contexto do usuário
@@ -86,6 +88,17 @@ class MenuService:
                 establishment_id=establishment_id,
             )
 
+            store = get_menu_catalog_store()
+            version = await store.current_version()
+            fingerprint = permission_fingerprint(
+                context.active_permissions, context.is_system_admin, menu_type
+            )
+            namespace = f"service:{menu_type}"
+
+            cached_tree = await store.get_tree(namespace, version, fingerprint)
+            if cached_tree is not None:
+                return [self._menu_item_from_dict(item) for item in cached_tree]
+
             # Buscar menus com hierarquia
             query = (
                 select(MenuHierarchyView)
@@ -113,6 +126,9 @@ class MenuService:
 
             # Construir árvore
             menu_tree = self._build_menu_tree(filtered_menus)
+            await store.set_tree(
+                namespace, version, fingerprint, [asdict(item) for item in menu_tree]
+            )
 
             await logger.ainfo(
                 "user_menu_tree_built",
@@ -423,6 +439,11 @@ class MenuService:
             )
             return False
 
+    def _menu_item_from_dict(self, data: Dict[str, Any]) -> MenuItem:
+        """Reconstrói MenuItem (e filhos) a partir do cache"""
+        children = [self._menu_item_from_dict(child) for child in data["children"]]
+        return MenuItem(**{**data, "children": children})
+
     def _build_menu_tree(self, menu_items: List) -> List[MenuItem]:
         """
         Constrói árvore hierárquica de menus
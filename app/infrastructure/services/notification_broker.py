@@ -0,0 +1,237 @@
+"""
+Broker de eventos de notificação em tempo real
+
+Cada worker mantém as conexões (SSE) dos seus usuários e recebe os eventos
+por Redis pub/sub, um canal por usuário (notifications:user:{id}) assinado
+apenas enquanto houver conexão local. Sem Redis (ou nos testes) o broker em
+memória entrega só dentro do próprio processo.
+
+- eventos: notification (id = id da notificação, usado como Last-Event-ID),
+  unread_count ({"count": n} na conexão, {"delta": ±n} depois) e resync
+- backpressure: cada conexão tem uma fila limitada; se o cliente não
+  acompanha, a fila é descartada e ele recebe resync (reconecta com o
+  Last-Event-ID e recebe o que perdeu do banco)
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+
+import structlog
+
+logger = structlog.get_logger()
+
+CHANNEL_PREFIX = "notifications:user:"
+
+EVENT_NOTIFICATION = "notification"
+EVENT_UNREAD_COUNT = "unread_count"
+EVENT_RESYNC = "resync"
+
+
+@dataclass
+class NotificationEvent:
+    """Evento entregue às conexões do usuário"""
+
+    event: str
+    data: Dict[str, Any]
+    id: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"event": self.event, "data": self.data, "id": self.id}
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "NotificationEvent":
+        return cls(event=payload["event"], data=payload["data"], id=payload.get("id"))
+
+    def encode_sse(self) -> str:
+        """Formato text/event-stream"""
+        lines = []
+        if self.id is not None:
+            lines.append(f"id: {self.id}")
+        lines.append(f"event: {self.event}")
+        lines.append(f"data: {json.dumps(self.data, default=str)}")
+        return "\n".join(lines) + "\n\n"
+
+
+class NotificationSubscription:
+    """Conexão de um usuário: fila limitada de eventos"""
+
+    def __init__(self, broker: "NotificationBroker", user_id: int, queue_size: int):
+        self.broker = broker
+        self.user_id = user_id
+        self.overflowed = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def deliver(self, event: NotificationEvent) -> None:
+        """Enfileira sem bloquear o publicador"""
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Cliente lento: descarta o que está pendente e pede resync
+            self.overflowed = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(
+                NotificationEvent(EVENT_RESYNC, {"reason": "overflow"})
+            )
+            logger.warning("notification_subscriber_overflow", user_id=self.user_id)
+
+    async def next_event(self, timeout: float) -> Optional[NotificationEvent]:
+        """Próximo evento ou None após timeout (hora do heartbeat)"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self) -> None:
+        await self.broker.unsubscribe(self)
+
+
+class NotificationBroker:
+    """Fan-out em memória (um processo); base do broker Redis"""
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscriptions: Dict[int, Set[NotificationSubscription]] = {}
+
+    def connected_users(self) -> int:
+        return len(self._subscriptions)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, user_id: int, event: NotificationEvent) -> None:
+        self._dispatch(user_id, event)
+
+    async def subscribe(self, user_id: int) -> NotificationSubscription:
+        subscription = NotificationSubscription(self, user_id, self.queue_size)
+        subscriptions = self._subscriptions.setdefault(user_id, set())
+        subscriptions.add(subscription)
+        if len(subscriptions) == 1:
+            await self._watch(user_id)
+        return subscription
+
+    async def unsubscribe(self, subscription: NotificationSubscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if not subscriptions or subscription not in subscriptions:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.user_id]
+            await self._unwatch(subscription.user_id)
+
+    def _dispatch(self, user_id: int, event: NotificationEvent) -> None:
+        for subscription in list(self._subscriptions.get(user_id, ())):
+            subscription.deliver(event)
+
+    async def _watch(self, user_id: int) -> None:
+        """Primeira conexão local do usuário"""
+
+    async def _unwatch(self, user_id: int) -> None:
+        """Última conexão local do usuário encerrada"""
+
+
+class RedisNotificationBroker(NotificationBroker):
+    """Fan-out entre workers via Redis pub/sub"""
+
+    def __init__(self, redis, queue_size: int = 100):
+        super().__init__(queue_size)
+        self.redis = redis
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._listener is not None:
+            return
+        self._pubsub = self.redis.pubsub()
+        self._listener = asyncio.create_task(self._listen())
+        logger.info("Notification broker started", backend="redis")
+
+    async def stop(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+        try:
+            await self._pubsub.aclose()
+        except Exception as e:
+            logger.warning("notification_pubsub_close_failed", error=str(e))
+        self._pubsub = None
+
+    async def publish(self, user_id: int, event: NotificationEvent) -> None:
+        try:
+            await self.redis.publish(
+                f"{CHANNEL_PREFIX}{user_id}", json.dumps(event.to_dict(), default=str)
+            )
+        except Exception as e:
+            # Sem Redis, ao menos as conexões deste worker recebem
+            logger.warning("notification_publish_failed", user_id=user_id, error=str(e))
+            self._dispatch(user_id, event)
+
+    async def _watch(self, user_id: int) -> None:
+        if self._pubsub is not None:
+            await self._pubsub.subscribe(f"{CHANNEL_PREFIX}{user_id}")
+
+    async def _unwatch(self, user_id: int) -> None:
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(f"{CHANNEL_PREFIX}{user_id}")
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                if not self._pubsub.subscribed:
+                    # Nenhum usuário conectado neste worker
+                    await asyncio.sleep(0.5)
+                    continue
+
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+                if not message or message["type"] != "message":
+                    continue
+
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                user_id = int(channel[len(CHANNEL_PREFIX) :])
+                self._dispatch(
+                    user_id, NotificationEvent.from_dict(json.loads(message["data"]))
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("notification_listener_error", error=str(e))
+                await asyncio.sleep(1.0)
+
+
+def _create_default_broker() -> NotificationBroker:
+    from app.infrastructure.cache.simplified_redis import simplified_redis_client
+    from config.settings import settings
+
+    redis = simplified_redis_client.redis
+    if settings.notification_broker == "redis" and hasattr(redis, "pubsub"):
+        return RedisNotificationBroker(
+            redis, queue_size=settings.notification_stream_queue_size
+        )
+    return NotificationBroker(queue_size=settings.notification_stream_queue_size)
+
+
+_notification_broker: Optional[NotificationBroker] = None
+
+
+def get_notification_broker() -> NotificationBroker:
+    """Instância global do broker (criar após conectar o Redis)"""
+    global _notification_broker
+    if _notification_broker is None:
+        _notification_broker = _create_default_broker()
+    return _notification_broker
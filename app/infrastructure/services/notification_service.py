@@ -1,17 +1,28 @@
 """
 Notification Service - Sistema de notificações em tempo real
-Integra com WebSockets, email, SMS e push notifications
+Integra com SSE (notification_broker), email, SMS e push notifications
 """
 
 import json
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional
 
 import structlog
 from sqlalchemy import text
 
+from app.infrastructure.cache.unread_counters import (
+    UnreadCounterStore,
+    get_unread_counter_store,
+)
+from app.infrastructure.services.notification_broker import (
+    EVENT_NOTIFICATION,
+    EVENT_UNREAD_COUNT,
+    NotificationBroker,
+    NotificationEvent,
+    get_notification_broker,
+)
 from app.infrastructure.services.security_service import SecurityService
 
 logger = structlog.get_logger()
@@ -95,10 +106,17 @@ class NotificationService:
     Serviço de notificações com múltiplos canais e templates
     """
 
-    def __init__(self, session, security_service: SecurityService):
+    def __init__(
+        self,
+        session,
+        security_service: SecurityService,
+        broker: Optional[NotificationBroker] = None,
+        unread_counters: Optional[UnreadCounterStore] = None,
+    ):
         self.session = session
         self.security_service = security_service
-        self._websocket_connections: Set[Any] = set()  # WebSocket connections
+        self.broker = broker or get_notification_broker()
+        self.unread_counters = unread_counters or get_unread_counter_store()
 
     async def create_notification(
         self,
@@ -150,7 +168,20 @@ class NotificationService:
             )
 
             # Enviar pelos canais habilitados
-            await self._send_notification(notification_id, enabled_channels)
+            await self._send_notification(
+                notification_id,
+                enabled_channels,
+                user_id=user_id,
+                payload={
+                    "id": notification_id,
+                    "type": template.type.value,
+                    "title": title,
+                    "message": message,
+                    "data": variables,
+                    "priority": priority,
+                },
+            )
+            await self._unread_changed(user_id, 1, notification_id)
 
             await logger.ainfo(
                 "notification_created",
@@ -208,11 +239,24 @@ class NotificationService:
         return notification_ids
 
     async def get_user_notifications(
-        self, user_id: int, unread_only: bool = False, limit: int = 50, offset: int = 0
+        self,
+        user_id: int,
+        unread_only: bool = False,
+        limit: int = 50,
+        offset: int = 0,
+        since_id: Optional[int] = None,
     ) -> List[Notification]:
         """
         Busca notificações do usuário
+
+        Com since_id retorna apenas as criadas depois dela, em ordem de id
+        (busca incremental: o cliente guarda o último id recebido).
         """
+        if since_id is not None:
+            return await self.get_notifications_after(
+                user_id, since_id, limit, unread_only
+            )
+
         try:
             query = text(
                 """
@@ -239,29 +283,7 @@ class NotificationService:
                 },
             )
 
-            notifications = []
-            for row in result.fetchall():
-                notifications.append(
-                    Notification(
-                        id=row.id,
-                        user_id=row.user_id,
-                        template_id=row.template_id,
-                        type=NotificationType(row.type),
-                        title=row.title,
-                        message=row.message,
-                        data=row.data,
-                        channels=[NotificationChannel(c) for c in row.channels],
-                        is_read=row.is_read,
-                        is_sent=row.is_sent,
-                        sent_at=row.sent_at,
-                        read_at=row.read_at,
-                        expires_at=row.expires_at,
-                        created_at=row.created_at,
-                        priority=row.priority,
-                    )
-                )
-
-            return notifications
+            return [self._row_to_notification(row) for row in result.fetchall()]
 
         except Exception as e:
             await logger.aerror(
@@ -269,6 +291,106 @@ class NotificationService:
             )
             return []
 
+    async def get_notifications_after(
+        self, user_id: int, last_id: int, limit: int = 100, unread_only: bool = False
+    ) -> List[Notification]:
+        """
+        Notificações com id maior que last_id, em ordem de criação
+        (reenvio ao reconectar com Last-Event-ID)
+        """
+        try:
+            query = text(
+                """
+                SELECT
+                    id, user_id, template_id, type, title, message, data,
+                    channels, is_read, is_sent, sent_at, read_at, expires_at,
+                    created_at, priority
+                FROM master.notifications
+                WHERE user_id = :user_id
+                  AND id > :last_id
+                  AND (expires_at IS NULL OR expires_at > NOW())
+                  AND (:unread_only = false OR is_read = false)
+                ORDER BY id
+                LIMIT :limit
+            """
+            )
+
+            result = await self.session.execute(
+                query,
+                {
+                    "user_id": user_id,
+                    "last_id": last_id,
+                    "limit": limit,
+                    "unread_only": unread_only,
+                },
+            )
+            return [self._row_to_notification(row) for row in result.fetchall()]
+
+        except Exception as e:
+            await logger.aerror(
+                "get_notifications_after_failed", user_id=user_id, error=str(e)
+            )
+            return []
+
+    async def count_user_notifications(
+        self,
+        user_id: int,
+        unread_only: bool = False,
+        since_id: Optional[int] = None,
+    ) -> int:
+        """
+        Total de notificações com os mesmos filtros de get_user_notifications
+
+        Sem since_id, o total de não lidas vem do contador mantido
+        incrementalmente.
+        """
+        if unread_only and since_id is None:
+            return await self.get_unread_count(user_id)
+
+        try:
+            query = text(
+                """
+                SELECT COUNT(*)
+                FROM master.notifications
+                WHERE user_id = :user_id
+                  AND (CAST(:since_id AS bigint) IS NULL OR id > :since_id)
+                  AND (expires_at IS NULL OR expires_at > NOW())
+                  AND (:unread_only = false OR is_read = false)
+            """
+            )
+
+            result = await self.session.execute(
+                query,
+                {"user_id": user_id, "since_id": since_id, "unread_only": unread_only},
+            )
+            return result.scalar() or 0
+
+        except Exception as e:
+            await logger.aerror(
+                "count_notifications_failed", user_id=user_id, error=str(e)
+            )
+            return 0
+
+    @staticmethod
+    def _row_to_notification(row) -> Notification:
+        return Notification(
+            id=row.id,
+            user_id=row.user_id,
+            template_id=row.template_id,
+            type=NotificationType(row.type),
+            title=row.title,
+            message=row.message,
+            data=row.data,
+            channels=[NotificationChannel(c) for c in row.channels],
+            is_read=row.is_read,
+            is_sent=row.is_sent,
+            sent_at=row.sent_at,
+            read_at=row.read_at,
+            expires_at=row.expires_at,
+            created_at=row.created_at,
+            priority=row.priority,
+        )
+
     async def mark_as_read(self, user_id: int, notification_ids: List[int]) -> int:
         """
         Marca notificações como lidas
@@ -290,6 +412,7 @@ class NotificationService:
 
             await self.session.commit()
             updated_count = result.rowcount
+            await self._unread_changed(user_id, -updated_count)
 
             await logger.ainfo(
                 "notifications_marked_read", user_id=user_id, count=updated_count
@@ -318,6 +441,8 @@ class NotificationService:
             await self.session.commit()
 
             updated_count = result.rowcount
+            await self.unread_counters.set(user_id, 0)
+            await self._publish_unread_delta(user_id, -updated_count)
 
             await logger.ainfo(
                 "all_notifications_marked_read", user_id=user_id, count=updated_count
@@ -332,7 +457,14 @@ class NotificationService:
     async def get_unread_count(self, user_id: int) -> int:
         """
         Conta notificações não lidas
+
+        Lê o contador mantido incrementalmente; o banco só é consultado para
+        reconciliá-lo (ausente ou mais antigo que o intervalo configurado).
         """
+        count = await self.unread_counters.get(user_id)
+        if count is not None:
+            return count
+
         try:
             query = text(
                 """
@@ -347,6 +479,7 @@ class NotificationService:
             result = await self.session.execute(query, {"user_id": user_id})
             count = result.scalar() or 0
 
+            await self.unread_counters.set(user_id, count)
             return count
 
         except Exception as e:
@@ -451,7 +584,7 @@ class NotificationService:
 
                 notification_ids.append(notification_id)
 
-                # Enviar via WebSocket se disponível
+                # Enviar às conexões em tempo real do usuário
                 await self._send_websocket_notification(
                     user_id,
                     {
@@ -462,6 +595,7 @@ class NotificationService:
                         "priority": 5,
                     },
                 )
+                await self._unread_changed(user_id, 1, notification_id)
 
             await logger.ainfo(
                 "system_alert_sent",
@@ -641,7 +775,11 @@ class NotificationService:
         return notification_id
 
     async def _send_notification(
-        self, notification_id: int, channels: List[NotificationChannel]
+        self,
+        notification_id: int,
+        channels: List[NotificationChannel],
+        user_id: Optional[int] = None,
+        payload: Optional[Dict[str, Any]] = None,
     ):
         """Envia notificação pelos canais especificados"""
         for channel in channels:
@@ -650,7 +788,8 @@ class NotificationService:
                     # Já está salvo no banco
                     pass
                 elif channel == NotificationChannel.WEBSOCKET:
-                    await self._send_websocket_notification_by_id(notification_id)
+                    if user_id is not None and payload is not None:
+                        await self._send_websocket_notification(user_id, payload)
                 elif channel == NotificationChannel.EMAIL:
                     await self._send_email_notification(notification_id)
                 elif channel == NotificationChannel.SMS:
@@ -666,13 +805,41 @@ class NotificationService:
                 )
 
     async def _send_websocket_notification(self, user_id: int, data: Dict[str, Any]):
-        """Envia notificação via WebSocket"""
-        # Implementação simplificada - seria integrada com WebSocket manager real
-        await logger.ainfo("websocket_notification_sent", user_id=user_id)
+        """Publica a notificação para as conexões em tempo real do usuário"""
+        try:
+            await self.broker.publish(
+                user_id, NotificationEvent(EVENT_NOTIFICATION, data, id=data["id"])
+            )
+            await logger.ainfo("websocket_notification_sent", user_id=user_id)
+        except Exception as e:
+            await logger.aerror(
+                "websocket_notification_failed", user_id=user_id, error=str(e)
+            )
 
-    async def _send_websocket_notification_by_id(self, notification_id: int):
-        """Envia notificação via WebSocket usando ID"""
-        # Implementação futura
+    async def _unread_changed(
+        self, user_id: int, delta: int, notification_id: Optional[int] = None
+    ):
+        """Ajusta o contador de não lidas e publica a variação"""
+        await self.unread_counters.add(user_id, delta)
+        await self._publish_unread_delta(user_id, delta, notification_id)
+
+    async def _publish_unread_delta(
+        self, user_id: int, delta: int, notification_id: Optional[int] = None
+    ):
+        """Publica a variação do contador de não lidas (após o commit)"""
+        if not delta:
+            return
+        data: Dict[str, Any] = {"delta": delta}
+        if notification_id is not None:
+            data["notification_id"] = notification_id
+        try:
+            await self.broker.publish(
+                user_id, NotificationEvent(EVENT_UNREAD_COUNT, data)
+            )
+        except Exception as e:
+            await logger.aerror(
+                "unread_delta_publish_failed", user_id=user_id, error=str(e)
+            )
 
     async def _send_email_notification(self, notification_id: int):
         """Envia notificação por email"""
@@ -731,7 +898,10 @@ class NotificationService:
 
 # Factory function para dependency injection
 def get_notification_service(
-    session, security_service: SecurityService
+    session,
+    security_service: SecurityService,
+    broker: Optional[NotificationBroker] = None,
+    unread_counters: Optional[UnreadCounterStore] = None,
 ) -> NotificationService:
     """Factory function for NotificationService"""
-    return NotificationService(session, security_service)
+    return NotificationService(session, security_service, broker, unread_counters)
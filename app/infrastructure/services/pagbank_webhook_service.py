@@ -4,6 +4,7 @@ from typing import Dict, Optional
 
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.infrastructure.orm.models import (
     ContractBillingSchedule,
@@ -276,8 +277,12 @@ class PagBankWebhookService:
 
         # Update last attempt if this is a failure
         if status in ["SUSPENDED", "CANCELLED", "PAYMENT_FAILED"]:
-            schedule.last_attempt_date = datetime.now().date()
-            schedule.attempt_count += 1
+            # Atomic UPDATE in the webhook transaction (no read-modify-write)
+            attempt_count = await self.billing_repository.increment_billing_attempt(
+                schedule.id
+            )
+            set_committed_value(schedule, "attempt_count", attempt_count)
+            set_committed_value(schedule, "last_attempt_date", datetime.now().date())
 
         await self.db.flush()
 
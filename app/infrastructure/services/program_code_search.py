@@ -0,0 +1,464 @@
+"""
+Índice em memória para busca de códigos de programas (Ctrl+Alt+X)
+
+master.program_codes é pequena e quase somente leitura, então cada worker
+mantém uma cópia indexada:
+- trie de prefixos sobre shortcode e label
+- índice invertido de trigramas (label, description) para busca por
+  substring e similaridade, compatível com pg_trgm
+- mapa de tokens (search_tokens)
+
+A relevância segue os mesmos níveis da busca SQL. O índice é recarregado
+quando master.program_codes_version muda (trigger da migration 019),
+verificado no máximo a cada check_interval segundos. Se a tabela de versão
+não existir (migration 019 não aplicada), a falha fica registrada por
+unavailable_retry segundos e as buscas usam o SQL sem nova tentativa.
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = structlog.get_logger()
+
+# Padrão: 2 letras + 4 dígitos (ex: em0001, ct0012)
+SHORTCODE_PATTERN = re.compile(r"^[a-z]{2}\d{4}$")
+
+# Mesmo limiar da busca SQL
+MIN_RELEVANCE = 0.3
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def pg_trigrams(value: str) -> FrozenSet[str]:
+    """Trigramas no formato do pg_trgm (palavras com padding "  " + w + " ")"""
+    grams: Set[str] = set()
+    for word in _WORD_RE.findall(value.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def trigram_similarity(left: FrozenSet[str], right: FrozenSet[str]) -> float:
+    """Equivalente a similarity() do pg_trgm"""
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+
+def _substring_grams(value: str) -> Set[str]:
+    return {value[i : i + 3] for i in range(len(value) - 2)}
+
+
+@dataclass
+class ProgramCodeEntry:
+    """Código de programa ativo"""
+
+    id: int
+    shortcode: str
+    label: str
+    description: Optional[str]
+    route: str
+    icon: Optional[str]
+    module_code: str
+    program_type: str
+    search_tokens: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.label_lower = self.label.lower()
+        self.description_lower = (self.description or "").lower()
+        self.label_trigrams = pg_trigrams(self.label)
+
+
+@dataclass
+class ProgramCodeMatch:
+    """Resultado de busca com nível de relevância"""
+
+    entry: ProgramCodeEntry
+    match_type: str
+    relevance_score: float
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.ids: Set[int] = set()
+
+
+class _PrefixTrie:
+    """Trie de prefixos; cada nó guarda os ids das chaves abaixo dele"""
+
+    def __init__(self):
+        self.root = _TrieNode()
+
+    def insert(self, key: str, entry_id: int):
+        node = self.root
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            node.ids.add(entry_id)
+
+    def starting_with(self, prefix: str) -> Set[int]:
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return set()
+        return node.ids
+
+
+class ProgramCodeSearchIndex:
+    """Índice de busca de códigos de programas de um worker"""
+
+    def __init__(
+        self,
+        check_interval: float = 5.0,
+        max_results: int = 20,
+        unavailable_retry: float = 60.0,
+    ):
+        self.check_interval = check_interval
+        self.max_results = max_results
+        self.unavailable_retry = unavailable_retry
+        self.version: Optional[int] = None
+        self._last_check = 0.0
+        self._unavailable_until = 0.0
+        self._refresh_lock = asyncio.Lock()
+        self._build([])
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    @property
+    def is_unavailable(self) -> bool:
+        """True enquanto uma falha recente de carga estiver em cache"""
+        return time.monotonic() < self._unavailable_until
+
+    def mark_unavailable(self):
+        """Evita consultar a versão de novo por unavailable_retry segundos"""
+        self._unavailable_until = time.monotonic() + self.unavailable_retry
+
+    def load(self, entries: Iterable[ProgramCodeEntry], version: Optional[int]):
+        """Substitui o conteúdo do índice"""
+        self._build(list(entries))
+        self.version = version
+        self._last_check = time.monotonic()
+
+    def _build(self, entries: List[ProgramCodeEntry]):
+        by_id: Dict[int, ProgramCodeEntry] = {}
+        by_shortcode: Dict[str, ProgramCodeEntry] = {}
+        label_trie = _PrefixTrie()
+        shortcode_trie = _PrefixTrie()
+        substring_index: Dict[str, Set[int]] = {}
+        trigram_index: Dict[str, Set[int]] = {}
+        token_index: Dict[str, Set[int]] = {}
+
+        for entry in entries:
+            by_id[entry.id] = entry
+            by_shortcode[entry.shortcode.lower()] = entry
+            label_trie.insert(entry.label_lower, entry.id)
+            shortcode_trie.insert(entry.shortcode.lower(), entry.id)
+            for gram in _substring_grams(entry.label_lower) | _substring_grams(
+                entry.description_lower
+            ):
+                substring_index.setdefault(gram, set()).add(entry.id)
+            for gram in entry.label_trigrams:
+                trigram_index.setdefault(gram, set()).add(entry.id)
+            for token in entry.search_tokens:
+                token_index.setdefault(token, set()).add(entry.id)
+
+        # Troca atômica: buscas concorrentes veem o índice antigo ou o novo
+        (
+            self._entries,
+            self._by_shortcode,
+            self._label_trie,
+            self._shortcode_trie,
+            self._substring_index,
+            self._trigram_index,
+            self._token_index,
+        ) = (
+            by_id,
+            by_shortcode,
+            label_trie,
+            shortcode_trie,
+            substring_index,
+            trigram_index,
+            token_index,
+        )
+
+    # ------------------------------------------------------------------
+    # Busca
+    # ------------------------------------------------------------------
+
+    def get_exact(self, shortcode: str) -> Optional[ProgramCodeEntry]:
+        """Busca exata por código"""
+        return self._by_shortcode.get(shortcode.lower())
+
+    def shortcodes_starting_with(self, prefix: str) -> List[ProgramCodeEntry]:
+        """Códigos que começam com o prefixo (autocomplete)"""
+        ids = self._shortcode_trie.starting_with(prefix.lower())
+        return sorted(
+            (self._entries[entry_id] for entry_id in ids), key=lambda e: e.shortcode
+        )
+
+    def _contains_candidates(self, query: str) -> Set[int]:
+        """Entradas cujo label ou description contém a query"""
+        if len(query) < 3:
+            candidates: Iterable[int] = self._entries.keys()
+        else:
+            postings = [self._substring_index.get(g) for g in _substring_grams(query)]
+            if not all(postings):
+                return set()
+            candidates = set.intersection(*postings)
+
+        return {
+            entry_id
+            for entry_id in candidates
+            if query in self._entries[entry_id].label_lower
+            or query in self._entries[entry_id].description_lower
+        }
+
+    def search(self, query: str) -> List[ProgramCodeMatch]:
+        """Busca por nome/tokens com os mesmos níveis de relevância do SQL"""
+        query = query.lower().strip()
+        if not query:
+            return []
+
+        query_trigrams = pg_trigrams(query)
+        candidates = self._contains_candidates(query)
+        candidates |= self._token_index.get(query, set())
+        for gram in query_trigrams:
+            candidates |= self._trigram_index.get(gram, set())
+        label_prefix_ids = self._label_trie.starting_with(query)
+
+        matches: List[ProgramCodeMatch] = []
+        for entry_id in candidates:
+            entry = self._entries[entry_id]
+            is_token = query in entry.search_tokens
+
+            if entry.label_lower == query:
+                score = 1.0
+            elif entry_id in label_prefix_ids:
+                score = 0.9
+            elif query in entry.label_lower:
+                score = 0.8
+            elif is_token:
+                score = 0.7
+            else:
+                score = trigram_similarity(entry.label_trigrams, query_trigrams)
+
+            if score <= MIN_RELEVANCE:
+                continue
+
+            if entry.label_lower == query:
+                match_type = "exact"
+            elif is_token:
+                match_type = "token"
+            else:
+                match_type = "fuzzy"
+            matches.append(ProgramCodeMatch(entry, match_type, score))
+
+        matches.sort(key=lambda m: (-m.relevance_score, m.entry.label))
+        return matches[: self.max_results]
+
+    # ------------------------------------------------------------------
+    # Atualização
+    # ------------------------------------------------------------------
+
+    async def ensure_fresh(self, db: AsyncSession):
+        """Recarrega o índice se a versão da tabela mudou"""
+        if (
+            self.version is not None
+            and time.monotonic() - self._last_check < self.check_interval
+        ):
+            return
+
+        async with self._refresh_lock:
+            if (
+                self.version is not None
+                and time.monotonic() - self._last_check < self.check_interval
+            ):
+                return
+
+            version = await fetch_program_codes_version(db)
+            if version != self.version:
+                entries = await fetch_active_program_codes(db)
+                self.load(entries, version)
+                logger.info(
+                    "program_code_index_loaded", version=version, size=self.size
+                )
+            else:
+                self._last_check = time.monotonic()
+
+
+async def fetch_program_codes_version(db: AsyncSession) -> int:
+    result = await db.execute(
+        text("SELECT version FROM master.program_codes_version WHERE id = 1")
+    )
+    return result.scalar_one()
+
+
+async def fetch_active_program_codes(db: AsyncSession) -> List[ProgramCodeEntry]:
+    result = await db.execute(
+        text(
+            """
+            SELECT
+                id, shortcode, label, description, route, icon,
+                module_code, program_type, search_tokens
+            FROM master.program_codes
+            WHERE is_active = TRUE
+        """
+        )
+    )
+    return [
+        ProgramCodeEntry(
+            id=row.id,
+            shortcode=row.shortcode,
+            label=row.label,
+            description=row.description,
+            route=row.route,
+            icon=row.icon,
+            module_code=row.module_code,
+            program_type=row.program_type,
+            search_tokens=list(row.search_tokens or []),
+        )
+        for row in result.fetchall()
+    ]
+
+
+# =====================================================
+# BUSCA SQL (fallback quando o índice não está disponível)
+# =====================================================
+
+
+def _row_to_match(row) -> ProgramCodeMatch:
+    entry = ProgramCodeEntry(
+        id=row.id,
+        shortcode=row.shortcode,
+        label=row.label,
+        description=row.description,
+        route=row.route,
+        icon=row.icon,
+        module_code=row.module_code,
+        program_type=row.program_type,
+    )
+    return ProgramCodeMatch(entry, row.match_type, float(row.relevance_score))
+
+
+async def sql_exact_search(
+    db: AsyncSession, shortcode: str
+) -> Optional[ProgramCodeMatch]:
+    """Busca exata por código no banco"""
+    stmt = text(
+        """
+        SELECT
+            id,
+            shortcode,
+            label,
+            description,
+            route,
+            icon,
+            module_code,
+            program_type,
+            'exact' as match_type,
+            1.0 as relevance_score
+        FROM master.program_codes
+        WHERE shortcode = :code
+        AND is_active = TRUE
+        LIMIT 1
+    """
+    )
+
+    result = await db.execute(stmt, {"code": shortcode})
+    row = result.fetchone()
+    return _row_to_match(row) if row else None
+
+
+async def sql_fuzzy_search(db: AsyncSession, query: str) -> List[ProgramCodeMatch]:
+    """Busca por nome/tokens no banco (pg_trgm)"""
+    # Busca combinada:
+    # a) Similaridade no label (pg_trgm)
+    # b) Match em search_tokens (array contains)
+    # c) Match no description
+    stmt = text(
+        """
+        WITH search_results AS (
+            SELECT
+                id,
+                shortcode,
+                label,
+                description,
+                route,
+                icon,
+                module_code,
+                program_type,
+                CASE
+                    -- Prioridade 1: Match exato no label (case insensitive)
+                    WHEN LOWER(label) = :query THEN 1.0
+                    -- Prioridade 2: Label começa com query
+                    WHEN LOWER(label) LIKE :query_start THEN 0.9
+                    -- Prioridade 3: Label contém query
+                    WHEN LOWER(label) LIKE :query_like THEN 0.8
+                    -- Prioridade 4: Match em search_tokens
+                    WHEN :query = ANY(search_tokens) THEN 0.7
+                    -- Prioridade 5: Similaridade pg_trgm
+                    ELSE similarity(label, :query)
+                END as relevance_score,
+                CASE
+                    WHEN LOWER(label) = :query THEN 'exact'
+                    WHEN :query = ANY(search_tokens) THEN 'token'
+                    ELSE 'fuzzy'
+                END as match_type
+            FROM master.program_codes
+            WHERE is_active = TRUE
+            AND (
+                -- Match em label
+                LOWER(label) LIKE :query_like
+                -- Match em search_tokens
+                OR :query = ANY(search_tokens)
+                -- Match em description
+                OR LOWER(description) LIKE :query_like
+                -- Similaridade pg_trgm > 0.3
+                OR similarity(label, :query) > 0.3
+            )
+        )
+        SELECT *
+        FROM search_results
+        WHERE relevance_score > 0.3
+        ORDER BY relevance_score DESC, label ASC
+        LIMIT 20
+    """
+    )
+
+    result = await db.execute(
+        stmt,
+        {
+            "query": query,
+            "query_start": f"{query}%",
+            "query_like": f"%{query}%",
+        },
+    )
+    return [_row_to_match(row) for row in result.fetchall()]
+
+
+_program_code_index: Optional[ProgramCodeSearchIndex] = None
+
+
+def get_program_code_index() -> ProgramCodeSearchIndex:
+    """Instância do índice deste worker"""
+    global _program_code_index
+    if _program_code_index is None:
+        from config.settings import settings
+
+        _program_code_index = ProgramCodeSearchIndex(
+            check_interval=settings.program_code_index_check_interval
+        )
+    return _program_code_index
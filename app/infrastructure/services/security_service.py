@@ -10,6 +10,13 @@ from fastapi import Depends
 from sqlalchemy import text
 
 from app.infrastructure.database import get_db
+from app.infrastructure.security.session_context_cache import (
+    get_session_context_cache,
+)
+from app.infrastructure.services.data_access_audit import (
+    DataAccessEvent,
+    get_data_access_audit_log,
+)
 
 logger = structlog.get_logger()
 
@@ -194,11 +201,22 @@ class SecurityService:
         """
         Valida sessão e contexto do usuário
         Function: validate_session_context
+
+        Contextos válidos ficam em cache até o expires_at da sessão
+        (memória do worker + Redis), sem consulta nas requisições seguintes.
         """
+        cache = get_session_context_cache()
+        cached_context = await cache.get(session_token, user_id)
+        if cached_context is not None:
+            return cached_context
+
         try:
             query = text(
                 """
-                SELECT * FROM master.validate_session_context(:session_token, :user_id)
+                SELECT v.*, us.expires_at AS session_expires_at
+                FROM master.validate_session_context(:session_token, :user_id) v
+                LEFT JOIN master.user_sessions us
+                    ON us.session_token = :session_token
             """
             )
 
@@ -217,6 +235,7 @@ class SecurityService:
                     context_id=row.context_id,
                     can_impersonate=row.can_impersonate or False,
                 )
+                await cache.set(session_token, user_id, context, row.session_expires_at)
             else:
                 context = SessionContext(
                     is_valid=False,
@@ -282,6 +301,8 @@ class SecurityService:
             )
 
             success = result.scalar() or False
+            if success:
+                await get_session_context_cache().invalidate(session_token)
 
             await logger.ainfo(
                 "context_switch",
@@ -369,32 +390,28 @@ class SecurityService:
     ) -> bool:
         """
         Registra acesso a dados de usuário (auditoria LGPD)
-        Function: log_user_data_access
+
+        O evento é enfileirado e gravado em lote em master.query_audit_logs
+        (data_access_audit); a leitura não espera a escrita.
+        Retorna False se o evento foi descartado por fila cheia.
         """
         try:
-            query = text(
-                """
-                SELECT master.log_user_data_access(
-                    :accessed_by_user_id, :accessed_user_id, :view_name,
-                    :access_type, :additional_data
+            records_accessed: Dict[str, Any] = {"user_ids": [accessed_user_id]}
+            if additional_data:
+                records_accessed["details"] = additional_data
+
+            logged = await get_data_access_audit_log().record(
+                DataAccessEvent(
+                    user_id=accessed_by_user_id,
+                    table_accessed=view_name,
+                    records_accessed=records_accessed,
+                    records_count=1,
+                    query_purpose=f"User data access ({access_type})",
+                    data_sensitivity_level="sensitive_personal",
+                    application_module="security_service",
                 )
-            """
             )
 
-            result = await self.session.execute(
-                query,
-                {
-                    "accessed_by_user_id": accessed_by_user_id,
-                    "accessed_user_id": accessed_user_id,
-                    "view_name": view_name,
-                    "access_type": access_type,
-                    "additional_data": additional_data,
-                },
-            )
-
-            logged = result.scalar() or False
-
-            # Log estruturado (não aguardar)
             logger.info(
                 "user_data_access_logged",
                 accessed_by=accessed_by_user_id,
@@ -0,0 +1,247 @@
+"""
+Contadores write-behind
+
+Incrementos frequentes (usage_count de códigos de programas, last_login_at)
+são acumulados em memória no worker e gravados em
+lote a cada flush_interval segundos: um único UPDATE ... FROM unnest(...) por
+tabela, em vez de um UPDATE + commit por evento disputando o lock da mesma
+linha. Timestamps são combinados pelo máximo (GREATEST).
+
+O flush final acontece no shutdown da aplicação; se um flush falhar, os
+valores pendentes voltam para o buffer e são regravados no próximo ciclo.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import structlog
+from sqlalchemy import text
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class CounterTarget:
+    """Tabela e colunas atualizadas por um contador"""
+
+    name: str
+    table: str
+    key_column: str
+    key_type: str
+    increment_columns: Tuple[str, ...] = ()
+    max_columns: Dict[str, str] = field(default_factory=dict)  # coluna -> tipo
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def build_update(self) -> str:
+        """UPDATE em lote com um array por coluna"""
+        assignments = [
+            f"{column} = COALESCE(t.{column}, 0) + v.{column}"
+            for column in self.increment_columns
+        ]
+        assignments += [
+            f"{column} = GREATEST(t.{column}, v.{column})"
+            for column in self.max_columns
+        ]
+
+        arrays = [f"CAST(:keys AS {self.key_type}[])"]
+        arrays += [f"CAST(:{c} AS integer[])" for c in self.increment_columns]
+        arrays += [f"CAST(:{c} AS {t}[])" for c, t in self.max_columns.items()]
+        columns = ["key", *self.increment_columns, *self.max_columns]
+
+        return (
+            f"UPDATE {self.table} AS t SET {', '.join(assignments)} "
+            f"FROM unnest({', '.join(arrays)}) AS v({', '.join(columns)}) "
+            f"WHERE t.{self.key_column} = v.key"
+        )
+
+
+PROGRAM_CODE_USAGE = CounterTarget(
+    name="program_code_usage",
+    table="master.program_codes",
+    key_column="shortcode",
+    key_type="varchar",
+    increment_columns=("usage_count",),
+    max_columns={"last_used_at": "timestamp"},
+)
+
+USER_LAST_LOGIN = CounterTarget(
+    name="user_last_login",
+    table="master.users",
+    key_column="id",
+    key_type="bigint",
+    max_columns={"last_login_at": "timestamp"},
+)
+
+
+@dataclass
+class _PendingUpdate:
+    increments: Dict[str, int] = field(default_factory=dict)
+    maxima: Dict[str, Any] = field(default_factory=dict)
+
+    def merge(self, increments: Dict[str, int], maxima: Dict[str, Any]):
+        for column, amount in increments.items():
+            self.increments[column] = self.increments.get(column, 0) + amount
+        for column, value in maxima.items():
+            current = self.maxima.get(column)
+            if value is not None and (current is None or value > current):
+                self.maxima[column] = value
+
+
+class WriteBehindCounters:
+    """Buffer de incrementos com flush periódico em lote"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Any]] = None,
+        flush_interval: float = 5.0,
+        max_pending_keys: int = 10000,
+    ):
+        self._session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_pending_keys = max_pending_keys
+        self._pending: Dict[CounterTarget, Dict[Hashable, _PendingUpdate]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_requested: Optional[asyncio.Event] = None
+        self.stats: Dict[str, int] = {"recorded": 0, "flushed_rows": 0, "errors": 0}
+
+    @property
+    def is_running(self) -> bool:
+        return self._flush_task is not None
+
+    def pending_keys(self) -> int:
+        return sum(len(keys) for keys in self._pending.values())
+
+    def record(
+        self,
+        target: CounterTarget,
+        key: Hashable,
+        increments: Optional[Dict[str, int]] = None,
+        maxima: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Acumula incrementos/máximos para uma linha (não bloqueia)"""
+        pending = self._pending.setdefault(target, {})
+        pending.setdefault(key, _PendingUpdate()).merge(increments or {}, maxima or {})
+        self.stats["recorded"] += 1
+
+        if self._flush_requested and self.pending_keys() >= self.max_pending_keys:
+            self._flush_requested.set()
+
+    def increment(
+        self,
+        target: CounterTarget,
+        key: Hashable,
+        amount: int = 1,
+        **maxima: Any,
+    ) -> None:
+        """Incrementa a primeira coluna do alvo (atalho para record)"""
+        self.record(target, key, {target.increment_columns[0]: amount}, maxima)
+
+    def pending_increment(
+        self, target: CounterTarget, key: Hashable, column: Optional[str] = None
+    ) -> int:
+        """Incremento ainda não gravado (para leituras consistentes)"""
+        column = column or target.increment_columns[0]
+        pending = self._pending.get(target, {}).get(key)
+        return pending.increments.get(column, 0) if pending else 0
+
+    async def flush(self) -> int:
+        """Grava todos os valores pendentes; retorna o número de linhas"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            batch, self._pending = self._pending, {}
+            flushed = 0
+            for target, updates in batch.items():
+                try:
+                    await self._write(target, updates)
+                    flushed += len(updates)
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    logger.error(
+                        "write_behind_flush_failed",
+                        target=target.name,
+                        keys=len(updates),
+                        error=str(e),
+                    )
+                    self._restore(target, updates)
+
+            self.stats["flushed_rows"] += flushed
+            return flushed
+
+    async def _write(
+        self, target: CounterTarget, updates: Dict[Hashable, _PendingUpdate]
+    ):
+        keys = list(updates)
+        params: Dict[str, list] = {"keys": keys}
+        for column in target.increment_columns:
+            params[column] = [updates[k].increments.get(column, 0) for k in keys]
+        for column in target.max_columns:
+            params[column] = [updates[k].maxima.get(column) for k in keys]
+
+        async with self._get_session_factory()() as session:
+            await session.execute(text(target.build_update()), params)
+            await session.commit()
+
+    def _restore(self, target: CounterTarget, updates: Dict[Hashable, _PendingUpdate]):
+        pending = self._pending.setdefault(target, {})
+        for key, update in updates.items():
+            pending.setdefault(key, _PendingUpdate()).merge(
+                update.increments, update.maxima
+            )
+
+    def _get_session_factory(self):
+        if self._session_factory is None:
+            from app.infrastructure.database import async_session
+
+            self._session_factory = async_session
+        return self._session_factory
+
+    async def start(self):
+        """Inicia o flush periódico"""
+        if self.is_running:
+            return
+        self._flush_requested = asyncio.Event()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info("Write-behind counters started", interval=self.flush_interval)
+
+    async def stop(self):
+        """Encerra o flush periódico e grava o que estiver pendente"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+            self._flush_requested = None
+        flushed = await self.flush()
+        logger.info("Write-behind counters stopped", flushed_rows=flushed)
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+
+_write_behind_counters: Optional[WriteBehindCounters] = None
+
+
+def get_write_behind_counters() -> WriteBehindCounters:
+    """Instância global dos contadores write-behind"""
+    global _write_behind_counters
+    if _write_behind_counters is None:
+        from config.settings import settings
+
+        _write_behind_counters = WriteBehindCounters(
+            flush_interval=settings.write_behind_flush_interval,
+            max_pending_keys=settings.write_behind_max_pending_keys,
+        )
+    return _write_behind_counters
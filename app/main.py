@@ -1,7 +1,5 @@
 import os
 
-# Configure structured logging
-import structlog
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
@@ -9,25 +7,20 @@ from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from structlog import get_logger
 
+# Configure structured logging
+from app.infrastructure.logging import (
+    configure_logging,
+    parse_event_rules,
+    shutdown_logging,
+)
 from app.presentation.api.v1.api import api_router
 from config.settings import settings
 
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer(),
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
+configure_logging(
+    level=settings.log_level,
+    sample_rates=parse_event_rules(settings.log_sample_rates),
+    rate_limits=parse_event_rules(settings.log_rate_limits),
+    queue_size=settings.log_queue_size,
 )
 
 logger = get_logger()
@@ -148,12 +141,15 @@ from app.infrastructure.exceptions import (
     business_exception_handler,
     general_exception_handler,
     not_found_exception_handler,
+    password_hasher_busy_handler,
     validation_exception_handler,
 )
+from app.infrastructure.security.password_hasher import PasswordHasherBusyError
 
 app.add_exception_handler(BusinessException, business_exception_handler)
 app.add_exception_handler(ValidationException, validation_exception_handler)
 app.add_exception_handler(NotFoundException, not_found_exception_handler)
+app.add_exception_handler(PasswordHasherBusyError, password_hasher_busy_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
 # Include API routes
@@ -258,11 +254,42 @@ async def startup_event():
 
     await simplified_redis_client.connect()
 
+    from app.infrastructure.cache.permission_cache import init_permission_cache
+
+    await init_permission_cache()
+
     # Start performance monitoring
     from app.infrastructure.monitoring.metrics import performance_metrics
 
     await performance_metrics.start_system_monitoring(interval=30)
 
+    # Start email outbox (async SMTP delivery)
+    if settings.send_emails and settings.email_outbox_enabled:
+        from app.infrastructure.services.email_outbox import get_email_outbox
+
+        await get_email_outbox().start()
+
+    # Start real-time notification fan-out (after Redis is connected)
+    from app.infrastructure.services.notification_broker import (
+        get_notification_broker,
+    )
+
+    await get_notification_broker().start()
+
+    # Start write-behind counter flushing
+    from app.infrastructure.services.write_behind_counters import (
+        get_write_behind_counters,
+    )
+
+    await get_write_behind_counters().start()
+
+    # Start batched LGPD data-access auditing
+    from app.infrastructure.services.data_access_audit import (
+        get_data_access_audit_log,
+    )
+
+    await get_data_access_audit_log().start()
+
     logger.info("All systems initialized")
 
 
@@ -275,12 +302,55 @@ async def shutdown_event():
 
     await performance_metrics.stop_system_monitoring()
 
+    # Deliver pending emails
+    from app.infrastructure.services.email_outbox import get_email_outbox
+
+    await get_email_outbox().stop()
+
+    # Flush buffered counters before closing the database pools
+    from app.infrastructure.services.write_behind_counters import (
+        get_write_behind_counters,
+    )
+
+    await get_write_behind_counters().stop()
+
+    # Flush queued audit events before closing the database pools
+    from app.infrastructure.services.data_access_audit import (
+        get_data_access_audit_log,
+    )
+
+    await get_data_access_audit_log().stop()
+
+    # Stop real-time notification fan-out
+    from app.infrastructure.services.notification_broker import (
+        get_notification_broker,
+    )
+
+    await get_notification_broker().stop()
+
     # Close Redis connection
     from app.infrastructure.cache.simplified_redis import simplified_redis_client
 
     await simplified_redis_client.disconnect()
 
+    from app.infrastructure.cache.permission_cache import cleanup_permission_cache
+
+    await cleanup_permission_cache()
+
+    # Close database pools
+    from app.infrastructure.database import dispose_engines
+
+    await dispose_engines()
+
+    # Stop password hashing threads
+    from app.infrastructure.auth import password_hasher
+
+    password_hasher.shutdown(wait=False)
+
     logger.info("All systems shut down gracefully")
 
+    # Flush queued log records
+    shutdown_logging()
+
 
 # Basic health endpoint (legacy - now handled by health router)
@@ -1,5 +1,6 @@
 from datetime import timedelta
 
+import structlog
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 
@@ -13,6 +14,8 @@ from app.presentation.schemas.user_legacy import Token, UserCreate
 from app.presentation.schemas.user_schemas import UserResponse
 from config.settings import settings
 
+logger = structlog.get_logger()
+
 router = APIRouter()
 
 
@@ -62,13 +65,13 @@ async def reset_admin_password(db=Depends(get_db)):
     """Reset admin@proteamcare.com password to 'admin123'"""
     from sqlalchemy import text
 
-    from app.infrastructure.auth import get_password_hash
+    from app.infrastructure.auth import get_password_hash_async
 
     email = "admin@proteamcare.com"
     new_password = "admin123"
 
     # Generate bcrypt hash
-    hashed_password = get_password_hash(new_password)
+    hashed_password = await get_password_hash_async(new_password)
 
     # Update password
     query = text(
@@ -168,16 +171,34 @@ async def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Verify password using the same method as auth infrastructure (with fallback)
-    from app.infrastructure.auth import verify_password
+    # Verify password off the event loop (same fallback as auth infrastructure)
+    from app.infrastructure.auth import verify_and_update_password
 
-    if not verify_password(form_data.password, user_row.password):
+    password_ok, new_hash = await verify_and_update_password(
+        form_data.password, user_row.password
+    )
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Transparent upgrade of legacy SHA256 / outdated bcrypt cost hashes
+    if new_hash:
+        await db.execute(
+            text(
+                """
+                UPDATE master.users
+                SET password = :password, updated_at = NOW()
+                WHERE id = :user_id
+            """
+            ),
+            {"password": new_hash, "user_id": user_row.id},
+        )
+        await db.commit()
+        logger.info("password_rehashed", user_id=user_row.id)
+
     # Create access token
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
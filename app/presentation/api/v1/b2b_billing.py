@@ -10,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.user import User
 from app.infrastructure.auth import get_current_user
-from app.infrastructure.database import get_db
+from app.infrastructure.database import get_batch_db, get_db
 from app.infrastructure.repositories.b2b_billing_repository import B2BBillingRepository
 from app.infrastructure.services.b2b_billing_service import B2BBillingService
 from app.infrastructure.services.pagbank_service import PagBankService
@@ -44,6 +44,15 @@ def get_b2b_billing_service(db: AsyncSession = Depends(get_db)) -> B2BBillingSer
     return B2BBillingService(repository, pagbank_service)
 
 
+def get_b2b_billing_batch_service(
+    db: AsyncSession = Depends(get_batch_db),
+) -> B2BBillingService:
+    """Dependency do serviço B2B usando o pool de jobs em lote"""
+    repository = B2BBillingRepository(db)
+    pagbank_service = PagBankService()
+    return B2BBillingService(repository, pagbank_service)
+
+
 # ==========================================
 # SUBSCRIPTION PLAN ENDPOINTS
 # ==========================================
@@ -365,7 +374,7 @@ async def mark_invoice_as_paid(
 @require_permission("billing_admin", context_type="system")
 async def bulk_generate_invoices(
     request: BulkInvoiceGenerationRequest,
-    service: B2BBillingService = Depends(get_b2b_billing_service),
+    service: B2BBillingService = Depends(get_b2b_billing_batch_service),
     current_user: User = Depends(get_current_user),
 ):
     """Gerar faturas em lote para um mês específico"""
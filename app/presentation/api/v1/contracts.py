@@ -1,12 +1,17 @@
 from typing import List, Optional
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
 from fastapi import status as http_status
 
 from app.domain.entities.user import User
 from app.infrastructure.auth import get_current_user
 from app.infrastructure.database import get_db
+from app.infrastructure.repositories.company_counters_repository import (
+    CompanyCountersRepository,
+    is_active_status,
+    status_delta,
+)
 from app.infrastructure.repositories.contract_repository import (
     ContractRepository,
     ServicesRepository,
@@ -31,6 +36,7 @@ from app.presentation.schemas.contract_lives import (
     ContractLifeHistoryResponse,
     ContractLifeResponse,
     ContractLifeUpdate,
+    ContractLivesImportResponse,
 )
 
 logger = structlog.get_logger()
@@ -113,7 +119,7 @@ async def list_contracts(
 ):
     """List contracts with filtering and pagination"""
     try:
-        logger.info(
+        logger.debug(
             "Starting contracts list request",
             client_id=client_id,
             status=contract_status,
@@ -131,19 +137,10 @@ async def list_contracts(
 
         # Convert contracts to response models
         try:
-            logger.info(
+            logger.debug(
                 "Converting contracts to response models",
                 contracts_count=len(result["contracts"]),
             )
-            if result["contracts"]:
-                logger.info(
-                    "First contract data",
-                    contract_data=(
-                        result["contracts"][0].__dict__
-                        if hasattr(result["contracts"][0], "__dict__")
-                        else str(result["contracts"][0])
-                    ),
-                )
             contracts_response = [
                 ContractResponse.model_validate(contract)
                 for contract in result["contracts"]
@@ -648,6 +645,9 @@ async def add_contract_life(
         )
 
         db.add(contract_life)
+        await CompanyCountersRepository(db).adjust_for_contract(
+            contract_id, active_lives_count=1
+        )
         await db.commit()
         await db.refresh(contract_life)
 
@@ -682,6 +682,84 @@ async def add_contract_life(
         )
 
 
+@router.post("/{contract_id}/lives/import", response_model=ContractLivesImportResponse)
+@require_permission("contracts.lives.manage")
+async def import_contract_lives(
+    contract_id: int,
+    file: UploadFile = File(...),
+    dry_run: bool = Query(False, description="Apenas valida, sem gravar"),
+    db=Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Importa vidas em lote a partir de um arquivo CSV ou XLSX
+
+    **Colunas:** person_name, cpf, start_date, end_date, relationship_type, notes
+    (datas em AAAA-MM-DD ou DD/MM/AAAA; CSV separado por vírgula ou ponto e vírgula)
+
+    As mesmas validações de `POST /{contract_id}/lives` são aplicadas ao lote
+    inteiro; pessoas são localizadas pelo CPF e criadas quando não existirem.
+    Linhas inválidas são reportadas em `errors` e não impedem a importação das
+    demais. Com `dry_run=true` nada é gravado.
+
+    **Permissão necessária:** `contracts.lives.manage`
+    """
+    try:
+        from app.application.validators.contract_lives_validator import (
+            ContractLivesValidator,
+        )
+        from app.infrastructure.services.contract_lives_import import (
+            ImportFileError,
+            get_contract_lives_import_service,
+        )
+        from app.infrastructure.services.tenant_context_service import tenant_context
+
+        contract = await ContractLivesValidator(db).validate_contract_exists(
+            contract_id
+        )
+
+        company_id = (
+            current_user.company_id
+            if hasattr(current_user, "company_id")
+            else tenant_context.current_company_id
+        )
+        if not company_id:
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail="User must be associated with a company to create contract lives",
+            )
+
+        try:
+            return await get_contract_lives_import_service(db).import_file(
+                contract,
+                company_id,
+                file.filename,
+                file.file,
+                created_by=current_user.id,
+                dry_run=dry_run,
+            )
+        except (ImportFileError, UnicodeDecodeError) as e:
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail=f"Arquivo inválido: {str(e)}",
+            )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error(
+            "Error importing contract lives",
+            error=str(e),
+            contract_id=contract_id,
+            filename=file.filename,
+        )
+        raise HTTPException(
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro interno do servidor ao importar vidas: {str(e)}",
+        )
+
+
 @router.put("/{contract_id}/lives/{life_id}", response_model=dict)
 @require_permission("contracts.lives.manage")
 async def update_contract_life(
@@ -751,10 +829,18 @@ async def update_contract_life(
         update_data["updated_at"] = datetime.utcnow()
 
         # Executar update
+        was_active = is_active_status(contract_life.status)
         stmt = (
             update(ContractLive).where(ContractLive.id == life_id).values(**update_data)
         )
         await db.execute(stmt)
+        if "status" in update_data:
+            await CompanyCountersRepository(db).adjust_for_contract(
+                contract_id,
+                active_lives_count=status_delta(
+                    was_active, is_active_status(update_data["status"])
+                ),
+            )
         await db.commit()
 
         logger.info(
@@ -842,6 +928,7 @@ async def remove_contract_life(
         await validator.validate_lives_limits(contract_id, action="remove")
 
         # Encerrar vida (soft delete)
+        was_active = is_active_status(contract_life.status)
         stmt = (
             update(ContractLive)
             .where(ContractLive.id == life_id)
@@ -853,6 +940,9 @@ async def remove_contract_life(
         )
 
         await db.execute(stmt)
+        await CompanyCountersRepository(db).adjust_for_contract(
+            contract_id, active_lives_count=-int(was_active)
+        )
         await db.commit()
 
         logger.info(
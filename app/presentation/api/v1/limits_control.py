@@ -393,6 +393,32 @@ async def check_contract_limits(
         )
 
 
+@router.post("/monitor-contract-limits/")
+@require_role_level_or_permission(50, "limits_check.execute")
+async def monitor_contract_limits(
+    contract_id: Optional[int] = Query(None),
+    check_date: Optional[date] = Query(None),
+    repo: LimitsRepository = Depends(get_limits_repository),
+):
+    """Monitorar limites de todos os contratos (ou de um contrato)"""
+    try:
+        result = await repo.monitor_contract_limits(
+            contract_id=contract_id, check_date=check_date
+        )
+
+        logger.info(
+            f"Monitoramento de limites executado: "
+            f"{result['violations_found']} violações"
+        )
+        return result
+    except Exception as e:
+        logger.error(f"Erro ao monitorar limites de contratos: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao monitorar limites de contratos",
+        )
+
+
 @router.get("/expiring-authorizations/")
 @require_role_level_or_permission(50, "authorization_alerts.view")
 async def get_expiring_authorizations(
@@ -13,6 +13,7 @@ from sqlalchemy import text
 
 from app.domain.repositories.menu_repository import MenuRepository
 from app.infrastructure.auth import get_current_user_skip_options
+from app.infrastructure.cache.menu_catalog import get_menu_catalog_store
 from app.infrastructure.database import get_db
 from app.infrastructure.services.tenant_context_service import get_tenant_context
 
@@ -195,7 +196,7 @@ async def get_user_dynamic_menus(
         tenant_service = get_tenant_context()
         await tenant_service.set_database_context(db, current_user.company_id)
 
-        menu_repo = MenuRepository(db)
+        menu_repo = MenuRepository(db, catalog_store=get_menu_catalog_store())
 
         # Buscar informações do usuário alvo
         target_user_info = await menu_repo.get_user_info(user_id)
@@ -225,17 +226,14 @@ async def get_user_dynamic_menus(
         if not target_user_info.get("is_system_admin", False):
             include_dev_menus = False
 
-        # Buscar menus do usuário
-        flat_menus = await menu_repo.get_user_menus(
+        # Árvore de menus do usuário (catálogo compilado + cache por perfil)
+        menu_tree, total_menus = await menu_repo.get_user_menu_tree(
             user_id=user_id,
             context_type=context_type,
             context_id=context_id,
             include_dev_menus=include_dev_menus or False,
         )
 
-        # Converter para árvore hierárquica
-        menu_tree = await menu_repo.get_menu_tree(flat_menus)
-
         # Buscar informações do contexto
         context_info = await menu_repo.get_context_info(context_type, context_id)
 
@@ -245,7 +243,7 @@ async def get_user_dynamic_menus(
                 user_id=user_id,
                 context_type=context_type,
                 context_id=context_id,
-                total_menus=len(flat_menus),
+                total_menus=total_menus,
                 is_root=True,
                 ip_address=client_ip,
             )
@@ -260,7 +258,7 @@ async def get_user_dynamic_menus(
                 "is_root": target_user_info.get("is_system_admin", False),
             },
             "context": context_info,
-            "total_menus": len(flat_menus),
+            "total_menus": total_menus,
             "include_dev_menus": include_dev_menus,
             "menus": menu_tree,
             "success": True,
@@ -270,7 +268,7 @@ async def get_user_dynamic_menus(
         logger.info(
             "Menus dinâmicos retornados com sucesso",
             user_id=user_id,
-            total_menus=len(flat_menus),
+            total_menus=total_menus,
             is_root=target_user_info.get("is_system_admin", False),
             context_type=context_type,
         )
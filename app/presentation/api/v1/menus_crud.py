@@ -12,7 +12,9 @@ from structlog import get_logger
 
 from app.domain.entities.user import User
 from app.infrastructure.auth import get_current_user
+from app.infrastructure.cache.menu_catalog import get_menu_catalog_store
 from app.infrastructure.database import get_db
+from app.infrastructure.repositories.ordering import next_position
 
 router = APIRouter(prefix="/menus/crud", tags=["Menus CRUD"])
 logger = get_logger()
@@ -153,17 +155,16 @@ async def create_menu(
         else:
             level = 0
 
-        # Calcular próximo sort_order
+        # Calcular próximo sort_order (mesmo intervalo das reordenações)
         sort_query = text(
             """
-            SELECT COALESCE(MAX(sort_order), 0) + 1 as next_sort
+            SELECT MAX(sort_order) as max_sort
             FROM master.menus
             WHERE parent_id IS NOT DISTINCT FROM :parent_id AND deleted_at IS NULL
         """
         )
         result = await db.execute(sort_query, {"parent_id": menu_data.parent_id})
-        next_sort = result.fetchone()
-        sort_order = next_sort.next_sort if next_sort else 1
+        sort_order = next_position(result.scalar())
 
         # Inserir novo menu
         insert_query = text(
@@ -207,6 +208,7 @@ async def create_menu(
             raise HTTPException(status_code=500, detail="Erro ao criar menu")
 
         await db.commit()
+        await get_menu_catalog_store().bump_version()
 
         # Buscar menu criado para retorno
         select_query = text(
@@ -563,6 +565,7 @@ async def update_menu(
 
         await db.execute(update_query, update_values)
         await db.commit()
+        await get_menu_catalog_store().bump_version()
 
         # Buscar menu atualizado
         select_query = text(
@@ -673,6 +676,7 @@ async def delete_menu(
         )
         await db.execute(delete_query, {"menu_id": menu_id})
         await db.commit()
+        await get_menu_catalog_store().bump_version()
 
         logger.info(
             "Menu excluído via API", menu_id=menu_id, deleted_by=current_user.id
@@ -801,6 +805,7 @@ async def move_menu(
         )
 
         await db.commit()
+        await get_menu_catalog_store().bump_version()
 
         logger.info(
             "Menu reordenado",
@@ -11,6 +11,7 @@ from structlog import get_logger
 
 from app.domain.entities.user import User
 from app.infrastructure.auth import get_current_user
+from app.infrastructure.cache.menu_catalog import get_menu_catalog_store
 from app.infrastructure.database import get_db
 
 router = APIRouter(prefix="/menus/simple", tags=["Menus CRUD Simples"])
@@ -98,6 +99,7 @@ async def update_menu_simple(
 
         await db.execute(update_query, update_values)
         await db.commit()
+        await get_menu_catalog_store().bump_version()
 
         # Buscar menu atualizado
         select_query = text(
@@ -215,6 +217,7 @@ async def create_menu_simple(
 
         new_menu_id = result.fetchone().id
         await db.commit()
+        await get_menu_catalog_store().bump_version()
 
         logger.info(
             "Menu criado via CRUD simples", menu_id=new_menu_id, user_id=current_user.id
@@ -271,6 +274,7 @@ async def delete_menu_simple(
         )
         await db.execute(delete_query, {"menu_id": menu_id})
         await db.commit()
+        await get_menu_catalog_store().bump_version()
 
         logger.info(
             "Menu excluído via CRUD simples", menu_id=menu_id, user_id=current_user.id
@@ -5,13 +5,14 @@ Metrics and monitoring endpoints
 from datetime import datetime
 from typing import Any, Dict
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import PlainTextResponse
 
 from app.domain.entities.user import User
 from app.infrastructure.auth import get_current_user_skip_options
 from app.infrastructure.database import get_db
 from app.infrastructure.logging import logger
+from app.infrastructure.monitoring.db_instrumentation import query_stats
 from app.infrastructure.monitoring.metrics import performance_metrics
 from app.infrastructure.rate_limiting import limiter
 from app.infrastructure.services.tenant_context_service import get_tenant_context
@@ -174,3 +175,38 @@ async def company_isolation_metrics(
             "error": str(e),
             "timestamp": datetime.utcnow().isoformat(),
         }
+
+
+@router.get("/metrics/db/slow-queries")
+async def database_slow_queries(
+    limit: int = Query(50, ge=1, le=500),
+    order_by: str = Query("total_ms", pattern="^(total_ms|max_ms|count)$"),
+    reset: bool = Query(False, description="Limpar estatísticas após leitura"),
+    current_user: User = Depends(get_current_user_skip_options),
+) -> Dict[str, Any]:
+    """
+    Queries mais lentas (normalizadas) e fingerprints mais custosos deste worker
+    Requer administrador do sistema
+    """
+    if not current_user.is_system_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso restrito a administradores",
+        )
+
+    data = {
+        "slow_threshold_ms": query_stats.slow_threshold_ms,
+        "slow_queries": query_stats.get_slow_queries(limit=limit),
+        "top_fingerprints": query_stats.get_top_fingerprints(
+            limit=limit, order_by=order_by
+        ),
+    }
+
+    if reset:
+        query_stats.reset()
+
+    return {
+        "status": "success",
+        "data": data,
+        "timestamp": datetime.utcnow().isoformat(),
+    }
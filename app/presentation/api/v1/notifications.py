@@ -1,11 +1,30 @@
-from typing import List
+from typing import AsyncIterator, List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.user import User
 from app.infrastructure.auth import get_current_user
+from app.infrastructure.database import get_db
+from app.infrastructure.services.notification_broker import (
+    EVENT_NOTIFICATION,
+    EVENT_RESYNC,
+    EVENT_UNREAD_COUNT,
+    NotificationEvent,
+    NotificationSubscription,
+)
+from app.infrastructure.services.notification_service import (
+    Notification,
+    NotificationService,
+)
+from app.infrastructure.services.security_service import (
+    SecurityService,
+    get_security_service,
+)
 from app.presentation.decorators.simple_permissions import require_permission
+from config.settings import settings
 
 router = APIRouter()
 
@@ -28,3 +47,198 @@ class NotificationListResponse(BaseModel):
     total: int = 0
     page: int = 1
     per_page: int = 20
+    last_id: Optional[int] = None  # cursor para a próxima busca com since_id
+
+
+class UnreadCountResponse(BaseModel):
+    """Unread notifications counter"""
+
+    count: int = 0
+
+
+def get_notification_service(
+    db: AsyncSession = Depends(get_db),
+    security_service: SecurityService = Depends(get_security_service),
+) -> NotificationService:
+    """Dependency do serviço de notificações"""
+    return NotificationService(db, security_service)
+
+
+@router.get("/unread-count", response_model=UnreadCountResponse)
+async def get_unread_count(
+    current_user: User = Depends(get_current_user),
+    service: NotificationService = Depends(get_notification_service),
+):
+    """Contador de não lidas (mantido incrementalmente, sem COUNT por chamada)"""
+    return UnreadCountResponse(count=await service.get_unread_count(current_user.id))
+
+
+@router.get("", response_model=NotificationListResponse)
+async def list_notifications(
+    since_id: Optional[int] = Query(
+        None, description="Apenas notificações com id maior (busca incremental)"
+    ),
+    unread_only: bool = Query(False),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    service: NotificationService = Depends(get_notification_service),
+):
+    """Notificações do usuário; com since_id retorna só as novas, em ordem de id"""
+    offset = 0 if since_id is not None else (page - 1) * per_page
+    notifications = await service.get_user_notifications(
+        current_user.id,
+        unread_only=unread_only,
+        limit=per_page,
+        offset=offset,
+        since_id=since_id,
+    )
+
+    if len(notifications) < per_page and (notifications or offset == 0):
+        # Última página: o total sai da própria consulta
+        total = offset + len(notifications)
+    else:
+        total = await service.count_user_notifications(
+            current_user.id, unread_only=unread_only, since_id=since_id
+        )
+
+    return NotificationListResponse(
+        notifications=[
+            NotificationResponse(
+                id=notification.id,
+                title=notification.title,
+                message=notification.message,
+                type=notification.type.value,
+                is_read=notification.is_read,
+                created_at=notification.created_at.isoformat(),
+            )
+            for notification in notifications
+        ],
+        total=total,
+        page=page,
+        per_page=per_page,
+        last_id=max((n.id for n in notifications), default=since_id),
+    )
+
+
+# Intervalo de reconexão sugerido ao EventSource (ms)
+STREAM_RETRY_MS = 3000
+
+
+def _notification_payload(notification: Notification) -> dict:
+    return {
+        "id": notification.id,
+        "type": notification.type.value,
+        "title": notification.title,
+        "message": notification.message,
+        "data": notification.data,
+        "priority": notification.priority,
+        "is_read": notification.is_read,
+        "created_at": notification.created_at,
+    }
+
+
+async def _initial_events(
+    service: NotificationService, user_id: int, last_event_id: Optional[str]
+) -> List[NotificationEvent]:
+    """Contador atual + notificações perdidas desde o Last-Event-ID"""
+    events = [
+        NotificationEvent(
+            EVENT_UNREAD_COUNT, {"count": await service.get_unread_count(user_id)}
+        )
+    ]
+
+    try:
+        last_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_id = None
+
+    if last_id is not None:
+        limit = settings.notification_stream_replay_limit
+        missed = await service.get_notifications_after(user_id, last_id, limit + 1)
+        events.extend(
+            NotificationEvent(
+                EVENT_NOTIFICATION,
+                _notification_payload(notification),
+                id=notification.id,
+            )
+            for notification in missed[:limit]
+        )
+        if len(missed) > limit:
+            # O cliente reconecta a partir do último id enviado
+            events.append(NotificationEvent(EVENT_RESYNC, {"reason": "replay_limit"}))
+
+    return events
+
+
+async def _sse_events(
+    subscription: NotificationSubscription,
+    initial_events: List[NotificationEvent],
+    heartbeat_interval: float,
+) -> AsyncIterator[str]:
+    """Stream text/event-stream com heartbeat; encerra em resync"""
+    replayed_id = max(
+        (event.id for event in initial_events if event.id is not None), default=None
+    )
+    try:
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+
+        for event in initial_events:
+            yield event.encode_sse()
+            if event.event == EVENT_RESYNC:
+                return
+
+        while True:
+            event = await subscription.next_event(heartbeat_interval)
+            if event is None:
+                yield ": heartbeat\n\n"
+                continue
+            # Publicada entre a assinatura e a leitura do banco: já reenviada
+            if (
+                event.id is not None
+                and replayed_id is not None
+                and event.id <= replayed_id
+            ):
+                continue
+            yield event.encode_sse()
+            if event.event == EVENT_RESYNC:
+                return
+    finally:
+        await subscription.close()
+
+
+@router.get("/stream")
+async def stream_notifications(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    service: NotificationService = Depends(get_notification_service),
+):
+    """
+    Notificações em tempo real (Server-Sent Events)
+
+    Eventos: notification, unread_count ({"count"} ao conectar, {"delta"}
+    depois) e resync (reconectar). Ao reconectar com Last-Event-ID as
+    notificações perdidas são reenviadas.
+    """
+    broker = service.broker
+
+    # Assinar antes de ler o banco: nada publicado no intervalo se perde
+    subscription = await broker.subscribe(current_user.id)
+    try:
+        initial_events = await _initial_events(service, current_user.id, last_event_id)
+        # Devolve a conexão ao pool antes de manter o stream aberto
+        await db.commit()
+    except Exception:
+        await subscription.close()
+        raise
+
+    return StreamingResponse(
+        _sse_events(
+            subscription,
+            initial_events,
+            settings.notification_stream_heartbeat_interval,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
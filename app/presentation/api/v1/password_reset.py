@@ -15,9 +15,10 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.infrastructure.auth import get_password_hash
+from app.infrastructure.auth import get_password_hash_async
 from app.infrastructure.database import get_db
 from app.infrastructure.orm.models import User
+from app.infrastructure.security.password_hasher import PasswordHasherBusyError
 from app.infrastructure.services.email_service import EmailService
 
 router = APIRouter(prefix="/auth", tags=["password-reset"])
@@ -236,7 +237,7 @@ async def reset_password(
             )
 
         # Atualizar senha
-        user.password = get_password_hash(request.new_password)
+        user.password = await get_password_hash_async(request.new_password)
         user.password_changed_at = datetime.utcnow()
 
         # Limpar token usado
@@ -250,7 +251,7 @@ async def reset_password(
             message="Senha redefinida com sucesso! Você já pode fazer login.",
         )
 
-    except HTTPException:
+    except (HTTPException, PasswordHasherBusyError):
         raise
     except Exception as e:
         print(f"Erro em reset_password: {str(e)}")
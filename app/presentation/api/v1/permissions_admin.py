@@ -12,7 +12,11 @@ from pydantic import BaseModel
 
 from app.domain.entities.user import User
 from app.infrastructure.auth import get_current_user
+from app.infrastructure.cache.permission_cache import invalidate_user_permissions
 from app.infrastructure.database import get_db
+from app.infrastructure.repositories.hierarchical_user_repository import (
+    invalidate_access_scope,
+)
 from app.infrastructure.repositories.role_repository import (
     PermissionRepository,
     RoleRepository,
@@ -187,6 +191,8 @@ async def assign_user_role(
         )
 
         await db.commit()
+        await invalidate_access_scope(assignment.user_id)
+        await invalidate_user_permissions(assignment.user_id)
 
         logger.info(
             "Role assigned to user",
@@ -268,6 +274,8 @@ async def revoke_user_role(
             )
 
         await db.commit()
+        await invalidate_access_scope(user_id)
+        await invalidate_user_permissions(user_id)
 
         logger.info(
             "Role revoked from user",
@@ -610,6 +618,8 @@ async def migrate_single_user(
         )
 
         await db.commit()
+        await invalidate_access_scope(user_id)
+        await invalidate_user_permissions(user_id)
 
         logger.info(
             "User migrated to granular permissions",
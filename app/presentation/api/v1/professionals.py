@@ -7,6 +7,10 @@ from structlog import get_logger
 
 from app.infrastructure.database import get_db
 from app.infrastructure.orm.models import Establishments, People, Professional
+from app.infrastructure.repositories.company_counters_repository import (
+    CompanyCountersRepository,
+    is_active_status,
+)
 from app.infrastructure.services.security_service import get_security_service
 from app.presentation.decorators.simple_permissions import (
     require_permission,
@@ -109,6 +113,11 @@ async def create_professional(
         )
 
         db.add(professional)
+        await CompanyCountersRepository(db).adjust_for_establishment(
+            professional.establishment_id,
+            professionals_count=1,
+            active_professionals_count=int(is_active_status(professional.status)),
+        )
         await db.commit()
         await db.refresh(professional)
 
@@ -321,6 +330,13 @@ async def delete_professional(
         # Soft delete
         from datetime import datetime
 
+        if professional.deleted_at is None:
+            await CompanyCountersRepository(db).adjust_for_establishment(
+                professional.establishment_id,
+                professionals_count=-1,
+                active_professionals_count=-int(is_active_status(professional.status)),
+            )
+
         professional.deleted_at = datetime.utcnow()
         professional.status = "INACTIVE"
 
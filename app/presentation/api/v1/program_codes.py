@@ -3,17 +3,30 @@ Endpoints para sistema de códigos de programas
 Navegação rápida estilo Datasul via Ctrl+Alt+X
 """
 
-import re
 import time
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
+import structlog
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func, or_, select, text
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.infrastructure.auth import get_current_user
 from app.infrastructure.database import get_db
 from app.infrastructure.orm.models import User
+from app.infrastructure.services.program_code_search import (
+    SHORTCODE_PATTERN,
+    ProgramCodeMatch,
+    ProgramCodeSearchIndex,
+    get_program_code_index,
+    sql_exact_search,
+    sql_fuzzy_search,
+)
+from app.infrastructure.services.write_behind_counters import (
+    PROGRAM_CODE_USAGE,
+    get_write_behind_counters,
+)
 from app.presentation.schemas.program_codes import (
     ProgramCodeResponse,
     ProgramCodeStatsResponse,
@@ -22,6 +35,9 @@ from app.presentation.schemas.program_codes import (
     QuickSearchResponse,
     QuickSearchResult,
 )
+from config.settings import settings
+
+logger = structlog.get_logger()
 
 router = APIRouter(prefix="/program-codes", tags=["Program Codes"])
 
@@ -50,156 +66,38 @@ async def quick_search(
     - Ordena por relevância
 
     **Performance:**
-    - Cache Redis (TODO)
-    - Índices GIN para arrays e trgm
+    - Índice em memória por worker (trie + trigramas), sem acesso ao banco
+    - Recarregado quando a versão de master.program_codes muda
+    - Fallback para índices GIN (arrays e trgm) no banco
     - Limit 20 resultados
     """
     start_time = time.time()
     query_lower = request.query.lower().strip()
 
-    # =====================================================
-    # 1. DETECTAR SE É CÓDIGO EXATO
-    # =====================================================
-    # Padrão: 2 letras + 4 dígitos (ex: em0001, ct0012)
-    code_pattern = re.compile(r"^[a-z]{2}\d{4}$")
-
-    if code_pattern.match(query_lower):
-        # Busca exata por código
-        stmt = text(
-            """
-            SELECT
-                id,
-                shortcode,
-                label,
-                description,
-                route,
-                icon,
-                module_code,
-                program_type,
-                'exact' as match_type,
-                1.0 as relevance_score
-            FROM master.program_codes
-            WHERE shortcode = :code
-            AND is_active = TRUE
-            LIMIT 1
-        """
-        )
-
-        result = await db.execute(stmt, {"code": query_lower})
-        row = result.fetchone()
-
-        if row:
-            search_result = QuickSearchResult(
-                shortcode=row.shortcode,
-                label=row.label,
-                description=row.description,
-                route=row.route,
-                icon=row.icon,
-                module_code=row.module_code,
-                program_type=row.program_type,
-                match_type="exact",
-                relevance_score=1.0,
-            )
-
-            elapsed_ms = (time.time() - start_time) * 1000
-
-            return QuickSearchResponse(
-                query=request.query,
-                execution_type="direct",  # Frontend executa direto
-                results=[search_result],
-                total_results=1,
-                search_time_ms=round(elapsed_ms, 2),
-            )
-
-    # =====================================================
-    # 2. BUSCA FUZZY POR NOME/TOKENS
-    # =====================================================
-
-    # Busca combinada:
-    # a) Similaridade no label (pg_trgm)
-    # b) Match em search_tokens (array contains)
-    # c) Match no description
-
-    stmt = text(
-        """
-        WITH search_results AS (
-            SELECT
-                id,
-                shortcode,
-                label,
-                description,
-                route,
-                icon,
-                module_code,
-                program_type,
-                CASE
-                    -- Prioridade 1: Match exato no label (case insensitive)
-                    WHEN LOWER(label) = :query THEN 1.0
-                    -- Prioridade 2: Label começa com query
-                    WHEN LOWER(label) LIKE :query_start THEN 0.9
-                    -- Prioridade 3: Label contém query
-                    WHEN LOWER(label) LIKE :query_like THEN 0.8
-                    -- Prioridade 4: Match em search_tokens
-                    WHEN :query = ANY(search_tokens) THEN 0.7
-                    -- Prioridade 5: Similaridade pg_trgm
-                    ELSE similarity(label, :query)
-                END as relevance_score,
-                CASE
-                    WHEN LOWER(label) = :query THEN 'exact'
-                    WHEN :query = ANY(search_tokens) THEN 'token'
-                    ELSE 'fuzzy'
-                END as match_type
-            FROM master.program_codes
-            WHERE is_active = TRUE
-            AND (
-                -- Match em label
-                LOWER(label) LIKE :query_like
-                -- Match em search_tokens
-                OR :query = ANY(search_tokens)
-                -- Match em description
-                OR LOWER(description) LIKE :query_like
-                -- Similaridade pg_trgm > 0.3
-                OR similarity(label, :query) > 0.3
-            )
-        )
-        SELECT *
-        FROM search_results
-        WHERE relevance_score > 0.3
-        ORDER BY relevance_score DESC, label ASC
-        LIMIT 20
-    """
-    )
+    index = await _get_fresh_index(db)
+    if index is not None:
+        matches = _search_index(index, query_lower)
+    else:
+        matches = await _search_sql(db, query_lower)
 
-    result = await db.execute(
-        stmt,
-        {
-            "query": query_lower,
-            "query_start": f"{query_lower}%",
-            "query_like": f"%{query_lower}%",
-        },
-    )
-
-    rows = result.fetchall()
-
-    # Converter para lista de resultados
     results = [
         QuickSearchResult(
-            shortcode=row.shortcode,
-            label=row.label,
-            description=row.description,
-            route=row.route,
-            icon=row.icon,
-            module_code=row.module_code,
-            program_type=row.program_type,
-            match_type=row.match_type,
-            relevance_score=round(float(row.relevance_score), 2),
+            shortcode=match.entry.shortcode,
+            label=match.entry.label,
+            description=match.entry.description,
+            route=match.entry.route,
+            icon=match.entry.icon,
+            module_code=match.entry.module_code,
+            program_type=match.entry.program_type,
+            match_type=match.match_type,
+            relevance_score=round(match.relevance_score, 2),
         )
-        for row in rows
+        for match in matches
     ]
 
     elapsed_ms = (time.time() - start_time) * 1000
 
-    # Se encontrou apenas 1 resultado com score alto, pode executar direto
+    # Código exato ou apenas 1 resultado com score alto: executa direto
     execution_type = (
         "direct"
         if len(results) == 1 and results[0].relevance_score >= 0.9
@@ -215,6 +113,49 @@ async def quick_search(
     )
 
 
+async def _get_fresh_index(db: AsyncSession) -> Optional[ProgramCodeSearchIndex]:
+    """Índice em memória atualizado, ou None para usar a busca SQL"""
+    if not settings.program_code_index_enabled:
+        return None
+
+    index = get_program_code_index()
+    if index.is_unavailable:
+        return None
+    try:
+        await index.ensure_fresh(db)
+    except Exception as e:
+        # Índice indisponível (ex: migration 019 não aplicada)
+        logger.warning("program_code_index_unavailable", error=str(e))
+        index.mark_unavailable()
+        await db.rollback()
+        return None
+    return index
+
+
+def _search_index(
+    index: ProgramCodeSearchIndex, query_lower: str
+) -> List[ProgramCodeMatch]:
+    """Busca no índice em memória do worker"""
+    # 1. Código exato (ex: "em0001") → execução direta
+    if SHORTCODE_PATTERN.match(query_lower):
+        entry = index.get_exact(query_lower)
+        if entry:
+            return [ProgramCodeMatch(entry, "exact", 1.0)]
+
+    # 2. Busca fuzzy por nome/tokens
+    return index.search(query_lower)
+
+
+async def _search_sql(db: AsyncSession, query_lower: str) -> List[ProgramCodeMatch]:
+    """Busca direta no banco (pg_trgm)"""
+    if SHORTCODE_PATTERN.match(query_lower):
+        match = await sql_exact_search(db, query_lower)
+        if match:
+            return [match]
+
+    return await sql_fuzzy_search(db, query_lower)
+
+
 # =====================================================
 # REGISTRAR USO (Analytics)
 # =====================================================
@@ -229,7 +170,7 @@ async def register_usage(
     """
     Registra uso de um código para analytics
 
-    **Atualiza:**
+    **Atualiza (write-behind, gravado em lote a cada poucos segundos):**
     - usage_count (incrementa)
     - last_used_at (timestamp atual)
 
@@ -237,37 +178,43 @@ async def register_usage(
     - Frontend chama após navegação bem-sucedida
     - Usado para rankings e sugestões
     """
-    stmt = text(
-        """
-        UPDATE master.program_codes
-        SET
-            usage_count = usage_count + 1,
-            last_used_at = CURRENT_TIMESTAMP
-        WHERE shortcode = :code
-        AND is_active = TRUE
-        RETURNING shortcode, usage_count
-    """
-    )
-
-    result = await db.execute(stmt, {"code": request.shortcode})
-    await db.commit()
-
-    row = result.fetchone()
+    shortcode = request.shortcode.lower().strip()
 
-    if not row:
+    if not await _is_active_shortcode(db, shortcode):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Código '{request.shortcode}' não encontrado",
         )
 
+    get_write_behind_counters().increment(
+        PROGRAM_CODE_USAGE, shortcode, last_used_at=datetime.utcnow()
+    )
+
     return {
         "success": True,
-        "shortcode": row.shortcode,
-        "usage_count": row.usage_count,
+        "shortcode": shortcode,
         "message": "Uso registrado com sucesso",
     }
 
 
+async def _is_active_shortcode(db: AsyncSession, shortcode: str) -> bool:
+    """Verifica o código no índice em memória (ou no banco, se indisponível)"""
+    index = await _get_fresh_index(db)
+    if index is not None:
+        return index.get_exact(shortcode) is not None
+
+    result = await db.execute(
+        text(
+            """
+            SELECT 1 FROM master.program_codes
+            WHERE shortcode = :code AND is_active = TRUE
+        """
+        ),
+        {"code": shortcode},
+    )
+    return result.scalar() is not None
+
+
 # =====================================================
 # ESTATÍSTICAS
 # =====================================================
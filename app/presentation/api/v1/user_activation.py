@@ -16,6 +16,7 @@ from app.application.use_cases.user_management_use_case import UserManagementUse
 from app.infrastructure.auth import get_current_user
 from app.infrastructure.database import get_db
 from app.infrastructure.orm.models import User
+from app.infrastructure.security.password_hasher import PasswordHasherBusyError
 
 router = APIRouter(prefix="/user-activation", tags=["user-activation"])
 
@@ -46,6 +47,8 @@ async def invite_company_manager(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
+    except PasswordHasherBusyError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -80,6 +83,8 @@ async def invite_establishment_manager(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
+    except PasswordHasherBusyError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -112,6 +117,8 @@ async def activate_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
+    except PasswordHasherBusyError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -148,6 +155,8 @@ async def resend_activation_email(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
+    except PasswordHasherBusyError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -7,6 +7,7 @@ from structlog import get_logger
 
 from app.infrastructure.auth import get_current_user
 from app.infrastructure.cache.decorators import cache_invalidate, cached
+from app.infrastructure.cache.permission_cache import invalidate_user_permissions
 from app.infrastructure.database import get_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
@@ -16,6 +17,9 @@ from sqlalchemy.orm import selectinload
 
 from app.infrastructure.orm.models import People, Role, User, UserRole
 from app.infrastructure.orm.views import UserCompleteView, UserHierarchicalView
+from app.infrastructure.repositories.hierarchical_user_repository import (
+    invalidate_access_scope,
+)
 from app.infrastructure.services.security_service import get_security_service
 from app.infrastructure.services.tenant_context_service import get_tenant_context
 from app.infrastructure.services.validation_service import get_validation_service
@@ -579,6 +583,8 @@ async def update_user_roles(
 
         # Commit the changes
         await db.commit()
+        await invalidate_access_scope(user_id)
+        await invalidate_user_permissions(user_id)
 
         await logger.ainfo(
             "user_roles_updated",
@@ -649,6 +655,8 @@ async def assign_user_role(
         db.add(user_role)
         await db.commit()
         await db.refresh(user_role)
+        await invalidate_access_scope(user_id)
+        await invalidate_user_permissions(user_id)
 
         await logger.ainfo(
             "user_role_assigned",
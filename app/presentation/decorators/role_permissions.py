@@ -86,7 +86,7 @@ def require_role_permission(permission: str, context_type: str = "establishment"
                     },
                 )
 
-            await logger.ainfo(
+            logger.info(
                 "permission_granted",
                 user_id=current_user.id,
                 permission=permission,
@@ -203,7 +203,7 @@ def require_role_level_or_permission(
                     },
                 )
 
-            await logger.ainfo(
+            logger.info(
                 "access_granted_level_or_permission",
                 user_id=current_user.id,
                 access_reason="level" if max_level >= min_level else "permission",
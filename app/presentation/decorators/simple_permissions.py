@@ -53,8 +53,8 @@ class SimplePermissionChecker:
 
         # 👑 SYSTEM ADMIN: Acesso irrestrito
         if is_system_admin:
-            await logger.ainfo(
-                "✅ System admin bypass - acesso total concedido",
+            logger.debug(
+                "system_admin_bypass",
                 user_id=user_id,
                 permission=permission,
                 context_type=context_type,
@@ -128,8 +128,8 @@ class SimplePermissionChecker:
                 has_permission = result.scalar() or False
 
                 if has_permission:
-                    await logger.ainfo(
-                        "✅ Permissão concedida via banco",
+                    logger.debug(
+                        "permission_granted_db",
                         user_id=user_id,
                         permission=permission,
                         context_type=context_type,
@@ -230,8 +230,8 @@ def require_permission(
                 )
 
             # ✅ Permissão concedida - executar função
-            await logger.ainfo(
-                "✅ Access granted",
+            logger.info(
+                "access_granted",
                 user_id=current_user.id,
                 permission=permission,
                 endpoint=func.__name__,
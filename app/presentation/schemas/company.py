@@ -340,6 +340,9 @@ class CompanyList(BaseModel):
     clients_count: int = 0
     professionals_count: int = 0
     users_count: int = 0
+    phones_count: int = 0
+    emails_count: int = 0
+    addresses_count: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -61,15 +61,53 @@ class ContractLifeCreate(ContractLifeBase):
         return v
 
 
+class ContractLifeImportRow(ContractLifeCreate):
+    """Linha do arquivo de importação em lote (pessoa identificada pelo CPF)"""
+
+    cpf: str = Field(..., description="CPF da pessoa (11 dígitos)")
+    notes: Optional[str] = Field(
+        None, max_length=100, description="Observações (gravadas no vínculo)"
+    )
+
+    @field_validator("start_date", "end_date", mode="before")
+    @classmethod
+    def parse_br_date(cls, v):
+        """Aceita também datas no formato DD/MM/AAAA"""
+        if isinstance(v, datetime):
+            return v.date()
+        if isinstance(v, str) and "/" in v:
+            try:
+                return datetime.strptime(v.strip(), "%d/%m/%Y").date()
+            except ValueError:
+                raise ValueError(f"Data inválida: {v}")
+        return v
+
+    @field_validator("relationship_type", mode="before")
+    @classmethod
+    def normalize_relationship_type(cls, v):
+        return v.strip().upper() if isinstance(v, str) else v
+
+    @field_validator("cpf")
+    @classmethod
+    def validate_cpf(cls, v: str) -> str:
+        """Validação básica de CPF (mesmas regras do cadastro de usuários)"""
+        cpf = "".join(filter(str.isdigit, v or ""))
+        if len(cpf) != 11:
+            raise ValueError("CPF deve ter 11 dígitos")
+        if cpf == cpf[0] * 11:
+            raise ValueError("CPF não pode ser uma sequência de dígitos iguais")
+        return cpf
+
+
 class ContractLifeUpdate(BaseModel):
     """Schema para atualizar uma vida existente"""
 
     end_date: Optional[date] = Field(
         None, description="Nova data de fim (para encerrar vida)"
     )
-    status: Optional[
-        Literal["active", "inactive", "substituted", "cancelled"]
-    ] = Field(None, description="Novo status da vida")
+    status: Optional[Literal["active", "inactive", "substituted", "cancelled"]] = Field(
+        None, description="Novo status da vida"
+    )
     notes: Optional[str] = Field(
         None, max_length=500, description="Atualização de observações"
     )
@@ -182,3 +220,21 @@ class ContractLifeHistoryResponse(BaseModel):
     person_name: str
     events: list[ContractLifeHistoryEvent]
     total_events: int
+
+
+class ContractLifeImportError(BaseModel):
+    """Erro de uma linha da importação"""
+
+    row: int = Field(..., description="Linha do arquivo (cabeçalho = 1)")
+    cpf: Optional[str] = None
+    error: str
+
+
+class ContractLivesImportResponse(BaseModel):
+    """Resultado da importação em lote de vidas"""
+
+    total_rows: int
+    imported: int
+    failed: int
+    dry_run: bool = False
+    errors: list[ContractLifeImportError] = []
@@ -53,10 +53,58 @@ class Settings(BaseSettings):
     )
     db_schema: str = Field(default_factory=lambda: os.getenv("DB_SCHEMA", "master"))
 
-    # Pool de conexões
+    # Pool de conexões (tráfego interativo da API)
     db_pool_size: int = Field(default=5, env="DB_POOL_SIZE")
     db_pool_overflow: int = Field(default=10, env="DB_POOL_OVERFLOW")
     db_pool_timeout: int = Field(default=30, env="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(default=1800, env="DB_POOL_RECYCLE")
+    db_command_timeout: int = Field(default=60, env="DB_COMMAND_TIMEOUT")
+
+    # Pool separado para jobs em lote (faturamento, relatórios)
+    db_batch_pool_size: int = Field(default=2, env="DB_BATCH_POOL_SIZE")
+    db_batch_pool_overflow: int = Field(default=2, env="DB_BATCH_POOL_OVERFLOW")
+    db_batch_command_timeout: int = Field(default=900, env="DB_BATCH_COMMAND_TIMEOUT")
+
+    # Cache de prepared statements (asyncpg / SQLAlchemy)
+    db_statement_cache_size: int = Field(default=500, env="DB_STATEMENT_CACHE_SIZE")
+    db_prepared_statement_cache_size: int = Field(
+        default=500, env="DB_PREPARED_STATEMENT_CACHE_SIZE"
+    )
+    db_pgbouncer_mode: str = Field(
+        default="disabled", env="DB_PGBOUNCER_MODE"
+    )  # disabled | transaction
+    db_application_name: str = Field(default="pro-team-care", env="DB_APPLICATION_NAME")
+
+    # Instrumentação de queries
+    db_slow_query_threshold_ms: int = Field(
+        default=200, env="DB_SLOW_QUERY_THRESHOLD_MS"
+    )
+    db_slow_query_log_size: int = Field(default=100, env="DB_SLOW_QUERY_LOG_SIZE")
+
+    # Contadores write-behind (usage_count, last_login_at)
+    write_behind_flush_interval: float = Field(
+        default=5.0, env="WRITE_BEHIND_FLUSH_INTERVAL"
+    )  # segundos
+    write_behind_max_pending_keys: int = Field(
+        default=10000, env="WRITE_BEHIND_MAX_PENDING_KEYS"
+    )  # flush antecipado acima deste número de linhas pendentes
+
+    # Auditoria LGPD de acesso a dados (fila em memória + INSERT em lote)
+    lgpd_audit_flush_interval: float = Field(
+        default=2.0, env="LGPD_AUDIT_FLUSH_INTERVAL"
+    )  # segundos
+    lgpd_audit_batch_size: int = Field(
+        default=500, env="LGPD_AUDIT_BATCH_SIZE"
+    )  # eventos por INSERT
+    lgpd_audit_max_queue_size: int = Field(
+        default=10000, env="LGPD_AUDIT_MAX_QUEUE_SIZE"
+    )  # eventos pendentes por worker
+    lgpd_audit_overflow_policy: str = Field(
+        default="block", env="LGPD_AUDIT_OVERFLOW_POLICY"
+    )  # fila cheia: block (aguarda o flush, depois descarta) ou drop
+    lgpd_audit_max_batch_retries: int = Field(
+        default=3, env="LGPD_AUDIT_MAX_BATCH_RETRIES"
+    )  # falhas seguidas antes de estacionar o lote
 
     @property
     def database_url(self) -> str:
@@ -102,6 +150,11 @@ class Settings(BaseSettings):
         default_factory=lambda: int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     )
 
+    # Hash de senhas (bcrypt) em executor dedicado
+    password_bcrypt_rounds: int = Field(default=12, env="PASSWORD_BCRYPT_ROUNDS")
+    password_hash_workers: int = Field(default=4, env="PASSWORD_HASH_WORKERS")
+    password_hash_max_pending: int = Field(default=64, env="PASSWORD_HASH_MAX_PENDING")
+
     # =================================
     # CONFIGURAÇÕES DO REDIS
     # =================================
@@ -147,6 +200,14 @@ class Settings(BaseSettings):
         default_factory=lambda: os.getenv("CACHE_ENABLED", "true").lower() == "true"
     )
 
+    # Índice em memória de códigos de programas (Ctrl+Alt+X)
+    program_code_index_enabled: bool = Field(
+        default=True, env="PROGRAM_CODE_INDEX_ENABLED"
+    )
+    program_code_index_check_interval: float = Field(
+        default=5.0, env="PROGRAM_CODE_INDEX_CHECK_INTERVAL"
+    )  # segundos entre verificações de versão
+
     @validator("secret_key")
     def validate_jwt_secret(cls, v: str) -> str:
         """Valida se JWT secret tem tamanho adequado para segurança"""
@@ -201,6 +262,27 @@ class Settings(BaseSettings):
 
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
     log_format: str = Field(default="json", env="LOG_FORMAT")  # json | text
+    log_queue_size: int = Field(default=10000, env="LOG_QUEUE_SIZE")
+
+    # Amostragem por evento (evento=fração mantida), apenas info/debug
+    log_sample_rates: str = Field(
+        default=(
+            "permission_granted=0.05,"
+            "access_granted=0.05,"
+            "access_granted_level_or_permission=0.05"
+        ),
+        env="LOG_SAMPLE_RATES",
+    )
+    # Limite por evento (evento=máximo de eventos por segundo), apenas info/debug
+    log_rate_limits: str = Field(default="", env="LOG_RATE_LIMITS")
+
+    @validator("db_pgbouncer_mode")
+    def validate_db_pgbouncer_mode(cls, v: str) -> str:
+        """Valida modo de compatibilidade com PgBouncer"""
+        valid_modes = ["disabled", "transaction"]
+        if v.lower() not in valid_modes:
+            raise ValueError(f"DB_PGBOUNCER_MODE deve ser um de: {valid_modes}")
+        return v.lower()
 
     @validator("log_level")
     def validate_log_level(cls, v: str) -> str:
@@ -250,6 +332,28 @@ class Settings(BaseSettings):
     redis_db: int = Field(default=0, env="REDIS_DB")
     redis_password: str = Field(default="", env="REDIS_PASSWORD")
     cache_ttl: int = Field(default=300, env="CACHE_TTL")  # 5 minutos
+    # json | msgpack
+    cache_serializer: str = Field(default="json", env="CACHE_SERIALIZER")
+    cache_compress_threshold: int = Field(
+        default=1024, env="CACHE_COMPRESS_THRESHOLD"
+    )  # bytes (0 desativa)
+    cache_read_legacy_keys: bool = Field(default=True, env="CACHE_READ_LEGACY_KEYS")
+    cache_batch_size: int = Field(default=500, env="CACHE_BATCH_SIZE")
+    # Escopo de acesso hierárquico por solicitante (listagem de usuários)
+    user_scope_cache_ttl: int = Field(default=60, env="USER_SCOPE_CACHE_TTL")
+    # Contextos de sessão validados (memória do worker; Redis até expires_at)
+    session_context_local_ttl: float = Field(
+        default=30.0, env="SESSION_CONTEXT_LOCAL_TTL"
+    )  # segundos
+    session_context_cache_size: int = Field(
+        default=10000, env="SESSION_CONTEXT_CACHE_SIZE"
+    )
+    # Catálogo de menus compilado: intervalo de verificação da versão e TTL
+    # das árvores filtradas por conjunto de permissões
+    menu_catalog_check_interval: float = Field(
+        default=5.0, env="MENU_CATALOG_CHECK_INTERVAL"
+    )  # segundos
+    menu_tree_cache_ttl: int = Field(default=300, env="MENU_TREE_CACHE_TTL")
 
     @property
     def redis_url(self) -> str:
@@ -287,6 +391,41 @@ class Settings(BaseSettings):
     smtp_use_ssl: bool = Field(default=False, env="SMTP_USE_SSL")
     send_emails: bool = Field(default=True, env="SEND_EMAILS")
 
+    # Outbox de emails (envio assíncrono com conexões SMTP persistentes)
+    email_outbox_enabled: bool = Field(default=True, env="EMAIL_OUTBOX_ENABLED")
+    email_outbox_workers: int = Field(default=2, env="EMAIL_OUTBOX_WORKERS")
+    email_outbox_queue_size: int = Field(default=5000, env="EMAIL_OUTBOX_QUEUE_SIZE")
+    email_outbox_batch_size: int = Field(default=20, env="EMAIL_OUTBOX_BATCH_SIZE")
+    email_outbox_max_attempts: int = Field(default=3, env="EMAIL_OUTBOX_MAX_ATTEMPTS")
+    email_outbox_rate_limit_per_second: float = Field(
+        default=10.0, env="EMAIL_OUTBOX_RATE_LIMIT_PER_SECOND"
+    )
+
+    # Notificações em tempo real (SSE + Redis pub/sub)
+    notification_broker: str = Field(
+        default="redis", env="NOTIFICATION_BROKER"
+    )  # redis | memory
+    notification_stream_heartbeat_interval: float = Field(
+        default=15.0, env="NOTIFICATION_STREAM_HEARTBEAT_INTERVAL"
+    )  # segundos
+    notification_stream_queue_size: int = Field(
+        default=100, env="NOTIFICATION_STREAM_QUEUE_SIZE"
+    )  # eventos pendentes por conexão antes de pedir resync
+    notification_stream_replay_limit: int = Field(
+        default=100, env="NOTIFICATION_STREAM_REPLAY_LIMIT"
+    )  # notificações reenviadas ao reconectar com Last-Event-ID
+    notification_unread_reconcile_interval: int = Field(
+        default=300, env="NOTIFICATION_UNREAD_RECONCILE_INTERVAL"
+    )  # segundos entre reconciliações do contador de não lidas com o banco
+
+    # Importação em lote de vidas de contrato (CSV/XLSX)
+    contract_lives_import_max_rows: int = Field(
+        default=5000, env="CONTRACT_LIVES_IMPORT_MAX_ROWS"
+    )  # linhas por arquivo
+    contract_lives_import_batch_size: int = Field(
+        default=1000, env="CONTRACT_LIVES_IMPORT_BATCH_SIZE"
+    )  # linhas por INSERT multi-row
+
     # Frontend URL para links nos emails
     frontend_url: str = Field(default="http://192.168.11.83:3000", env="FRONTEND_URL")
 
@@ -0,0 +1,57 @@
+-- =====================================================
+-- MIGRATION 019: Versão do catálogo de códigos de programas
+-- =====================================================
+-- Cada worker da API mantém um índice em memória de program_codes para a
+-- busca rápida (Ctrl+Alt+X). Esta migration cria um carimbo de versão,
+-- incrementado por trigger apenas quando colunas usadas na busca mudam
+-- (analytics como usage_count/last_used_at não invalidam o índice).
+-- =====================================================
+
+BEGIN;
+
+-- =====================================================
+-- 1. TABELA DE VERSÃO (linha única)
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS master.program_codes_version (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO master.program_codes_version (id, version)
+VALUES (1, 1)
+ON CONFLICT (id) DO NOTHING;
+
+COMMENT ON TABLE master.program_codes_version IS 'Carimbo de versão de program_codes para invalidar índices em memória';
+
+-- =====================================================
+-- 2. TRIGGER DE INCREMENTO (por statement)
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION master.bump_program_codes_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE master.program_codes_version
+    SET version = version + 1,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_program_codes_version_write ON master.program_codes;
+CREATE TRIGGER trigger_program_codes_version_write
+AFTER INSERT OR DELETE OR TRUNCATE ON master.program_codes
+FOR EACH STATEMENT
+EXECUTE FUNCTION master.bump_program_codes_version();
+
+DROP TRIGGER IF EXISTS trigger_program_codes_version_update ON master.program_codes;
+CREATE TRIGGER trigger_program_codes_version_update
+AFTER UPDATE OF shortcode, label, description, route, icon, module_code,
+                program_type, search_tokens, is_active
+ON master.program_codes
+FOR EACH STATEMENT
+EXECUTE FUNCTION master.bump_program_codes_version();
+
+COMMIT;
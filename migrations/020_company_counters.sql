@@ -0,0 +1,77 @@
+-- =====================================================
+-- MIGRATION 020: Contadores por empresa
+-- =====================================================
+-- Projeção com uma linha por empresa lida pela página da empresa
+-- (/companies/{id}/stats) e pelos dashboards administrativos. Os
+-- repositórios ajustam os contadores na mesma transação das escritas e
+-- scripts/reconcile_company_counters.py recalcula tudo em lote.
+-- Status ativo é comparado com LOWER(status) ('active' e 'ACTIVE'),
+-- a mesma regra de is_active_status no repositório.
+-- =====================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS master.company_counters (
+    company_id BIGINT PRIMARY KEY REFERENCES master.companies(id) ON DELETE CASCADE,
+    establishments_count INTEGER NOT NULL DEFAULT 0,
+    clients_count INTEGER NOT NULL DEFAULT 0,
+    active_clients_count INTEGER NOT NULL DEFAULT 0,
+    professionals_count INTEGER NOT NULL DEFAULT 0,
+    active_professionals_count INTEGER NOT NULL DEFAULT 0,
+    users_count INTEGER NOT NULL DEFAULT 0,
+    active_users_count INTEGER NOT NULL DEFAULT 0,
+    active_contracts_count INTEGER NOT NULL DEFAULT 0,
+    active_lives_count INTEGER NOT NULL DEFAULT 0,
+    reconciled_at TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE master.company_counters IS 'Contadores agregados por empresa (projeção mantida pelos repositórios)';
+
+-- =====================================================
+-- BACKFILL
+-- =====================================================
+
+INSERT INTO master.company_counters (
+    company_id, establishments_count, clients_count, active_clients_count,
+    professionals_count, active_professionals_count, users_count,
+    active_users_count, active_contracts_count, active_lives_count,
+    reconciled_at
+)
+SELECT
+    c.id,
+    (SELECT COUNT(*) FROM master.establishments e
+      WHERE e.company_id = c.id AND e.deleted_at IS NULL),
+    (SELECT COUNT(*) FROM master.clients cl
+       JOIN master.establishments e ON e.id = cl.establishment_id
+      WHERE e.company_id = c.id AND e.deleted_at IS NULL AND cl.deleted_at IS NULL),
+    (SELECT COUNT(*) FROM master.clients cl
+       JOIN master.establishments e ON e.id = cl.establishment_id
+      WHERE e.company_id = c.id AND e.deleted_at IS NULL AND cl.deleted_at IS NULL
+        AND LOWER(cl.status) = 'active'),
+    (SELECT COUNT(*) FROM master.professionals p
+       JOIN master.establishments e ON e.id = p.establishment_id
+      WHERE e.company_id = c.id AND e.deleted_at IS NULL AND p.deleted_at IS NULL),
+    (SELECT COUNT(*) FROM master.professionals p
+       JOIN master.establishments e ON e.id = p.establishment_id
+      WHERE e.company_id = c.id AND e.deleted_at IS NULL AND p.deleted_at IS NULL
+        AND LOWER(p.status) = 'active'),
+    (SELECT COUNT(*) FROM master.users u
+      WHERE u.company_id = c.id AND u.deleted_at IS NULL),
+    (SELECT COUNT(*) FROM master.users u
+      WHERE u.company_id = c.id AND u.deleted_at IS NULL AND u.is_active),
+    (SELECT COUNT(*) FROM master.contracts ct
+       JOIN master.clients cl ON cl.id = ct.client_id
+       JOIN master.establishments e ON e.id = cl.establishment_id
+      WHERE e.company_id = c.id AND e.deleted_at IS NULL AND LOWER(ct.status) = 'active'),
+    (SELECT COUNT(*) FROM master.contract_lives lv
+       JOIN master.contracts ct ON ct.id = lv.contract_id
+       JOIN master.clients cl ON cl.id = ct.client_id
+       JOIN master.establishments e ON e.id = cl.establishment_id
+      WHERE e.company_id = c.id AND e.deleted_at IS NULL AND LOWER(lv.status) = 'active'),
+    CURRENT_TIMESTAMP
+FROM master.companies c
+WHERE c.deleted_at IS NULL
+ON CONFLICT (company_id) DO NOTHING;
+
+COMMIT;
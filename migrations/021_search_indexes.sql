@@ -0,0 +1,90 @@
+-- =====================================================
+-- MIGRATION 021: Índices de busca textual (pg_trgm + unaccent)
+-- =====================================================
+-- As buscas de pessoas, clientes, usuários e menus usavam ILIKE '%termo%'
+-- em várias colunas, o que nunca usa os índices btree existentes. Esta
+-- migration cria:
+--   * master.search_normalize(text): lower + unaccent IMMUTABLE (indexável),
+--     qualificada com o esquema da extensão unaccent
+--   * índices GIN gin_trgm_ops sobre search_normalize(coluna), usados por
+--     LIKE '%termo%' e por similarity() no ranking
+--   * índices text_pattern_ops em tax_id para busca por prefixo de CPF/CNPJ
+--     (tax_id já é gravado apenas com dígitos)
+-- O builder em app/infrastructure/repositories/search_builder.py gera as
+-- condições usando exatamente estas expressões.
+-- =====================================================
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+-- Sem SCHEMA a extensão iria para master (search_path 'master', 'public')
+CREATE EXTENSION IF NOT EXISTS unaccent SCHEMA public;
+
+-- unaccent() é STABLE (depende do dicionário); com o dicionário explícito
+-- o resultado é determinístico e a função pode ser usada em índices. Uma
+-- instalação anterior pode estar em outro esquema: função e dicionário são
+-- qualificados com o esquema onde a extensão realmente está.
+DO $$
+DECLARE
+    unaccent_schema TEXT;
+BEGIN
+    SELECT n.nspname INTO unaccent_schema
+    FROM pg_extension e
+    JOIN pg_namespace n ON n.oid = e.extnamespace
+    WHERE e.extname = 'unaccent';
+
+    EXECUTE format(
+        $sql$
+        CREATE OR REPLACE FUNCTION master.search_normalize(value TEXT)
+        RETURNS TEXT AS $fn$
+            SELECT lower(%I.unaccent(%L::regdictionary, value));
+        $fn$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        $sql$,
+        unaccent_schema,
+        quote_ident(unaccent_schema) || '.unaccent'
+    );
+END;
+$$;
+
+COMMENT ON FUNCTION master.search_normalize(TEXT) IS 'Normalização para busca (minúsculas, sem acentos) usada nos índices trigram';
+
+-- =====================================================
+-- PESSOAS (empresas, clientes, usuários, estabelecimentos)
+-- =====================================================
+
+CREATE INDEX IF NOT EXISTS idx_people_name_search_trgm
+    ON master.people USING gin (master.search_normalize(name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_people_trade_name_search_trgm
+    ON master.people USING gin (master.search_normalize(trade_name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_people_tax_id_prefix
+    ON master.people (tax_id text_pattern_ops);
+
+-- =====================================================
+-- CLIENTES / USUÁRIOS
+-- =====================================================
+
+CREATE INDEX IF NOT EXISTS idx_clients_code_search_trgm
+    ON master.clients USING gin (master.search_normalize(client_code) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_users_email_search_trgm
+    ON master.users USING gin (master.search_normalize(email_address) gin_trgm_ops);
+
+-- =====================================================
+-- MENUS
+-- =====================================================
+
+CREATE INDEX IF NOT EXISTS idx_menus_name_search_trgm
+    ON master.menus USING gin (master.search_normalize(name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_menus_slug_search_trgm
+    ON master.menus USING gin (master.search_normalize(slug) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_menus_full_path_search_trgm
+    ON master.menus USING gin (master.search_normalize(full_path_name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_menus_description_search_trgm
+    ON master.menus USING gin (master.search_normalize(description) gin_trgm_ops);
+
+COMMIT;
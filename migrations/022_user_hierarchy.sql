@@ -0,0 +1,244 @@
+-- =====================================================
+-- MIGRATION 022: Projeção hierárquica de usuários
+-- =====================================================
+-- A listagem hierárquica de usuários materializava todos os ids acessíveis
+-- via get_accessible_users_hierarchical() e classificava cada linha com
+-- EXISTS correlacionados em user_roles ⨝ roles. Esta migration cria
+-- master.user_hierarchy, uma linha por usuário ativo com:
+--   * maior nível de role por contexto (empresa / estabelecimento)
+--   * empresas e estabelecimentos administrados (contextos das roles)
+--   * empresas e estabelecimentos a que o usuário pertence
+--   * classificação hierárquica (ROOT, ADMIN_EMPRESA, ...) e ordem
+-- mantida por triggers nas tabelas de origem. O escopo do solicitante vira
+-- uma condição de sobreposição de arrays (índices GIN) sobre a projeção.
+-- As regras de acesso são as mesmas de get_accessible_users_hierarchical().
+-- =====================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS master.user_hierarchy (
+    user_id BIGINT PRIMARY KEY REFERENCES master.users(id) ON DELETE CASCADE,
+    is_system_admin BOOLEAN NOT NULL DEFAULT FALSE,
+    max_company_level INTEGER,
+    max_establishment_level INTEGER,
+    max_role_level INTEGER,
+    -- Contextos das roles (o que o usuário administra)
+    company_role_ids BIGINT[] NOT NULL DEFAULT '{}',
+    establishment_role_ids BIGINT[] NOT NULL DEFAULT '{}',
+    -- Vínculos (por onde o usuário é alcançado por administradores)
+    establishment_ids BIGINT[] NOT NULL DEFAULT '{}',
+    company_ids BIGINT[] NOT NULL DEFAULT '{}',
+    hierarchy_level VARCHAR(30) NOT NULL,
+    hierarchy_rank SMALLINT NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE master.user_hierarchy IS 'Projeção hierárquica por usuário (mantida por triggers) usada na listagem de usuários acessíveis';
+
+CREATE INDEX IF NOT EXISTS idx_user_hierarchy_company_ids
+    ON master.user_hierarchy USING gin (company_ids);
+CREATE INDEX IF NOT EXISTS idx_user_hierarchy_establishment_ids
+    ON master.user_hierarchy USING gin (establishment_ids);
+CREATE INDEX IF NOT EXISTS idx_user_hierarchy_rank
+    ON master.user_hierarchy (hierarchy_rank);
+
+-- =====================================================
+-- RECÁLCULO
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION master.refresh_user_hierarchy(p_user_ids BIGINT[])
+RETURNS VOID AS $$
+BEGIN
+    -- Usuários removidos saem da projeção
+    DELETE FROM master.user_hierarchy uh
+    USING master.users u
+    WHERE uh.user_id = u.id
+      AND u.id = ANY(p_user_ids)
+      AND u.deleted_at IS NOT NULL;
+
+    INSERT INTO master.user_hierarchy AS uh (
+        user_id, is_system_admin, max_company_level, max_establishment_level,
+        max_role_level, company_role_ids, establishment_role_ids,
+        establishment_ids, company_ids, hierarchy_level, hierarchy_rank,
+        updated_at
+    )
+    SELECT
+        u.id,
+        COALESCE(u.is_system_admin, FALSE),
+        roles.max_company_level,
+        roles.max_establishment_level,
+        roles.max_role_level,
+        COALESCE(roles.company_role_ids, '{}'),
+        COALESCE(roles.establishment_role_ids, '{}'),
+        COALESCE(links.establishment_ids, '{}'),
+        -- Sem nenhum vínculo ativo o usuário pertence às empresas das roles
+        CASE WHEN links.has_links
+             THEN COALESCE(links.company_ids, '{}')
+             ELSE COALESCE(roles.company_role_ids, '{}')
+        END,
+        CASE
+            WHEN u.is_system_admin THEN 'ROOT'
+            WHEN roles.max_company_level >= 80 THEN 'ADMIN_EMPRESA'
+            WHEN roles.max_establishment_level >= 60 THEN 'ADMIN_ESTABELECIMENTO'
+            ELSE 'USUARIO_COMUM'
+        END,
+        CASE
+            WHEN u.is_system_admin THEN 1
+            WHEN roles.max_role_level >= 80 THEN 2
+            WHEN roles.max_role_level >= 60 THEN 3
+            ELSE 4
+        END,
+        CURRENT_TIMESTAMP
+    FROM master.users u
+    LEFT JOIN LATERAL (
+        SELECT
+            MAX(r.level) FILTER (WHERE ur.context_type = 'company') AS max_company_level,
+            MAX(r.level) FILTER (WHERE ur.context_type = 'establishment') AS max_establishment_level,
+            MAX(r.level) AS max_role_level,
+            ARRAY_AGG(DISTINCT ur.context_id) FILTER (
+                WHERE ur.context_type = 'company' AND ur.context_id IS NOT NULL
+            ) AS company_role_ids,
+            ARRAY_AGG(DISTINCT ur.context_id) FILTER (
+                WHERE ur.context_type = 'establishment' AND ur.context_id IS NOT NULL
+            ) AS establishment_role_ids
+        FROM master.user_roles ur
+        JOIN master.roles r ON r.id = ur.role_id
+        WHERE ur.user_id = u.id
+          AND ur.deleted_at IS NULL
+    ) roles ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT
+            COUNT(*) > 0 AS has_links,
+            ARRAY_AGG(DISTINCT e.id) FILTER (WHERE e.deleted_at IS NULL) AS establishment_ids,
+            ARRAY_AGG(DISTINCT c.id) FILTER (
+                WHERE e.deleted_at IS NULL AND c.deleted_at IS NULL
+            ) AS company_ids
+        FROM master.user_establishments ue
+        JOIN master.establishments e ON e.id = ue.establishment_id
+        LEFT JOIN master.companies c ON c.id = e.company_id
+        WHERE ue.user_id = u.id
+          AND ue.deleted_at IS NULL
+    ) links ON TRUE
+    WHERE u.id = ANY(p_user_ids)
+      AND u.deleted_at IS NULL
+    ON CONFLICT (user_id) DO UPDATE SET
+        is_system_admin = EXCLUDED.is_system_admin,
+        max_company_level = EXCLUDED.max_company_level,
+        max_establishment_level = EXCLUDED.max_establishment_level,
+        max_role_level = EXCLUDED.max_role_level,
+        company_role_ids = EXCLUDED.company_role_ids,
+        establishment_role_ids = EXCLUDED.establishment_role_ids,
+        establishment_ids = EXCLUDED.establishment_ids,
+        company_ids = EXCLUDED.company_ids,
+        hierarchy_level = EXCLUDED.hierarchy_level,
+        hierarchy_rank = EXCLUDED.hierarchy_rank,
+        updated_at = EXCLUDED.updated_at;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION master.refresh_user_hierarchy(BIGINT[]) IS 'Recalcula a projeção master.user_hierarchy para os usuários informados';
+
+-- =====================================================
+-- TRIGGERS
+-- =====================================================
+
+-- users, user_roles e user_establishments: recalcula o(s) usuário(s) da linha
+CREATE OR REPLACE FUNCTION master.tr_refresh_user_hierarchy_by_user()
+RETURNS TRIGGER AS $$
+DECLARE
+    column_name TEXT := TG_ARGV[0];
+    affected BIGINT[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        affected := ARRAY[(to_jsonb(NEW) ->> column_name)::BIGINT];
+    ELSIF TG_OP = 'DELETE' THEN
+        affected := ARRAY[(to_jsonb(OLD) ->> column_name)::BIGINT];
+    ELSE
+        affected := ARRAY[
+            (to_jsonb(NEW) ->> column_name)::BIGINT,
+            (to_jsonb(OLD) ->> column_name)::BIGINT
+        ];
+    END IF;
+
+    PERFORM master.refresh_user_hierarchy(affected);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tr_user_hierarchy_users ON master.users;
+CREATE TRIGGER tr_user_hierarchy_users
+    AFTER INSERT OR UPDATE OF is_system_admin, deleted_at ON master.users
+    FOR EACH ROW EXECUTE FUNCTION master.tr_refresh_user_hierarchy_by_user('id');
+
+DROP TRIGGER IF EXISTS tr_user_hierarchy_user_roles ON master.user_roles;
+CREATE TRIGGER tr_user_hierarchy_user_roles
+    AFTER INSERT OR UPDATE OR DELETE ON master.user_roles
+    FOR EACH ROW EXECUTE FUNCTION master.tr_refresh_user_hierarchy_by_user('user_id');
+
+DROP TRIGGER IF EXISTS tr_user_hierarchy_user_establishments ON master.user_establishments;
+CREATE TRIGGER tr_user_hierarchy_user_establishments
+    AFTER INSERT OR UPDATE OR DELETE ON master.user_establishments
+    FOR EACH ROW EXECUTE FUNCTION master.tr_refresh_user_hierarchy_by_user('user_id');
+
+-- roles: mudança de nível/contexto recalcula quem possui a role
+CREATE OR REPLACE FUNCTION master.tr_refresh_user_hierarchy_by_role()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM master.refresh_user_hierarchy(ARRAY(
+        SELECT DISTINCT ur.user_id FROM master.user_roles ur WHERE ur.role_id = NEW.id
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tr_user_hierarchy_roles ON master.roles;
+CREATE TRIGGER tr_user_hierarchy_roles
+    AFTER UPDATE OF level, context_type ON master.roles
+    FOR EACH ROW EXECUTE FUNCTION master.tr_refresh_user_hierarchy_by_role();
+
+-- establishments / companies: mudança de empresa ou exclusão lógica
+-- recalcula os usuários vinculados
+CREATE OR REPLACE FUNCTION master.tr_refresh_user_hierarchy_by_establishment()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM master.refresh_user_hierarchy(ARRAY(
+        SELECT DISTINCT ue.user_id
+        FROM master.user_establishments ue
+        WHERE ue.establishment_id = NEW.id
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tr_user_hierarchy_establishments ON master.establishments;
+CREATE TRIGGER tr_user_hierarchy_establishments
+    AFTER UPDATE OF company_id, deleted_at ON master.establishments
+    FOR EACH ROW EXECUTE FUNCTION master.tr_refresh_user_hierarchy_by_establishment();
+
+CREATE OR REPLACE FUNCTION master.tr_refresh_user_hierarchy_by_company()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM master.refresh_user_hierarchy(ARRAY(
+        SELECT DISTINCT ue.user_id
+        FROM master.user_establishments ue
+        JOIN master.establishments e ON e.id = ue.establishment_id
+        WHERE e.company_id = NEW.id
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tr_user_hierarchy_companies ON master.companies;
+CREATE TRIGGER tr_user_hierarchy_companies
+    AFTER UPDATE OF deleted_at ON master.companies
+    FOR EACH ROW EXECUTE FUNCTION master.tr_refresh_user_hierarchy_by_company();
+
+-- =====================================================
+-- BACKFILL
+-- =====================================================
+
+SELECT master.refresh_user_hierarchy(ARRAY(
+    SELECT id FROM master.users WHERE deleted_at IS NULL
+));
+
+COMMIT;
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Benchmark do codec de valores do cache Redis
+
+Mede tamanho e tempo de encode/decode para payloads típicos (árvore de
+menus e lista de permissões) no formato antigo (json.dumps + prefixo na
+chave) e no codec com cabeçalho (orjson/msgpack, compressão acima do
+limite). Com --redis mede também a latência de get/set contra o Redis
+configurado, incluindo o custo de um miss no formato antigo (3 GETs).
+
+Uso:
+    python scripts/benchmark_cache_codec.py            # apenas codec
+    python scripts/benchmark_cache_codec.py --redis    # codec + Redis
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.infrastructure.cache.codec import CacheCodec, msgpack  # noqa: E402
+
+
+def menu_tree(roots: int = 8, children: int = 6, depth: int = 3) -> List[Dict]:
+    """Árvore de menus no formato cacheado pelo MenuCacheService"""
+
+    def node(menu_id: int, level: int, path: str) -> Dict[str, Any]:
+        name = f"Menu {menu_id}"
+        return {
+            "id": menu_id,
+            "name": name,
+            "slug": f"menu-{menu_id}",
+            "url": f"/admin{path}/menu-{menu_id}",
+            "icon": "Folder",
+            "level": level,
+            "sort_order": menu_id % 10,
+            "menu_type": "folder" if level < depth else "page",
+            "status": "active",
+            "is_visible": True,
+            "permission_name": f"menus.view.{menu_id}",
+            "full_path_name": f"{path.strip('/').replace('/', ' > ')} > {name}",
+            "children": [],
+        }
+
+    counter = iter(range(1, 100000))
+
+    def build(level: int, path: str) -> List[Dict]:
+        count = roots if level == 0 else children
+        nodes = []
+        for _ in range(count):
+            item = node(next(counter), level, path)
+            if level < depth - 1:
+                item["children"] = build(level + 1, f"{path}/{item['slug']}")
+            nodes.append(item)
+        return nodes
+
+    return build(0, "")
+
+
+def permissions(count: int = 300) -> List[str]:
+    modules = ["users", "companies", "establishments", "clients", "contracts"]
+    actions = ["view", "list", "create", "edit", "delete", "export"]
+    return [
+        f"{modules[i % len(modules)]}.{actions[i % len(actions)]}.{i}"
+        for i in range(count)
+    ]
+
+
+PAYLOADS = {
+    "menu_tree": menu_tree(),
+    "permissions": permissions(),
+    "small_dict": {"user_id": 1, "context": "establishment", "context_id": 10},
+}
+
+
+def legacy_encode(value: Any) -> bytes:
+    return json.dumps(value, default=str).encode("utf-8")
+
+
+def legacy_decode(data: bytes) -> Any:
+    return json.loads(data.decode("utf-8"))
+
+
+def timed(func: Callable[[], Any], rounds: int) -> List[float]:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(name: str, samples: List[float], size: int = None):
+    samples = sorted(samples)
+    p99 = samples[max(0, int(len(samples) * 0.99) - 1)]
+    size_info = f"  {size:>8} bytes" if size is not None else ""
+    print(
+        f"  {name:<22} mean={statistics.fmean(samples) * 1e6:9.1f}µs  "
+        f"p50={statistics.median(samples) * 1e6:9.1f}µs  "
+        f"p99={p99 * 1e6:9.1f}µs{size_info}"
+    )
+
+
+def codecs() -> Dict[str, Any]:
+    variants = {
+        "json": CacheCodec("json", compress_threshold=0),
+        "json+compress": CacheCodec("json", compress_threshold=1024),
+    }
+    if msgpack is not None:
+        variants["msgpack"] = CacheCodec("msgpack", compress_threshold=0)
+        variants["msgpack+compress"] = CacheCodec("msgpack", compress_threshold=1024)
+    return variants
+
+
+def bench_codecs(rounds: int):
+    for name, payload in PAYLOADS.items():
+        print(f"\n📦 {name}")
+        legacy = legacy_encode(payload)
+        report(
+            "legacy json encode",
+            timed(lambda: legacy_encode(payload), rounds),
+            len(legacy),
+        )
+        report("legacy json decode", timed(lambda: legacy_decode(legacy), rounds))
+
+        for codec_name, codec in codecs().items():
+            encoded = codec.encode(payload)
+            report(
+                f"{codec_name} encode",
+                timed(lambda: codec.encode(payload), rounds),
+                len(encoded),
+            )
+            report(f"{codec_name} decode", timed(lambda: codec.decode(encoded), rounds))
+
+
+async def bench_redis(rounds: int):
+    from app.infrastructure.cache.simplified_redis import SimplifiedRedisClient
+
+    client = SimplifiedRedisClient()
+    await client.connect()
+    try:
+        for name, payload in PAYLOADS.items():
+            key = f"benchmark:codec:{name}"
+            print(f"\n🔌 Redis - {name}")
+
+            samples = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                await client.set(key, payload, 60)
+                samples.append(time.perf_counter() - start)
+            report("set", samples)
+
+            samples = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                await client.get(key)
+                samples.append(time.perf_counter() - start)
+            report("get (hit)", samples)
+
+            samples = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                await client.get(f"{key}:missing")
+                samples.append(time.perf_counter() - start)
+            report("get (miss)", samples)
+
+            # Miss no formato antigo: json:, pickle: e raw: em sequência
+            samples = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for prefix in ("json", "pickle", "raw"):
+                    await client.redis.get(f"{prefix}:{key}:missing")
+                samples.append(time.perf_counter() - start)
+            report("legacy get (miss)", samples)
+
+            await client.delete(key)
+    finally:
+        await client.disconnect()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--redis", action="store_true")
+    parser.add_argument("--rounds", type=int, default=500)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    bench_codecs(args.rounds)
+    if args.redis:
+        asyncio.run(bench_redis(args.rounds))
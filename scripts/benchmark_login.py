@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark de login sob carga
+
+Dispara logins concorrentes contra uma API em execução e, ao mesmo tempo,
+mede a latência de um endpoint não relacionado (por padrão o liveness probe).
+Com o hash de senhas fora do event loop, a latência do probe deve permanecer
+baixa mesmo durante uma "tempestade" de logins; quando o executor satura, os
+logins excedentes recebem HTTP 429 rapidamente.
+
+Uso:
+    python scripts/benchmark_login.py \\
+        --base-url http://localhost:8000 \\
+        --email admin@proteamcare.com --password admin123 \\
+        --concurrency 50 --duration 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+from typing import Dict, List
+
+import httpx
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentil por nearest-rank"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def login_worker(
+    client: httpx.AsyncClient,
+    args: argparse.Namespace,
+    deadline: float,
+    latencies: List[float],
+    statuses: Counter,
+):
+    data = {"username": args.email, "password": args.password}
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.post("/api/v1/auth/login", data=data)
+            statuses[response.status_code] += 1
+        except httpx.HTTPError as e:
+            statuses[type(e).__name__] += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def probe_worker(
+    client: httpx.AsyncClient,
+    path: str,
+    interval: float,
+    deadline: float,
+    latencies: List[float],
+):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            await client.get(path)
+            latencies.append(time.perf_counter() - start)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(interval)
+
+
+async def measure_probe_baseline(
+    client: httpx.AsyncClient, path: str, samples: int
+) -> List[float]:
+    latencies: List[float] = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        await client.get(path)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def summarize(name: str, latencies: List[float]) -> Dict[str, float]:
+    summary = {
+        "count": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+    }
+    print(
+        f"  {name:<22} n={summary['count']:<6} "
+        f"p50={summary['p50_ms']:8.1f}ms  p99={summary['p99_ms']:8.1f}ms  "
+        f"mean={summary['mean_ms']:8.1f}ms"
+    )
+    return summary
+
+
+async def run(args: argparse.Namespace):
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        print(f"🔎 Baseline do probe ({args.probe_path})...")
+        baseline = await measure_probe_baseline(client, args.probe_path, samples=50)
+
+        print(
+            f"🚀 {args.concurrency} logins concorrentes por {args.duration}s "
+            f"({args.base_url})..."
+        )
+        login_latencies: List[float] = []
+        probe_latencies: List[float] = []
+        statuses: Counter = Counter()
+
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            probe_worker(
+                client,
+                args.probe_path,
+                args.probe_interval,
+                deadline,
+                probe_latencies,
+            ),
+            *[
+                login_worker(client, args, deadline, login_latencies, statuses)
+                for _ in range(args.concurrency)
+            ],
+        )
+        elapsed = time.perf_counter() - started
+
+    successful = statuses.get(200, 0)
+    print("\n📊 Resultados")
+    print(f"  logins/s (200)         {successful / elapsed:8.1f}")
+    print(f"  respostas              {dict(statuses)}")
+    summarize("login", login_latencies)
+    summarize("probe (baseline)", baseline)
+    summarize("probe (durante carga)", probe_latencies)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de login sob carga")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@proteamcare.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--probe-path", default="/api/v1/live")
+    parser.add_argument("--probe-interval", type=float, default=0.05)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
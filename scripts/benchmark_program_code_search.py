@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca de códigos de programas (Ctrl+Alt+X)
+
+Compara o índice em memória com a busca SQL (pg_trgm) para um conjunto de
+consultas típicas de digitação. Sem --database usa um catálogo sintético e
+mede apenas o índice.
+
+Uso:
+    python scripts/benchmark_program_code_search.py              # sintético
+    python scripts/benchmark_program_code_search.py --database   # índice vs SQL
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.infrastructure.services.program_code_search import (  # noqa: E402
+    ProgramCodeEntry,
+    ProgramCodeSearchIndex,
+)
+
+QUERIES = [
+    "em0001",
+    "e",
+    "em",
+    "emp",
+    "empr",
+    "empresa",
+    "cadastro",
+    "consulta",
+    "contrato",
+    "vidas",
+    "usuario",
+    "relatorio",
+    "empressa",
+    "faturamento",
+]
+
+MODULES = {
+    "EM": "Empresas",
+    "ES": "Estabelecimentos",
+    "US": "Usuários",
+    "CL": "Clientes",
+    "CT": "Contratos",
+    "VD": "Vidas",
+    "FT": "Faturamento",
+    "RL": "Relatórios",
+}
+
+PROGRAM_TYPES = {
+    "00": "Cadastro de",
+    "01": "Detalhes de",
+    "02": "Consulta de",
+    "05": "Relatório de",
+    "07": "Ativação de",
+}
+
+
+def synthetic_catalog(copies: int) -> List[ProgramCodeEntry]:
+    entries = []
+    entry_id = 1
+    for copy in range(copies):
+        for module_code, module in MODULES.items():
+            for program_type, action in PROGRAM_TYPES.items():
+                label = f"{action} {module}" + (f" {copy}" if copy else "")
+                entries.append(
+                    ProgramCodeEntry(
+                        id=entry_id,
+                        shortcode=f"{module_code.lower()}{program_type}{copy:02d}",
+                        label=label,
+                        description=f"Manutenção e {action.lower()} {module.lower()}",
+                        route=f"/admin/{module.lower()}",
+                        icon="Search",
+                        module_code=module_code,
+                        program_type=program_type,
+                        search_tokens=[module.lower(), action.split()[0].lower()],
+                    )
+                )
+                entry_id += 1
+    return entries
+
+
+def report(name: str, samples: List[float]):
+    samples = sorted(samples)
+    p99 = samples[max(0, int(len(samples) * 0.99) - 1)]
+    print(
+        f"  {name:<10} n={len(samples):<6} "
+        f"mean={statistics.fmean(samples) * 1e6:10.1f}µs  "
+        f"p50={statistics.median(samples) * 1e6:10.1f}µs  "
+        f"p99={p99 * 1e6:10.1f}µs"
+    )
+
+
+def bench_sync(func: Callable[[str], object], rounds: int) -> List[float]:
+    samples = []
+    for _ in range(rounds):
+        for query in QUERIES:
+            start = time.perf_counter()
+            func(query)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def bench_database(rounds: int):
+    from app.infrastructure.database import async_session, dispose_engines
+    from app.infrastructure.services.program_code_search import (
+        SHORTCODE_PATTERN,
+        fetch_active_program_codes,
+        sql_exact_search,
+        sql_fuzzy_search,
+    )
+
+    async with async_session() as db:
+        index = ProgramCodeSearchIndex()
+        index.load(await fetch_active_program_codes(db), version=None)
+        print(f"📚 {index.size} códigos ativos carregados do banco")
+
+        sql_samples = []
+        for _ in range(rounds):
+            for query in QUERIES:
+                start = time.perf_counter()
+                if not (
+                    SHORTCODE_PATTERN.match(query) and await sql_exact_search(db, query)
+                ):
+                    await sql_fuzzy_search(db, query)
+                sql_samples.append(time.perf_counter() - start)
+
+    await dispose_engines()
+    return index, sql_samples
+
+
+def index_search(index: ProgramCodeSearchIndex):
+    def search(query: str):
+        if index.get_exact(query):
+            return
+        index.search(query)
+
+    return search
+
+
+async def main(args: argparse.Namespace):
+    if args.database:
+        index, sql_samples = await bench_database(args.rounds)
+    else:
+        index = ProgramCodeSearchIndex()
+        index.load(synthetic_catalog(args.copies), version=None)
+        sql_samples = None
+        print(f"📚 Catálogo sintético com {index.size} códigos")
+
+    print(f"\n📊 {len(QUERIES)} consultas x {args.rounds} rodadas")
+    report("índice", bench_sync(index_search(index), args.rounds))
+    if sql_samples:
+        report("sql", sql_samples)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", action="store_true")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--copies", type=int, default=5)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Reconciliação dos contadores por empresa (master.company_counters)
+
+Recalcula a projeção em lote a partir das tabelas de origem. Agendar
+diariamente (cron) para corrigir desvios de escritas feitas fora dos
+repositórios (scripts, SQL manual).
+
+Uso:
+    python scripts/reconcile_company_counters.py               # todas
+    python scripts/reconcile_company_counters.py --company 1 2 # apenas estas
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.infrastructure.database import (  # noqa: E402
+    batch_session_scope,
+    dispose_engines,
+)
+from app.infrastructure.repositories.company_counters_repository import (  # noqa: E402
+    CompanyCountersRepository,
+)
+
+
+async def main(args: argparse.Namespace):
+    start = time.perf_counter()
+    async with batch_session_scope() as db:
+        companies = await CompanyCountersRepository(db).reconcile(args.company)
+    await dispose_engines()
+
+    print(
+        f"✅ {companies} empresas reconciliadas em "
+        f"{time.perf_counter() - start:.2f}s"
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--company", type=int, nargs="+", default=None)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
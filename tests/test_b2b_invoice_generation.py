@@ -0,0 +1,95 @@
+"""
+Testes para a geração mensal de faturas B2B em lote
+"""
+
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.infrastructure.repositories.b2b_billing_repository import B2BBillingRepository
+from app.infrastructure.services.b2b_billing_service import B2BBillingService
+
+
+def _subscription(company_id, billing_day=10, already_invoiced=False):
+    return SimpleNamespace(
+        id=company_id * 10,
+        company_id=company_id,
+        billing_day=billing_day,
+        payment_method="manual",
+        monthly_price=Decimal("99.90"),
+        already_invoiced=already_invoiced,
+    )
+
+
+@pytest.fixture
+def repository():
+    repo = MagicMock()
+    repo.format_invoice_number = B2BBillingRepository.format_invoice_number
+
+    async def create_bulk(invoices):
+        return {invoice["company_id"] for invoice in invoices}
+
+    repo.create_proteamcare_invoices_bulk = AsyncMock(side_effect=create_bulk)
+    return repo
+
+
+class TestGenerateMonthlyInvoices:
+    """Uma consulta de assinaturas e um INSERT por lote"""
+
+    @pytest.mark.asyncio
+    async def test_skips_already_invoiced_companies(self, repository):
+        repository.get_subscriptions_for_invoicing = AsyncMock(
+            return_value=[
+                _subscription(1),
+                _subscription(2, already_invoiced=True),
+                _subscription(3, billing_day=31),
+            ]
+        )
+        service = B2BBillingService(repository, MagicMock())
+
+        result = await service.generate_monthly_invoices(2, 2025)
+
+        repository.get_subscriptions_for_invoicing.assert_awaited_once_with(
+            date(2025, 2, 1), date(2025, 2, 28), None
+        )
+        repository.create_proteamcare_invoices_bulk.assert_awaited_once()
+        invoices = repository.create_proteamcare_invoices_bulk.await_args.args[0]
+        assert [invoice["invoice_number"] for invoice in invoices] == [
+            "PTC-2025-02-0001-001",
+            "PTC-2025-02-0003-001",
+        ]
+        assert invoices[1]["due_date"] == date(2025, 2, 28)
+
+        assert result["total_companies"] == 3
+        assert result["invoices_created"] == 2
+        assert result["invoices_failed"] == 1
+        assert result["total_amount"] == Decimal("199.80")
+        assert result["errors"] == ["Fatura já existe para empresa ID 2"]
+
+    @pytest.mark.asyncio
+    async def test_batches_and_conflicts(self, repository):
+        repository.get_subscriptions_for_invoicing = AsyncMock(
+            return_value=[_subscription(company_id) for company_id in range(1, 6)]
+        )
+        # Segundo lote falha; empresa 5 faturada por outra execução
+        repository.create_proteamcare_invoices_bulk.side_effect = [
+            {1, 2},
+            RuntimeError("falha"),
+            set(),
+        ]
+        service = B2BBillingService(repository, MagicMock())
+        service.INVOICE_BATCH_SIZE = 2
+
+        result = await service.generate_monthly_invoices(12, 2025, [1, 2, 3, 4, 5])
+
+        assert repository.create_proteamcare_invoices_bulk.await_count == 3
+        assert result["invoices_created"] == 2
+        assert result["invoices_failed"] == 3
+        assert result["errors"] == [
+            "Erro na empresa ID 3: falha",
+            "Erro na empresa ID 4: falha",
+            "Fatura já existe para empresa ID 5",
+        ]
@@ -0,0 +1,154 @@
+"""
+Testes para as operações em lote do cache (get_many/set_many/delete_many)
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.domain.entities.menu import MenuEntity
+from app.infrastructure.cache.advanced_cache import AdvancedCacheManager
+from app.infrastructure.cache.menu_cache_service import MenuCacheService
+from app.infrastructure.cache.mock_redis import MockRedis
+from app.infrastructure.cache.permission_cache import PermissionCache
+from app.infrastructure.cache.simplified_redis import SimplifiedRedisClient
+
+
+@pytest.fixture
+def client():
+    redis_client = SimplifiedRedisClient()
+    redis_client.redis = MockRedis()
+    redis_client.redis.mget = AsyncMock(wraps=redis_client.redis.mget)
+    redis_client.redis.pipeline = MagicMock(wraps=redis_client.redis.pipeline)
+    return redis_client
+
+
+class TestSimplifiedRedisBatch:
+    """Um comando por lote em vez de um round trip por chave"""
+
+    @pytest.mark.asyncio
+    async def test_set_many_with_per_key_ttl(self, client):
+        written = await client.set_many({"a": 1, "b": [2], "c": "3"}, 60, ttls={"b": 5})
+
+        assert written == 3
+        assert client.redis.pipeline.call_count == 1
+        assert client.redis._expiry == {"a": 60, "b": 5, "c": 60}
+
+    @pytest.mark.asyncio
+    async def test_get_many_returns_only_hits(self, client):
+        await client.set_many({"a": 1, "b": {"x": 2}})
+
+        assert await client.get_many(["a", "b", "missing"]) == {"a": 1, "b": {"x": 2}}
+        assert client.redis.mget.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_batches_respect_batch_size(self, client):
+        client.batch_size = 2
+        keys = [f"k{i}" for i in range(5)]
+        await client.set_many({key: key for key in keys})
+
+        assert client.redis.pipeline.call_count == 3
+        assert await client.get_many(keys) == {key: key for key in keys}
+        assert client.redis.mget.await_count == 3
+        assert await client.delete_many(keys) == 5
+
+    @pytest.mark.asyncio
+    async def test_get_many_migrates_legacy_keys(self, client):
+        await client.redis.setex("json:a", 30, b"1")
+        await client.redis.setex("raw:b", 40, b"texto")
+
+        assert await client.get_many(["a", "b"]) == {"a": 1, "b": "texto"}
+        assert sorted(client.redis._data) == ["a", "b"]
+        assert client.redis._expiry == {"a": 30, "b": 40}
+
+
+class TestAdvancedCacheBatch:
+    """L1 + L2 em lote"""
+
+    @pytest.mark.asyncio
+    async def test_get_many_fills_l1_from_l2(self, client):
+        cache = AdvancedCacheManager(redis_client=client)
+        assert await cache.set_many("users", {"1": "ana", "2": "bia"}) == 2
+        assert await client.get("advanced_cache:users:1") == "ana"
+
+        cache._l1_cache.clear()
+        await cache.set("users", "3", "caio", l1_only=True)
+
+        result = await cache.get_many("users", ["1", "2", "3", "4"])
+        assert result == {"1": "ana", "2": "bia", "3": "caio"}
+        assert cache.metrics.l1_hits == 1
+        assert cache.metrics.l2_hits == 2
+        assert cache.metrics.misses == 1
+
+        assert await cache.delete_many("users", ["1", "2"]) == 2
+        assert await client.get_many(["advanced_cache:users:1"]) == {}
+
+    @pytest.mark.asyncio
+    async def test_warm_cache_writes_once(self, client):
+        cache = AdvancedCacheManager(redis_client=client)
+
+        async def load(key):
+            return None if key == "skip" else key.upper()
+
+        await cache.warm_cache("codes", load, ["a", "b", "skip"])
+
+        assert client.redis.pipeline.call_count == 1
+        assert await cache.get_many("codes", ["a", "b", "skip"]) == {
+            "a": "A",
+            "b": "B",
+        }
+
+
+class TestMenuCacheBatch:
+    """Pré-aquecimento de menus em um único pipeline"""
+
+    @pytest.mark.asyncio
+    async def test_warm_cache_single_pipeline(self, client):
+        child = MenuEntity(id=2, name="Usuários", slug="usuarios", level=1)
+        root = MenuEntity(id=1, name="Admin", slug="admin", children=[child])
+        service = MenuCacheService(client)
+
+        results = await service.warm_cache([root])
+
+        assert results == {"tree": True, "items": True, "items_count": 2}
+        assert client.redis.pipeline.call_count == 1
+        assert client.redis._expiry["menu_tree:v0:system"] == 300
+
+        items = await service.get_menu_items([1, 2, 3])
+        assert sorted(items) == [1, 2]
+        assert items[2].name == "Usuários"
+
+
+class TestPermissionPreload:
+    """Um MGET, uma consulta e um pipeline"""
+
+    @pytest.mark.asyncio
+    async def test_preload_fetches_only_missing_contexts(self):
+        cache = PermissionCache()
+        cache.redis = MockRedis()
+        await cache.redis.setex(
+            "permissions:user:5:ctx:company:1",
+            60,
+            '{"roles": {"2": 0}, "permissions": ["companies.view"]}',
+        )
+
+        fetch = AsyncMock(
+            return_value={
+                ("establishment", 3): {"roles": {"4": 0}, "permissions": ["users.view"]}
+            }
+        )
+        with patch.object(cache, "_fetch_contexts_entries_from_db", fetch):
+            result = await cache.preload_user_permissions(
+                5,
+                [
+                    {"context_type": "company", "context_id": 1},
+                    {"context_type": "establishment", "context_id": 3},
+                ],
+            )
+
+        assert result == {
+            ("company", 1): ["companies.view"],
+            ("establishment", 3): ["users.view"],
+        }
+        fetch.assert_awaited_once_with(5, [("establishment", 3)])
+        assert "permissions:user:5:ctx:establishment:3" in cache.redis._data
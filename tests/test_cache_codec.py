@@ -0,0 +1,98 @@
+"""
+Testes para o codec de valores do cache e o SimplifiedRedisClient
+"""
+
+import json
+from datetime import date
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.infrastructure.cache.codec import (
+    COMPRESSION_ZLIB,
+    COMPRESSION_ZSTD,
+    FORMAT_JSON,
+    FORMAT_PICKLE,
+    CacheCodec,
+    CodecError,
+)
+from app.infrastructure.cache.mock_redis import MockRedis
+from app.infrastructure.cache.simplified_redis import SimplifiedRedisClient
+
+
+class TestCacheCodec:
+    """Formato no byte de cabeçalho"""
+
+    def test_json_native_values(self):
+        codec = CacheCodec(compress_threshold=0)
+        for value in ({"a": [1, 2.5, None]}, ["x"], "texto", 10, True):
+            encoded = codec.encode(value)
+            assert encoded[0] == FORMAT_JSON
+            assert codec.decode(encoded) == value
+
+    def test_other_values_use_pickle(self):
+        codec = CacheCodec(compress_threshold=0)
+        encoded = codec.encode(date(2025, 1, 2))
+        assert encoded[0] == FORMAT_PICKLE
+        assert codec.decode(encoded) == date(2025, 1, 2)
+
+    def test_compresses_large_payloads(self):
+        codec = CacheCodec(compress_threshold=256)
+        value = [{"name": "Menu", "slug": "menu", "level": 1}] * 100
+        encoded = codec.encode(value)
+        assert encoded[0] & (COMPRESSION_ZLIB | COMPRESSION_ZSTD)
+        assert len(encoded) < len(json.dumps(value))
+        assert codec.decode(encoded) == value
+
+    def test_invalid_data(self):
+        codec = CacheCodec()
+        with pytest.raises(CodecError):
+            codec.decode(b"")
+        with pytest.raises(CodecError):
+            codec.decode(b"\x0f{}")
+
+
+@pytest.fixture
+def client():
+    redis_client = SimplifiedRedisClient()
+    redis_client.redis = MockRedis()
+    return redis_client
+
+
+class TestSimplifiedRedisClient:
+    """Um round trip por get e migração das chaves prefixadas"""
+
+    @pytest.mark.asyncio
+    async def test_set_get_single_key(self, client):
+        assert await client.set("menus:tree", {"id": 1}, 60)
+        assert list(client.redis._data) == ["menus:tree"]
+
+        client.redis.mget = AsyncMock(wraps=client.redis.mget)
+        assert await client.get("menus:tree") == {"id": 1}
+        assert client.redis.mget.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_get_without_legacy_keys_is_plain_get(self, client):
+        client.read_legacy_keys = False
+        client.redis.mget = AsyncMock()
+        assert await client.get("missing") is None
+        client.redis.mget.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_legacy_value_is_migrated(self, client):
+        await client.redis.setex("json:permissions:1", 120, b'["users.view"]')
+
+        assert await client.get("permissions:1") == ["users.view"]
+        assert "json:permissions:1" not in client.redis._data
+        assert client.codec.decode(client.redis._data["permissions:1"]) == [
+            "users.view"
+        ]
+        assert client.redis._expiry["permissions:1"] == 120
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_legacy_variants(self, client):
+        await client.set("key", "novo")
+        await client.redis.setex("pickle:key", 60, b"antigo")
+        assert await client.exists("key")
+        assert await client.delete("key")
+        assert client.redis._data == {}
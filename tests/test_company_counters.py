@@ -0,0 +1,329 @@
+"""
+Testes para a projeção de contadores por empresa
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from app.infrastructure.repositories.company_counters_repository import (
+    COUNTER_COLUMNS,
+    CompanyCountersRepository,
+    is_active_status,
+    status_delta,
+)
+from app.presentation.schemas.client import ClientStatus
+
+
+def _result(row=None, scalar=None):
+    result = MagicMock()
+    result.mappings.return_value.first.return_value = row
+    result.mappings.return_value.one.return_value = row
+    result.scalar.return_value = scalar
+    result.rowcount = 1
+    return result
+
+
+@pytest.fixture
+def db():
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=_result())
+    session.commit = AsyncMock()
+    session.flush = AsyncMock()
+    return session
+
+
+class TestCompanyCountersRepository:
+    """Ajustes incrementais e leitura de uma linha"""
+
+    @pytest.mark.asyncio
+    async def test_adjust_updates_only_changed_counters(self, db):
+        await CompanyCountersRepository(db).adjust(
+            7, clients_count=1, active_clients_count=0
+        )
+
+        statement, params = db.execute.await_args.args
+        sql = str(statement)
+        assert sql.startswith("UPDATE master.company_counters")
+        assert "clients_count = clients_count + :clients_count" in sql
+        assert "active_clients_count" not in sql
+        assert params == {"company_id": 7, "clients_count": 1}
+
+    @pytest.mark.asyncio
+    async def test_adjust_reports_negative_counters(self, db):
+        db.execute = AsyncMock(return_value=_result(row={"clients_count": -1}))
+
+        with patch(
+            "app.infrastructure.repositories.company_counters_repository.logger"
+        ) as logger:
+            await CompanyCountersRepository(db).adjust(7, clients_count=-1)
+
+        assert "GREATEST" not in str(db.execute.await_args.args[0])
+        logger.warning.assert_called_once_with(
+            "company_counters_drift", company_id=7, counters={"clients_count": -1}
+        )
+
+    @pytest.mark.asyncio
+    async def test_adjust_without_company_or_delta_is_noop(self, db):
+        repo = CompanyCountersRepository(db)
+        await repo.adjust(None, clients_count=1)
+        await repo.adjust(7, clients_count=0)
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_adjust_rejects_unknown_counter(self, db):
+        with pytest.raises(ValueError):
+            await CompanyCountersRepository(db).adjust(7, patients_count=1)
+
+    @pytest.mark.asyncio
+    async def test_adjust_for_client_resolves_company(self, db):
+        db.execute = AsyncMock(side_effect=[_result(scalar=3), _result()])
+
+        await CompanyCountersRepository(db).adjust_for_client(
+            42, active_contracts_count=1
+        )
+
+        lookup, update = db.execute.await_args_list
+        assert lookup.args[1] == {"key": 42}
+        assert update.args[1]["company_id"] == 3
+
+    @pytest.mark.asyncio
+    async def test_get_reconciles_missing_row(self, db):
+        row = {column: 1 for column in COUNTER_COLUMNS}
+        db.execute = AsyncMock(side_effect=[_result(), _result(), _result(row=row)])
+
+        counters = await CompanyCountersRepository(db).get(5)
+
+        assert counters == row
+        reconcile_params = db.execute.await_args_list[1].args[1]
+        assert reconcile_params == {"company_ids": [5]}
+        db.flush.assert_awaited_once()
+        db.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_client_moved_to_other_company(self, db):
+        dependants = {"active_contracts_count": 2, "active_lives_count": 5}
+        db.execute = AsyncMock(
+            side_effect=[
+                _result(scalar=1),  # empresa do estabelecimento antigo
+                _result(scalar=2),  # empresa do estabelecimento novo
+                _result(row=dependants),
+                _result(),
+                _result(),
+            ]
+        )
+
+        await CompanyCountersRepository(db).adjust_for_client_update(
+            42, 10, 20, was_active=True, is_active=True
+        )
+
+        old_params = db.execute.await_args_list[3].args[1]
+        new_params = db.execute.await_args_list[4].args[1]
+        assert old_params == {
+            "company_id": 1,
+            "clients_count": -1,
+            "active_clients_count": -1,
+            "active_contracts_count": -2,
+            "active_lives_count": -5,
+        }
+        assert new_params == {
+            "company_id": 2,
+            "clients_count": 1,
+            "active_clients_count": 1,
+            "active_contracts_count": 2,
+            "active_lives_count": 5,
+        }
+
+    @pytest.mark.asyncio
+    async def test_client_status_change_in_same_company(self, db):
+        db.execute = AsyncMock(side_effect=[_result(scalar=1), _result()])
+
+        await CompanyCountersRepository(db).adjust_for_client_update(
+            42, 10, 10, was_active=True, is_active=False
+        )
+
+        assert db.execute.await_args.args[1] == {
+            "company_id": 1,
+            "active_clients_count": -1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_remove_establishment_subtracts_dependants(self, db):
+        dependants = {
+            "clients_count": 0,
+            "active_clients_count": 0,
+            "professionals_count": 0,
+            "active_professionals_count": 0,
+            "active_contracts_count": 1,
+            "active_lives_count": 3,
+        }
+        db.execute = AsyncMock(side_effect=[_result(row=dependants), _result()])
+
+        await CompanyCountersRepository(db).remove_establishment(7, 10)
+
+        assert db.execute.await_args.args[1] == {
+            "company_id": 7,
+            "establishments_count": -1,
+            "active_contracts_count": -1,
+            "active_lives_count": -3,
+        }
+
+
+class TestStatusHelpers:
+    def test_status_delta(self):
+        assert status_delta(False, True) == 1
+        assert status_delta(True, False) == -1
+        assert status_delta(True, True) == 0
+
+    def test_is_active_status_accepts_enum(self):
+        assert is_active_status(ClientStatus.ACTIVE)
+        assert is_active_status("ACTIVE")
+        assert not is_active_status("inactive")
+        assert not is_active_status(None)
+
+
+# Esquema descartável com as colunas lidas pelo SQL de contagem; as consultas
+# do repositório rodam com "master." trocado por este esquema, numa transação
+# desfeita ao final do teste.
+SCHEMA = "company_counters_test"
+
+FIXTURE_TABLES = f"""
+    CREATE SCHEMA {SCHEMA};
+    CREATE TABLE {SCHEMA}.companies (
+        id BIGINT PRIMARY KEY, deleted_at TIMESTAMP
+    );
+    CREATE TABLE {SCHEMA}.establishments (
+        id BIGINT PRIMARY KEY, company_id BIGINT NOT NULL, deleted_at TIMESTAMP
+    );
+    CREATE TABLE {SCHEMA}.clients (
+        id BIGINT PRIMARY KEY, establishment_id BIGINT NOT NULL,
+        status VARCHAR(20), deleted_at TIMESTAMP
+    );
+    CREATE TABLE {SCHEMA}.professionals (
+        id BIGSERIAL PRIMARY KEY, establishment_id BIGINT NOT NULL,
+        status VARCHAR(20), deleted_at TIMESTAMP
+    );
+    CREATE TABLE {SCHEMA}.users (
+        id BIGINT PRIMARY KEY, company_id BIGINT, is_active BOOLEAN,
+        deleted_at TIMESTAMP
+    );
+    CREATE TABLE {SCHEMA}.contracts (
+        id BIGINT PRIMARY KEY, client_id BIGINT NOT NULL, status VARCHAR(20)
+    );
+    CREATE TABLE {SCHEMA}.contract_lives (
+        id BIGINT PRIMARY KEY, contract_id BIGINT NOT NULL, status VARCHAR(20)
+    );
+    CREATE TABLE {SCHEMA}.company_counters (
+        company_id BIGINT PRIMARY KEY,
+        establishments_count INTEGER NOT NULL DEFAULT 0,
+        clients_count INTEGER NOT NULL DEFAULT 0,
+        active_clients_count INTEGER NOT NULL DEFAULT 0,
+        professionals_count INTEGER NOT NULL DEFAULT 0,
+        active_professionals_count INTEGER NOT NULL DEFAULT 0,
+        users_count INTEGER NOT NULL DEFAULT 0,
+        active_users_count INTEGER NOT NULL DEFAULT 0,
+        active_contracts_count INTEGER NOT NULL DEFAULT 0,
+        active_lives_count INTEGER NOT NULL DEFAULT 0,
+        reconciled_at TIMESTAMP,
+        updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+    INSERT INTO {SCHEMA}.companies (id) VALUES (1);
+    INSERT INTO {SCHEMA}.establishments (id, company_id) VALUES (10, 1);
+"""
+
+
+def _local(sql: str) -> str:
+    return sql.replace("master.", f"{SCHEMA}.")
+
+
+class _SchemaSession:
+    """Sessão mínima que executa o SQL do repositório no esquema de teste"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def execute(self, statement, params=None):
+        return await self.conn.execute(text(_local(str(statement))), params or {})
+
+    async def flush(self):
+        pass
+
+
+@pytest_asyncio.fixture
+async def counters_db():
+    """Conexão com o esquema de teste (pula sem banco disponível)"""
+    from tests.conftest import test_engine
+
+    try:
+        conn = await test_engine.connect()
+    except Exception as e:
+        pytest.skip(f"PostgreSQL de teste indisponível: {e}")
+
+    transaction = await conn.begin()
+    try:
+        for statement in FIXTURE_TABLES.split(";"):
+            if statement.strip():
+                await conn.execute(text(statement))
+        yield _SchemaSession(conn)
+    finally:
+        await transaction.rollback()
+        await conn.close()
+
+
+async def _create_professional(db, status: str) -> None:
+    """Mesmo ajuste feito por POST /professionals"""
+    await db.execute(
+        text(
+            "INSERT INTO master.professionals (establishment_id, status) "
+            "VALUES (10, :status)"
+        ),
+        {"status": status},
+    )
+    await CompanyCountersRepository(db).adjust_for_establishment(
+        10,
+        professionals_count=1,
+        active_professionals_count=int(is_active_status(status)),
+    )
+
+
+@pytest.mark.integration
+class TestCompanyCountersReconcile:
+    """Incrementos e reconciliação usam a mesma definição de ativo"""
+
+    @pytest.mark.asyncio
+    async def test_uppercase_active_professional_survives_reconcile(self, counters_db):
+        repo = CompanyCountersRepository(counters_db)
+        await repo.reconcile([1])
+
+        await _create_professional(counters_db, "ACTIVE")
+        await _create_professional(counters_db, "inactive")
+        incremental = await repo.get(1)
+
+        await repo.reconcile([1])
+        reconciled = await repo.get(1)
+
+        assert incremental["professionals_count"] == 2
+        assert incremental["active_professionals_count"] == 1
+        assert reconciled == incremental
+
+    @pytest.mark.asyncio
+    async def test_remove_establishment_matches_reconcile(self, counters_db):
+        repo = CompanyCountersRepository(counters_db)
+        await _create_professional(counters_db, "ACTIVE")
+        await repo.reconcile([1])
+
+        await repo.remove_establishment(1, 10)
+        await counters_db.execute(
+            text(
+                "UPDATE master.establishments SET deleted_at = CURRENT_TIMESTAMP "
+                "WHERE id = 10"
+            )
+        )
+        incremental = await repo.get(1)
+
+        await repo.reconcile([1])
+
+        assert incremental["active_professionals_count"] == 0
+        assert await repo.get(1) == incremental
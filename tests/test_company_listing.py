@@ -0,0 +1,159 @@
+"""
+Testes para a listagem de empresas (contagem de contatos)
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.infrastructure.repositories.company_repository import (
+    PEOPLE_CONTACT_TYPES,
+    CompanyRepository,
+)
+
+
+@pytest.fixture
+def db():
+    session = MagicMock()
+    result = MagicMock()
+    result.fetchall.return_value = [
+        SimpleNamespace(
+            id=1,
+            person_id=10,
+            name="Empresa",
+            trade_name=None,
+            tax_id="11222333000181",
+            status="active",
+            phones_count=2,
+            emails_count=3,
+            addresses_count=0,
+            created_at=datetime(2025, 1, 1),
+            updated_at=datetime(2025, 1, 1),
+        )
+    ]
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+class TestGetCompanies:
+    """Contagens correlacionadas só para as empresas da página"""
+
+    @pytest.mark.asyncio
+    async def test_counts_are_limited_to_the_page(self, db):
+        companies = await CompanyRepository(db).get_companies(limit=10)
+        assert [company.id for company in companies] == [1]
+        assert companies[0].emails_count == 3
+
+        statement = db.execute.await_args.args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        # Paginação dentro da subquery; contagens correlacionadas, sem GROUP BY
+        assert "GROUP BY" not in sql
+        assert sql.index("LIMIT") < sql.index(") AS page")
+        for column in ("phoneable_id", "emailable_id", "addressable_id"):
+            assert f"{column} = page.person_id" in sql
+
+    @pytest.mark.asyncio
+    async def test_legacy_contact_types_are_counted(self, db):
+        await CompanyRepository(db).get_companies(limit=10)
+
+        statement = db.execute.await_args.args[0]
+        params = statement.compile(dialect=postgresql.dialect()).params
+        assert params["phoneable_type_1"] == list(PEOPLE_CONTACT_TYPES)
+        assert {"People", "people", "person"} <= set(PEOPLE_CONTACT_TYPES)
+
+
+@pytest.mark.integration
+class TestGetCompaniesDatabase:
+    """Contagens contra PostgreSQL (transação desfeita ao final)"""
+
+    @pytest.mark.asyncio
+    async def test_counts_match_contacts(self):
+        from sqlalchemy.ext.asyncio import AsyncSession
+
+        from app.infrastructure.orm.models import (
+            Address,
+            Base,
+            Company,
+            Email,
+            People,
+            Phone,
+        )
+        from tests.conftest import test_engine
+
+        try:
+            conn = await test_engine.connect()
+        except Exception as e:
+            pytest.skip(f"PostgreSQL de teste indisponível: {e}")
+
+        transaction = await conn.begin()
+        try:
+            await conn.run_sync(Base.metadata.create_all)
+            session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+
+            company = Company()
+            session.add(company)
+            await session.flush()
+            person = People(
+                company_id=company.id,
+                person_type="PJ",
+                name="Empresa Contatos",
+                tax_id="11222333000181",
+            )
+            session.add(person)
+            await session.flush()
+            company.person_id = person.id
+
+            # Tipos atual e legados; um contato excluído não conta
+            for index, contact_type in enumerate(PEOPLE_CONTACT_TYPES):
+                session.add(
+                    Phone(
+                        phoneable_type=contact_type,
+                        phoneable_id=person.id,
+                        company_id=company.id,
+                        number=f"1199999000{index}",
+                    )
+                )
+            session.add(
+                Phone(
+                    phoneable_id=person.id,
+                    company_id=company.id,
+                    number="11999990009",
+                    deleted_at=datetime(2025, 1, 1),
+                )
+            )
+            for index in range(2):
+                session.add(
+                    Email(
+                        emailable_type="People",
+                        emailable_id=person.id,
+                        company_id=company.id,
+                        email_address=f"contato{index}@empresa.com",
+                    )
+                )
+            session.add(
+                Address(
+                    addressable_id=person.id,
+                    company_id=company.id,
+                    street="Rua A",
+                    neighborhood="Centro",
+                    city="São Paulo",
+                    state="SP",
+                    zip_code="01001000",
+                )
+            )
+            await session.flush()
+
+            companies = await CompanyRepository(session).get_companies(
+                search="Empresa Contatos"
+            )
+        finally:
+            await transaction.rollback()
+            await conn.close()
+
+        listed = next(c for c in companies if c.id == company.id)
+        assert listed.phones_count == len(PEOPLE_CONTACT_TYPES)
+        assert listed.emails_count == 2
+        assert listed.addresses_count == 1
@@ -0,0 +1,131 @@
+"""
+Testes para a importação em lote de vidas de contrato
+"""
+
+import io
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.infrastructure.services.contract_lives_import import (
+    ContractLivesImportService,
+    ImportFileError,
+    iter_import_rows,
+)
+
+CONTRACT = SimpleNamespace(
+    id=9,
+    start_date=date(2025, 1, 1),
+    end_date=date(2025, 12, 31),
+    lives_contracted=3,
+    lives_maximum=None,
+)
+
+HEADER = "person_name;cpf;start_date;end_date;relationship_type;notes\n"
+
+
+def _csv(*lines):
+    return io.BytesIO((HEADER + "".join(lines)).encode("utf-8"))
+
+
+def _result(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    result.scalar.return_value = rows
+    return result
+
+
+def _db(*results):
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=list(results))
+    db.commit = AsyncMock()
+    return db
+
+
+class TestImportParsing:
+    """Leitura em streaming do CSV"""
+
+    def test_csv_with_semicolon_and_br_dates(self):
+        rows = list(
+            iter_import_rows(
+                "vidas.csv",
+                _csv(
+                    "Ana Souza;1234567890;01/02/2025;;titular;\n",
+                    ";;;;;\n",
+                    "Bia Lima;529.982.247-25;2025-03-01;2025-06-30;DEPENDENTE;obs\n",
+                ),
+            )
+        )
+
+        assert [number for number, _ in rows] == [2, 4]
+        assert rows[0][1]["cpf"] == "01234567890"
+        assert rows[0][1]["end_date"] is None
+        assert rows[1][1]["notes"] == "obs"
+
+    def test_missing_columns(self):
+        with pytest.raises(ImportFileError):
+            list(iter_import_rows("vidas.csv", io.BytesIO(b"nome,cpf\nAna,1\n")))
+
+
+class TestContractLivesImportService:
+    """Validação por lote e gravação em INSERTs multi-row"""
+
+    @pytest.mark.asyncio
+    async def test_row_errors_and_dry_run(self):
+        file = _csv(
+            "Ana Souza;52998224725;01/02/2025;;TITULAR;\n",
+            "Ana Souza;52998224725;2025-03-01;;TITULAR;\n",
+            "Bia Lima;11111111111;2025-03-01;;TITULAR;\n",
+            "Caio Reis;39053344705;2024-12-01;;TITULAR;\n",
+            "Davi Melo;16899535009;2025-02-01;;OUTRO;\n",
+            "Eva Dias;86288366757;2025-02-01;;DEPENDENTE;\n",
+        )
+        # Pessoas existentes, sobreposição com o banco, vidas ativas
+        db = _db(_result([("86288366757", 40)]), _result([(7,)]), _result(0))
+
+        response = await ContractLivesImportService(db).import_file(
+            CONTRACT, 1, "vidas.csv", file, dry_run=True
+        )
+
+        assert response.total_rows == 6
+        assert response.imported == 1
+        assert [error.row for error in response.errors] == [3, 4, 5, 6, 7]
+        assert "linha 2" in response.errors[0].error
+        assert "início do contrato" in response.errors[2].error
+        assert db.execute.await_count == 3
+        db.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_import_respects_limit_and_batches(self):
+        file = _csv(
+            "Ana Souza;52998224725;2025-02-01;;TITULAR;\n",
+            "Bia Lima;39053344705;2025-02-01;;TITULAR;\n",
+            "Caio Reis;16899535009;2025-02-01;;TITULAR;\n",
+        )
+        db = _db(
+            _result([]),
+            _result(1),
+            _result([("52998224725", 1)]),
+            _result([("39053344705", 2)]),
+            _result([(1, date(2025, 2, 1))]),
+            _result([(2, date(2025, 2, 1))]),
+        )
+        counters = MagicMock(adjust_for_contract=AsyncMock())
+
+        with patch(
+            "app.infrastructure.services.contract_lives_import.CompanyCountersRepository",
+            return_value=counters,
+        ):
+            response = await ContractLivesImportService(db, batch_size=1).import_file(
+                CONTRACT, 1, "vidas.csv", file, created_by=3
+            )
+
+        assert response.imported == 2
+        assert [error.row for error in response.errors] == [4]
+        assert "Limite de vidas" in response.errors[0].error
+        # pessoas + limite + 2 blocos de pessoas novas + 2 blocos de vidas
+        assert db.execute.await_count == 6
+        counters.adjust_for_contract.assert_awaited_once_with(9, active_lives_count=2)
+        db.commit.assert_awaited_once()
@@ -0,0 +1,201 @@
+"""
+Testes para a auditoria LGPD em lote
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.infrastructure.services.data_access_audit import (
+    OVERFLOW_BLOCK,
+    OVERFLOW_DROP,
+    DataAccessAuditLog,
+    DataAccessEvent,
+)
+
+
+class FakeSession:
+    """Sessão falsa que registra statements executados"""
+
+    executed = []
+    fail = False
+    poison = None
+    delay = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self, statement, params):
+        if FakeSession.delay:
+            await asyncio.sleep(FakeSession.delay)
+        if FakeSession.fail:
+            raise RuntimeError("database unavailable")
+        rows = json.loads(params["events"])
+        if any(row["user_id"] == FakeSession.poison for row in rows):
+            raise ValueError("invalid input value")
+        FakeSession.executed.append((str(statement), params))
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def reset_session():
+    FakeSession.executed = []
+    FakeSession.fail = False
+    FakeSession.poison = None
+    FakeSession.delay = 0
+
+
+def _written_user_ids():
+    return sorted(
+        row["user_id"]
+        for _, params in FakeSession.executed
+        for row in json.loads(params["events"])
+    )
+
+
+def _event(user_id=1):
+    return DataAccessEvent(
+        user_id=user_id,
+        table_accessed="vw_users_complete",
+        records_accessed={"user_ids": [2, 3]},
+        records_count=2,
+    )
+
+
+class TestDataAccessAuditLog:
+    """Fila limitada, INSERT multi-row e flush no shutdown"""
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_batches(self):
+        audit = DataAccessAuditLog(session_factory=FakeSession, batch_size=2)
+        for user_id in range(5):
+            assert await audit.record(_event(user_id))
+
+        assert await audit.flush() == 5
+        assert len(FakeSession.executed) == 3
+
+        statement, params = FakeSession.executed[0]
+        assert "jsonb_to_recordset" in statement
+        rows = json.loads(params["events"])
+        assert [row["user_id"] for row in rows] == [0, 1]
+        assert rows[0]["records_accessed"] == {"user_ids": [2, 3]}
+        assert audit.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_returns_to_queue(self):
+        audit = DataAccessAuditLog(session_factory=FakeSession)
+        await audit.record(_event())
+        FakeSession.fail = True
+
+        assert await audit.flush() == 0
+        assert audit.pending() == 1
+        assert audit.stats["errors"] == 1
+
+        FakeSession.fail = False
+        assert await audit.flush() == 1
+
+    @pytest.mark.asyncio
+    async def test_drop_policy_when_full(self):
+        audit = DataAccessAuditLog(
+            session_factory=FakeSession, max_queue_size=2, overflow_policy=OVERFLOW_DROP
+        )
+        results = [await audit.record(_event()) for _ in range(3)]
+
+        assert results == [True, True, False]
+        assert audit.stats["dropped"] == 1
+        assert audit.pending() == 2
+
+    @pytest.mark.asyncio
+    async def test_block_policy_waits_for_flush(self):
+        audit = DataAccessAuditLog(
+            session_factory=FakeSession,
+            flush_interval=60,
+            max_queue_size=2,
+            overflow_policy=OVERFLOW_BLOCK,
+        )
+        await audit.start()
+        try:
+            for _ in range(3):
+                assert await asyncio.wait_for(audit.record(_event()), 1)
+            assert audit.stats["dropped"] == 0
+        finally:
+            await audit.stop()
+
+        assert audit.stats["written"] == 3
+        assert audit.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_write_in_progress(self):
+        audit = DataAccessAuditLog(
+            session_factory=FakeSession, flush_interval=60, batch_size=1
+        )
+        await audit.start()
+        FakeSession.delay = 0.05
+        await audit.record(_event())
+        await asyncio.sleep(0.01)
+
+        await audit.stop()
+
+        assert len(FakeSession.executed) == 1
+        assert audit.stats["written"] == 1
+        assert audit.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_write_returns_batch_to_queue(self):
+        audit = DataAccessAuditLog(session_factory=FakeSession)
+        await audit.record(_event())
+        FakeSession.delay = 1
+
+        flush = asyncio.create_task(audit.flush())
+        await asyncio.sleep(0.01)
+        flush.cancel()
+        await asyncio.gather(flush, return_exceptions=True)
+
+        assert audit.pending() == 1
+        FakeSession.delay = 0
+        assert await audit.flush() == 1
+
+    @pytest.mark.asyncio
+    async def test_poison_batch_is_parked_and_isolated(self):
+        audit = DataAccessAuditLog(
+            session_factory=FakeSession, batch_size=4, max_batch_retries=2
+        )
+        FakeSession.poison = 99
+        for user_id in (1, 99, 2, 3, 4):
+            await audit.record(_event(user_id))
+
+        assert await audit.flush() == 0
+        assert await audit.flush() == 0
+        assert audit.stats["parked"] == 4
+
+        # O lote estacionado não bloqueia os eventos seguintes
+        assert await audit.flush() == 1
+        assert _written_user_ids() == [4]
+
+        for _ in range(3):
+            await audit.flush()
+
+        assert _written_user_ids() == [1, 2, 3, 4]
+        assert audit.stats["discarded"] == 1
+        assert audit.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_parked_batch_kept_while_database_is_down(self):
+        audit = DataAccessAuditLog(session_factory=FakeSession, max_batch_retries=1)
+        await audit.record(_event())
+        FakeSession.fail = True
+
+        for _ in range(3):
+            assert await audit.flush() == 0
+        assert audit.pending() == 1
+        assert audit.stats["discarded"] == 0
+
+        FakeSession.fail = False
+        assert await audit.flush() == 1
+        assert audit.pending() == 0
@@ -0,0 +1,42 @@
+"""
+Testes para configuração dos engines de banco por workload
+"""
+
+from app.infrastructure import database
+from config.settings import settings
+
+
+class TestWorkloadEngines:
+    """Testes para engines API/batch e cache de prepared statements"""
+
+    def test_api_pool_uses_settings(self):
+        """Pool da API segue DB_POOL_SIZE / DB_POOL_OVERFLOW"""
+        pool = database.engine.sync_engine.pool
+        assert pool.size() == settings.db_pool_size
+        assert pool._max_overflow == settings.db_pool_overflow
+
+    def test_batch_engine_has_separate_pool(self):
+        """Jobs em lote não compartilham pool com requests"""
+        assert database.batch_engine is not database.engine
+        pool = database.batch_engine.sync_engine.pool
+        assert pool is not database.engine.sync_engine.pool
+        assert pool.size() == settings.db_batch_pool_size
+
+    def test_statement_cache_enabled_for_direct_connections(self, monkeypatch):
+        """Sem PgBouncer, caches de statements do asyncpg ficam habilitados"""
+        monkeypatch.setattr(settings, "db_pgbouncer_mode", "disabled")
+        connect_args = database._build_connect_args("api", 60)
+
+        assert connect_args["statement_cache_size"] == settings.db_statement_cache_size
+        assert connect_args["prepared_statement_cache_size"] > 0
+        assert "prepared_statement_name_func" not in connect_args
+
+    def test_pgbouncer_transaction_mode_uses_unique_statement_names(self, monkeypatch):
+        """Em transaction pooling, nomes únicos evitam colisões entre conexões"""
+        monkeypatch.setattr(settings, "db_pgbouncer_mode", "transaction")
+        connect_args = database._build_connect_args("batch", 900)
+
+        assert connect_args["statement_cache_size"] == 0
+        name_func = connect_args["prepared_statement_name_func"]
+        assert name_func() != name_func()
+        assert connect_args["server_settings"]["application_name"].endswith("-batch")
@@ -0,0 +1,217 @@
+"""
+Testes para a outbox de emails (entrega assíncrona com pool SMTP)
+"""
+
+import asyncio
+import smtplib
+import socket
+from email.mime.text import MIMEText
+
+import pytest
+
+from app.infrastructure.services.email_outbox import EmailOutbox
+
+
+def _message(to: str = "user@example.com") -> MIMEText:
+    msg = MIMEText("corpo")
+    msg["From"] = "noreply@proteamcare.com"
+    msg["To"] = to
+    msg["Subject"] = "Teste"
+    return msg
+
+
+class FakeSMTP:
+    """Conexão SMTP falsa que registra mensagens enviadas"""
+
+    instances = []
+
+    def __init__(self, fail_first: int = 0):
+        self.sent = []
+        self.fail_first = fail_first
+        self.closed = False
+        FakeSMTP.instances.append(self)
+
+    def send_message(self, msg):
+        if self.fail_first:
+            self.fail_first -= 1
+            raise smtplib.SMTPServerDisconnected("connection lost")
+        self.sent.append(msg)
+
+    def noop(self):
+        return (250, b"OK")
+
+    def quit(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def reset_fake_smtp():
+    FakeSMTP.instances = []
+    yield
+
+
+class TestEmailOutbox:
+    """Testes para EmailOutbox"""
+
+    @pytest.mark.asyncio
+    async def test_reuses_persistent_connection(self):
+        """Vários emails compartilham uma conexão por worker"""
+        outbox = EmailOutbox(
+            connection_factory=FakeSMTP, workers=1, rate_limit_per_second=0
+        )
+        await outbox.start()
+
+        for i in range(50):
+            outbox.enqueue(_message(f"user{i}@example.com"))
+        await outbox.stop()
+
+        assert len(FakeSMTP.instances) == 1
+        assert len(FakeSMTP.instances[0].sent) == 50
+        assert outbox.stats["sent"] == 50
+
+    @pytest.mark.asyncio
+    async def test_retries_after_disconnect(self):
+        """Conexão perdida é recriada e o email reenviado"""
+        factories = iter([FakeSMTP(fail_first=1), FakeSMTP()])
+        outbox = EmailOutbox(
+            connection_factory=lambda: next(factories),
+            workers=1,
+            retry_base_delay=0.01,
+            rate_limit_per_second=0,
+        )
+        await outbox.start()
+
+        outbox.enqueue(_message())
+        await asyncio.sleep(0.2)
+        await outbox.stop()
+
+        assert outbox.stats["retried"] == 1
+        assert outbox.stats["sent"] == 1
+        assert len(FakeSMTP.instances[1].sent) == 1
+
+    @pytest.mark.asyncio
+    async def test_reconnects_dropped_connection_without_retry(self):
+        """Conexão encerrada pelo servidor é refeita sem contar tentativa"""
+
+        class IdleClosed(FakeSMTP):
+            def noop(self):
+                raise smtplib.SMTPServerDisconnected("idle timeout")
+
+        idle, reused, fresh = IdleClosed(), FakeSMTP(), FakeSMTP()
+        factories = iter([idle, reused, fresh])
+        outbox = EmailOutbox(
+            connection_factory=lambda: next(factories),
+            workers=1,
+            retry_base_delay=60,
+            rate_limit_per_second=0,
+        )
+        await outbox.start()
+
+        for _ in range(2):
+            outbox.enqueue(_message())
+            await outbox._queue.join()
+
+        # Passa no NOOP mas cai durante o envio
+        reused.fail_first = 1
+        outbox.enqueue(_message())
+        await outbox.stop()
+
+        assert [len(conn.sent) for conn in (idle, reused, fresh)] == [1, 1, 1]
+        assert outbox.stats["sent"] == 3
+        assert outbox.stats["retried"] == 0
+
+    @pytest.mark.asyncio
+    async def test_refused_recipient_keeps_connection(self):
+        """Recusa do destinatário não perde a conexão recém-aberta"""
+
+        class Refusing(FakeSMTP):
+            def send_message(self, msg):
+                if msg["To"].startswith("bad"):
+                    raise smtplib.SMTPRecipientsRefused({msg["To"]: (550, b"")})
+                super().send_message(msg)
+
+        dropped, fresh = FakeSMTP(), Refusing()
+        factories = iter([dropped, fresh])
+        outbox = EmailOutbox(
+            connection_factory=lambda: next(factories),
+            workers=1,
+            retry_base_delay=60,
+            rate_limit_per_second=0,
+        )
+        await outbox.start()
+
+        outbox.enqueue(_message())
+        await outbox._queue.join()
+
+        # Reconexão em que o primeiro envio é recusado
+        dropped.fail_first = 1
+        for to in ("bad1@example.com", "ok@example.com", "bad2@example.com"):
+            outbox.enqueue(_message(to))
+        await outbox.stop()
+
+        assert len(FakeSMTP.instances) == 2
+        assert [len(conn.sent) for conn in (dropped, fresh)] == [1, 1]
+        assert outbox.stats["retried"] == 2
+        assert all(conn.closed for conn in FakeSMTP.instances)
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        """Após max_attempts o email vai para dead letters"""
+
+        class AlwaysFailing(FakeSMTP):
+            def send_message(self, msg):
+                raise smtplib.SMTPRecipientsRefused({})
+
+        outbox = EmailOutbox(
+            connection_factory=AlwaysFailing,
+            workers=1,
+            max_attempts=2,
+            retry_base_delay=0.01,
+            rate_limit_per_second=0,
+        )
+        await outbox.start()
+
+        outbox.enqueue(_message())
+        await asyncio.sleep(0.2)
+        await outbox.stop()
+
+        assert outbox.stats["failed"] == 1
+        assert len(outbox.dead_letters) == 1
+
+    @pytest.mark.asyncio
+    async def test_delivers_to_local_smtp_server(self):
+        """Entrega real contra um servidor aiosmtpd local"""
+        aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+        from aiosmtpd.handlers import Sink
+
+        class Recorder(Sink):
+            def __init__(self):
+                self.received = []
+
+            async def handle_DATA(self, server, session, envelope):
+                self.received.append(envelope)
+                return "250 OK"
+
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+
+        handler = Recorder()
+        controller = aiosmtpd_controller.Controller(
+            handler, hostname="127.0.0.1", port=port
+        )
+        controller.start()
+        try:
+            outbox = EmailOutbox(
+                connection_factory=lambda: smtplib.SMTP("127.0.0.1", port),
+                workers=2,
+                rate_limit_per_second=0,
+            )
+            await outbox.start()
+            for i in range(10):
+                outbox.enqueue(_message(f"user{i}@example.com"))
+            await outbox.stop()
+        finally:
+            controller.stop()
+
+        assert len(handler.received) == 10
@@ -0,0 +1,178 @@
+"""
+Testes para os códigos de execução gerados por contador diário
+"""
+
+import importlib.util
+from datetime import date
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+MIGRATION = (
+    Path(__file__).resolve().parent.parent
+    / "alembic"
+    / "versions"
+    / "019_execution_code_counters.py"
+)
+
+
+@pytest.fixture(scope="module")
+def migration():
+    spec = importlib.util.spec_from_file_location("execution_codes", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Esquema descartável com as colunas usadas pelo trigger de 012; o SQL da
+# migration é aplicado com "master." trocado por este esquema e tudo roda
+# numa transação desfeita ao final do teste.
+SCHEMA = "execution_codes_test"
+
+FIXTURE_TABLES = f"""
+    CREATE SCHEMA {SCHEMA};
+    CREATE TABLE {SCHEMA}.service_executions (
+        id BIGSERIAL PRIMARY KEY,
+        execution_code VARCHAR(30) NOT NULL UNIQUE,
+        execution_date DATE NOT NULL
+    );
+"""
+
+TRIGGER_SQL = f"""
+    CREATE TRIGGER trigger_generate_execution_code
+        BEFORE INSERT ON {SCHEMA}.service_executions
+        FOR EACH ROW
+        WHEN (NEW.execution_code IS NULL OR NEW.execution_code = '')
+        EXECUTE FUNCTION {SCHEMA}.generate_execution_code();
+"""
+
+TODAY = date(2025, 3, 14)
+
+
+def _local(sql: str) -> str:
+    return sql.replace("master.", f"{SCHEMA}.")
+
+
+@pytest_asyncio.fixture
+async def codes_db():
+    """Conexão asyncpg com o esquema de teste (pula sem banco disponível)"""
+    from tests.conftest import test_engine
+
+    try:
+        conn = await test_engine.connect()
+    except Exception as e:
+        pytest.skip(f"PostgreSQL de teste indisponível: {e}")
+
+    raw = (await conn.get_raw_connection()).driver_connection
+    transaction = raw.transaction()
+    await transaction.start()
+    try:
+        await raw.execute(FIXTURE_TABLES)
+        yield raw
+    finally:
+        await transaction.rollback()
+        await conn.close()
+
+
+async def _install(db, migration, backfill: bool = False):
+    await db.execute(_local(migration.COUNTERS_TABLE_SQL))
+    if backfill:
+        await db.execute(_local(migration.BACKFILL_SQL))
+    await db.execute(_local(migration.EXECUTION_CODE_FUNCTIONS_SQL))
+    await db.execute(TRIGGER_SQL)
+
+
+async def _insert(db, execution_date, execution_code=None):
+    return await db.fetchval(
+        f"""
+        INSERT INTO {SCHEMA}.service_executions (execution_code, execution_date)
+        VALUES ($1, $2) RETURNING execution_code
+        """,
+        execution_code,
+        execution_date,
+    )
+
+
+async def _reserve(db, code_date, count):
+    rows = await db.fetch(
+        f"SELECT code FROM {SCHEMA}.reserve_execution_codes($1, $2) AS code",
+        code_date,
+        count,
+    )
+    return [row["code"] for row in rows]
+
+
+@pytest.mark.integration
+class TestExecutionCodeCounters:
+    """Backfill, reserva em bloco e trigger contra PostgreSQL"""
+
+    @pytest.mark.asyncio
+    async def test_backfill_seeds_from_existing_codes(self, codes_db, migration):
+        db = codes_db
+        for code, execution_date in (
+            ("EXE-20250314-001", TODAY),
+            ("EXE-20250314-007", TODAY),
+            ("EXE-20250313-1200", date(2025, 3, 13)),
+            ("MANUAL-42", TODAY),
+        ):
+            await _insert(db, execution_date, code)
+
+        await _install(db, migration, backfill=True)
+
+        counters = await db.fetch(
+            f"SELECT code_date, last_value FROM {SCHEMA}.execution_code_counters "
+            "ORDER BY code_date"
+        )
+        assert [tuple(row) for row in counters] == [
+            (date(2025, 3, 13), 1200),
+            (TODAY, 7),
+        ]
+        # Continua depois do maior código existente
+        assert await _insert(db, TODAY) == "EXE-20250314-008"
+
+    @pytest.mark.asyncio
+    async def test_reserve_returns_contiguous_block(self, codes_db, migration):
+        db = codes_db
+        await _install(db, migration)
+
+        assert await _reserve(db, TODAY, 3) == [
+            "EXE-20250314-001",
+            "EXE-20250314-002",
+            "EXE-20250314-003",
+        ]
+        assert await _reserve(db, TODAY, 2) == [
+            "EXE-20250314-004",
+            "EXE-20250314-005",
+        ]
+        assert await _reserve(db, TODAY, 0) == []
+        # Cada dia tem seu contador
+        assert await _reserve(db, date(2025, 3, 15), 1) == ["EXE-20250315-001"]
+
+    @pytest.mark.asyncio
+    async def test_same_day_inserts_get_consecutive_codes(self, codes_db, migration):
+        db = codes_db
+        await _install(db, migration)
+
+        first = await _insert(db, TODAY)
+        second = await _insert(db, TODAY)
+        # Código informado explicitamente não passa pelo contador
+        await _insert(db, TODAY, "EXE-20250314-900")
+
+        assert (first, second) == ("EXE-20250314-001", "EXE-20250314-002")
+        assert await _insert(db, TODAY) == "EXE-20250314-003"
+
+    @pytest.mark.asyncio
+    async def test_codes_above_999_are_not_truncated(self, codes_db, migration):
+        db = codes_db
+        await _install(db, migration)
+        await db.execute(
+            f"INSERT INTO {SCHEMA}.execution_code_counters VALUES ($1, 998)", TODAY
+        )
+
+        assert await _insert(db, TODAY) == "EXE-20250314-999"
+        assert await _insert(db, TODAY) == "EXE-20250314-1000"
+        assert await _reserve(db, TODAY, 2) == [
+            "EXE-20250314-1001",
+            "EXE-20250314-1002",
+        ]
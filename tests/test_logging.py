@@ -0,0 +1,86 @@
+"""
+Testes para o pipeline de logging estruturado (amostragem e fila)
+"""
+
+import logging
+
+import pytest
+import structlog
+
+from app.infrastructure.logging import EventSampler, parse_event_rules
+
+
+class TestEventRules:
+    """Testes para parsing das regras configuradas em settings"""
+
+    def test_parse_event_rules(self):
+        rules = parse_event_rules("permission_granted=0.05, access_granted=10,bad")
+        assert rules == {"permission_granted": 0.05, "access_granted": 10.0}
+
+    def test_parse_empty_rules(self):
+        assert parse_event_rules("") == {}
+
+
+class TestEventSampler:
+    """Testes para amostragem/rate limit por nome de evento"""
+
+    def test_unconfigured_events_pass(self):
+        sampler = EventSampler(sample_rates={"noisy": 0.0})
+        event = {"event": "other"}
+        assert sampler(None, "info", event) is event
+
+    def test_zero_rate_drops_info_events(self):
+        sampler = EventSampler(sample_rates={"noisy": 0.0})
+        with pytest.raises(structlog.DropEvent):
+            sampler(None, "info", {"event": "noisy"})
+
+    def test_warnings_are_never_sampled(self):
+        sampler = EventSampler(sample_rates={"noisy": 0.0})
+        event = {"event": "noisy"}
+        assert sampler(None, "warning", event) is event
+
+    def test_rate_limit_reports_dropped_count(self):
+        sampler = EventSampler(rate_limits={"burst": 1})
+
+        assert sampler(None, "info", {"event": "burst"}) == {"event": "burst"}
+        with pytest.raises(structlog.DropEvent):
+            sampler(None, "info", {"event": "burst"})
+
+        # Nova janela de 1s: evento volta com a contagem de descartados
+        sampler._windows["burst"][0] -= 1.0
+        assert sampler(None, "info", {"event": "burst"}) == {
+            "event": "burst",
+            "dropped": 1,
+        }
+
+
+class TestQueueHandler:
+    """Testes para o handler não bloqueante"""
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        import queue
+
+        from app.infrastructure.logging import _DeferredQueueHandler
+
+        handler = _DeferredQueueHandler(queue.Queue(maxsize=1))
+        record = logging.LogRecord("t", logging.INFO, __file__, 1, "msg", None, None)
+
+        handler.emit(record)
+        handler.emit(record)
+
+        assert handler.queue.qsize() == 1
+        assert handler.dropped == 1
+
+
+class TestOrjsonRenderer:
+    """Testes para a serialização JSON com orjson"""
+
+    def test_int_keys_are_rendered(self):
+        from app.infrastructure import logging as app_logging
+
+        if app_logging.orjson is None:
+            pytest.skip("orjson não instalado")
+
+        rendered = app_logging._orjson_dumps({"event": "x", "counts": {7: 2}})
+
+        assert '"7":2' in rendered
@@ -0,0 +1,238 @@
+"""
+Testes para o catálogo de menus compilado
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.domain.repositories.menu_repository import MenuRepository
+from app.infrastructure.cache.menu_catalog import (
+    CompiledMenuCatalog,
+    MenuCatalogStore,
+    permission_fingerprint,
+)
+from app.infrastructure.cache.mock_redis import MockRedis
+from app.infrastructure.cache.simplified_redis import SimplifiedRedisClient
+from app.infrastructure.repositories.ordering import ORDER_GAP
+
+
+def _row(menu_id, parent_id=None, permission=None, company=False, level=0):
+    return SimpleNamespace(
+        id=menu_id,
+        parent_id=parent_id,
+        name=f"Menu {menu_id}",
+        slug=f"menu-{menu_id}",
+        url=f"/menu/{menu_id}",
+        route_name=None,
+        route_params=None,
+        icon=None,
+        level=level,
+        sort_order=menu_id,
+        badge_text=None,
+        badge_color=None,
+        full_path_name=f"Menu {menu_id}",
+        id_path=[menu_id],
+        type="menu",
+        permission_name=permission,
+        company_specific=company,
+        establishment_specific=False,
+    )
+
+
+ROWS = [
+    _row(1),
+    _row(2, permission="users.view"),
+    _row(3, parent_id=1, permission="reports.view", level=1),
+    _row(4, parent_id=1, company=True, level=1),
+]
+
+
+@pytest.fixture
+def redis_client():
+    client = SimplifiedRedisClient()
+    client.redis = MockRedis()
+    with patch("app.infrastructure.cache.menu_catalog.simplified_redis_client", client):
+        yield client
+
+
+def _db(*results):
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=list(results))
+    return db
+
+
+def _result(rows=None, row=None):
+    result = MagicMock()
+    result.fetchall.return_value = rows
+    result.fetchone.return_value = row
+    return result
+
+
+class TestCompiledMenuCatalog:
+    """Filtro por permissões e contexto sobre os vetores do catálogo"""
+
+    def test_visible_indexes(self):
+        catalog = CompiledMenuCatalog.compile(1, ROWS)
+
+        assert catalog.parent_index == (-1, -1, 0, 0)
+        assert catalog.required_permissions == {"users.view", "reports.view"}
+        assert catalog.visible_indexes([], True, "system") == [0, 1, 2, 3]
+        assert catalog.visible_indexes(["users.view"], False, "system") == [0, 1]
+        assert catalog.visible_indexes(["reports.view"], False, "company") == [
+            0,
+            2,
+            3,
+        ]
+
+    def test_flat_menus_are_copies(self):
+        catalog = CompiledMenuCatalog.compile(1, ROWS)
+        menus = catalog.flat_menus([0])
+        menus[0]["children"] = []
+        assert "children" not in catalog.items[0]
+
+    def test_fingerprint_shared_by_equivalent_permission_sets(self):
+        relevant = frozenset({"users.view", "reports.view"})
+
+        same_role = permission_fingerprint(
+            ["users.view", "audit.export"], False, "company", relevant
+        )
+        assert same_role == permission_fingerprint(
+            ["users.view"], False, "company", relevant
+        )
+        assert same_role != permission_fingerprint(
+            ["users.view"], False, "establishment", relevant
+        )
+        assert permission_fingerprint(["x"], True, "company") == "admin"
+
+
+class TestMenuCatalogStore:
+    """Compilado uma vez por worker, recarregado quando a versão muda"""
+
+    @pytest.mark.asyncio
+    async def test_reload_on_version_bump(self, redis_client):
+        store = MenuCatalogStore(check_interval=60)
+        db = _db(_result(rows=ROWS), _result(rows=ROWS[:2]))
+
+        first = await store.get_catalog(db)
+        assert await store.get_catalog(db) is first
+        assert db.execute.await_count == 1
+
+        assert await store.bump_version() == 1
+        second = await store.get_catalog(db)
+        assert second.version == 1
+        assert len(second) == 2
+
+    @pytest.mark.asyncio
+    async def test_other_workers_see_bump_after_interval(self, redis_client):
+        editor = MenuCatalogStore(check_interval=60)
+        reader = MenuCatalogStore(check_interval=0)
+
+        assert await reader.current_version() == 0
+        await editor.bump_version()
+        assert await reader.current_version() == 1
+
+
+class TestUserMenuTree:
+    """Usuários com o mesmo perfil compartilham a árvore cacheada"""
+
+    @pytest.mark.asyncio
+    async def test_tree_shared_between_users(self, redis_client):
+        store = MenuCatalogStore(check_interval=60)
+        access = SimpleNamespace(is_system_admin=False, permissions=["reports.view"])
+        db = _db(_result(row=access), _result(rows=ROWS), _result(row=access))
+
+        repo = MenuRepository(db, catalog_store=store)
+        tree, total = await repo.get_user_menu_tree(5, "company", 1)
+        cached_tree, cached_total = await repo.get_user_menu_tree(6, "company", 1)
+
+        assert total == cached_total == 3
+        assert [menu["id"] for menu in tree] == [1]
+        assert [child["id"] for child in tree[0]["children"]] == [3, 4]
+        assert cached_tree == tree
+        # Acesso de cada usuário + catálogo uma única vez
+        assert db.execute.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_inactive_user_gets_no_menus(self, redis_client):
+        repo = MenuRepository(_db(_result(row=None)))
+        assert await repo.get_user_menu_tree(5, "company", 1) == ([], 0)
+        assert await MenuRepository(_db(_result(row=None))).get_user_menus(5) == []
+
+
+class TestMenuCrudInvalidation:
+    """Menus criados pelo CRUD aparecem em /menus/user sem esperar o TTL"""
+
+    @pytest.mark.asyncio
+    async def test_created_menu_visible_in_user_menus(self, redis_client):
+        from app.presentation.api.v1 import menus, menus_crud
+
+        store = MenuCatalogStore(check_interval=60)
+        user = SimpleNamespace(id=5, is_system_admin=False, company_id=1)
+        request = MagicMock(method="GET", client=None)
+        access = SimpleNamespace(is_system_admin=False, permissions=[])
+        created = SimpleNamespace(
+            **vars(_row(5)),
+            is_visible=True,
+            visible_in_menu=True,
+            description=None,
+            has_children=False,
+            children_count=0,
+            created_at=None,
+            updated_at=None,
+        )
+
+        async def user_menu_ids(db):
+            response = await menus.get_user_dynamic_menus(
+                user_id=5,
+                request=request,
+                context_type="company",
+                context_id=1,
+                include_dev_menus=False,
+                current_user=user,
+                db=db,
+            )
+            return [menu["id"] for menu in response["menus"]]
+
+        with patch.object(
+            menus, "get_menu_catalog_store", return_value=store
+        ), patch.object(
+            menus_crud, "get_menu_catalog_store", return_value=store
+        ), patch.object(
+            menus, "get_tenant_context"
+        ) as tenant, patch.object(
+            MenuRepository,
+            "get_user_info",
+            AsyncMock(return_value={"is_active": True, "is_system_admin": False}),
+        ), patch.object(
+            MenuRepository, "get_context_info", AsyncMock(return_value={})
+        ):
+            tenant.return_value.set_database_context = AsyncMock()
+
+            before = await user_menu_ids(_db(_result(row=access), _result(rows=ROWS)))
+
+            last_sibling = _result()
+            last_sibling.scalar.return_value = 2048
+            crud_db = _db(
+                _result(row=None),
+                last_sibling,
+                _result(row=SimpleNamespace(id=5)),
+                _result(row=created),
+            )
+            crud_db.commit = AsyncMock()
+            await menus_crud.create_menu(
+                menus_crud.MenuCreateSchema(name="Menu 5", slug="menu-5"),
+                current_user=user,
+                db=crud_db,
+            )
+
+            after = await user_menu_ids(
+                _db(_result(row=access), _result(rows=ROWS + [_row(5)]))
+            )
+
+        assert 5 not in before
+        assert 5 in after
+        # Anexado com o mesmo intervalo das reordenações
+        insert_params = crud_db.execute.await_args_list[2].args[1]
+        assert insert_params["sort_order"] == 2048 + ORDER_GAP
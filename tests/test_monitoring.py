@@ -105,3 +105,123 @@ class TestMonitoring:
         # (serão filtrados pelo middleware)
         # Mas requisições normais devem aparecer
         assert "/auth/me" in metrics_content or "auth" in metrics_content
+
+
+class TestRouteTemplateLabels:
+    """Testes para labels de métricas baseados no template da rota"""
+
+    @pytest.fixture
+    def monitored_app(self):
+        from fastapi import FastAPI
+
+        from app.infrastructure.monitoring.middleware import (
+            setup_monitoring_middleware,
+        )
+
+        test_app = FastAPI()
+
+        @test_app.get("/api/v1/companies/{company_id}")
+        async def get_company(company_id: str):
+            return {"company_id": company_id}
+
+        setup_monitoring_middleware(test_app)
+        return test_app
+
+    def test_route_template_used_as_endpoint_label(self, monitored_app):
+        """Slugs/CNPJs no path não devem gerar labels distintos"""
+        from app.infrastructure.monitoring.metrics import performance_metrics
+
+        with TestClient(monitored_app) as test_client:
+            test_client.get("/api/v1/companies/12.345.678-0001-90")
+            test_client.get("/api/v1/companies/empresa-slug")
+
+        content = performance_metrics.export_prometheus_metrics().decode()
+        assert 'endpoint="/api/v1/companies/{company_id}"' in content
+        assert "empresa-slug" not in content
+        assert "12.345.678" not in content
+
+    def test_handler_duration_recorded(self, monitored_app):
+        """Tempo do handler deve ser registrado separado do tempo total"""
+        from app.infrastructure.monitoring.metrics import performance_metrics
+
+        with TestClient(monitored_app) as test_client:
+            response = test_client.get("/api/v1/companies/1")
+
+        assert "X-Response-Time" in response.headers
+        content = performance_metrics.export_prometheus_metrics().decode()
+        assert "http_handler_duration_seconds_count" in content
+
+    def test_unmatched_path_falls_back_to_regex(self):
+        """404s não possuem rota: usa normalização por regex"""
+        from app.infrastructure.monitoring.middleware import (
+            PerformanceMonitoringMiddleware,
+        )
+
+        middleware = PerformanceMonitoringMiddleware(app=None)
+        label = middleware._get_route_template({}, "/api/v1/unknown/123")
+        assert label == "/api/v1/unknown/{id}"
+
+
+class TestDatabaseInstrumentation:
+    """Testes para instrumentação de queries do SQLAlchemy"""
+
+    def test_fingerprint_normalizes_literals_and_in_lists(self):
+        """Queries que diferem apenas em valores compartilham fingerprint"""
+        from app.infrastructure.monitoring.db_instrumentation import (
+            fingerprint_statement,
+        )
+
+        first = fingerprint_statement(
+            "SELECT * FROM master.users WHERE id IN (1, 2, 3) AND email = 'a@b.com'"
+        )
+        second = fingerprint_statement(
+            "SELECT *  FROM master.users\n WHERE id IN (7, 8) AND email = 'x@y.com'"
+        )
+        assert first == second
+        assert first == "SELECT * FROM master.users WHERE id IN (?) AND email = ?"
+
+    def test_fingerprint_keeps_casts(self):
+        """Casts PostgreSQL (::text) não são confundidos com bind params"""
+        from app.infrastructure.monitoring.db_instrumentation import (
+            fingerprint_statement,
+        )
+
+        fingerprint = fingerprint_statement("SELECT $1::text, :name")
+        assert fingerprint == "SELECT ?::text, ?"
+
+    def test_slow_query_ring_buffer_is_bounded(self):
+        """Ring buffer mantém apenas as N amostras mais recentes"""
+        from app.infrastructure.monitoring.db_instrumentation import (
+            QueryStatsCollector,
+        )
+
+        collector = QueryStatsCollector(slow_threshold_ms=10, slow_log_size=3)
+        for duration in (5, 50, 40, 30, 20):
+            collector.record("SELECT ?", "select", "t", duration)
+
+        slow = collector.get_slow_queries()
+        assert [q["duration_ms"] for q in slow] == [40, 30, 20]
+
+        top = collector.get_top_fingerprints()
+        assert top[0]["count"] == 5
+        assert top[0]["max_ms"] == 50
+
+    def test_engine_events_count_queries_per_request(self):
+        """Eventos do engine alimentam contador de queries do request"""
+        from sqlalchemy import create_engine, text
+
+        from app.infrastructure.monitoring import db_instrumentation
+
+        engine = create_engine("sqlite://")
+        db_instrumentation.instrument_engine(engine, name="test")
+
+        token = db_instrumentation.start_request_tracking()
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+            assert db_instrumentation.get_request_query_count() == 2
+        finally:
+            db_instrumentation.stop_request_tracking(token)
+
+        assert db_instrumentation.get_request_query_count() is None
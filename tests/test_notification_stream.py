@@ -0,0 +1,126 @@
+"""
+Testes para a entrega de notificações em tempo real (broker + SSE)
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.infrastructure.services.notification_broker import (
+    EVENT_NOTIFICATION,
+    EVENT_RESYNC,
+    EVENT_UNREAD_COUNT,
+    NotificationBroker,
+    NotificationEvent,
+    RedisNotificationBroker,
+)
+from app.infrastructure.services.notification_service import NotificationService
+from app.presentation.api.v1.notifications import _sse_events
+
+
+def _notification(notification_id):
+    return NotificationEvent(
+        EVENT_NOTIFICATION, {"id": notification_id}, id=notification_id
+    )
+
+
+class TestNotificationBroker:
+    """Fan-out por usuário com filas limitadas"""
+
+    @pytest.mark.asyncio
+    async def test_fan_out_to_user_connections(self):
+        broker = NotificationBroker()
+        first = await broker.subscribe(1)
+        second = await broker.subscribe(1)
+        other = await broker.subscribe(2)
+
+        await broker.publish(1, _notification(10))
+
+        assert (await first.next_event(0.1)).id == 10
+        assert (await second.next_event(0.1)).id == 10
+        assert await other.next_event(0.01) is None
+
+        await first.close()
+        await second.close()
+        assert broker.connected_users() == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_gets_resync(self):
+        broker = NotificationBroker(queue_size=2)
+        subscription = await broker.subscribe(1)
+
+        for notification_id in range(5):
+            await broker.publish(1, _notification(notification_id))
+
+        assert subscription.overflowed
+        event = await subscription.next_event(0.1)
+        assert event.event == EVENT_RESYNC
+        assert await subscription.next_event(0.01) is None
+
+    @pytest.mark.asyncio
+    async def test_redis_broker_subscribes_per_connected_user(self):
+        redis = MagicMock()
+        redis.publish = AsyncMock()
+        broker = RedisNotificationBroker(redis)
+        broker._pubsub = MagicMock(subscribe=AsyncMock(), unsubscribe=AsyncMock())
+
+        subscription = await broker.subscribe(7)
+        await broker.subscribe(7)
+        broker._pubsub.subscribe.assert_awaited_once_with("notifications:user:7")
+
+        await broker.publish(7, _notification(1))
+        redis.publish.assert_awaited_once()
+        assert redis.publish.await_args.args[0] == "notifications:user:7"
+
+        # Entrega vinda do listener
+        broker._dispatch(7, NotificationEvent.from_dict(_notification(1).to_dict()))
+        assert (await subscription.next_event(0.1)).id == 1
+
+
+class TestSseStream:
+    """Formato text/event-stream, heartbeat e reenvio"""
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_replay_dedup_and_resync(self):
+        broker = NotificationBroker()
+        subscription = await broker.subscribe(1)
+        initial = [
+            NotificationEvent(EVENT_UNREAD_COUNT, {"count": 2}),
+            _notification(5),
+        ]
+        stream = _sse_events(subscription, initial, heartbeat_interval=0.01)
+
+        assert await stream.__anext__() == "retry: 3000\n\n"
+        assert await stream.__anext__() == 'event: unread_count\ndata: {"count": 2}\n\n'
+        assert (await stream.__anext__()).startswith("id: 5\n")
+        assert await stream.__anext__() == ": heartbeat\n\n"
+
+        # Já reenviada na conexão: ignorada
+        await broker.publish(1, _notification(5))
+        await broker.publish(1, _notification(6))
+        assert (await stream.__anext__()).startswith("id: 6\nevent: notification\n")
+
+        await broker.publish(1, NotificationEvent(EVENT_RESYNC, {}))
+        assert (await stream.__anext__()).startswith("event: resync")
+        with pytest.raises(StopAsyncIteration):
+            await stream.__anext__()
+        assert broker.connected_users() == 0
+
+
+class TestNotificationServicePublishing:
+    """Deltas do contador publicados após o commit"""
+
+    @pytest.mark.asyncio
+    async def test_mark_all_as_read_publishes_delta(self):
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock(rowcount=3))
+        session.commit = AsyncMock()
+        broker = NotificationBroker()
+        subscription = await broker.subscribe(1)
+
+        service = NotificationService(session, MagicMock(), broker)
+        assert await service.mark_all_as_read(1) == 3
+
+        event = await subscription.next_event(0.1)
+        assert event.event == EVENT_UNREAD_COUNT
+        assert event.data == {"delta": -3}
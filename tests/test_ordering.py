@@ -0,0 +1,91 @@
+"""
+Testes para a reordenação em lote com chaves espaçadas
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.infrastructure.orm.models import Establishments
+from app.infrastructure.repositories.ordering import (
+    ORDER_GAP,
+    next_position,
+    plan_positions,
+    reorder_rows,
+)
+
+CURRENT = {1: 1024, 2: 2048, 3: 3072, 4: 4096}
+
+
+class TestPlanPositions:
+    """Mover um item altera uma linha; reespaça só quando falta intervalo"""
+
+    def test_move_single_item_updates_one_row(self):
+        assert plan_positions(CURRENT, [4, 1, 2, 3]) == {4: 512}
+        assert plan_positions(CURRENT, [1, 3, 2, 4]) == {3: 1536}
+        assert plan_positions(CURRENT, [2, 3, 4, 1]) == {1: 5120}
+        assert plan_positions(CURRENT, [1, 2, 3, 4]) == {}
+
+    def test_respace_when_gap_exhausted(self):
+        # Chaves sequenciais antigas (1, 2, 3): sem espaço entre elas
+        positions = plan_positions({1: 1, 2: 2, 3: 3}, [3, 1, 2])
+        assert positions == {3: ORDER_GAP, 1: 2 * ORDER_GAP, 2: 3 * ORDER_GAP}
+
+    def test_new_keys_never_collide_with_current(self):
+        current = {1: 10, 2: 11, 3: 12, 4: 40, 5: 41}
+        positions = plan_positions(current, [5, 4, 3, 2, 1])
+
+        final = {**current, **positions}
+        assert sorted(final, key=final.get) == [5, 4, 3, 2, 1]
+        assert not set(positions.values()) & set(current.values())
+
+    def test_next_position(self):
+        assert next_position(None) == ORDER_GAP
+        assert next_position(2048) == 2048 + ORDER_GAP
+
+
+class TestReorderRows:
+    """Um SELECT e um UPDATE ... FROM (VALUES ...) com o guard do grupo"""
+
+    @pytest.mark.asyncio
+    async def test_single_update_with_guard(self):
+        db = MagicMock()
+        select_result = MagicMock()
+        select_result.all.return_value = list(CURRENT.items())
+        db.execute = AsyncMock(side_effect=[select_result, MagicMock(rowcount=1)])
+
+        updated = await reorder_rows(
+            db,
+            Establishments,
+            "display_order",
+            [4, 1, 2, 3],
+            Establishments.company_id == 7,
+        )
+
+        assert updated == 1
+        assert db.execute.await_count == 2
+        sql = str(
+            db.execute.await_args_list[1].args[0].compile(dialect=postgresql.dialect())
+        )
+        assert "FROM (VALUES" in sql
+        assert "master.establishments.company_id = " in sql
+
+    @pytest.mark.asyncio
+    async def test_skips_ids_outside_group(self):
+        db = MagicMock()
+        select_result = MagicMock()
+        select_result.all.return_value = [(1, 1024), (2, 2048)]
+        db.execute = AsyncMock(side_effect=[select_result, MagicMock(rowcount=1)])
+
+        updated = await reorder_rows(db, Establishments, "display_order", [2, 99, 1])
+
+        assert updated == 1
+        update_params = (
+            db.execute.await_args_list[1]
+            .args[0]
+            .compile(dialect=postgresql.dialect())
+            .params
+        )
+        # Só o item 2 muda (para antes do 1); o 99 é ignorado
+        assert list(update_params.values()) == [2, 512]
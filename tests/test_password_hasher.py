@@ -0,0 +1,144 @@
+"""
+Testes para o executor de hash de senhas e rehash no login
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+
+import pytest
+
+from app.infrastructure import auth
+from app.infrastructure.security.password_hasher import (
+    PasswordHasher,
+    PasswordHasherBusyError,
+)
+
+
+def _slow_operation(duration: float = 0.2):
+    time.sleep(duration)
+    return "done"
+
+
+class TestPasswordHasher:
+    """Testes para PasswordHasher"""
+
+    @pytest.mark.asyncio
+    async def test_runs_off_event_loop(self):
+        """O event loop continua respondendo durante o hash"""
+        hasher = PasswordHasher(max_workers=2, max_pending=4)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            result = await hasher.run("verify", _slow_operation, 0.2)
+        finally:
+            ticker_task.cancel()
+            hasher.shutdown()
+
+        assert result == "done"
+        assert ticks >= 10
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_saturated(self):
+        """Acima de max_pending as chamadas falham imediatamente"""
+        hasher = PasswordHasher(max_workers=1, max_pending=2)
+        release = threading.Event()
+
+        running = [
+            asyncio.create_task(hasher.run("verify", release.wait, 5)) for _ in range(2)
+        ]
+        await asyncio.sleep(0.05)
+        assert hasher.in_flight == 2
+
+        start = time.perf_counter()
+        with pytest.raises(PasswordHasherBusyError):
+            await hasher.run("verify", release.wait, 5)
+        assert time.perf_counter() - start < 0.05
+
+        release.set()
+        await asyncio.gather(*running)
+        hasher.shutdown()
+        assert hasher.in_flight == 0
+
+
+class TestRehashOnLogin:
+    """Testes para atualização transparente de hashes"""
+
+    @pytest.mark.asyncio
+    async def test_legacy_hash_is_upgraded(self, monkeypatch):
+        """Hash SHA256 legado gera um novo hash após login válido"""
+        legacy = hashlib.sha256(b"secret123").hexdigest()
+        monkeypatch.setattr(auth, "get_password_hash", lambda p: "$2b$12$new-hash")
+
+        valid, new_hash = await auth.verify_and_update_password("secret123", legacy)
+
+        assert valid is True
+        assert new_hash == "$2b$12$new-hash"
+
+    @pytest.mark.asyncio
+    async def test_invalid_password_returns_no_hash(self):
+        """Senha incorreta não gera novo hash"""
+        legacy = hashlib.sha256(b"secret123").hexdigest()
+
+        valid, new_hash = await auth.verify_and_update_password("wrong", legacy)
+
+        assert valid is False
+        assert new_hash is None
+
+    @pytest.mark.asyncio
+    async def test_keeps_hash_when_bcrypt_unavailable(self, monkeypatch):
+        """Sem bcrypt o hash legado é mantido (evita rehash a cada login)"""
+        legacy = hashlib.sha256(b"secret123").hexdigest()
+        monkeypatch.setattr(
+            auth,
+            "get_password_hash",
+            lambda p: hashlib.sha256(p.encode()).hexdigest(),
+        )
+
+        valid, new_hash = await auth.verify_and_update_password("secret123", legacy)
+
+        assert valid is True
+        assert new_hash is None
+
+    def test_outdated_bcrypt_cost_needs_rehash(self):
+        """bcrypt com custo menor que o configurado precisa de rehash"""
+        if not auth.pwd_context:
+            pytest.skip("bcrypt indisponível")
+        rounds = auth.settings.password_bcrypt_rounds
+        salt_and_hash = "a" * 53
+
+        assert auth.password_needs_rehash(f"$2b${rounds - 2:02d}${salt_and_hash}")
+        assert not auth.password_needs_rehash(f"$2b${rounds:02d}${salt_and_hash}")
+
+
+class TestUserRepositoryHashing:
+    """Hash de senhas do UserRepository"""
+
+    @pytest.mark.asyncio
+    async def test_user_repository_hashes_in_executor(self, monkeypatch):
+        """UserRepository usa o executor de hash, não bcrypt no event loop"""
+        from unittest.mock import AsyncMock, MagicMock
+
+        from app.infrastructure.repositories.user_repository import UserRepository
+
+        calls = []
+
+        async def fake_run(kind, func, *args):
+            calls.append(kind)
+            return "hashed"
+
+        monkeypatch.setattr(auth.password_hasher, "run", fake_run)
+        user = MagicMock(deleted_at=None)
+        db = MagicMock(get=AsyncMock(return_value=user), commit=AsyncMock())
+
+        assert await UserRepository(db).change_password(1, "nova-senha-123")
+        assert user.password == "hashed"
+        assert calls == ["hash"]
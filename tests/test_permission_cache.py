@@ -0,0 +1,122 @@
+"""
+Testes para a invalidação do cache de permissões por versão de perfil
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.infrastructure.cache.mock_redis import MockRedis
+from app.infrastructure.cache.permission_cache import PermissionCache
+
+KEY = "permissions:user:5:ctx:company:1"
+
+
+@pytest.fixture
+def cache():
+    permission_cache = PermissionCache()
+    permission_cache.redis = MockRedis()
+    return permission_cache
+
+
+def _fetch(*permissions, roles=None):
+    roles = roles or {"2": 0}
+    return AsyncMock(
+        return_value={
+            ("company", 1): {"roles": roles, "permissions": list(permissions)}
+        }
+    )
+
+
+class TestRoleVersionedPermissions:
+    """Editar um perfil é um INCR; entradas antigas são recalculadas"""
+
+    @pytest.mark.asyncio
+    async def test_entry_reused_while_role_version_unchanged(self, cache):
+        fetch = _fetch("users.view")
+        with patch.object(cache, "_fetch_contexts_entries_from_db", fetch):
+            assert await cache.get_user_permissions(5, "company", 1) == ["users.view"]
+            assert await cache.get_user_permissions(5, "company", 1) == ["users.view"]
+
+        assert fetch.await_count == 1
+        assert json.loads(cache.redis._data[KEY]) == {
+            "roles": {"2": 0},
+            "permissions": ["users.view"],
+        }
+
+    @pytest.mark.asyncio
+    async def test_role_bump_invalidates_without_scanning(self, cache):
+        cache.redis.keys = AsyncMock()
+        with patch.object(
+            cache, "_fetch_contexts_entries_from_db", _fetch("users.view")
+        ):
+            await cache.get_user_permissions(5, "company", 1)
+
+        await cache.bump_role_versions([2, 2])
+        cache.redis.keys.assert_not_awaited()
+        assert cache.redis._data["role_version:2"] == b"1"
+
+        fetch = _fetch("users.view", "users.edit", roles={"2": 1})
+        with patch.object(cache, "_fetch_contexts_entries_from_db", fetch):
+            assert await cache.get_user_permissions(5, "company", 1) == [
+                "users.view",
+                "users.edit",
+            ]
+            await cache.get_user_permissions(5, "company", 1)
+
+        assert fetch.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_other_roles_keep_their_entries(self, cache):
+        with patch.object(
+            cache, "_fetch_contexts_entries_from_db", _fetch("users.view")
+        ):
+            await cache.get_user_permissions(5, "company", 1)
+
+        await cache.bump_role_versions([3])
+
+        fetch = _fetch()
+        with patch.object(cache, "_fetch_contexts_entries_from_db", fetch):
+            assert await cache.get_user_permissions(5, "company", 1) == ["users.view"]
+        fetch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_legacy_list_entry_is_recomputed(self, cache):
+        await cache.redis.setex(KEY, 60, '["users.view"]')
+
+        fetch = _fetch("companies.view")
+        with patch.object(cache, "_fetch_contexts_entries_from_db", fetch):
+            assert await cache.get_user_permissions(5, "company", 1) == [
+                "companies.view"
+            ]
+        fetch.assert_awaited_once()
+
+
+class TestRoleAssignmentInvalidation:
+    """Mudar os perfis de um usuário descarta as permissões em cache dele"""
+
+    @pytest.mark.asyncio
+    async def test_revoke_invalidates_user_permissions(self):
+        from app.presentation.api.v1 import permissions_admin
+
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=MagicMock(fetchone=lambda: (1,)))
+        db.commit = AsyncMock()
+        invalidate = AsyncMock()
+
+        with patch.object(
+            permissions_admin, "invalidate_access_scope", AsyncMock()
+        ), patch.object(permissions_admin, "invalidate_user_permissions", invalidate):
+            await permissions_admin.revoke_user_role.__wrapped__(
+                user_id=5,
+                role_id=2,
+                context_type="company",
+                context_id=1,
+                current_user=SimpleNamespace(id=1),
+                db=db,
+            )
+
+        db.commit.assert_awaited_once()
+        invalidate.assert_awaited_once_with(5)
@@ -0,0 +1,140 @@
+"""
+Testes para o índice em memória de códigos de programas
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.infrastructure.services import program_code_search
+from app.infrastructure.services.program_code_search import (
+    ProgramCodeEntry,
+    ProgramCodeSearchIndex,
+    pg_trigrams,
+    trigram_similarity,
+)
+
+
+def _entry(entry_id, shortcode, label, description=None, tokens=None):
+    return ProgramCodeEntry(
+        id=entry_id,
+        shortcode=shortcode,
+        label=label,
+        description=description,
+        route=f"/admin/{shortcode}",
+        icon=None,
+        module_code=shortcode[:2].upper(),
+        program_type=shortcode[2:4],
+        search_tokens=tokens or [],
+    )
+
+
+CATALOG = [
+    _entry(1, "em0001", "Cadastro de Empresas", "Manutenção cadastral", ["empresa"]),
+    _entry(2, "em0020", "Consulta de Empresas", "Consulta e filtros", ["empresa"]),
+    _entry(3, "ct0001", "Contratos", "Gestão de contratos", ["contrato"]),
+    _entry(4, "vd0001", "Vidas", "Beneficiários do contrato", ["beneficiario"]),
+]
+
+
+@pytest.fixture
+def index():
+    search_index = ProgramCodeSearchIndex()
+    search_index.load(CATALOG, version=1)
+    return search_index
+
+
+class TestTrigrams:
+    """Compatibilidade com pg_trgm"""
+
+    def test_similarity_matches_pg_trgm(self):
+        """similarity('word', 'words') = 4/7 no PostgreSQL"""
+        score = trigram_similarity(pg_trigrams("word"), pg_trigrams("words"))
+        assert score == pytest.approx(0.571429, abs=1e-6)
+
+    def test_trigrams_are_case_insensitive_and_per_word(self):
+        assert pg_trigrams("Ab-Cd") == pg_trigrams("ab cd")
+        assert "  a" in pg_trigrams("ab") and "ab " in pg_trigrams("ab")
+
+
+class TestProgramCodeSearchIndex:
+    """Níveis de relevância iguais aos da busca SQL"""
+
+    def test_exact_shortcode(self, index):
+        assert index.get_exact("EM0001").label == "Cadastro de Empresas"
+        assert index.get_exact("zz9999") is None
+
+    def test_relevance_tiers(self, index):
+        assert [
+            (m.entry.id, m.relevance_score, m.match_type)
+            for m in index.search("contratos")
+        ] == [(3, 1.0, "exact")]
+
+        prefix = index.search("consulta")
+        assert prefix[0].entry.id == 2 and prefix[0].relevance_score == 0.9
+
+        contains = index.search("empresas")
+        assert {m.entry.id for m in contains} == {1, 2}
+        assert all(m.relevance_score == 0.8 for m in contains)
+
+        token = index.search("beneficiario")
+        assert [(m.entry.id, m.relevance_score, m.match_type) for m in token] == [
+            (4, 0.7, "token")
+        ]
+
+    def test_fuzzy_typo(self, index):
+        """Erro de digitação encontrado por similaridade de trigramas"""
+        results = index.search("contrstos")
+        assert results and results[0].entry.id == 3
+        assert results[0].match_type == "fuzzy"
+        assert 0.3 < results[0].relevance_score < 0.7
+
+    def test_description_only_match_is_filtered(self, index):
+        """Como no SQL, match só na descrição precisa de similaridade > 0.3"""
+        assert index.search("filtros") == []
+
+    def test_shortcode_prefix(self, index):
+        assert [e.shortcode for e in index.shortcodes_starting_with("em")] == [
+            "em0001",
+            "em0020",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_reloads_only_when_version_changes(self):
+        search_index = ProgramCodeSearchIndex(check_interval=0)
+        fetch_entries = AsyncMock(return_value=CATALOG)
+
+        with patch.object(
+            program_code_search,
+            "fetch_program_codes_version",
+            AsyncMock(side_effect=[1, 1, 2]),
+        ), patch.object(
+            program_code_search, "fetch_active_program_codes", fetch_entries
+        ):
+            await search_index.ensure_fresh(db=None)
+            await search_index.ensure_fresh(db=None)
+            assert fetch_entries.await_count == 1
+
+            await search_index.ensure_fresh(db=None)
+            assert fetch_entries.await_count == 2
+            assert search_index.version == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_version_table_is_cached(self):
+        from app.presentation.api.v1 import program_codes
+
+        search_index = ProgramCodeSearchIndex(check_interval=0)
+        fetch_version = AsyncMock(side_effect=RuntimeError("relation does not exist"))
+        db = MagicMock(rollback=AsyncMock())
+
+        with patch.object(
+            program_codes, "get_program_code_index", return_value=search_index
+        ), patch.object(
+            program_code_search, "fetch_program_codes_version", fetch_version
+        ):
+            assert await program_codes._get_fresh_index(db) is None
+            assert await program_codes._get_fresh_index(db) is None
+
+        assert fetch_version.await_count == 1
+        assert db.rollback.await_count == 1
+        assert search_index.is_unavailable
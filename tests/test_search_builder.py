@@ -0,0 +1,189 @@
+"""
+Testes para o builder de busca textual (índices trigram)
+"""
+
+import re
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.dialects import postgresql
+
+from app.infrastructure.orm.models import People
+from app.infrastructure.repositories.search_builder import (
+    build_search,
+    like_pattern,
+    normalize_search_term,
+    search_sql,
+    tax_id_digits,
+)
+
+
+def _compile(expression):
+    return expression.compile(dialect=postgresql.dialect())
+
+
+class TestNormalization:
+    """Normalização em Python equivalente a master.search_normalize"""
+
+    def test_removes_accents_and_case(self):
+        assert normalize_search_term("  São JOSÉ ") == "sao jose"
+
+    def test_keeps_inner_whitespace_like_sql(self):
+        # master.search_normalize não colapsa espaços: "a  b" só casa "a  b"
+        assert normalize_search_term("São  José") == "sao  jose"
+
+    def test_tax_id_terms(self):
+        assert tax_id_digits("11.222.333/0001-81") == "11222333000181"
+        assert tax_id_digits("112") == "112"
+        assert tax_id_digits("11") is None
+        assert tax_id_digits("Clínica 123") is None
+
+    def test_like_pattern_escapes_wildcards(self):
+        assert like_pattern("100%_Ação") == "%100\\%\\_acao%"
+
+
+class TestBuildSearch:
+    """Condições sobre as expressões indexadas"""
+
+    def test_empty_term(self):
+        assert build_search(None, [People.name]) is None
+        assert build_search("   ", [People.name]) is None
+
+    def test_uses_normalized_expression(self):
+        clause = build_search("José", [People.name, People.trade_name])
+        compiled = _compile(clause.condition)
+        sql = str(compiled)
+        assert "master.search_normalize(master.people.name) LIKE" in sql
+        assert "%jose%" in compiled.params.values()
+        assert "master.search_normalize(master.people.trade_name)" in sql
+        assert "ILIKE" not in sql
+        assert "greatest" in str(_compile(clause.rank))
+
+    def test_tax_id_prefix_only_for_numeric_terms(self):
+        numeric = build_search("112.223", [People.name], tax_id_column=People.tax_id)
+        compiled = _compile(numeric.condition)
+        assert "master.people.tax_id LIKE" in str(compiled)
+        assert "112223%" in compiled.params.values()
+
+        textual = build_search("Maria", [People.name], tax_id_column=People.tax_id)
+        assert "tax_id" not in str(_compile(textual.condition))
+
+    def test_raw_sql_condition(self):
+        assert search_sql(["vc.person_name", "vc.user_email"]) == (
+            "(master.search_normalize(vc.person_name) LIKE :search"
+            " OR master.search_normalize(vc.user_email) LIKE :search)"
+        )
+
+
+MIGRATION = (
+    Path(__file__).resolve().parent.parent / "migrations" / "021_search_indexes.sql"
+)
+
+# Esquema descartável com as colunas indexadas pela migration; o search_path
+# do banco ('master', 'public') é reproduzido com este esquema no lugar de
+# master e tudo roda numa transação desfeita ao final do teste.
+SCHEMA = "search_indexes_test"
+
+FIXTURE_TABLES = f"""
+    CREATE SCHEMA {SCHEMA};
+    SET LOCAL search_path TO {SCHEMA}, public;
+    CREATE TABLE {SCHEMA}.people (
+        id BIGSERIAL PRIMARY KEY, name TEXT, trade_name TEXT, tax_id VARCHAR(14)
+    );
+    CREATE TABLE {SCHEMA}.clients (id BIGSERIAL PRIMARY KEY, client_code TEXT);
+    CREATE TABLE {SCHEMA}.users (id BIGSERIAL PRIMARY KEY, email_address TEXT);
+    CREATE TABLE {SCHEMA}.menus (
+        id BIGSERIAL PRIMARY KEY, name TEXT, slug TEXT, full_path_name TEXT,
+        description TEXT
+    );
+"""
+
+
+def _migration_sql() -> str:
+    """SQL da migration no esquema de teste, sem o BEGIN/COMMIT próprio"""
+    sql = re.sub(r"^(BEGIN|COMMIT);$", "", MIGRATION.read_text(), flags=re.M)
+    return sql.replace("master.", f"{SCHEMA}.")
+
+
+@pytest_asyncio.fixture
+async def search_db():
+    """Conexão asyncpg com o esquema de teste (pula sem banco disponível)"""
+    from tests.conftest import test_engine
+
+    try:
+        conn = await test_engine.connect()
+    except Exception as e:
+        pytest.skip(f"PostgreSQL de teste indisponível: {e}")
+
+    raw = (await conn.get_raw_connection()).driver_connection
+    transaction = raw.transaction()
+    await transaction.start()
+    try:
+        await raw.execute(FIXTURE_TABLES)
+        yield raw
+    finally:
+        await transaction.rollback()
+        await conn.close()
+
+
+async def _unaccent_schema(db):
+    return await db.fetchval(
+        "SELECT n.nspname FROM pg_extension e "
+        "JOIN pg_namespace n ON n.oid = e.extnamespace "
+        "WHERE e.extname = 'unaccent'"
+    )
+
+
+@pytest.mark.integration
+class TestSearchIndexesMigration:
+    """migrations/021_search_indexes.sql contra PostgreSQL"""
+
+    @pytest.mark.asyncio
+    async def test_migration_creates_function_and_indexes(self, search_db):
+        db = search_db
+        installed = await _unaccent_schema(db)
+
+        await db.execute(_migration_sql())
+
+        # Instalação nova vai para public mesmo com outro esquema na frente
+        assert await _unaccent_schema(db) == (installed or "public")
+        normalized = await db.fetchval(
+            f"SELECT {SCHEMA}.search_normalize($1)", "  São JOSÉ "
+        )
+        assert normalized == "  sao jose "
+        assert normalized.strip() == normalize_search_term("  São JOSÉ ")
+
+        indexes = await db.fetch(
+            "SELECT indexname FROM pg_indexes WHERE schemaname = $1", SCHEMA
+        )
+        assert {row["indexname"] for row in indexes} >= {
+            "idx_people_name_search_trgm",
+            "idx_people_trade_name_search_trgm",
+            "idx_people_tax_id_prefix",
+            "idx_clients_code_search_trgm",
+            "idx_users_email_search_trgm",
+            "idx_menus_name_search_trgm",
+            "idx_menus_slug_search_trgm",
+            "idx_menus_full_path_search_trgm",
+            "idx_menus_description_search_trgm",
+        }
+
+    @pytest.mark.asyncio
+    async def test_existing_unaccent_outside_public(self, search_db):
+        db = search_db
+        if await _unaccent_schema(db) is not None:
+            pytest.skip("unaccent já instalado no banco de teste")
+        await db.execute(f"CREATE EXTENSION unaccent SCHEMA {SCHEMA}")
+
+        await db.execute(_migration_sql())
+
+        assert await _unaccent_schema(db) == SCHEMA
+        await db.execute(f"INSERT INTO {SCHEMA}.people (name) VALUES ('Clínica Ação')")
+        assert (
+            await db.fetchval(
+                f"SELECT name FROM {SCHEMA}.people "
+                f"WHERE {SCHEMA}.search_normalize(name) LIKE '%acao%'"
+            )
+            == "Clínica Ação"
+        )
@@ -0,0 +1,115 @@
+"""
+Testes para o cache de contextos de sessão validados
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.infrastructure.security.session_context_cache import SessionContextCache
+from app.infrastructure.services.security_service import (
+    SecurityService,
+    SessionContext,
+)
+
+
+def _context(is_valid=True):
+    return SessionContext(
+        is_valid=is_valid,
+        effective_user_id=5,
+        current_role_id=2,
+        context_type="company",
+        context_id=1,
+        can_impersonate=False,
+    )
+
+
+@pytest.fixture
+def redis_store():
+    """Redis em memória com a mesma API do simplified_redis_client"""
+    store = {}
+    fake = MagicMock()
+    fake.get = AsyncMock(side_effect=lambda key: store.get(key))
+    fake.set = AsyncMock(side_effect=lambda key, value, ttl: store.update({key: value}))
+    fake.delete = AsyncMock(side_effect=lambda key: store.pop(key, None))
+    with patch(
+        "app.infrastructure.security.session_context_cache.simplified_redis_client",
+        fake,
+    ):
+        yield store
+
+
+class TestSessionContextCache:
+    """Dois níveis: memória do worker e Redis"""
+
+    @pytest.mark.asyncio
+    async def test_shared_between_workers(self, redis_store):
+        expires_at = datetime.utcnow() + timedelta(hours=1)
+        await SessionContextCache().set("token", 5, _context(), expires_at)
+
+        other_worker = SessionContextCache()
+        assert await other_worker.get("token", 5) == _context()
+        assert await other_worker.get("token", 6) is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_or_expired_not_cached(self, redis_store):
+        cache = SessionContextCache()
+        future = datetime.utcnow() + timedelta(hours=1)
+        await cache.set("invalid", 5, _context(is_valid=False), future)
+        await cache.set("expired", 5, _context(), datetime.utcnow())
+
+        assert redis_store == {}
+        assert await cache.get("invalid", 5) is None
+        assert await cache.get("expired", 5) is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_on_logout(self, redis_store):
+        cache = SessionContextCache()
+        expires_at = datetime.utcnow() + timedelta(hours=1)
+        await cache.set("token", 5, _context(), expires_at)
+
+        await cache.invalidate("token")
+        assert redis_store == {}
+        assert await cache.get("token", 5) is None
+
+    @pytest.mark.asyncio
+    async def test_local_entries_are_bounded(self, redis_store):
+        cache = SessionContextCache(max_entries=2)
+        expires_at = datetime.utcnow() + timedelta(hours=1)
+        for token in ("a", "b", "c"):
+            await cache.set(token, 5, _context(), expires_at)
+        assert len(cache._local) == 2
+
+
+class TestValidateSessionContext:
+    """Requisições seguintes não consultam o banco"""
+
+    @pytest.mark.asyncio
+    async def test_second_validation_is_served_from_cache(self, redis_store):
+        row = SimpleNamespace(
+            is_valid=True,
+            effective_user_id=5,
+            current_role_id=2,
+            context_type="company",
+            context_id=1,
+            can_impersonate=False,
+            session_expires_at=datetime.utcnow() + timedelta(hours=2),
+        )
+        result = MagicMock()
+        result.fetchone.return_value = row
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        cache = SessionContextCache()
+        with patch(
+            "app.infrastructure.services.security_service.get_session_context_cache",
+            return_value=cache,
+        ):
+            service = SecurityService(session)
+            first = await service.validate_session_context("token", user_id=5)
+            second = await service.validate_session_context("token", user_id=5)
+
+        assert first == second == _context()
+        assert session.execute.await_count == 1
@@ -0,0 +1,175 @@
+"""
+Testes para os contadores de notificações não lidas
+"""
+
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.infrastructure.cache.mock_redis import MockRedis
+from app.infrastructure.cache.simplified_redis import SimplifiedRedisClient
+from app.infrastructure.cache.unread_counters import UnreadCounterStore
+from app.infrastructure.services.notification_broker import NotificationBroker
+from app.infrastructure.services.notification_service import (
+    NotificationService,
+    NotificationType,
+)
+from app.presentation.api.v1.notifications import list_notifications
+
+
+@pytest.fixture
+def redis_client():
+    client = SimplifiedRedisClient()
+    client.redis = MockRedis()
+    with patch(
+        "app.infrastructure.cache.unread_counters.simplified_redis_client", client
+    ):
+        yield client
+
+
+def _service(session, counters):
+    return NotificationService(session, MagicMock(), NotificationBroker(), counters)
+
+
+def _session(scalar=None, rowcount=0):
+    session = MagicMock()
+    result = MagicMock(rowcount=rowcount)
+    result.scalar.return_value = scalar
+    session.execute = AsyncMock(return_value=result)
+    session.commit = AsyncMock()
+    return session
+
+
+class TestUnreadCounterStore:
+    """Hash por usuário com reconciliação"""
+
+    @pytest.mark.asyncio
+    async def test_increment_without_sync_is_not_trusted(self, redis_client):
+        counters = UnreadCounterStore()
+        await counters.add(1, 1)
+        assert await counters.get(1) is None
+
+        await counters.set(1, 4)
+        await counters.add(1, -1)
+        assert await counters.get(1) == 3
+        assert redis_client.redis._expiry["notifications:unread:1"] == 86400
+
+    @pytest.mark.asyncio
+    async def test_stale_or_negative_counter_is_reconciled(self, redis_client):
+        counters = UnreadCounterStore(reconcile_interval=60)
+        await redis_client.hset(
+            "notifications:unread:1", {"count": 2, "synced_at": time.time() - 120}
+        )
+        assert await counters.get(1) is None
+
+        await counters.set(1, 0)
+        await counters.add(1, -1)
+        assert await counters.get(1) is None
+
+
+class TestNotificationServiceUnreadCount:
+    """O(1) no caminho comum; COUNT só para reconciliar"""
+
+    @pytest.mark.asyncio
+    async def test_count_maintained_by_service(self, redis_client):
+        counters = UnreadCounterStore()
+        session = _session(scalar=5)
+        service = _service(session, counters)
+
+        assert await service.get_unread_count(1) == 5
+        assert await service.get_unread_count(1) == 5
+        assert session.execute.await_count == 1
+
+        session.execute.return_value.rowcount = 2
+        await service.mark_as_read(1, [10, 11])
+        assert await service.get_unread_count(1) == 3
+
+        await service.mark_all_as_read(1)
+        assert await service.get_unread_count(1) == 0
+        assert session.execute.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_since_id_fetch(self, redis_client):
+        session = _session()
+        session.execute.return_value.fetchall.return_value = []
+        service = _service(session, UnreadCounterStore())
+
+        await service.get_user_notifications(1, limit=20, since_id=42)
+
+        query, params = session.execute.await_args.args
+        assert "id > :last_id" in str(query)
+        assert params["last_id"] == 42
+        assert params["limit"] == 20
+
+    @pytest.mark.asyncio
+    async def test_unread_total_uses_counter(self, redis_client):
+        counters = UnreadCounterStore()
+        await counters.set(1, 7)
+        session = _session(scalar=30)
+        service = _service(session, counters)
+
+        assert await service.count_user_notifications(1, unread_only=True) == 7
+        session.execute.assert_not_awaited()
+
+        assert await service.count_user_notifications(1, since_id=42) == 30
+        query, params = session.execute.await_args.args
+        assert "COUNT(*)" in str(query)
+        assert params["since_id"] == 42
+
+
+class TestNotificationListTotal:
+    """total é o total de notificações, não o tamanho da página"""
+
+    @staticmethod
+    def _notification(notification_id):
+        return SimpleNamespace(
+            id=notification_id,
+            title="Título",
+            message="Mensagem",
+            type=NotificationType.INFO,
+            is_read=False,
+            created_at=datetime(2025, 1, 1),
+        )
+
+    @pytest.mark.asyncio
+    async def test_full_page_counts_total(self):
+        service = MagicMock(
+            get_user_notifications=AsyncMock(
+                return_value=[self._notification(i) for i in (1, 2)]
+            ),
+            count_user_notifications=AsyncMock(return_value=9),
+        )
+
+        response = await list_notifications(
+            since_id=None,
+            unread_only=False,
+            page=2,
+            per_page=2,
+            current_user=SimpleNamespace(id=1),
+            service=service,
+        )
+
+        assert response.total == 9
+        assert service.get_user_notifications.await_args.kwargs["offset"] == 2
+
+    @pytest.mark.asyncio
+    async def test_last_page_skips_count(self):
+        service = MagicMock(
+            get_user_notifications=AsyncMock(return_value=[self._notification(5)]),
+            count_user_notifications=AsyncMock(),
+        )
+
+        response = await list_notifications(
+            since_id=None,
+            unread_only=False,
+            page=3,
+            per_page=2,
+            current_user=SimpleNamespace(id=1),
+            service=service,
+        )
+
+        assert response.total == 5
+        service.count_user_notifications.assert_not_awaited()
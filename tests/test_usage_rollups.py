@@ -0,0 +1,331 @@
+"""
+Testes para os agregados diários de uso (controle de limites)
+"""
+
+import importlib.util
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+
+from app.infrastructure.repositories.limits_repository import LimitsRepository
+
+MIGRATION = (
+    Path(__file__).resolve().parent.parent
+    / "alembic"
+    / "versions"
+    / "018_usage_rollups.py"
+)
+
+
+@pytest.fixture(scope="module")
+def migration():
+    spec = importlib.util.spec_from_file_location("usage_rollups", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestUsageRollupMigration:
+    """Funções SQL geradas a partir dos templates"""
+
+    def test_check_authorization_limits_reads_rollup(self, migration):
+        sql = migration.CHECK_AUTHORIZATION_LIMITS_SQL.format(
+            authorization_usage="master.authorization_usage_daily"
+        )
+        assert "FROM master.authorization_usage_daily u" in sql
+        assert "service_usage_tracking" not in sql
+        # Uma única leitura para os três limites
+        assert sql.count("INTO daily_usage, weekly_usage, monthly_usage") == 1
+
+    def test_monitor_is_set_based(self, migration):
+        sql = migration.MONITOR_CONTRACT_LIMITS_SQL.format(
+            contract_usage="master.service_usage_daily"
+        )
+        assert "LOOP" not in sql
+        assert "JOIN master.service_usage_daily d" in sql
+        assert "INSERT INTO master.limits_violations" in sql
+
+    def test_downgrade_sources_keep_rollup_columns(self, migration):
+        """Subconsultas do downgrade expõem as mesmas colunas dos agregados"""
+        for column in ("authorization_id", "usage_date", "sessions_used"):
+            assert column in migration.RAW_AUTHORIZATION_USAGE
+        for column in ("contract_id", "service_id", "usage_date", "value_charged"):
+            assert column in migration.RAW_CONTRACT_USAGE
+
+
+class TestMonitorContractLimits:
+    """LimitsRepository.monitor_contract_limits"""
+
+    @pytest.mark.asyncio
+    async def test_calls_function_and_commits(self):
+        session = MagicMock()
+        result = MagicMock()
+        result.scalar.return_value = {"violations_found": 0, "violations": []}
+        session.execute = AsyncMock(return_value=result)
+        session.commit = AsyncMock()
+
+        repo = LimitsRepository(session)
+        monitoring = await repo.monitor_contract_limits(check_date=date(2025, 1, 31))
+
+        assert monitoring["violations_found"] == 0
+        statement, params = session.execute.await_args.args
+        assert "master.monitor_contract_limits" in str(statement)
+        assert params == {"contract_id": None, "check_date": date(2025, 1, 31)}
+        session.commit.assert_awaited_once()
+
+
+# Esquema descartável com as colunas usadas pelas funções da migration; o
+# SQL da migration é aplicado com "master." trocado por este esquema e tudo
+# roda numa transação desfeita ao final do teste.
+SCHEMA = "usage_rollups_test"
+
+FIXTURE_TABLES = f"""
+    CREATE SCHEMA {SCHEMA};
+    CREATE TABLE {SCHEMA}.contract_lives (id BIGINT PRIMARY KEY, contract_id BIGINT);
+    CREATE TABLE {SCHEMA}.medical_authorizations (
+        id BIGINT PRIMARY KEY, contract_life_id BIGINT, service_id BIGINT,
+        status VARCHAR(20) DEFAULT 'active', valid_from DATE, valid_until DATE,
+        sessions_remaining INTEGER, daily_limit INTEGER, weekly_limit INTEGER,
+        monthly_limit INTEGER
+    );
+    CREATE TABLE {SCHEMA}.service_usage_tracking (
+        id BIGSERIAL PRIMARY KEY, authorization_id BIGINT, execution_date DATE,
+        sessions_used INTEGER, value_charged NUMERIC(10, 2), status VARCHAR(20)
+    );
+    CREATE TABLE {SCHEMA}.limits_configuration (
+        id BIGINT PRIMARY KEY, rule_name VARCHAR(100), rule_type VARCHAR(20),
+        limit_scope VARCHAR(20), contract_id BIGINT, service_id BIGINT,
+        limit_value NUMERIC(15, 2), alert_threshold NUMERIC(3, 2) DEFAULT 0.8,
+        auto_block BOOLEAN DEFAULT false, is_active BOOLEAN DEFAULT true,
+        valid_from DATE, valid_until DATE, priority INTEGER DEFAULT 1
+    );
+    CREATE TABLE {SCHEMA}.limits_violations (
+        id BIGSERIAL PRIMARY KEY, limit_rule_id BIGINT, contract_id BIGINT,
+        violation_type VARCHAR(50), current_usage NUMERIC(15, 2),
+        limit_value NUMERIC(15, 2), percentage_used NUMERIC(8, 4),
+        period_start DATE, period_end DATE, auto_action_taken VARCHAR(50)
+    );
+    CREATE TABLE {SCHEMA}.authorization_usage_daily (
+        authorization_id BIGINT, usage_date DATE, sessions_used BIGINT DEFAULT 0,
+        PRIMARY KEY (authorization_id, usage_date)
+    );
+    CREATE TABLE {SCHEMA}.service_usage_daily (
+        contract_id BIGINT, service_id BIGINT, usage_date DATE,
+        sessions_used BIGINT DEFAULT 0, value_charged NUMERIC(14, 2) DEFAULT 0,
+        executions INTEGER DEFAULT 0,
+        PRIMARY KEY (contract_id, service_id, usage_date)
+    );
+    INSERT INTO {SCHEMA}.contract_lives VALUES (1, 10), (2, 20);
+    INSERT INTO {SCHEMA}.medical_authorizations
+        (id, contract_life_id, service_id, valid_from, valid_until, daily_limit,
+         weekly_limit)
+    VALUES (100, 1, 5, '2025-01-01', '2025-12-31', 2, 5),
+           (200, 2, 5, '2025-01-01', '2025-12-31', NULL, NULL);
+"""
+
+TODAY = date(2025, 3, 14)
+
+
+def _local(sql: str) -> str:
+    return sql.replace("master.", f"{SCHEMA}.")
+
+
+@pytest_asyncio.fixture
+async def rollup_db():
+    """Conexão asyncpg com o esquema de teste (pula sem banco disponível)"""
+    from tests.conftest import test_engine
+
+    try:
+        conn = await test_engine.connect()
+    except Exception as e:
+        pytest.skip(f"PostgreSQL de teste indisponível: {e}")
+
+    raw = (await conn.get_raw_connection()).driver_connection
+    transaction = raw.transaction()
+    await transaction.start()
+    try:
+        await raw.execute(FIXTURE_TABLES)
+        yield raw
+    finally:
+        await transaction.rollback()
+        await conn.close()
+
+
+async def _install(db, migration, backfill: bool = False):
+    await db.execute(_local(migration.ROLLUP_TRIGGER_SQL))
+    if backfill:
+        await db.execute(_local(migration.BACKFILL_SQL))
+    await db.execute(
+        _local(
+            migration.CHECK_AUTHORIZATION_LIMITS_SQL.format(
+                authorization_usage="master.authorization_usage_daily"
+            )
+        )
+    )
+    await db.execute(
+        _local(
+            migration.MONITOR_CONTRACT_LIMITS_SQL.format(
+                contract_usage="master.service_usage_daily"
+            )
+        )
+    )
+
+
+async def _track(db, authorization_id, execution_date, sessions, value, status):
+    return await db.fetchval(
+        f"""
+        INSERT INTO {SCHEMA}.service_usage_tracking
+            (authorization_id, execution_date, sessions_used, value_charged, status)
+        VALUES ($1, $2, $3, $4, $5) RETURNING id
+        """,
+        authorization_id,
+        execution_date,
+        sessions,
+        Decimal(value),
+        status,
+    )
+
+
+async def _assert_rollups_match_history(db, migration):
+    """Agregados == GROUP BY direto sobre service_usage_tracking"""
+    rollup = await db.fetch(
+        f"""
+        SELECT authorization_id, usage_date, sessions_used
+        FROM {SCHEMA}.authorization_usage_daily WHERE sessions_used <> 0
+        ORDER BY 1, 2
+        """
+    )
+    raw = await db.fetch(
+        f"""
+        SELECT authorization_id, usage_date, SUM(sessions_used) AS sessions_used
+        FROM {_local(migration.RAW_AUTHORIZATION_USAGE)} r
+        GROUP BY 1, 2 ORDER BY 1, 2
+        """
+    )
+    assert [tuple(r) for r in rollup] == [tuple(r) for r in raw]
+
+    rollup = await db.fetch(
+        f"""
+        SELECT contract_id, service_id, usage_date, sessions_used, value_charged
+        FROM {SCHEMA}.service_usage_daily WHERE executions <> 0
+        ORDER BY 1, 2, 3
+        """
+    )
+    raw = await db.fetch(
+        f"""
+        SELECT contract_id, service_id, usage_date, SUM(sessions_used),
+               SUM(value_charged)
+        FROM {_local(migration.RAW_CONTRACT_USAGE)} r
+        GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+        """
+    )
+    assert [tuple(r) for r in rollup] == [tuple(r) for r in raw]
+
+
+@pytest.mark.integration
+class TestUsageRollupBehaviour:
+    """Trigger, backfill e funções de leitura contra PostgreSQL"""
+
+    @pytest.mark.asyncio
+    async def test_trigger_applies_row_deltas(self, rollup_db, migration):
+        db = rollup_db
+        await _install(db, migration)
+
+        done = await _track(db, 100, TODAY, 1, 50, "completed")
+        await _track(db, 100, TODAY, 2, 80, "completed")
+        pending = await _track(db, 200, TODAY, 3, 90, "pending")
+        await _assert_rollups_match_history(db, migration)
+
+        # Mudança de status, de data e de sessões; exclusão
+        await db.execute(
+            f"UPDATE {SCHEMA}.service_usage_tracking SET status = 'completed' "
+            "WHERE id = $1",
+            pending,
+        )
+        await db.execute(
+            f"UPDATE {SCHEMA}.service_usage_tracking "
+            "SET execution_date = $2, sessions_used = 4 WHERE id = $1",
+            done,
+            TODAY - timedelta(days=1),
+        )
+        await _assert_rollups_match_history(db, migration)
+
+        await db.execute(
+            f"DELETE FROM {SCHEMA}.service_usage_tracking WHERE id = $1", done
+        )
+        await _assert_rollups_match_history(db, migration)
+
+    @pytest.mark.asyncio
+    async def test_backfill_matches_history(self, rollup_db, migration):
+        db = rollup_db
+        await _track(db, 100, TODAY, 1, 50, "completed")
+        await _track(db, 100, TODAY - timedelta(days=3), 2, 30, "completed")
+        await _track(db, 200, TODAY, 5, 10, "cancelled")
+
+        await _install(db, migration, backfill=True)
+
+        await _assert_rollups_match_history(db, migration)
+
+    @pytest.mark.asyncio
+    async def test_check_authorization_limits_reads_rollup(self, rollup_db, migration):
+        db = rollup_db
+        await _install(db, migration)
+        await _track(db, 100, TODAY, 2, 0, "completed")
+        await _track(db, 100, TODAY - timedelta(days=6), 2, 0, "completed")
+        # Fora da janela semanal
+        await _track(db, 100, TODAY - timedelta(days=7), 9, 0, "completed")
+
+        result = json.loads(
+            await db.fetchval(
+                f"SELECT {SCHEMA}.check_authorization_limits(100, 1, $1)", TODAY
+            )
+        )
+
+        assert result["valid"] is False
+        violations = {v["type"]: v["current_usage"] for v in result["violations"]}
+        assert violations == {"DAILY_LIMIT_EXCEEDED": 2}
+
+        result = json.loads(
+            await db.fetchval(
+                f"SELECT {SCHEMA}.check_authorization_limits(100, 1, $1)",
+                TODAY + timedelta(days=1),
+            )
+        )
+        assert result["valid"] is True
+
+    @pytest.mark.asyncio
+    async def test_monitor_evaluates_global_rule_per_contract(
+        self, rollup_db, migration
+    ):
+        db = rollup_db
+        await _install(db, migration)
+        await db.execute(
+            f"""
+            INSERT INTO {SCHEMA}.limits_configuration
+                (id, rule_name, rule_type, limit_scope, limit_value, valid_from)
+            VALUES (1, 'Sessões por mês', 'SESSION', 'MONTHLY', 3, '2025-01-01')
+            """
+        )
+        await _track(db, 100, TODAY, 4, 0, "completed")
+        await _track(db, 200, TODAY, 1, 0, "completed")
+        # Mês anterior não conta
+        await _track(db, 200, date(2025, 2, 28), 9, 0, "completed")
+
+        result = json.loads(
+            await db.fetchval(
+                f"SELECT {SCHEMA}.monitor_contract_limits(NULL, $1)", TODAY
+            )
+        )
+
+        assert result["violations_found"] == 1
+        violation = result["violations"][0]
+        assert violation["contract_id"] == 10
+        assert violation["violation_type"] == "EXCEEDED"
+        assert (
+            await db.fetchval(f"SELECT COUNT(*) FROM {SCHEMA}.limits_violations") == 1
+        )
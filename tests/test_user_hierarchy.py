@@ -0,0 +1,120 @@
+"""
+Testes para o escopo hierárquico da listagem de usuários
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.infrastructure.repositories.hierarchical_user_repository import (
+    AccessScope,
+    HierarchicalUserRepository,
+)
+
+
+def _hierarchy_row(**overrides):
+    row = {
+        "user_id": 7,
+        "is_system_admin": False,
+        "max_company_level": None,
+        "max_establishment_level": None,
+        "company_role_ids": [],
+        "establishment_role_ids": [],
+        "establishment_ids": [],
+    }
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+class TestAccessScope:
+    """Mesmas regras de master.get_accessible_users_hierarchical"""
+
+    def test_root(self):
+        scope = AccessScope.from_hierarchy(_hierarchy_row(is_system_admin=True))
+        assert scope.access_level == "full"
+        assert scope.condition() == ("TRUE", {})
+
+    def test_company_admin(self):
+        scope = AccessScope.from_hierarchy(
+            _hierarchy_row(max_company_level=80, company_role_ids=[1, 2])
+        )
+        condition, params = scope.condition()
+        assert scope.access_level == "company"
+        assert "uh.company_ids &&" in condition
+        assert params == {"scope_company_ids": [1, 2]}
+
+    def test_establishment_admin(self):
+        scope = AccessScope.from_hierarchy(
+            _hierarchy_row(
+                max_company_level=50,
+                max_establishment_level=60,
+                establishment_role_ids=[10],
+            )
+        )
+        assert scope.access_level == "establishment"
+        assert scope.condition()[1] == {"scope_establishment_ids": [10]}
+
+    def test_common_user_sees_self_and_colleagues(self):
+        scope = AccessScope.from_hierarchy(
+            _hierarchy_row(max_establishment_level=40, establishment_ids=[10, 11])
+        )
+        condition, params = scope.condition()
+        assert scope.access_level == "self"
+        assert "uh.user_id = :scope_user_id" in condition
+        assert params["scope_establishment_ids"] == [10, 11]
+
+        assert scope.describe_access(7, [], [10]) == ("self", "Own Data Access")
+        assert scope.describe_access(8, [], [11, 12]) == (
+            "establishment",
+            "Colleague in Establishment 11",
+        )
+        assert scope.access_level_condition("company") is None
+
+    def test_cache_round_trip(self):
+        scope = AccessScope(3, "company", company_ids=(1, 2))
+        assert AccessScope.from_dict(scope.to_dict()) == scope
+
+
+class TestListAccessibleUsers:
+    """Listagem como junção com a projeção, sem arrays de ids de usuários"""
+
+    @pytest.mark.asyncio
+    async def test_lists_by_company_scope(self):
+        scope_row = _hierarchy_row(max_company_level=90, company_role_ids=[1])
+        user_row = MagicMock()
+        user_row._mapping = {
+            "user_id": 8,
+            "user_email": "ana@example.com",
+            "person_name": "Ana",
+            "hierarchy_level": "USUARIO_COMUM",
+            "hierarchy_rank": 4,
+            "member_company_ids": [1],
+            "member_establishment_ids": [10],
+        }
+
+        scope_result = MagicMock()
+        scope_result.fetchone.return_value = scope_row
+        list_result = MagicMock()
+        list_result.fetchall.return_value = [user_row]
+
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=[scope_result, list_result])
+
+        users, total = await HierarchicalUserRepository(db).list_accessible_users(
+            requesting_user_id=7, search="ana"
+        )
+
+        assert total == 1
+        assert users[0]["access_reason"] == (
+            "Company Administrator - Access to Company 1"
+        )
+        assert "hierarchy_rank" not in users[0]
+        assert "member_company_ids" not in users[0]
+
+        statement, params = db.execute.await_args_list[1].args
+        sql = str(statement)
+        assert "JOIN master.user_hierarchy uh" in sql
+        assert "EXISTS" not in sql
+        assert "accessible_users" not in params
+        assert params["scope_company_ids"] == [1]
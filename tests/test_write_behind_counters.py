@@ -0,0 +1,98 @@
+"""
+Testes para os contadores write-behind
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.infrastructure.services.write_behind_counters import (
+    PROGRAM_CODE_USAGE,
+    USER_LAST_LOGIN,
+    WriteBehindCounters,
+)
+
+
+class FakeSession:
+    """Sessão falsa que registra statements executados"""
+
+    executed = []
+    fail = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self, statement, params):
+        if FakeSession.fail:
+            raise RuntimeError("database unavailable")
+        FakeSession.executed.append((str(statement), params))
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def counters():
+    FakeSession.executed = []
+    FakeSession.fail = False
+    return WriteBehindCounters(session_factory=FakeSession, flush_interval=60)
+
+
+class TestWriteBehindCounters:
+    """Testes para WriteBehindCounters"""
+
+    @pytest.mark.asyncio
+    async def test_accumulates_and_flushes_in_one_statement(self, counters):
+        """Vários incrementos viram um único UPDATE por tabela"""
+        early, late = datetime(2025, 1, 1, 10), datetime(2025, 1, 1, 11)
+        for _ in range(3):
+            counters.increment(PROGRAM_CODE_USAGE, "em0001", last_used_at=late)
+        counters.increment(PROGRAM_CODE_USAGE, "em0001", last_used_at=early)
+        counters.increment(PROGRAM_CODE_USAGE, "ct0001", last_used_at=early)
+
+        assert counters.pending_increment(PROGRAM_CODE_USAGE, "em0001") == 4
+        assert await counters.flush() == 2
+
+        assert len(FakeSession.executed) == 1
+        sql, params = FakeSession.executed[0]
+        assert "unnest" in sql and "GREATEST" in sql
+        rows = dict(
+            zip(params["keys"], zip(params["usage_count"], params["last_used_at"]))
+        )
+        assert rows == {"em0001": (4, late), "ct0001": (1, early)}
+        assert counters.pending_keys() == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_pending_values(self, counters):
+        """Falha no banco não perde incrementos"""
+        counters.increment(PROGRAM_CODE_USAGE, "em0001")
+        FakeSession.fail = True
+        assert await counters.flush() == 0
+
+        counters.increment(PROGRAM_CODE_USAGE, "em0001")
+        assert counters.pending_increment(PROGRAM_CODE_USAGE, "em0001") == 2
+
+        FakeSession.fail = False
+        assert await counters.flush() == 1
+        assert FakeSession.executed[0][1]["usage_count"] == [2]
+
+    def test_max_only_target(self, counters):
+        """last_login_at usa apenas GREATEST, sem colunas de incremento"""
+        sql = USER_LAST_LOGIN.build_update()
+        assert "last_login_at = GREATEST(t.last_login_at, v.last_login_at)" in sql
+        assert "CAST(:keys AS bigint[])" in sql
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending(self, counters):
+        """Shutdown grava o que estiver pendente"""
+        await counters.start()
+        counters.record(
+            USER_LAST_LOGIN, 1, maxima={"last_login_at": datetime(2025, 1, 1)}
+        )
+        await counters.stop()
+
+        assert not counters.is_running
+        assert len(FakeSession.executed) == 1